@@ -115,6 +115,7 @@ class AITRIOSCameraHandler:
         # Face recognition setup
         self.known_face_encodings = []
         self.known_face_names = []
+        self.face_gallery = None
         self.face_recognition_enabled = FACE_RECOGNITION_AVAILABLE
         
         # Camera configuration
@@ -192,48 +193,17 @@ class AITRIOSCameraHandler:
             return False
     
     def load_known_faces(self):
-        """Load known faces from the people directory for AI-enhanced recognition."""
+        """Load known faces from the shared people/ gallery for AI-enhanced recognition."""
         if not self.face_recognition_enabled:
             return
         
-        people_dir = "people"
-        if not os.path.exists(people_dir):
-            self.logger.warning(f"People directory '{people_dir}' not found")
-            return
-        
-        self.logger.info("👤 Loading known faces for AI camera...")
+        from model_registry import get_face_gallery
         
-        for person_name in os.listdir(people_dir):
-            person_path = os.path.join(people_dir, person_name)
-            if not os.path.isdir(person_path):
-                continue
-            
-            self.logger.info(f"   Loading faces for {person_name.title()}...")
-            person_encodings = []
-            
-            for image_file in os.listdir(person_path):
-                if image_file.lower().endswith(('.jpg', '.jpeg', '.png')):
-                    image_path = os.path.join(person_path, image_file)
-                    
-                    try:
-                        image = face_recognition.load_image_file(image_path)
-                        encodings = face_recognition.face_encodings(image)
-                        
-                        if encodings:
-                            person_encodings.extend(encodings)
-                            self.logger.info(f"     ✅ Loaded {len(encodings)} face(s) from {image_file}")
-                        else:
-                            self.logger.info(f"     ⚠️ No face found in {image_file}")
-                    
-                    except Exception as e:
-                        self.logger.error(f"     ❌ Error loading {image_file}: {e}")
-            
-            if person_encodings:
-                self.known_face_encodings.extend(person_encodings)
-                self.known_face_names.extend([person_name] * len(person_encodings))
-                self.logger.info(f"   ✅ Total {len(person_encodings)} face encodings loaded for {person_name.title()}")
+        self.face_gallery = get_face_gallery("people")
+        self.known_face_encodings = self.face_gallery.encodings
+        self.known_face_names = self.face_gallery.names
         
-        self.logger.info(f"🎉 AI Face recognition ready! Loaded {len(self.known_face_names)} encodings")
+        self.logger.info(f"🎉 AI Face recognition ready! Using {len(self.known_face_names)} shared encodings")
     
     def _start_ai_processing(self):
         """Start AI processing thread for continuous object detection"""
@@ -372,18 +342,12 @@ class AITRIOSCameraHandler:
             
             face_detections = []
             
-            for face_encoding, face_location in zip(face_encodings, face_locations):
-                matches = face_recognition.compare_faces(self.known_face_encodings, face_encoding, tolerance=0.6)
-                face_distances = face_recognition.face_distance(self.known_face_encodings, face_encoding)
-                
-                name = "Unknown"
-                confidence = 0.0
-                
-                if any(matches):
-                    best_match_index = np.argmin(face_distances)
-                    if matches[best_match_index]:
-                        name = self.known_face_names[best_match_index]
-                        confidence = 1.0 - face_distances[best_match_index]
+            # Batched match of every face against the shared gallery
+            matches = self.face_gallery.match(face_encodings, tolerance=0.6) if self.face_gallery else \
+                [("Unknown", 1.0)] * len(face_encodings)
+            
+            for (name, distance), face_location in zip(matches, face_locations):
+                confidence = 1.0 - distance if name != "Unknown" else 0.0
                 
                 # Scale back up face locations
                 top, right, bottom, left = face_location
@@ -192,40 +192,20 @@ Show me your first animal! 🎉"""
     def _identify_animal_with_vision(self, user: str) -> Dict[str, Any]:
         """Use the existing ObjectIdentifier with specialized animal prompts."""
         try:
-            # Use the object identifier's capture_and_identify method
-            # but we'll need to customize the prompt for animals
-            
-            # First, let's capture using the object identifier
-            result = self.object_identifier.capture_and_identify()
-            
-            if not result["success"]:
-                return result
-            
-            # Get the image path from the result
-            image_path = result.get("image_path")
-            if not image_path:
+            # Capture a frame and encode it in memory (one vision call, no file round trip)
+            ret, frame = self.object_identifier.capture_frame()
+            if not ret or frame is None:
                 return {
                     "success": False,
-                    "message": "Failed to get captured image path."
+                    "message": "I couldn't take a picture. The camera might be busy."
                 }
             
-            # Now use custom animal identification logic
-            import base64
+            # This animal was shown before: answer from memory
+            signature, remembered = self.object_identifier.recall(user, "animal", frame)
+            if remembered is not None:
+                return dict(remembered, user=user)
             
-            # Handle image encoding based on camera type
-            if hasattr(self.object_identifier, 'using_shared_camera') and self.object_identifier.using_shared_camera:
-                # For shared camera, encode the image file directly
-                with open(image_path, "rb") as image_file:
-                    base64_image = base64.b64encode(image_file.read()).decode('utf-8')
-            else:
-                # For standalone camera manager, use its method
-                base64_image = self.object_identifier.camera_manager.encode_image_to_base64(image_path)
-            
-            if not base64_image:
-                return {
-                    "success": False,
-                    "message": "I couldn't process the image properly."
-                }
+            image = self.object_identifier.encoder.encode(frame, detail="high", name="animal_capture")
             
             # Create specialized animal identification prompt
             prompt = self._get_animal_identification_prompt(user)
@@ -239,18 +219,12 @@ Show me your first animal! 🎉"""
                             "type": "text",
                             "text": prompt
                         },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{base64_image}",
-                                "detail": "high"
-                            }
-                        }
+                        image.image_content()
                     ]
                 }
             ]
             
-            response = self.object_identifier.client.chat.completions.create(
+            response = self.object_identifier._chat(
                 model="gpt-4o",
                 messages=messages,
                 max_tokens=500,
@@ -259,19 +233,14 @@ Show me your first animal! 🎉"""
             
             ai_response = response.choices[0].message.content.strip()
             
-            # Clean up image file
-            try:
-                import os
-                os.remove(image_path)
-            except:
-                pass
-            
-            return {
+            result = {
                 "success": True,
                 "ai_response": ai_response,
                 "user": user,
                 "message": ai_response
             }
+            self.object_identifier.remember(user, "animal", signature, result)
+            return result
             
         except Exception as e:
             logger.error(f"Vision API error in animal identification: {e}")
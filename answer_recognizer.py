@@ -0,0 +1,196 @@
+"""
+Game Answer Recognizer for AI Assistant
+Recognizes answers during games against the small set of answers the active
+game expects, instead of open-vocabulary recognition plus fuzzy string fixes
+
+- With a local Vosk model the utterance is decoded directly against a
+  restricted grammar of the candidate phrases (typically well under 200 ms)
+- Otherwise (or for words the model doesn't know, e.g. Filipino) an open
+  transcript is matched to the candidates by phonetic similarity, so
+  "como esta" still scores as "kumusta" and "read he" as "ready"
+
+Candidates are given as {spoken phrase: text handed to the game}, e.g.
+{"seven": "7", "the answer is seven": "7", "ready": "ready"}.
+"""
+
+import re
+import time
+import logging
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import speech_recognition as sr
+
+logger = logging.getLogger(__name__)
+
+# Minimum phonetic similarity for a transcript to count as a candidate
+MIN_PHONETIC_SIMILARITY = 0.8
+# Minimum decoder confidence for a restricted-grammar result
+MIN_GRAMMAR_CONFIDENCE = 0.6
+
+# Words around an answer ("I think it's ...", "the answer is ...") that are ignored
+# unless a candidate phrase uses them
+FILLER_WORDS = {'i', 'think', "it's", 'its', 'it', 'is', 'the', 'a', 'an', 'answer', 'my', 'guess',
+                'um', 'uh', 'umm', 'so', 'like', 'say', 'that', 'was', 'how', 'about'}
+
+GRAMMAR_FILLERS = ['the answer is', "i think it's", "it's", 'i think', 'um']
+
+# Spelling -> sound rewrites, applied in order (English spellings of English and Filipino words)
+_PHONETIC_RULES = [
+    (r'ph', 'f'), (r'ck', 'k'), (r'qu', 'kw'), (r'x', 'ks'), (r'th', 't'),
+    (r'sh', 's'), (r'ch', 's'), (r'c(?=[eiy])', 's'), (r'c', 'k'), (r'q', 'k'),
+    (r'z', 's'), (r'v', 'b'), (r'ng', 'N'), (r'gh', ''), (r'wh', 'w'),
+    (r'h', ''),
+    (r'ee|ea|ie|ey|[eiy]', 'I'), (r'oo|ou|ow|[ou]', 'U'), (r'a', 'A'),
+    (r'(.)\1+', r'\1'),
+]
+
+_ONES = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
+         'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen',
+         'eighteen', 'nineteen']
+_TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+
+
+def number_words(n: int) -> str:
+    """Spoken form of 0-999 ("forty two")"""
+    if n < 20:
+        return _ONES[n]
+    if n < 100:
+        return _TENS[n // 10] + ('' if n % 10 == 0 else ' ' + _ONES[n % 10])
+    rest = n % 100
+    return _ONES[n // 100] + ' hundred' + ('' if rest == 0 else ' ' + number_words(rest))
+
+
+@lru_cache(maxsize=4096)
+def phonetic_key(text: str) -> str:
+    """Rough pronunciation key: consonant classes plus three vowel classes, spaces removed"""
+    key = re.sub(r'[^a-z]', '', text.lower())
+    for pattern, replacement in _PHONETIC_RULES:
+        key = re.sub(pattern, replacement, key)
+    return key
+
+
+def _edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def phonetic_similarity(a: str, b: str) -> float:
+    """0-1 similarity of two phrases by pronunciation key"""
+    key_a, key_b = phonetic_key(a), phonetic_key(b)
+    if not key_a or not key_b:
+        return 0.0
+    return 1.0 - _edit_distance(key_a, key_b) / max(len(key_a), len(key_b))
+
+
+@dataclass
+class AnswerMatch:
+    """Best candidate for an utterance"""
+    spoken: str        # candidate phrase that matched
+    value: str         # text handed to the game
+    confidence: float  # 0-1
+    method: str        # 'grammar' or 'phonetic'
+    latency: float = 0.0
+
+
+class AnswerRecognizer:
+    """Scores utterances against the active game's candidate answers"""
+
+    def __init__(self, stt=None, min_similarity: float = MIN_PHONETIC_SIMILARITY,
+                 min_confidence: float = MIN_GRAMMAR_CONFIDENCE):
+        """
+        Args:
+            stt: SpeechToText chain whose local grammar-capable backend is used (optional)
+            min_similarity: Minimum phonetic similarity for match_text()
+            min_confidence: Minimum decoder confidence for recognize()
+        """
+        self.stt = stt
+        self.min_similarity = min_similarity
+        self.min_confidence = min_confidence
+
+    def recognize(self, audio_data: sr.AudioData, candidates: Dict[str, str],
+                  language: str = 'en-US') -> Optional[AnswerMatch]:
+        """
+        Decode the utterance against the candidates with a local restricted grammar
+
+        Returns:
+            Best candidate, or None if no local decoder is available, the
+            utterance wasn't one of the candidates, or confidence is too low
+            (callers then fall back to open recognition + match_text())
+        """
+        backend = self.stt.local_vocabulary_backend() if self.stt else None
+        if backend is None or not candidates:
+            return None
+
+        start = time.time()
+        try:
+            # Filler phrases are in the grammar too, so "the answer is seven" decodes cleanly
+            transcript = backend.recognize(audio_data, language, list(candidates) + GRAMMAR_FILLERS)
+        except sr.RequestError as e:
+            logger.warning(f"⚠️ Answer grammar decoding unavailable: {e}")
+            return None
+        latency = time.time() - start
+        if transcript is None or transcript.confidence < self.min_confidence:
+            return None
+
+        text = transcript.text.lower().strip()
+        if text in candidates:
+            match = AnswerMatch(text, candidates[text], transcript.confidence, 'grammar', latency)
+        else:
+            # Several grammar phrases in one utterance ("ready ready"): take the closest
+            match = self.match_text(text, candidates)
+            if match is None:
+                return None
+            match.method, match.latency = 'grammar', latency
+            match.confidence = min(match.confidence, transcript.confidence)
+        logger.info(f"🎯 Answer '{match.spoken}' -> '{match.value}' "
+                    f"({match.method}, {match.confidence:.2f}, {latency * 1000:.0f} ms)")
+        return match
+
+    def match_text(self, text: str, candidates: Dict[str, str]) -> Optional[AnswerMatch]:
+        """
+        Closest candidate to a transcript by pronunciation
+
+        Each candidate is compared with every run of words in the transcript of
+        about the candidate's length, so "I think it's sven" still finds "seven".
+        """
+        if not text or not candidates:
+            return None
+        start = time.time()
+        candidate_words = {word for spoken in candidates for word in spoken.split()}
+        words = [w for w in text.lower().split() if w not in FILLER_WORDS or w in candidate_words]
+        if not words:
+            return None
+        heard = f" {' '.join(words)} "
+        scores = []
+        for spoken in candidates:
+            length = len(spoken.split())
+            best = 0.0
+            for size in {max(1, length - 1), length, length + 1}:
+                for i in range(max(1, len(words) - size + 1)):
+                    best = max(best, phonetic_similarity(' '.join(words[i:i + size]), spoken))
+            scores.append((best, f' {spoken} ' in heard, len(spoken), spoken))
+        # Ties go to the phrase actually heard ("tree" over "three"), then the longer one
+        # ("twenty one" over "twenty")
+        scores.sort(reverse=True)
+
+        best, exact, _, spoken = scores[0]
+        runner_up = scores[1] if len(scores) > 1 else None
+        # Two different answers that sound alike: only trust a clear winner
+        if (runner_up and not exact and candidates[runner_up[3]] != candidates[spoken]
+                and runner_up[3] not in spoken and best - runner_up[0] < 0.05):
+            best -= 0.1
+        if best < self.min_similarity:
+            return None
+        return AnswerMatch(spoken, candidates[spoken], best, 'phonetic', time.time() - start)
+
+
+def candidates_from(phrases: List[str]) -> Dict[str, str]:
+    """Candidates whose game text is the phrase itself"""
+    return {phrase.lower(): phrase.lower() for phrase in phrases}
@@ -0,0 +1,221 @@
+"""
+In-Memory Audio Playback for AI Assistant
+Plays TTS audio straight from memory on a reserved pygame mixer channel, with
+no temp files on the SD card and no get_busy() polling loop
+
+- play_bytes(): decode MP3/WAV/OGG bytes in memory and play them
+- play_pcm_stream(): play raw 16-bit PCM chunks as they arrive from a
+  streaming TTS response, so speech starts before the download finishes
+
+Completion is signalled with a threading.Event (set by stop() or after the
+clip's known duration) instead of polling the mixer every 100 ms
+"""
+
+import io
+import time
+import wave
+import logging
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# OpenAI TTS response_format="pcm": 24 kHz, signed 16-bit little-endian, mono
+OPENAI_PCM_RATE = 24000
+# Channel kept free for speech so cue sounds (Sound.play) never cut it off
+SPEECH_CHANNEL = 0
+# Allowance for the audio device buffer after a clip's nominal duration
+PLAYBACK_TAIL = 0.25
+PLAYBACK_TAIL_STEP = 0.005
+# Decoded clips kept ready for instant replay (hot cached phrases)
+DECODED_CLIPS = 16
+
+_speech_player = None
+_speech_player_lock = threading.Lock()
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = OPENAI_PCM_RATE) -> bytes:
+    """Wrap raw 16-bit mono PCM in a WAV header so it can be cached and decoded later"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class InMemoryPlayer:
+    """Speech playback on a reserved mixer channel, fed from memory"""
+
+    def __init__(self):
+        if pygame.mixer.get_num_channels() <= SPEECH_CHANNEL:
+            pygame.mixer.set_num_channels(8)
+        pygame.mixer.set_reserved(SPEECH_CHANNEL + 1)
+        self.channel = pygame.mixer.Channel(SPEECH_CHANNEL)
+        self._done = threading.Event()
+        self._stopped = False
+        self._decoded = OrderedDict()  # cache key -> decoded Sound
+        self.last_finished_at = 0.0    # time.time() when the last clip stopped playing
+
+    def decode(self, audio_bytes: bytes) -> pygame.mixer.Sound:
+        """Decode encoded audio (MP3, WAV, OGG) into a mixer-ready Sound"""
+        return pygame.mixer.Sound(file=io.BytesIO(audio_bytes))
+
+    def play_sound(self, sound: pygame.mixer.Sound, volume: float = 1.0, max_duration: float = 45.0) -> bool:
+        """
+        Play a decoded Sound and block until it has finished
+
+        Returns:
+            bool: False if playback was stopped early
+        """
+        self._begin()
+        self.channel.set_volume(volume)
+        self.channel.play(sound)
+        self._wait_until(time.time() + min(sound.get_length(), max_duration))
+        return self._finish()
+
+    def play_bytes(self, audio_bytes: bytes, volume: float = 1.0, max_duration: float = 45.0,
+                   cache_key: Optional[str] = None) -> bool:
+        """
+        Decode encoded audio in memory and play it, blocking until done
+
+        Args:
+            audio_bytes: MP3/WAV/OGG data
+            volume: Playback volume (0.0 - 1.0)
+            max_duration: Upper bound on how long to wait
+            cache_key: Keep the decoded Sound under this key so replays skip decoding
+        """
+        sound = self._decoded.get(cache_key) if cache_key else None
+        if sound is None:
+            sound = self.decode(audio_bytes)
+            if cache_key:
+                self._decoded[cache_key] = sound
+                while len(self._decoded) > DECODED_CLIPS:
+                    self._decoded.popitem(last=False)
+        else:
+            self._decoded.move_to_end(cache_key)
+        return self.play_sound(sound, volume, max_duration)
+
+    def play_pcm_stream(self, chunks: Iterable[bytes], sample_rate: int = OPENAI_PCM_RATE,
+                        volume: float = 1.0, prebuffer: float = 0.25) -> Tuple[bytes, bool]:
+        """
+        Play raw 16-bit mono PCM chunks as they arrive
+
+        Audio is queued on the speech channel in blocks: the first block starts
+        once `prebuffer` seconds are available, later blocks are appended
+        whenever the channel's queue slot is free
+
+        Args:
+            chunks: Iterable of PCM byte chunks (e.g. response.iter_bytes())
+            sample_rate: Sample rate of the PCM data
+            volume: Playback volume (0.0 - 1.0)
+            prebuffer: Seconds of audio to collect before starting playback
+
+        Returns:
+            (pcm, completed): All PCM received, and False if stop() cut playback
+            short - only a completed stream is the whole clip and safe to cache
+        """
+        self._begin()
+        self.channel.set_volume(volume)
+        received = bytearray()
+        pending = bytearray()
+        self._ends_at = 0.0
+        self._queued_length = 0.0
+        min_block = int(prebuffer * sample_rate) * 2
+
+        for chunk in chunks:
+            if self._stopped:
+                break
+            received += chunk
+            pending += chunk
+            if len(pending) >= min_block and self._slot_free():
+                self._queue(self._pcm_sound(pending, sample_rate))
+
+        # Download finished - queue the rest as slots free up
+        while len(pending) >= 2 and not self._stopped:
+            if not self._slot_free():
+                self._wait_until(self._ends_at - self._queued_length)
+                continue
+            self._queue(self._pcm_sound(pending, sample_rate))
+
+        self._wait_until(self._ends_at)
+        completed = self._finish()
+        return bytes(received), completed
+
+    def stop(self):
+        """Stop playback and wake up whoever is waiting on it"""
+        self._stopped = True
+        self._done.set()
+        try:
+            self.channel.stop()
+        except pygame.error:
+            pass
+
+    def is_playing(self) -> bool:
+        return self.channel.get_busy()
+
+    def _begin(self):
+        self._stopped = False
+        self._done.clear()
+
+    def _finish(self) -> bool:
+        stopped = self._stopped
+        self.last_finished_at = time.time()
+        self._done.set()
+        return not stopped
+
+    def _wait_until(self, deadline: float):
+        """Sleep until deadline (plus device latency) unless stop() is called"""
+        remaining = deadline - time.time()
+        if remaining > 0:
+            self._done.wait(remaining)
+        # The mixer may still be draining its last buffer
+        tail_deadline = time.time() + PLAYBACK_TAIL
+        while not self._stopped and self.channel.get_busy() and time.time() < tail_deadline:
+            self._done.wait(PLAYBACK_TAIL_STEP)
+
+    def _slot_free(self) -> bool:
+        """True when another block can be handed to the channel without blocking"""
+        return not self.channel.get_busy() or self.channel.get_queue() is None
+
+    def _queue(self, sound: pygame.mixer.Sound):
+        """Start or append a block, tracking when the queued audio will end"""
+        length = sound.get_length()
+        now = time.time()
+        if not self.channel.get_busy():
+            self.channel.play(sound)
+            self._ends_at = now + length
+        else:
+            self.channel.queue(sound)
+            self._ends_at = max(self._ends_at, now) + length
+        self._queued_length = length
+
+    def _pcm_sound(self, pending: bytearray, sample_rate: int) -> pygame.mixer.Sound:
+        """Convert (and consume) buffered mono PCM into a Sound in the mixer's format"""
+        usable = len(pending) - len(pending) % 2
+        samples = np.frombuffer(bytes(pending[:usable]), dtype=np.int16)
+        del pending[:usable]
+
+        mixer_rate, _, mixer_channels = pygame.mixer.get_init()
+        if mixer_rate != sample_rate and len(samples) > 1:
+            target_length = int(round(len(samples) * mixer_rate / sample_rate))
+            positions = np.linspace(0, len(samples) - 1, target_length)
+            samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+        if mixer_channels > 1:
+            samples = np.repeat(samples[:, None], mixer_channels, axis=1)
+
+        return pygame.mixer.Sound(buffer=np.ascontiguousarray(samples).tobytes())
+
+
+def get_speech_player() -> InMemoryPlayer:
+    """Process-wide speech player (all TTS voices share the speech channel)"""
+    global _speech_player
+    with _speech_player_lock:
+        if _speech_player is None:
+            _speech_player = InMemoryPlayer()
+        return _speech_player
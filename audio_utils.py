@@ -6,24 +6,30 @@ Handles speech recognition and audio processing with premium OpenAI TTS
 import pyaudio
 import speech_recognition as sr
 import logging
-from typing import Optional, Tuple
-import numpy as np
+from typing import Callable, Optional, Tuple, List
 import pyttsx3
 import openai
 import io
 import pygame
-import tempfile
 import os
 from pathlib import Path
-import threading
 import time
 import platform
+from tts_cache import TTSCache, tts_cache_key
+from audio_playback import get_speech_player, pcm_to_wav
+from mic_stream import MicrophoneStream, RingBufferSource
+from stt_backends import SpeechToText
+from cloud_transport import get_transport
+
+# Seconds per OpenAI TTS request attempt
+TTS_TIMEOUT = 15.0
 
 
 class OpenAITTSEngine:
     """Premium OpenAI Text-to-Speech Engine with natural human-like voices."""
     
-    def __init__(self, openai_client: openai.OpenAI, voice: str = "nova", model: str = "tts-1-hd"):
+    def __init__(self, openai_client: openai.OpenAI, voice: str = "nova", model: str = "tts-1-hd",
+                 cache: Optional[TTSCache] = None, stream_playback: bool = True):
         """
         Initialize OpenAI TTS Engine
         
@@ -31,8 +37,12 @@ class OpenAITTSEngine:
             openai_client: OpenAI client instance
             voice: Voice to use (alloy, echo, fable, onyx, nova, shimmer)
             model: TTS model (tts-1 for speed, tts-1-hd for quality)
+            cache: Optional TTS audio cache shared between engines
+            stream_playback: Start playing PCM while the TTS response is still downloading
         """
         self.client = openai_client
+        self.cache = cache
+        self.stream_playback = stream_playback
         self.voice = voice
         self.model = model
         self.rate = 1.0  # Speech rate (0.25 to 4.0)
@@ -40,140 +50,117 @@ class OpenAITTSEngine:
         
         # Initialize pygame mixer for audio playback
         pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        self.player = get_speech_player()
+        self.transport = get_transport()
+        self._offline_engine = None  # local pyttsx3 voice, created the first time the cloud is unreachable
         
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"OpenAI TTS Engine initialized with voice: {voice}")
     
     def say(self, text: str):
-        """Convert text to speech and play it with retry logic."""
-        max_retries = 2
-        base_timeout = 15.0
+        """Convert text to speech and play it, falling back to the offline voice if OpenAI TTS fails."""
+        cached_audio = self.cache.get(text, self.voice, self.model, self.rate) if self.cache else None
+        if cached_audio:
+            self.logger.info(f"OpenAI TTS: Cache hit for '{text[:50]}...'")
+            self.play_audio(cached_audio, text, cache_key=tts_cache_key(text, self.voice, self.model, self.rate))
+            return
         
-        for attempt in range(max_retries):
-            try:
-                if attempt > 0:
-                    self.logger.info(f"OpenAI TTS: Retry attempt {attempt + 1}/{max_retries}")
-                
-                self.logger.info(f"OpenAI TTS: Starting to process text: '{text[:50]}...'")
-                
-                # Generate speech using OpenAI TTS with progressive timeout
-                self.logger.info("OpenAI TTS: Calling API...")
-                
-                # Progressive timeout: 15s, then 25s
-                current_timeout = base_timeout + (attempt * 10)
-                
-                # Add timeout to the OpenAI API call
-                response = None
-                api_error = None
-                
-                def api_call():
-                    nonlocal response, api_error
-                    try:
-                        response = self.client.audio.speech.create(
-                            model=self.model,
-                            voice=self.voice,
-                            input=text,
-                            speed=self.rate
-                        )
-                    except Exception as e:
-                        api_error = e
-                
-                # Start API call in separate thread with timeout
-                api_thread = threading.Thread(target=api_call)
-                api_thread.daemon = True
-                api_thread.start()
-                
-                # Wait for API call to complete with progressive timeout
-                api_thread.join(timeout=current_timeout)
-                
-                if api_thread.is_alive():
-                    self.logger.error(f"OpenAI TTS: API call timed out after {current_timeout} seconds (attempt {attempt + 1})")
-                    if attempt < max_retries - 1:
-                        self.logger.info("OpenAI TTS: Retrying with longer timeout...")
-                        time.sleep(1)  # Brief pause before retry
-                        continue
-                    else:
-                        self.logger.error(f"OpenAI TTS: All retry attempts failed for text: '{text[:50]}...'")
-                        print(f"🔇 TTS TIMEOUT - Message was: {text}")
-                        return
-                
-                if api_error:
-                    self.logger.error(f"OpenAI TTS: API call failed: {api_error} (attempt {attempt + 1})")
-                    if attempt < max_retries - 1:
-                        self.logger.info("OpenAI TTS: Retrying after API error...")
-                        time.sleep(2)  # Longer pause after API error
-                        continue
-                    else:
-                        self.logger.error(f"OpenAI TTS: All retry attempts failed for text: '{text[:50]}...'")
-                        print(f"🔇 TTS FAILED - Message was: {text}")
-                        return
-                
-                if not response:
-                    self.logger.error(f"OpenAI TTS: API call returned no response (attempt {attempt + 1})")
-                    if attempt < max_retries - 1:
-                        self.logger.info("OpenAI TTS: Retrying after no response...")
-                        time.sleep(1)
-                        continue
-                    else:
-                        self.logger.error(f"OpenAI TTS: All retry attempts failed for text: '{text[:50]}...'")
-                        print(f"🔇 TTS NO RESPONSE - Message was: {text}")
-                        return
-                    
-                # Success! Process the audio
-                self.logger.info(f"OpenAI TTS: API call successful on attempt {attempt + 1}, processing audio...")
-                break  # Exit retry loop on success
-                
-            except Exception as e:
-                self.logger.error(f"OpenAI TTS error on attempt {attempt + 1}: {e}")
-                if attempt < max_retries - 1:
-                    self.logger.info("OpenAI TTS: Retrying after exception...")
-                    time.sleep(1)
-                    continue
-                else:
-                    self.logger.error(f"OpenAI TTS: All retry attempts failed for text: '{text[:50]}...'")
-                    print(f"🔇 TTS ERROR - Message was: {text}")
-                    return
+        if self.stream_playback and self.transport.available('tts_stream') and self._stream_and_play(text):
+            return
         
-        # Process the successful audio response
+        audio_bytes = self.synthesize(text)
+        if audio_bytes:
+            self.play_audio(audio_bytes, text)
+        else:
+            self.say_offline(text)
+    
+    def say_offline(self, text: str) -> bool:
+        """Speak with the local pyttsx3 voice when OpenAI TTS is unavailable. Returns True if spoken."""
         try:
-            # Create temporary file for audio
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(response.content)
-                temp_file_path = temp_file.name
-            
-            self.logger.info(f"OpenAI TTS: Audio file created: {temp_file_path}")
-            
-            try:
-                # Play the audio using pygame
-                self.logger.info("OpenAI TTS: Loading audio into pygame...")
-                pygame.mixer.music.load(temp_file_path)
-                pygame.mixer.music.set_volume(self.volume)
-                
-                self.logger.info("OpenAI TTS: Starting audio playback...")
-                pygame.mixer.music.play()
-                
-                # Wait for playback to complete with timeout
-                timeout_counter = 0
-                max_timeout = 45  # Increased max timeout for longer messages
-                
-                while pygame.mixer.music.get_busy():
-                    pygame.time.wait(100)
-                    timeout_counter += 0.1
-                    if timeout_counter > max_timeout:
-                        self.logger.warning("OpenAI TTS: Playback timeout, stopping...")
-                        pygame.mixer.music.stop()
-                        break
-                
-                self.logger.info("OpenAI TTS: Playback completed successfully")
-                    
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_file_path)
-                    self.logger.info("OpenAI TTS: Temporary file cleaned up")
-                except Exception as cleanup_error:
-                    self.logger.warning(f"OpenAI TTS: Could not clean up temp file: {cleanup_error}")
-                    
+            if self._offline_engine is None:
+                self._offline_engine = pyttsx3.init()
+            self.logger.info(f"OpenAI TTS: Speaking offline: '{text[:50]}...'")
+            self._offline_engine.say(text)
+            self._offline_engine.runAndWait()
+            return True
+        except Exception as e:
+            self.logger.error(f"OpenAI TTS: Offline voice failed: {e}")
+            return False
+    
+    def _stream_and_play(self, text: str) -> bool:
+        """
+        Request raw PCM and play it chunk by chunk while it downloads.
+        Returns False if nothing was played, so the caller can fall back to the buffered request.
+        """
+        received = []
+        
+        def chunks(response):
+            for chunk in response.iter_bytes(4096):
+                received.append(chunk)
+                yield chunk
+        
+        try:
+            self.logger.info(f"OpenAI TTS: Streaming speech for '{text[:50]}...'")
+            # One attempt: a stream that was partly played can't be retried
+            with self.transport.track('tts_stream'), self.client.audio.speech.with_streaming_response.create(
+                model=self.model,
+                voice=self.voice,
+                input=text,
+                speed=self.rate,
+                response_format="pcm",
+                timeout=TTS_TIMEOUT
+            ) as response:
+                pcm, completed = self.player.play_pcm_stream(chunks(response), volume=self.volume)
+        except Exception as e:
+            self.logger.warning(f"OpenAI TTS: Streaming playback failed: {e}")
+            # Don't repeat speech that was already (partly) heard
+            return bool(received)
+        
+        # A stopped stream is only the start of the clip - never cache it
+        if pcm and completed and self.cache:
+            self.cache.put(text, self.voice, self.model, self.rate, pcm_to_wav(pcm))
+        # Interrupted speech is not retried through the buffered request either
+        return bool(pcm) or not completed
+    
+    def synthesize(self, text: str) -> Optional[bytes]:
+        """Call the OpenAI TTS API through the shared transport and return the MP3 audio bytes."""
+        if self.cache:
+            cached_audio = self.cache.get(text, self.voice, self.model, self.rate)
+            if cached_audio:
+                self.logger.info(f"OpenAI TTS: Cache hit for '{text[:50]}...'")
+                return cached_audio
+        
+        if not self.transport.available('tts'):
+            self.logger.warning("OpenAI TTS: Offline (too many recent failures), skipping the API")
+            return None
+        
+        try:
+            self.logger.info(f"OpenAI TTS: Starting to process text: '{text[:50]}...'")
+            # Retries with jittered backoff are done by the shared transport
+            response = self.transport.call(
+                'tts', self.client.audio.speech.create,
+                model=self.model,
+                voice=self.voice,
+                input=text,
+                speed=self.rate,
+                timeout=TTS_TIMEOUT
+            )
+        except Exception as e:
+            self.logger.error(f"OpenAI TTS: API call failed: {e}")
+            print(f"🔇 TTS FAILED - Message was: {text}")
+            return None
+        
+        if self.cache:
+            self.cache.put(text, self.voice, self.model, self.rate, response.content)
+        return response.content
+    
+    def play_audio(self, audio_bytes: bytes, text: str = "", cache_key: Optional[str] = None):
+        """Decode audio bytes returned by synthesize() in memory and wait until playback finishes."""
+        try:
+            self.logger.info("OpenAI TTS: Starting in-memory playback...")
+            finished = self.player.play_bytes(audio_bytes, volume=self.volume, cache_key=cache_key)
+            self.logger.info("OpenAI TTS: Playback completed successfully" if finished
+                             else "OpenAI TTS: Playback stopped")
         except Exception as audio_error:
             self.logger.error(f"OpenAI TTS: Audio processing error: {audio_error}")
             print(f"🔇 TTS AUDIO ERROR - Message was: {text}")
@@ -205,6 +192,7 @@ class OpenAITTSEngine:
     def stop(self):
         """Stop current speech."""
         try:
+            self.player.stop()
             pygame.mixer.music.stop()
         except:
             pass
@@ -233,11 +221,30 @@ class AudioManager:
         # Initialize PyAudio
         self.audio = pyaudio.PyAudio()
         
+        # Seconds of already-captured audio included at the start of each listen
+        self.preroll_seconds = 0.5
+        
+        # Microphone device is probed once and cached (re-probed only after a stream error)
+        self._mic_device_index = None
+        self._mic_device_probed = False
+        
+        # Single long-lived capture stream shared by listening, level metering,
+        # wake word detection and calibration (started on first use)
+        self.mic_stream = MicrophoneStream(
+            self.audio,
+            sample_rate=self.sample_rate,
+            chunk_size=self.chunk_size,
+            device_index_provider=self._get_best_microphone_device,
+            sample_format=self.format
+        )
+        
         # Initialize pygame mixer for sound effects
         pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
         
         # Initialize speech recognizer
         self.recognizer = sr.Recognizer()
+        # Speech-to-text backends (cloud first, local model for game answers and when offline)
+        self.stt = SpeechToText(self.recognizer)
         
         # Configure recognizer with platform-optimized settings
         self.energy_threshold = platform_settings['energy_threshold']
@@ -375,6 +382,8 @@ class AudioManager:
                         "channels": device_info["maxInputChannels"],
                         "sample_rate": device_info["defaultSampleRate"]
                     })
+            
+            info["stream"] = self.mic_stream.get_stats()
         except Exception as e:
             self.logger.error(f"Error getting microphone info: {e}")
         
@@ -383,25 +392,32 @@ class AudioManager:
     def test_microphone(self) -> bool:
         """Test if microphone is working properly."""
         try:
-            # Get the best microphone device for this platform
-            mic_device_index = self._get_best_microphone_device()
-            
-            # Use platform-optimized microphone settings with specific device
-            with sr.Microphone(
-                device_index=mic_device_index,
-                sample_rate=self.sample_rate, 
-                chunk_size=self.chunk_size
-            ) as source:
-                self.logger.info(f"Testing microphone (device index: {mic_device_index})...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                self.logger.info("Microphone test successful")
-                return True
+            reader = self.mic_stream.reader()
+            self.logger.info("Testing microphone (shared stream)...")
+            if reader.read_chunk(timeout=2.0) is None:
+                self.logger.error("Microphone test failed: no audio from the microphone stream")
+                return False
+            self.logger.info("Microphone test successful")
+            return True
         except Exception as e:
             self.logger.error(f"Microphone test failed: {e}")
             return False
 
-    def _get_best_microphone_device(self) -> Optional[int]:
-        """Get the best microphone device for the current platform with ALSA error handling."""
+    def _get_best_microphone_device(self, refresh: bool = False) -> Optional[int]:
+        """
+        Get the best microphone device for the current platform (cached after the first probe).
+        
+        Args:
+            refresh: Probe the devices again (used after a microphone stream error)
+        """
+        if self._mic_device_probed and not refresh:
+            return self._mic_device_index
+        self._mic_device_index = self._probe_microphone_device()
+        self._mic_device_probed = True
+        return self._mic_device_index
+
+    def _probe_microphone_device(self) -> Optional[int]:
+        """Find the best microphone device for the current platform with ALSA error handling."""
         try:
             # Get all microphones with error handling
             try:
@@ -467,36 +483,10 @@ class AudioManager:
 
     def calibrate_audio(self, duration: float = 2.0):
         """Calibrate audio settings for ambient noise with robust error handling and threshold management."""
-        mic_source = None
         try:
-            # Get the best microphone device for this platform
-            mic_device_index = self._get_best_microphone_device()
-            
-            # Try with specific device first
-            try:
-                mic_source = sr.Microphone(
-                    device_index=mic_device_index,
-                    sample_rate=self.sample_rate, 
-                    chunk_size=self.chunk_size
-                )
-                self.logger.info(f"Calibration: Microphone initialized with device {mic_device_index}")
-            except Exception as device_error:
-                self.logger.warning(f"Calibration: Failed to initialize with device {mic_device_index}: {device_error}")
-                # Fallback to default device
-                try:
-                    mic_source = sr.Microphone(
-                        sample_rate=self.sample_rate, 
-                        chunk_size=self.chunk_size
-                    )
-                    self.logger.info("Calibration: Microphone initialized with default device")
-                except Exception as default_error:
-                    self.logger.error(f"Calibration: Failed to initialize default microphone: {default_error}")
-                    # Last resort - basic microphone
-                    mic_source = sr.Microphone()
-                    self.logger.info("Calibration: Microphone initialized with basic settings")
-            
-            # Use platform-optimized microphone settings with specific device
-            with mic_source as source:
+            # Calibrate on the shared stream, starting with audio already captured
+            # (only the part of `duration` not yet buffered is waited for)
+            with RingBufferSource(self.mic_stream, preroll=duration) as source:
                 try:
                     self.logger.info(f"Calibrating for ambient noise ({duration}s)...")
                     
@@ -554,48 +544,38 @@ class AudioManager:
             self.energy_threshold = fallback_threshold
             self.logger.info(f"Using fallback energy threshold: {fallback_threshold}")
 
-    def listen_for_audio(self, timeout: int = 5, phrase_time_limit: int = 10) -> Optional[sr.AudioData]:
-        """Listen for audio input with improved error handling for Raspberry Pi."""
-        mic_source = None
+    def listen_for_audio(self, timeout: int = 5, phrase_time_limit: int = 10,
+                         preroll: Optional[float] = None) -> Optional[sr.AudioData]:
+        """
+        Listen for audio input with improved error handling for Raspberry Pi.
+        
+        Args:
+            timeout: Seconds to wait for speech to start
+            phrase_time_limit: Maximum phrase length in seconds
+            preroll: Seconds of audio captured before this call to include, so speech
+                that started before listening began isn't clipped (default: self.preroll_seconds);
+                it never reaches back into the assistant's own last spoken reply
+        """
+        if preroll is None:
+            preroll = self.preroll_seconds
         try:
-            self.logger.info(f"🎤 AUDIO DEBUG: Starting audio capture (timeout={timeout}s, phrase_limit={phrase_time_limit}s)")
-            
-            # Try to get the best microphone with proper error handling
-            best_device_index = self._get_best_microphone_device()
+            self.logger.info(f"🎤 AUDIO DEBUG: Starting audio capture (timeout={timeout}s, phrase_limit={phrase_time_limit}s, "
+                             f"pre-roll={preroll:.2f}s)")
             
-            # Initialize microphone with robust error handling
-            if best_device_index is not None:
-                try:
-                    mic_source = sr.Microphone(device_index=best_device_index, sample_rate=self.sample_rate, chunk_size=self.chunk_size)
-                    self.logger.info(f"🎤 AUDIO DEBUG: Using microphone device {best_device_index}")
-                except Exception as device_error:
-                    self.logger.warning(f"🎤 AUDIO DEBUG: Failed to use device {best_device_index}: {device_error}")
-                    mic_source = None
-            
-            # Fallback to default microphone if specific device failed
-            if mic_source is None:
-                try:
-                    mic_source = sr.Microphone(sample_rate=self.sample_rate, chunk_size=self.chunk_size)
-                    self.logger.info("🎤 AUDIO DEBUG: Using default microphone with custom settings")
-                except Exception as default_error:
-                    self.logger.error(f"🎤 AUDIO DEBUG: Failed to initialize default microphone: {default_error}")
-                    # Last resort - basic microphone
-                    try:
-                        mic_source = sr.Microphone()
-                        self.logger.info("🎤 AUDIO DEBUG: Using basic microphone settings")
-                    except Exception as basic_error:
-                        self.logger.error(f"🎤 AUDIO DEBUG: Failed to initialize any microphone: {basic_error}")
-                        return None
-            
-            # Test if microphone can be opened before using it
+            # Read from the shared microphone stream: no device probe or open per turn, and
+            # listening starts `preroll` seconds in the past
+            ready_start = time.time()
+            opens_before = self.mic_stream.opens
+            if preroll > 0:
+                # Keep the whole pre-roll window in front of the detected voice onset
+                self.recognizer.non_speaking_duration = min(preroll, self.recognizer.pause_threshold)
             try:
-                with mic_source as source:
-                    # Test if the stream actually opened
-                    if not hasattr(source, 'stream') or source.stream is None:
-                        self.logger.error("🎤 AUDIO DEBUG: Microphone stream failed to initialize")
-                        return None
-                    
-                    self.logger.info("🎤 AUDIO DEBUG: Microphone opened successfully")
+                with RingBufferSource(self.mic_stream, preroll=preroll,
+                                      not_before=get_speech_player().last_finished_at) as source:
+                    self.logger.info(f"🎤 AUDIO DEBUG: Shared microphone stream ready in "
+                                     f"{(time.time() - ready_start) * 1000:.1f}ms "
+                                     f"(device opened {self.mic_stream.opens - opens_before}x this turn, "
+                                     f"{self.mic_stream.opens}x total)")
                     
                     # Quick ambient noise adjustment with error handling
                     try:
@@ -603,9 +583,13 @@ class AudioManager:
                         # Only do full calibration if threshold seems way off, otherwise use quick adjustment
                         current_threshold = getattr(self, '_energy_threshold', self.recognizer.energy_threshold)
                         
-                        # Quick calibration (0.5s) to avoid excessive threshold climbing
-                        self.recognizer.adjust_for_ambient_noise(source, duration=0.3)
-                        new_threshold = self.recognizer.energy_threshold
+                        # Ambient level from recently buffered audio (quiet chunks only, cue
+                        # sounds excluded), so calibration neither waits nor eats the pre-roll
+                        noise_level = self.mic_stream.noise_level()
+                        if noise_level is None:
+                            new_threshold = current_threshold
+                        else:
+                            new_threshold = noise_level * self.recognizer.dynamic_energy_ratio
                         
                         # Apply the same threshold management as in calibrate_audio
                         platform_max_threshold = 1000 if 'Raspberry Pi' in self.platform_info['name'] else 800
@@ -673,19 +657,28 @@ class AudioManager:
             self.logger.error(f"🎤 AUDIO DEBUG: Traceback: {traceback.format_exc()}")
             return None
 
-    def audio_to_text(self, audio_data: sr.AudioData) -> Optional[str]:
-        """Convert audio data to text using Google Speech Recognition."""
+    def audio_to_text(self, audio_data: sr.AudioData, vocabulary: Optional[List[str]] = None,
+                      language: str = 'en-US', on_draft: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """
+        Convert audio data to text with the configured speech-to-text backends.
+        
+        Args:
+            audio_data: Captured utterance
+            vocabulary: Expected answers (e.g. the current game's words) for the
+                local restricted-grammar fast path
+            language: Recognition language
+            on_draft: Called with a likely (lowercase) transcript while a slower backend confirms it
+        """
         try:
             self.logger.info("🧠 RECOGNITION DEBUG: Starting speech recognition...")
-            text = self.recognizer.recognize_google(audio_data)
-            self.logger.info(f"🧠 RECOGNITION DEBUG: Speech recognized successfully: '{text}'")
-            return text.lower()
-        except sr.UnknownValueError:
-            self.logger.info("🧠 RECOGNITION DEBUG: Could not understand audio - speech was unclear")
-            return None
-        except sr.RequestError as e:
-            self.logger.error(f"🧠 RECOGNITION DEBUG: Speech recognition service error: {e}")
-            return None
+            transcript = self.stt.recognize(audio_data, language=language, vocabulary=vocabulary,
+                                            on_draft=(lambda draft: on_draft(draft.text.lower())) if on_draft else None)
+            if transcript is None:
+                self.logger.info("🧠 RECOGNITION DEBUG: Could not understand audio - speech was unclear")
+                return None
+            self.logger.info(f"🧠 RECOGNITION DEBUG: Speech recognized successfully: '{transcript.text}' "
+                             f"({transcript.backend}, {transcript.latency * 1000:.0f} ms)")
+            return transcript.text.lower()
         except Exception as e:
             self.logger.error(f"🧠 RECOGNITION DEBUG: Unexpected recognition error: {e}")
             import traceback
@@ -693,31 +686,9 @@ class AudioManager:
             return None
 
     def get_audio_level(self, duration: float = 0.1) -> float:
-        """Get current audio input level for wake word detection."""
+        """Get current audio input level (RMS of the last `duration` seconds on the shared stream)."""
         try:
-            stream = self.audio.open(
-                format=self.format,
-                channels=self.channels,
-                rate=self.sample_rate,
-                input=True,
-                frames_per_buffer=self.chunk_size
-            )
-            
-            frames_to_record = int(self.sample_rate * duration / self.chunk_size)
-            audio_data = []
-            
-            for _ in range(frames_to_record):
-                data = stream.read(self.chunk_size)
-                audio_data.append(data)
-            
-            stream.stop_stream()
-            stream.close()
-            
-            # Convert to numpy array and calculate RMS
-            audio_np = np.frombuffer(b''.join(audio_data), dtype=np.int16)
-            rms = np.sqrt(np.mean(audio_np.astype(np.float64)**2))
-            
-            return rms
+            return self.mic_stream.level(duration)
         except Exception as e:
             self.logger.error(f"Error getting audio level: {e}")
             return 0.0
@@ -725,6 +696,7 @@ class AudioManager:
     def cleanup(self):
         """Clean up audio resources."""
         try:
+            self.mic_stream.stop()
             self.audio.terminate()
             pygame.mixer.quit()
             self.logger.info("Audio resources cleaned up")
@@ -736,17 +708,23 @@ class AudioManager:
         self.cleanup()
 
 
-def setup_premium_tts_engines(client):
-    """Setup premium OpenAI TTS engines with natural human voices for each user."""
+def setup_premium_tts_engines(client, cache: Optional[TTSCache] = None):
+    """
+    Setup premium OpenAI TTS engines with natural human voices for each user.
+    
+    Args:
+        client: OpenAI client instance
+        cache: Optional TTS audio cache shared by both voices
+    """
     
     logger = logging.getLogger(__name__)
     
     # Sophia's voice - soft, encouraging, and supportive (feminine)
-    sophia_tts = OpenAITTSEngine(client, voice="nova")  # Nova: reliable and friendly
+    sophia_tts = OpenAITTSEngine(client, voice="nova", cache=cache)  # Nova: reliable and friendly
     logger.info("✨ Sophia's premium voice (Nova) initialized - soft and encouraging")
     
     # Eladriel's voice - energetic, playful, and adventurous (masculine for a boy)
-    eladriel_tts = OpenAITTSEngine(client, voice="alloy")  # Alloy: reliable and energetic
+    eladriel_tts = OpenAITTSEngine(client, voice="alloy", cache=cache)  # Alloy: reliable and energetic
     logger.info("🦕 Eladriel's premium voice (Alloy) initialized - energetic and reliable")
     
     return sophia_tts, eladriel_tts
@@ -44,6 +44,7 @@ class CameraManager:
         self.cap = None
         self.using_aitrios = False
         self.aitrios_handler = None
+        self.using_frame_bus = False
         
         # Create image directory
         self.image_dir = 'captured_images'
@@ -55,8 +56,21 @@ class CameraManager:
         logger.info("CameraManager initialized")
     
     def initialize_camera(self) -> bool:
-        """Initialize camera - AITRIOS first, then USB fallback"""
+        """Initialize camera - shared frame bus first, then AITRIOS, then USB fallback"""
         try:
+            # Reuse the process-wide frame bus if another module already owns the camera
+            try:
+                from frame_bus import get_frame_bus
+                frame_bus = get_frame_bus(create=False)
+            except ImportError:
+                frame_bus = None
+            
+            if frame_bus and frame_bus.is_camera_available():
+                self.cap = frame_bus.subscribe('camera_manager')
+                self.using_frame_bus = True
+                logger.info("✅ CameraManager subscribed to shared frame bus")
+                return True
+            
             # Try AITRIOS AI camera first
             if AITRIOS_AVAILABLE:
                 logger.info("🤖 Attempting to initialize AITRIOS AI Camera")
@@ -0,0 +1,383 @@
+"""
+Cloud Transport for AI Assistant
+One place where every cloud call (chat, vision, TTS, speech recognition, image
+generation, image downloads) gets its retries, concurrency limit, circuit breaker and metrics
+
+- Jittered exponential backoff (full jitter) on connection errors, timeouts,
+  429 and 5xx; other errors (bad request, auth) fail straight away
+- Per-endpoint concurrency limits so a burst of TTS synthesis can't starve a
+  vision request
+- Per-endpoint circuit breaker: after a few consecutive failures calls fail
+  immediately with CircuitOpenError for a cool-down period, so the assistant
+  falls back to its offline behaviour instead of waiting 15-25 s per call;
+  after the cool-down one trial call decides whether it closes again
+- One pooled requests.Session for plain HTTP downloads
+- Latency histogram and error counts per endpoint
+"""
+
+import time
+import random
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Concurrent requests per endpoint (unknown endpoints get DEFAULT_LIMIT)
+ENDPOINT_LIMITS = {
+    'chat': 4,
+    'vision': 2,
+    'tts': 3,
+    'tts_stream': 2,
+    'stt': 2,
+    'image': 1,
+    'download': 2,
+}
+DEFAULT_LIMIT = 2
+
+DEFAULT_MAX_RETRIES = 2
+BACKOFF_BASE = 0.5   # seconds; attempt n waits up to BACKOFF_BASE * 2**n
+BACKOFF_CAP = 4.0
+CIRCUIT_FAILURES = 3  # consecutive failed attempts that open the circuit
+CIRCUIT_RESET = 30.0  # seconds the circuit stays open
+DOWNLOAD_TIMEOUT = (5.0, 20.0)  # connect, read
+POOL_SIZE = 10
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000)
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+class CircuitOpenError(ConnectionError):
+    """The endpoint failed repeatedly and is being skipped until its cool-down ends"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"{endpoint} is offline (circuit open, retrying in {retry_in:.0f}s)")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    """HTTP status carried by an OpenAI or requests error, if any"""
+    code = getattr(error, 'status_code', None)
+    if code is None and getattr(error, 'response', None) is not None:
+        code = getattr(error.response, 'status_code', None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient failures worth another attempt (and counted by the circuit breaker)"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    code = status_code(error)
+    if code is not None:
+        return code in RETRYABLE_STATUS
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError,
+                          requests.ConnectionError, requests.Timeout)):
+        return True
+    # openai.APIConnectionError / APITimeoutError, without importing openai here
+    return type(error).__name__ in ('APIConnectionError', 'APITimeoutError')
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open trial after the cool-down"""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURES, reset_after: float = CIRCUIT_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        return 'open' if time.monotonic() - self.opened_at < self.reset_after else 'half-open'
+
+    def retry_in(self) -> float:
+        return max(0.0, self.reset_after - (time.monotonic() - self.opened_at)) if self.opened_at else 0.0
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (only one trial call while half-open)"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self) -> bool:
+        """Count a failed attempt; returns True if this opened the circuit"""
+        with self._lock:
+            self.failures += 1
+            reopened = self.trial_running
+            self.trial_running = False
+            if reopened or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def release_trial(self):
+        """A trial call ended without a verdict (non-retryable error)"""
+        with self._lock:
+            self.trial_running = False
+
+
+class EndpointMetrics:
+    """Latency histogram and error counts for one endpoint"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.error_types: Dict[str, int] = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total_latency = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, error: Optional[BaseException] = None):
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            latency_ms = latency * 1000
+            index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if latency_ms <= bound),
+                         len(LATENCY_BUCKETS_MS))
+            self.buckets[index] += 1
+            if error is not None:
+                self.errors += 1
+                name = type(error).__name__
+                self.error_types[name] = self.error_types.get(name, 0) + 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket holding the given fraction of requests (None = above the last bound)"""
+        target = fraction * self.requests
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            histogram = {f"<={bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)}
+            histogram[f">{LATENCY_BUCKETS_MS[-1]}ms"] = self.buckets[-1]
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'retries': self.retries,
+                'rejected': self.rejected,
+                'error_types': dict(self.error_types),
+                'mean_ms': self.total_latency / self.requests * 1000 if self.requests else 0.0,
+                'p50_ms': self.percentile(0.5),
+                'p95_ms': self.percentile(0.95),
+                'histogram': histogram,
+            }
+
+
+class CloudTransport:
+    """Retries, limits, circuit breakers and metrics for every cloud endpoint"""
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES, circuit_failures: int = CIRCUIT_FAILURES,
+                 circuit_reset: float = CIRCUIT_RESET, limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            max_retries: Extra attempts after a transient failure
+            circuit_failures: Consecutive failed attempts that take an endpoint offline
+            circuit_reset: Seconds an endpoint stays offline before a trial call
+            limits: Concurrent requests per endpoint (merged over ENDPOINT_LIMITS)
+        """
+        self.max_retries = max_retries
+        self.circuit_failures = circuit_failures
+        self.circuit_reset = circuit_reset
+        self.limits = dict(ENDPOINT_LIMITS, **(limits or {}))
+
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._metrics: Dict[str, EndpointMetrics] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._async_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _endpoint(self, endpoint: str):
+        """Breaker, metrics and thread semaphore for an endpoint (created on first use)"""
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(self.circuit_failures, self.circuit_reset)
+                self._metrics[endpoint] = EndpointMetrics()
+                self._semaphores[endpoint] = threading.BoundedSemaphore(self.limits.get(endpoint, DEFAULT_LIMIT))
+            return self._breakers[endpoint], self._metrics[endpoint], self._semaphores[endpoint]
+
+    def _async_semaphore(self, endpoint: str) -> asyncio.Semaphore:
+        # Coroutines all run on the one OpenAI loop, so an asyncio semaphore per endpoint is enough
+        with self._lock:
+            if endpoint not in self._async_semaphores:
+                self._async_semaphores[endpoint] = asyncio.Semaphore(self.limits.get(endpoint, DEFAULT_LIMIT))
+            return self._async_semaphores[endpoint]
+
+    def available(self, endpoint: str) -> bool:
+        """False while the endpoint's circuit is open (callers can go offline without trying)"""
+        breaker, _, _ = self._endpoint(endpoint)
+        return breaker.state != 'open'
+
+    def _admit(self, endpoint: str) -> CircuitBreaker:
+        breaker, metrics, _ = self._endpoint(endpoint)
+        if not breaker.allow():
+            metrics.rejected += 1
+            raise CircuitOpenError(endpoint, breaker.retry_in())
+        return breaker
+
+    def _settle(self, endpoint: str, breaker: CircuitBreaker, started: float, error: Optional[BaseException]):
+        _, metrics, _ = self._endpoint(endpoint)
+        metrics.record(time.monotonic() - started, error)
+        if error is None:
+            breaker.record_success()
+        elif is_retryable(error):
+            if breaker.record_failure():
+                logger.warning(f"🔌 {endpoint}: {breaker.failures} failures in a row - going offline "
+                               f"for {breaker.reset_after:g}s")
+        else:
+            breaker.release_trial()
+
+    @contextmanager
+    def track(self, endpoint: str):
+        """
+        One attempt without retries: circuit check, concurrency slot and metrics
+        (for calls that can't be wrapped in a function, like a streaming response)
+        """
+        breaker = self._admit(endpoint)
+        _, _, semaphore = self._endpoint(endpoint)
+        with semaphore:
+            started = time.monotonic()
+            try:
+                yield
+            except BaseException as e:
+                self._settle(endpoint, breaker, started, e)
+                raise
+            self._settle(endpoint, breaker, started, None)
+
+    @asynccontextmanager
+    async def atrack(self, endpoint: str):
+        """track() for coroutines on the OpenAI loop"""
+        breaker = self._admit(endpoint)
+        async with self._async_semaphore(endpoint):
+            started = time.monotonic()
+            try:
+                yield
+            except asyncio.CancelledError:
+                # Cancelled by the caller - no verdict on the endpoint
+                breaker.release_trial()
+                raise
+            except BaseException as e:
+                self._settle(endpoint, breaker, started, e)
+                raise
+            self._settle(endpoint, breaker, started, None)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number attempt+1"""
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+    def _should_retry(self, endpoint: str, error: BaseException, attempt: int, retries: int) -> bool:
+        if attempt >= retries or not is_retryable(error) or not self.available(endpoint):
+            return False
+        self._endpoint(endpoint)[1].retries += 1
+        logger.info(f"🔁 {endpoint}: {type(error).__name__}, retry {attempt + 1}/{retries}")
+        return True
+
+    def call(self, endpoint: str, fn: Callable[..., Any], *args, retries: Optional[int] = None, **kwargs) -> Any:
+        """
+        Call fn(*args, **kwargs) with retries, the endpoint's concurrency limit and circuit breaker
+
+        Raises:
+            CircuitOpenError: The endpoint is offline (raised immediately)
+        """
+        retries = self.max_retries if retries is None else retries
+        attempt = 0
+        while True:
+            try:
+                with self.track(endpoint):
+                    return fn(*args, **kwargs)
+            except Exception as e:
+                if not self._should_retry(endpoint, e, attempt, retries):
+                    raise
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+    async def acall(self, endpoint: str, make_coro: Callable[[], Awaitable], retries: Optional[int] = None) -> Any:
+        """call() for coroutines; make_coro() must build a fresh coroutine for each attempt"""
+        retries = self.max_retries if retries is None else retries
+        attempt = 0
+        while True:
+            try:
+                async with self.atrack(endpoint):
+                    return await make_coro()
+            except Exception as e:
+                if not self._should_retry(endpoint, e, attempt, retries):
+                    raise
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+
+    def get(self, url: str, endpoint: str = 'download', **kwargs) -> requests.Response:
+        """GET on the pooled session; raises for HTTP errors so 5xx responses are retried"""
+        kwargs.setdefault('timeout', DOWNLOAD_TIMEOUT)
+
+        def fetch():
+            response = self.session.get(url, **kwargs)
+            response.raise_for_status()
+            return response
+
+        return self.call(endpoint, fetch)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics and circuit state per endpoint"""
+        with self._lock:
+            endpoints = list(self._metrics)
+        result = {}
+        for endpoint in endpoints:
+            breaker, metrics, _ = self._endpoint(endpoint)
+            result[endpoint] = dict(metrics.snapshot(), circuit=breaker.state)
+        return result
+
+    def summary(self) -> str:
+        """One line per endpoint for logs and diagnostics"""
+        lines = []
+        for endpoint, s in sorted(self.stats().items()):
+            p95 = f"{s['p95_ms']}ms" if s['p95_ms'] is not None else f">{LATENCY_BUCKETS_MS[-1]}ms"
+            lines.append(f"{endpoint}: {s['requests']} req, {s['errors']} err, {s['retries']} retries, "
+                         f"{s['rejected']} skipped, mean {s['mean_ms']:.0f}ms, p95 {p95}, circuit {s['circuit']}")
+        return "\n".join(lines) if lines else "no cloud calls yet"
+
+
+def get_transport(max_retries: int = DEFAULT_MAX_RETRIES, circuit_failures: int = CIRCUIT_FAILURES,
+                  circuit_reset: float = CIRCUIT_RESET) -> CloudTransport:
+    """Process-wide cloud transport (created by the first caller, whose settings it uses)"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = CloudTransport(max_retries=max_retries, circuit_failures=circuit_failures,
+                                        circuit_reset=circuit_reset)
+        return _transport
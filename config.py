@@ -28,19 +28,79 @@ class Config:
         # Wake Word Configuration
         self.wake_word_sensitivity = float(os.getenv('WAKE_WORD_SENSITIVITY', '0.5'))
         self.porcupine_access_key = os.getenv('PORCUPINE_ACCESS_KEY', '')
+        # 'local' = offline keyword spotting from enrolled samples (python keyword_spotter.py enroll <user>),
+        # 'speech' = cloud speech recognition of every idle phrase
+        self.wake_word_engine = os.getenv('WAKE_WORD_ENGINE', 'local').lower()
+        self.wake_word_samples_dir = os.getenv('WAKE_WORD_SAMPLES_DIR', 'wake_words')
         
         # Speech Recognition Configuration
         self.speech_timeout = int(os.getenv('SPEECH_TIMEOUT', '5'))
         self.speech_phrase_limit = int(os.getenv('SPEECH_PHRASE_LIMIT', '10'))
+        # Audio captured before listening starts that is kept, so first syllables aren't clipped
+        self.speech_preroll = float(os.getenv('SPEECH_PREROLL', '0.5'))
+        # Start listening right after the listening cue instead of pausing first
+        self.listen_fast_start = os.getenv('LISTEN_FAST_START', 'true').lower() == 'true'
+        # Speech-to-text backends in the order they are tried ('vosk' = local model, 'google' = cloud);
+        # game answers with a vocabulary, and everything while the cloud is offline, go to vosk first
+        self.stt_backends = os.getenv('STT_BACKENDS', 'google,vosk')
+        self.vosk_model_path = os.getenv('VOSK_MODEL_PATH', 'models/vosk-model-small-en-us-0.15')
+        # Local results below this confidence are re-checked by the next backend
+        self.stt_min_confidence = float(os.getenv('STT_MIN_CONFIDENCE', '0.6'))
         
         # Text-to-Speech Configuration
         self.tts_rate = int(os.getenv('TTS_RATE', '180'))
         self.tts_volume = float(os.getenv('TTS_VOLUME', '0.9'))
         
+        # TTS Audio Cache (fixed phrases are synthesized once; prewarm with tts_prewarm.py)
+        self.tts_cache_enabled = os.getenv('TTS_CACHE', 'true').lower() == 'true'
+        self.tts_cache_dir = os.getenv('TTS_CACHE_DIR', 'tts_cache')
+        self.tts_cache_max_mb = float(os.getenv('TTS_CACHE_MAX_MB', '200'))
+        
         # OpenAI Model Configuration
         self.openai_model = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
         self.openai_max_tokens = int(os.getenv('OPENAI_MAX_TOKENS', '150'))
         self.openai_temperature = float(os.getenv('OPENAI_TEMPERATURE', '0.7'))
+        # Seconds before an OpenAI request is given up (requests share one keep-alive connection pool)
+        self.openai_request_timeout = float(os.getenv('OPENAI_REQUEST_TIMEOUT', '30'))
+        # Cloud calls: retries with jittered backoff, then skip an endpoint for a while after repeated failures
+        self.cloud_max_retries = int(os.getenv('CLOUD_MAX_RETRIES', '2'))
+        self.cloud_circuit_failures = int(os.getenv('CLOUD_CIRCUIT_FAILURES', '3'))
+        self.cloud_circuit_reset = float(os.getenv('CLOUD_CIRCUIT_RESET', '30'))
+        
+        # Streaming Configuration (speak sentences while the answer is still being generated)
+        self.openai_streaming = os.getenv('OPENAI_STREAMING', 'true').lower() == 'true'
+        self.tts_synthesis_workers = int(os.getenv('TTS_SYNTHESIS_WORKERS', '2'))
+        # Start the OpenAI reply from the first transcript, while the turn is still being routed
+        self.speculative_replies = os.getenv('SPECULATIVE_REPLIES', 'true').lower() == 'true'
+        
+        # Conversation Memory (recent turns + rolling summary sent with each request)
+        self.conversation_token_budget = int(os.getenv('CONVERSATION_TOKEN_BUDGET', '400'))
+        self.conversation_summary_tokens = int(os.getenv('CONVERSATION_SUMMARY_TOKENS', '120'))
+        self.conversation_max_turns = int(os.getenv('CONVERSATION_MAX_TURNS', '20'))
+        
+        # Local Handwriting OCR (spelling words and math answers are checked on the device first)
+        self.local_ocr_enabled = os.getenv('LOCAL_OCR_ENABLED', 'true').lower() == 'true'
+        self.tesseract_cmd = os.getenv('TESSERACT_CMD', '')
+        # Tesseract confidence (0-100) needed to confirm / reject an answer without the vision API
+        self.ocr_confirm_confidence = float(os.getenv('OCR_CONFIRM_CONFIDENCE', '60'))
+        self.ocr_reject_confidence = float(os.getenv('OCR_REJECT_CONFIDENCE', '85'))
+        
+        # Vision Uploads (frames are encoded in memory, sized for the model's detail level)
+        self.vision_jpeg_quality = int(os.getenv('VISION_JPEG_QUALITY', '80'))
+        # Also keep every capture sent to the vision API (written in the background)
+        self.vision_archive_captures = os.getenv('VISION_ARCHIVE_CAPTURES', 'false').lower() == 'true'
+        self.vision_archive_dir = os.getenv('VISION_ARCHIVE_DIR', 'captured_images')
+        
+        # Recognition Cache (the same toy shown again is answered without a vision call)
+        self.recognition_cache_enabled = os.getenv('RECOGNITION_CACHE', 'true').lower() == 'true'
+        self.recognition_cache_file = os.getenv('RECOGNITION_CACHE_FILE', 'recognition_cache/results.json')
+        self.recognition_cache_ttl_hours = float(os.getenv('RECOGNITION_CACHE_TTL_HOURS', '72'))
+        self.recognition_cache_max_entries = int(os.getenv('RECOGNITION_CACHE_MAX_ENTRIES', '200'))
+        
+        # Local Detector (YOLO looks first; sure answers skip the vision API, the rest upload a crop)
+        self.local_detector_enabled = os.getenv('LOCAL_DETECTOR', 'true').lower() == 'true'
+        # Detector confidence (0-1) needed to answer an everyday object without the vision API
+        self.local_detector_answer_confidence = float(os.getenv('LOCAL_DETECTOR_ANSWER_CONFIDENCE', '0.8'))
         
         # Logging Configuration
         self.log_level = os.getenv('LOG_LEVEL', 'INFO')
@@ -66,9 +126,16 @@ class Config:
         """Print current configuration (excluding sensitive data)."""
         print("🔧 Current Configuration:")
         print(f"   • OpenAI Model: {self.openai_model}")
+        print(f"   • OpenAI Request Timeout: {self.openai_request_timeout}s")
+        print(f"   • Cloud Retries: {self.cloud_max_retries} (offline after {self.cloud_circuit_failures} failures "
+              f"for {self.cloud_circuit_reset:.0f}s)")
         print(f"   • Audio Sample Rate: {self.audio_sample_rate}")
         print(f"   • Speech Timeout: {self.speech_timeout}s")
         print(f"   • TTS Rate: {self.tts_rate}")
+        print(f"   • Streaming Responses: {self.openai_streaming}")
+        print(f"   • Speculative Replies: {self.speculative_replies}")
+        print(f"   • Wake Word Engine: {self.wake_word_engine}")
+        print(f"   • Speech-to-Text: {self.stt_backends}")
         print(f"   • Wake Word Sensitivity: {self.wake_word_sensitivity}")
         print(f"   • Pi Optimization: {self.pi_optimization}")
         print(f"   • Low Power Mode: {self.low_power_mode}") 
\ No newline at end of file
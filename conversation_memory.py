@@ -0,0 +1,244 @@
+"""
+Conversation Memory for AI Assistant
+Per-user conversation memory that fits a prompt token budget instead of
+re-sending the last three exchanges as one formatted string
+
+- Recent turns are kept in a deque and sent as real user/assistant messages
+  (no "You asked: ... | You responded: ..." wrapping)
+- When the recent turns outgrow the budget, the oldest ones are folded into a
+  rolling summary on a background thread; the turn that triggered it doesn't
+  wait, and the folded turns stay in the prompt until their summary is ready
+- Token counts use tiktoken when it and its encoding are available (exact),
+  otherwise a characters-per-token estimate; each turn is counted once
+"""
+
+import logging
+import threading
+import concurrent.futures
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 400          # tokens of history (summary + recent turns) per request
+DEFAULT_SUMMARY_TOKENS = 120  # target length of the rolling summary
+DEFAULT_MAX_TURNS = 20        # recent turns kept verbatim at most
+MIN_RECENT_TURNS = 2          # never folded into the summary
+CHARS_PER_TOKEN = 4           # estimate when tiktoken isn't usable
+# Chat format overhead: every message costs ~3 tokens, every reply is primed with 3
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+SUMMARY_PREFIX = "Earlier in this conversation: "
+
+
+_encodings = {}
+_encodings_lock = threading.Lock()
+
+
+def _load_encoding(model: str):
+    """tiktoken encoding for a model, loaded once per process (None if unusable)"""
+    with _encodings_lock:
+        if model not in _encodings:
+            encoding = None
+            if TIKTOKEN_AVAILABLE:
+                try:
+                    try:
+                        encoding = tiktoken.encoding_for_model(model)
+                    except KeyError:
+                        encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    # The encoding file is downloaded on first use - not possible offline
+                    logger.warning(f"⚠️ tiktoken encoding unavailable ({type(e).__name__}), estimating token counts")
+            _encodings[model] = encoding
+        return _encodings[model]
+
+
+class TokenCounter:
+    """Token counts for chat messages, exact with tiktoken and estimated otherwise"""
+
+    def __init__(self, model: str = "gpt-3.5-turbo"):
+        self.encoding = _load_encoding(model)
+        self.exact = self.encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+    def count_message(self, content: str) -> int:
+        return TOKENS_PER_MESSAGE + self.count(content)
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Prompt tokens of a whole request"""
+        return sum(self.count_message(m['content']) for m in messages) + TOKENS_PER_REPLY
+
+
+class Turn:
+    """One exchange, with its token cost counted once"""
+
+    __slots__ = ('timestamp', 'user_message', 'ai_response', 'tokens')
+
+    def __init__(self, user_message: str, ai_response: str, tokens: int):
+        self.timestamp = datetime.now().isoformat()
+        self.user_message = user_message
+        self.ai_response = ai_response
+        self.tokens = tokens
+
+    def messages(self) -> List[Dict[str, str]]:
+        return [{"role": "user", "content": self.user_message},
+                {"role": "assistant", "content": self.ai_response}]
+
+
+class UserMemory:
+    """Recent turns, the turns being summarized, and the summary of everything older"""
+
+    def __init__(self, max_turns: int):
+        self.recent: Deque[Turn] = deque(maxlen=max_turns)
+        self.folding: List[Turn] = []  # out of the budget, summary not ready yet
+        self.summary = ""
+        self.summary_tokens = 0
+        self.summarizing = False
+        self.generation = 0  # bumped by clear() so a late summary is dropped
+        self.lock = threading.Lock()
+
+    @property
+    def recent_tokens(self) -> int:
+        return sum(turn.tokens for turn in self.recent)
+
+
+class ConversationMemory:
+    """Token-budgeted conversation memory for every user"""
+
+    def __init__(self, summarize: Optional[Callable[[str, List[Tuple[str, str]], int], str]] = None,
+                 budget_tokens: int = DEFAULT_BUDGET, summary_tokens: int = DEFAULT_SUMMARY_TOKENS,
+                 max_turns: int = DEFAULT_MAX_TURNS, model: str = "gpt-3.5-turbo"):
+        """
+        Args:
+            summarize: Callable(previous_summary, [(user_message, ai_response), ...], max_tokens)
+                returning the updated summary; None keeps only the recent turns
+            budget_tokens: Tokens of history sent with each request
+            summary_tokens: Target length of the rolling summary
+            max_turns: Recent turns kept verbatim at most
+            model: Model whose tokenizer is used for counting
+        """
+        self.summarize = summarize
+        self.budget_tokens = budget_tokens
+        self.summary_tokens = summary_tokens
+        self.max_turns = max_turns
+        self.counter = TokenCounter(model)
+        self.summaries = 0
+        self._users: Dict[str, UserMemory] = {}
+        self._users_lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-summary")
+
+    def _memory(self, user: str) -> UserMemory:
+        with self._users_lock:
+            if user not in self._users:
+                self._users[user] = UserMemory(self.max_turns)
+            return self._users[user]
+
+    def add(self, user: str, user_message: str, ai_response: str):
+        """Record an exchange; folds the oldest turns into the summary once over budget"""
+        memory = self._memory(user)
+        tokens = self.counter.count_message(user_message) + self.counter.count_message(ai_response)
+        with memory.lock:
+            if len(memory.recent) == memory.recent.maxlen:
+                # The deque would drop the oldest turn silently - fold it instead
+                memory.folding.append(memory.recent.popleft())
+            memory.recent.append(Turn(user_message, ai_response, tokens))
+            recent_budget = self.budget_tokens - memory.summary_tokens
+            while len(memory.recent) > MIN_RECENT_TURNS and memory.recent_tokens > recent_budget:
+                memory.folding.append(memory.recent.popleft())
+            if memory.folding and not memory.summarizing:
+                self._start_summary(user, memory)
+        logger.info(f"Added to conversation history for {user}: {len(memory.recent)} recent turns "
+                    f"({memory.recent_tokens} tokens), summary {memory.summary_tokens} tokens")
+
+    def _start_summary(self, user: str, memory: UserMemory):
+        """Summarize memory.folding in the background (memory.lock held)"""
+        if self.summarize is None:
+            memory.folding.clear()
+            return
+        memory.summarizing = True
+        self._executor.submit(self._refresh_summary, user, memory, memory.generation,
+                              memory.summary, list(memory.folding))
+
+    def _refresh_summary(self, user: str, memory: UserMemory, generation: int, previous: str, turns: List[Turn]):
+        try:
+            summary = self.summarize(previous, [(t.user_message, t.ai_response) for t in turns],
+                                     self.summary_tokens).strip()
+        except Exception as e:
+            logger.warning(f"⚠️ Conversation summary for {user} failed: {e}")
+            summary = None
+        with memory.lock:
+            memory.summarizing = False
+            if memory.generation != generation:
+                return
+            if summary:
+                memory.summary = summary
+                memory.summary_tokens = self.counter.count_message(SUMMARY_PREFIX + summary)
+                del memory.folding[:len(turns)]
+                self.summaries += 1
+                logger.info(f"📝 Conversation summary for {user} updated ({memory.summary_tokens} tokens)")
+            elif len(memory.folding) > self.max_turns:
+                # Summaries keep failing - don't let the backlog grow without bound
+                del memory.folding[:len(memory.folding) - self.max_turns]
+            if memory.folding and summary:
+                self._start_summary(user, memory)
+
+    def messages(self, user: str) -> List[Dict[str, str]]:
+        """History messages for the next request: summary first, then as many recent turns as fit"""
+        memory = self._memory(user)
+        with memory.lock:
+            budget = self.budget_tokens
+            history: List[Dict[str, str]] = []
+            if memory.summary:
+                history.append({"role": "system", "content": SUMMARY_PREFIX + memory.summary})
+                budget -= memory.summary_tokens
+            kept = []
+            for turn in reversed(list(memory.folding) + list(memory.recent)):
+                if turn.tokens > budget:
+                    break
+                kept.append(turn)
+                budget -= turn.tokens
+            for turn in reversed(kept):
+                history.extend(turn.messages())
+            return history
+
+    def last_response(self, user: str) -> Optional[str]:
+        memory = self._memory(user)
+        with memory.lock:
+            return memory.recent[-1].ai_response if memory.recent else None
+
+    def turn_count(self, user: str) -> int:
+        memory = self._memory(user)
+        with memory.lock:
+            return len(memory.recent)
+
+    def clear(self, user: str):
+        """Forget everything about the conversation with this user"""
+        memory = self._memory(user)
+        with memory.lock:
+            memory.recent.clear()
+            memory.folding.clear()
+            memory.summary = ""
+            memory.summary_tokens = 0
+            memory.generation += 1
+
+    def wait_for_summaries(self, timeout: Optional[float] = None):
+        """Block until queued summaries are done (tests and shutdown)"""
+        while True:
+            self._executor.submit(lambda: None).result(timeout)
+            with self._users_lock:
+                if not any(memory.summarizing for memory in self._users.values()):
+                    return
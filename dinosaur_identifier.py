@@ -4,14 +4,15 @@ Dinosaur Identification Module for Eladriel
 Uses OpenAI GPT-4 Vision to identify dinosaur toys and provide fun facts
 """
 
-import base64
 import logging
 from typing import Optional, Dict, Any
 import openai
 from camera_utils import CameraManager
-import cv2
-import time
-import os
+from cloud_transport import get_transport
+from frame_encoder import get_frame_encoder
+from recognition_cache import get_recognition_cache, image_signature
+from object_preclassifier import ObjectPreclassifier
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,19 @@ class DinosaurIdentifier:
             self.using_shared_camera = False
             logger.info("🦕 DinosaurIdentifier using standalone camera")
         
+        # Frames go to the vision API as in-memory JPEGs
+        self.encoder = get_frame_encoder(config.vision_jpeg_quality, config.vision_archive_captures,
+                                         config.vision_archive_dir)
+        
+        # Dinosaurs shown before are answered from memory
+        self.recognition_cache = get_recognition_cache(
+            config.recognition_cache_file,
+            ttl_seconds=config.recognition_cache_ttl_hours * 3600,
+            max_entries=config.recognition_cache_max_entries
+        ) if config.recognition_cache_enabled else None
+        # The local detector's box around the held-up dinosaur keys the cache (set up by use_detector())
+        self.preclassifier = None
+        
         # Dinosaur knowledge base for enhanced responses
         self.dinosaur_facts = {
             "t-rex": {
@@ -67,6 +81,26 @@ class DinosaurIdentifier:
         
         logger.info("DinosaurIdentifier initialized for Eladriel!")
     
+    def use_detector(self, detector):
+        """Box the held-up toy with this on-device detector (a SmartCameraDetector) to key the recognition cache"""
+        if not getattr(self.config, 'local_detector_enabled', True) or detector is None:
+            return
+        # Only the box is used: COCO labels are no answer for a dinosaur, so nothing is answered locally
+        self.preclassifier = ObjectPreclassifier(detector, {}, answer_confidence=float('inf'))
+    
+    def _signature(self, frame: np.ndarray):
+        """Recognition cache key for the boxed toy, or None (no cache, no detector or no usable box)"""
+        if self.recognition_cache is None or self.preclassifier is None:
+            return None
+        try:
+            found = self.preclassifier.classify(frame)
+        except Exception as e:
+            logger.warning(f"⚠️ Local detector failed: {e}")
+            return None
+        if found.box is None:
+            return None
+        return image_signature(frame, found.box, found.detection['bbox'])
+    
     def capture_and_identify(self) -> Dict[str, Any]:
         """Capture image and identify the dinosaur."""
         try:
@@ -82,43 +116,27 @@ class DinosaurIdentifier:
                         "message": "Hmm, I couldn't take a picture. Is your camera working?"
                     }
                 
-                # Capture frame and save as image
                 ret, frame = self.camera_handler.read()
-                if not ret:
-                    return {
-                        "success": False,
-                        "error": "Failed to read from shared camera",
-                        "message": "I had trouble capturing the dinosaur picture. Try again!"
-                    }
-                
-                # Save frame as image file
-                timestamp = int(time.time())
-                image_path = f"captured_images/dinosaur_capture_{timestamp}.jpg"
-                
-                # Create directory if it doesn't exist
-                os.makedirs("captured_images", exist_ok=True)
-                
-                # Save the captured frame
-                success = cv2.imwrite(image_path, frame)
-                if not success:
-                    return {
-                        "success": False,
-                        "error": "Failed to save captured image",
-                        "message": "I had trouble saving the dinosaur picture. Try again!"
-                    }
             else:
                 # Use standalone camera manager
-                image_path = self.camera_manager.capture_image()
-                
-                if not image_path:
-                    return {
-                        "success": False,
-                        "error": "Failed to capture image",
-                        "message": "Hmm, I couldn't take a picture. Is your camera working?"
-                    }
+                ret, frame = self.camera_manager.read_frame()
+            
+            if not ret or frame is None:
+                return {
+                    "success": False,
+                    "error": "Failed to capture frame",
+                    "message": "I had trouble capturing the dinosaur picture. Try again!"
+                }
             
-            # Identify dinosaur using GPT-4 Vision
-            identification = self._identify_dinosaur_with_vision(image_path)
+            # Seen this dinosaur before: answer from memory
+            signature = self._signature(frame)
+            identification = self.recognition_cache.lookup("eladriel", "dinosaur", signature) \
+                if signature is not None else None
+            if identification is None:
+                # Identify dinosaur using GPT-4 Vision
+                identification = self._identify_dinosaur_with_vision(frame)
+                if signature is not None and identification["success"]:
+                    self.recognition_cache.put("eladriel", "dinosaur", signature, identification)
             
             if identification["success"]:
                 # Enhance with local knowledge
@@ -135,24 +153,11 @@ class DinosaurIdentifier:
                 "message": "Oops! Something went wrong while trying to identify your dinosaur."
             }
     
-    def _identify_dinosaur_with_vision(self, image_path: str) -> Dict[str, Any]:
+    def _identify_dinosaur_with_vision(self, frame: np.ndarray) -> Dict[str, Any]:
         """Use OpenAI GPT-4 Vision to identify the dinosaur."""
         try:
-            # Encode image to base64
-            if self.using_shared_camera:
-                # For shared camera, encode the image file directly
-                with open(image_path, "rb") as image_file:
-                    base64_image = base64.b64encode(image_file.read()).decode('utf-8')
-            else:
-                # For standalone camera manager, use its method
-                base64_image = self.camera_manager.encode_image_to_base64(image_path)
-            
-            if not base64_image:
-                return {
-                    "success": False,
-                    "error": "Failed to encode image",
-                    "message": "I couldn't process the image properly."
-                }
+            # Encode the frame in memory, sized for high detail
+            image = self.encoder.encode(frame, detail="high", name="dinosaur_capture")
             
             # Create vision prompt for dinosaur identification
             messages = [
@@ -178,19 +183,14 @@ COOL FACTS: [2-3 fun facts]
 
 If it's not a dinosaur, still be enthusiastic and educational!"""
                         },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{base64_image}",
-                                "detail": "high"
-                            }
-                        }
+                        image.image_content()
                     ]
                 }
             ]
             
             # Call GPT-4 Vision
-            response = self.client.chat.completions.create(
+            response = get_transport().call(
+                'vision', self.client.chat.completions.create,
                 model="gpt-4o",
                 messages=messages,
                 max_tokens=300,
@@ -202,7 +202,7 @@ If it's not a dinosaur, still be enthusiastic and educational!"""
             return {
                 "success": True,
                 "ai_response": ai_response,
-                "image_path": image_path,
+                "image_path": image.archive_path,
                 "message": ai_response
             }
             
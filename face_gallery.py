@@ -0,0 +1,311 @@
+"""
+Face Gallery for AI Assistant
+Loads face encodings for every person in the people/ directory
+(people/<name>/*.jpg|jpeg|png) so all face recognizers share one gallery
+
+Encodings are cached on disk (people/.face_cache/) as a float32 matrix plus a
+manifest keyed by file path, size, mtime and content hash, so a restart only
+runs the face encoder on photos that were added or changed
+
+Matching runs against one contiguous float32 (N x 128) matrix with precomputed
+norms: all detected faces are matched in a single matrix product and distances
+are aggregated per person, so cost stays flat as families add more photos
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import List, Dict, Tuple, Optional
+
+import numpy as np
+
+# Try to import face recognition
+try:
+    import face_recognition
+    FACE_RECOGNITION_AVAILABLE = True
+except ImportError:
+    FACE_RECOGNITION_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+CACHE_DIR_NAME = '.face_cache'
+CACHE_VERSION = 1
+ENCODING_SIZE = 128
+
+
+def _file_sha1(path: str) -> str:
+    """Content hash of a photo"""
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+class FaceGallery:
+    """Known face encodings grouped by person"""
+
+    def __init__(self, people_dir: str = "people", use_cache: bool = True):
+        """
+        Initialize an empty gallery
+
+        Args:
+            people_dir: Directory with one sub-directory of photos per person
+            use_cache: Reuse encodings from people_dir/.face_cache for unchanged photos
+        """
+        self.people_dir = people_dir
+        self.use_cache = use_cache
+        self.cache_dir = os.path.join(people_dir, CACHE_DIR_NAME)
+        self.encodings = []  # Flat list, parallel to names
+        self.names = []
+        self.person_encodings = {}  # name -> list of encodings
+        self.loaded = False
+        
+        # Contiguous matching matrix, rows grouped by person (built by _build_matrix)
+        self.matrix = np.zeros((0, ENCODING_SIZE), dtype=np.float32)
+        self.sq_norms = np.zeros(0, dtype=np.float32)
+        self.person_names = []
+        self.person_starts = np.zeros(0, dtype=np.intp)
+        self.person_counts = np.zeros(0, dtype=np.intp)
+
+        # Cache statistics from the last load
+        self.photos_encoded = 0
+        self.photos_reused = 0
+
+    def load(self) -> 'FaceGallery':
+        """Encode every photo in the people directory, reusing cached encodings"""
+        if not os.path.exists(self.people_dir):
+            print(f"⚠️ People directory '{self.people_dir}' not found")
+            return self
+
+        print("👤 Loading known faces...")
+
+        cached_files, cached_matrix = self._read_cache() if self.use_cache else ({}, None)
+        cached_by_hash = {entry['sha1']: entry for entry in cached_files.values()}
+        manifest_files = {}
+        matrix_rows = []
+
+        for person_name in sorted(os.listdir(self.people_dir)):
+            person_path = os.path.join(self.people_dir, person_name)
+            if person_name.startswith('.') or not os.path.isdir(person_path):
+                continue
+
+            person_encodings = []
+
+            for image_file in sorted(os.listdir(person_path)):
+                if not image_file.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+
+                image_path = os.path.join(person_path, image_file)
+                relative_path = f"{person_name}/{image_file}"
+
+                try:
+                    stat = os.stat(image_path)
+                    entry = cached_files.get(relative_path)
+                    if entry is None and cached_by_hash:
+                        # Renamed or moved photo - match by content hash
+                        entry = cached_by_hash.get(_file_sha1(image_path))
+                    encodings, sha1 = self._cached_encodings(entry, image_path, stat, cached_matrix)
+
+                    if encodings is None:
+                        encodings = self._encode_photo(image_path, image_file)
+                        if encodings is None:
+                            continue
+                        sha1 = sha1 or _file_sha1(image_path)
+                        self.photos_encoded += 1
+                    else:
+                        self.photos_reused += 1
+
+                    manifest_files[relative_path] = {
+                        'person': person_name,
+                        'size': stat.st_size,
+                        'mtime': stat.st_mtime,
+                        'sha1': sha1,
+                        'row': len(matrix_rows),
+                        'count': len(encodings)
+                    }
+                    matrix_rows.extend(encodings)
+                    person_encodings.extend(encodings)
+
+                except Exception as e:
+                    print(f"     ❌ Error loading {image_file}: {e}")
+
+            if person_encodings:
+                self._add_person(person_name, person_encodings)
+                print(f"   ✅ Total {len(person_encodings)} face encodings loaded for {person_name.title()}")
+
+        if self.use_cache and manifest_files != cached_files:
+            self._write_cache(manifest_files, matrix_rows)
+
+        self._build_matrix()
+        self.loaded = True
+        print(f"🎉 Face recognition ready! Loaded {len(self.names)} face encodings for {len(self.person_encodings)} people "
+              f"({self.photos_reused} photos from cache, {self.photos_encoded} newly encoded)")
+        return self
+
+    def _encode_photo(self, image_path: str, image_file: str) -> Optional[List[np.ndarray]]:
+        """Run the face encoder on one photo (None if the encoder is unavailable)"""
+        if not FACE_RECOGNITION_AVAILABLE:
+            print(f"     ⚠️ Skipping {image_file} - face recognition not installed")
+            return None
+
+        image = face_recognition.load_image_file(image_path)
+        encodings = [np.asarray(e, dtype=np.float32) for e in face_recognition.face_encodings(image)]
+
+        if encodings:
+            print(f"     ✅ Encoded {len(encodings)} face(s) from {image_file}")
+        else:
+            # Still recorded in the manifest so the photo is not re-encoded on every boot
+            print(f"     ⚠️ No face found in {image_file}")
+        return encodings
+
+    def _cached_encodings(self, entry: Optional[Dict], image_path: str, stat,
+                          cached_matrix: Optional[np.ndarray]) -> Tuple[Optional[List[np.ndarray]], Optional[str]]:
+        """Return (encodings, sha1) from the cache if the photo is unchanged, else (None, sha1 or None)"""
+        if entry is None or cached_matrix is None:
+            return None, None
+
+        sha1 = entry['sha1']
+        if entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+            # Touched or copied - only re-encode if the content actually changed
+            sha1 = _file_sha1(image_path)
+            if sha1 != entry['sha1']:
+                return None, sha1
+
+        start, count = entry['row'], entry['count']
+        if start + count > len(cached_matrix):
+            return None, sha1
+        return [cached_matrix[i] for i in range(start, start + count)], sha1
+
+    def _read_cache(self) -> Tuple[Dict, Optional[np.ndarray]]:
+        """Read the manifest and memory-map the encoding matrix"""
+        manifest_path = os.path.join(self.cache_dir, 'manifest.json')
+        matrix_path = os.path.join(self.cache_dir, 'encodings.npy')
+        if not os.path.exists(manifest_path) or not os.path.exists(matrix_path):
+            return {}, None
+
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != CACHE_VERSION:
+                return {}, None
+            matrix = np.load(matrix_path, mmap_mode='r')
+            return manifest.get('files', {}), matrix
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable face encoding cache: {e}")
+            return {}, None
+
+    def _write_cache(self, manifest_files: Dict, matrix_rows: List[np.ndarray]):
+        """Atomically write the encoding matrix and manifest"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            matrix = np.asarray(matrix_rows, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+
+            matrix_path = os.path.join(self.cache_dir, 'encodings.npy')
+            manifest_path = os.path.join(self.cache_dir, 'manifest.json')
+
+            with open(matrix_path + '.tmp', 'wb') as f:
+                np.save(f, matrix)
+            with open(manifest_path + '.tmp', 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'files': manifest_files}, f, indent=1)
+
+            os.replace(matrix_path + '.tmp', matrix_path)
+            os.replace(manifest_path + '.tmp', manifest_path)
+            logger.info(f"💾 Face encoding cache updated: {len(matrix)} encodings")
+        except Exception as e:
+            logger.warning(f"Could not write face encoding cache: {e}")
+
+    def _add_person(self, person_name: str, encodings: List):
+        """Add a person's encodings to the gallery"""
+        self.person_encodings[person_name] = encodings
+        self.encodings.extend(encodings)
+        self.names.extend([person_name] * len(encodings))
+
+    def _build_matrix(self):
+        """Pack all encodings into one contiguous float32 matrix with squared norms"""
+        self.matrix = np.ascontiguousarray(
+            np.asarray(self.encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE))
+        self.sq_norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+        
+        self.person_names = list(self.person_encodings.keys())
+        counts = [len(self.person_encodings[name]) for name in self.person_names]
+        self.person_counts = np.asarray(counts, dtype=np.intp)
+        self.person_starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp) if counts else \
+            np.zeros(0, dtype=np.intp)
+
+    def distances(self, face_encodings) -> np.ndarray:
+        """
+        Euclidean distances from each query face to every gallery encoding
+        
+        Args:
+            face_encodings: Sequence of M 128-d face encodings
+            
+        Returns:
+            M x N float32 distance matrix
+        """
+        queries = np.asarray(face_encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        query_norms = np.einsum('ij,ij->i', queries, queries)
+        squared = query_norms[:, None] + self.sq_norms[None, :] - 2.0 * (queries @ self.matrix.T)
+        return np.sqrt(np.maximum(squared, 0.0))
+
+    def person_distances(self, face_encodings, top_k: int = 1) -> np.ndarray:
+        """
+        Distance from each query face to each person
+        
+        Args:
+            face_encodings: Sequence of M 128-d face encodings
+            top_k: 1 = closest photo of the person, >1 = mean of the k closest photos
+            
+        Returns:
+            M x P float32 matrix, columns ordered like person_names
+        """
+        distances = self.distances(face_encodings)
+        if top_k <= 1:
+            return np.minimum.reduceat(distances, self.person_starts, axis=1)
+        
+        per_person = np.empty((distances.shape[0], len(self.person_names)), dtype=np.float32)
+        for column, (start, count) in enumerate(zip(self.person_starts, self.person_counts)):
+            block = distances[:, start:start + count]
+            k = min(top_k, count)
+            per_person[:, column] = np.partition(block, k - 1, axis=1)[:, :k].mean(axis=1)
+        return per_person
+
+    def match(self, face_encodings, tolerance: float = 0.6, top_k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Match every detected face against the gallery in one batched operation
+        
+        Args:
+            face_encodings: Sequence of 128-d face encodings from one frame
+            tolerance: Maximum distance for a match (face_recognition default 0.6)
+            top_k: Per-person aggregation, see person_distances
+            
+        Returns:
+            list: (name, distance) per face - name is "Unknown" when nothing is within tolerance
+        """
+        if len(face_encodings) == 0:
+            return []
+        if len(self.matrix) == 0:
+            return [("Unknown", 1.0)] * len(face_encodings)
+        
+        per_person = self.person_distances(face_encodings, top_k=top_k)
+        best = np.argmin(per_person, axis=1)
+        results = []
+        for row, column in enumerate(best):
+            distance = float(per_person[row, column])
+            name = self.person_names[column] if distance <= tolerance else "Unknown"
+            results.append((name, distance))
+        return results
+
+    def representative_encodings(self) -> Tuple[List, List[str]]:
+        """One encoding per person (the first photo), for trackers that match per person"""
+        names = list(self.person_encodings.keys())
+        return [self.person_encodings[name][0] for name in names], names
+
+    def get_people(self) -> List[str]:
+        """Names of everyone in the gallery"""
+        return list(self.person_encodings.keys())
+
+    def __len__(self) -> int:
+        return len(self.encodings)
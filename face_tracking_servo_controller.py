@@ -10,7 +10,6 @@ import face_recognition
 import numpy as np
 import serial
 import time
-import os
 import threading
 import json
 from typing import List, Tuple, Dict, Optional
@@ -71,13 +70,14 @@ class PremiumFaceTracker:
         """Initialize camera with CameraHandler support (Sony IMX500 AI Camera)"""
         print("🎥 Initializing camera system...")
         
-        # Try using the existing CameraHandler first (supports Sony IMX500 AI Camera)
+        # Subscribe to the shared frame bus first (CameraHandler with Sony IMX500 AI Camera support)
         try:
-            from camera_handler import CameraHandler
-            print("  🤖 Attempting to use CameraHandler (Sony IMX500 AI support)...")
+            from frame_bus import get_frame_bus
+            print("  🤖 Attempting to use shared frame bus (Sony IMX500 AI support)...")
             
-            # Initialize camera handler with IMX500 preference
-            self.camera_handler = CameraHandler(camera_index=self.camera_index, prefer_imx500=True)
+            # Frames are copied when the preview window draws on them
+            self.camera_handler = get_frame_bus(camera_index=self.camera_index).subscribe(
+                'face_tracker', copy=not self.headless)
             
             if self.camera_handler.is_camera_available():
                 self.using_imx500 = self.camera_handler.using_imx500
@@ -166,40 +166,13 @@ class PremiumFaceTracker:
             return False
             
     def load_known_faces(self):
-        """Load known face encodings from people directory"""
-        print("👤 Loading known faces...")
+        """Load known face encodings from the shared people/ gallery"""
+        from model_registry import get_face_gallery
         
-        people_dir = "people"
-        if not os.path.exists(people_dir):
-            print("  ⚠️ No 'people' directory found - will track any face")
-            return
-            
-        for person_name in os.listdir(people_dir):
-            person_path = os.path.join(people_dir, person_name)
-            if not os.path.isdir(person_path):
-                continue
-                
-            person_encodings = []
-            image_files = [f for f in os.listdir(person_path) 
-                          if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-            
-            for image_file in image_files:
-                try:
-                    image_path = os.path.join(person_path, image_file)
-                    image = face_recognition.load_image_file(image_path)
-                    encodings = face_recognition.face_encodings(image)
-                    
-                    if encodings:
-                        person_encodings.extend(encodings)
-                        
-                except Exception as e:
-                    print(f"    ⚠️ Error loading {image_file}: {e}")
-                    
-            if person_encodings:
-                # Use the first encoding as representative
-                self.known_face_encodings.append(person_encodings[0])
-                self.known_face_names.append(person_name)
-                print(f"  ✅ Loaded {len(person_encodings)} encodings for {person_name}")
+        self.face_gallery = get_face_gallery("people")
+        
+        # One entry per person; matching uses every photo through the gallery
+        self.known_face_encodings, self.known_face_names = self.face_gallery.representative_encodings()
                 
         if self.known_face_encodings:
             print(f"  🎯 Ready to track: {', '.join(self.known_face_names)}")
@@ -232,22 +205,8 @@ class PremiumFaceTracker:
         # Get face encodings for detected faces
         face_encodings = face_recognition.face_encodings(frame, face_locations)
         
-        face_names = []
-        for face_encoding in face_encodings:
-            # Compare with known faces
-            matches = face_recognition.compare_faces(self.known_face_encodings, face_encoding)
-            name = "Unknown"
-            
-            # Use the known face with the smallest distance
-            face_distances = face_recognition.face_distance(self.known_face_encodings, face_encoding)
-            best_match_index = np.argmin(face_distances)
-            
-            if matches[best_match_index] and face_distances[best_match_index] < 0.6:
-                name = self.known_face_names[best_match_index]
-                
-            face_names.append(name)
-            
-        return face_names
+        # Closest photo per person, all faces matched in one batched operation
+        return [name for name, distance in self.face_gallery.match(face_encodings, tolerance=0.6)]
         
     def get_face_center(self, face_location: Tuple[int, int, int, int]) -> Tuple[int, int]:
         """Get center point of face bounding box"""
@@ -9,10 +9,15 @@ import random
 import difflib
 from typing import Dict, List, Optional
 import pygame
-import numpy as np
+from sound_bank import get_sound_bank
+from answer_recognizer import candidates_from
 
 logger = logging.getLogger(__name__)
 
+# Phrases that start / end the Filipino game
+FILIPINO_GAME_COMMANDS = ['filipino game', 'learn filipino', 'filipino translation']
+FILIPINO_END_COMMANDS = ['end filipino game', 'stop filipino']
+
 class FilipinoTranslator:
     def __init__(self, openai_client, ai_assistant=None):
         """Initialize the Filipino translator with OpenAI client and AI assistant reference."""
@@ -24,9 +29,10 @@ class FilipinoTranslator:
         # Initialize pygame mixer for sound effects
         pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
         
-        # Generate sound effects
-        self.correct_sound = self._generate_applause_sound()
-        self.wrong_sound = self._generate_buzzer_sound()
+        # Shared pre-rendered sound effects
+        self.sound_bank = get_sound_bank()
+        self.correct_sound = self.sound_bank.get('celebration')
+        self.wrong_sound = self.sound_bank.get('buzzer')
         
         # Expanded Filipino vocabulary for advanced learning
         self.basic_vocabulary = {
@@ -663,6 +669,21 @@ class FilipinoTranslator:
             logger.error(f"Error checking answer: {e}")
             return "Error checking answer. Try again!"
 
+    def get_answer_candidates(self) -> Dict[str, str]:
+        """Spoken answers expected for the current question ({phrase: text passed to check_translation_answer})"""
+        if not self.game_active or not self.current_translation:
+            return {}
+        
+        correct = self.current_translation['filipino'].lower()
+        # Every Filipino word in the game, so a wrong answer is heard as that word
+        candidates = candidates_from([word for word in self.basic_vocabulary.values() if isinstance(word, str)])
+        candidates.update(candidates_from(['end filipino game', 'stop filipino']))
+        # How English speech recognition tends to hear the correct word
+        for alternative in self.pronunciation_alternatives.get(correct, []):
+            candidates[alternative.lower().replace('-', ' ')] = correct
+        candidates[correct] = correct
+        return candidates
+
     def _is_close_pronunciation(self, user_answer: str, correct_answer: str) -> bool:
         """Check if the user's answer is phonetically close to the correct answer."""
         # Remove common speech recognition artifacts
@@ -769,29 +790,25 @@ class FilipinoTranslator:
 
     def is_filipino_game_command(self, user_input: str) -> bool:
         """Check if the input is related to the Filipino game."""
-        filipino_commands = [
-            'filipino game', 'learn filipino', 'filipino translation',
-            'end filipino game', 'stop filipino'
-        ]
-        
         user_input_lower = user_input.lower()
         
         # If game is active and there's a current question, treat any input as a potential answer
         if self.game_active and self.current_translation:
             return True
             
-        return any(command in user_input_lower for command in filipino_commands)
+        return any(command in user_input_lower for command in FILIPINO_GAME_COMMANDS + FILIPINO_END_COMMANDS)
 
     def handle_filipino_command(self, user_input: str, user: str) -> str:
         """Handle Filipino game related commands."""
         user_input_lower = user_input.lower()
         
-        if any(phrase in user_input_lower for phrase in ['filipino game', 'learn filipino']):
-            return self.start_filipino_game(user)
-        
-        elif any(phrase in user_input_lower for phrase in ['end filipino game', 'stop filipino']):
+        # "end filipino game" contains "filipino game", so check for the end first
+        if any(phrase in user_input_lower for phrase in FILIPINO_END_COMMANDS):
             return self.end_game()
         
+        elif any(phrase in user_input_lower for phrase in ['filipino game', 'learn filipino']):
+            return self.start_filipino_game(user)
+        
         elif self.game_active and self.current_translation:
             # User is giving an answer to current question
             return self.check_translation_answer(user_input, user)
@@ -799,149 +816,6 @@ class FilipinoTranslator:
         else:
             return "Say 'Filipino game' to start!"
 
-    def _generate_applause_sound(self):
-        """Generate a celebratory victory sound for correct answers."""
-        try:
-            sample_rate = 22050
-            duration = 1.8  # 1.8 seconds
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            
-            # Create a "Ta-Da!" victory sound with ascending musical notes
-            celebration = np.zeros_like(t)
-            
-            # First part: Rising musical phrase (Ta!)
-            first_part_end = 0.6
-            first_mask = t <= first_part_end
-            
-            # Rising chord progression for excitement
-            frequencies_rising = [
-                (220, 0.0, 0.2),   # A3 
-                (277, 0.1, 0.3),   # C#4
-                (330, 0.2, 0.4),   # E4
-                (440, 0.3, 0.6),   # A4 (climax)
-            ]
-            
-            for freq, start_time, end_time in frequencies_rising:
-                note_mask = (t >= start_time) & (t <= end_time)
-                if np.any(note_mask):
-                    note_t = t[note_mask] - start_time
-                    # Create a bell-like tone with harmonics
-                    fundamental = np.sin(2 * np.pi * freq * note_t)
-                    harmonic2 = 0.3 * np.sin(2 * np.pi * freq * 2 * note_t)
-                    harmonic3 = 0.1 * np.sin(2 * np.pi * freq * 3 * note_t)
-                    
-                    # Bell envelope - quick attack, gradual decay
-                    envelope = np.exp(-note_t * 4) * (1 - np.exp(-note_t * 50))
-                    
-                    note = (fundamental + harmonic2 + harmonic3) * envelope
-                    celebration[note_mask] += note * 0.4
-            
-            # Second part: Sparkle effect (Da!)
-            sparkle_start = 0.5
-            sparkle_end = 1.8
-            sparkle_mask = (t >= sparkle_start) & (t <= sparkle_end)
-            
-            if np.any(sparkle_mask):
-                sparkle_t = t[sparkle_mask] - sparkle_start
-                
-                # Add magical sparkle with high frequency components
-                sparkle_freqs = [880, 1108, 1397, 1760, 2217]  # High harmonious frequencies
-                
-                for i, freq in enumerate(sparkle_freqs):
-                    delay = i * 0.08  # Staggered sparkles
-                    if len(sparkle_t) > int(delay * sample_rate):
-                        delayed_t = sparkle_t[int(delay * sample_rate):]
-                        if len(delayed_t) > 0:
-                            # Create shimmering effect
-                            shimmer = np.sin(2 * np.pi * freq * delayed_t)
-                            shimmer *= np.exp(-delayed_t * 2)  # Decay
-                            shimmer *= (1 + 0.5 * np.sin(10 * delayed_t))  # Tremolo effect
-                            
-                            # Add to the celebration sound
-                            start_idx = int((sparkle_start + delay) * sample_rate)
-                            end_idx = start_idx + len(shimmer)
-                            if end_idx <= len(celebration):
-                                celebration[start_idx:end_idx] += shimmer * 0.15
-            
-            # Third part: Final triumphant chord
-            final_start = 1.2
-            final_mask = t >= final_start
-            
-            if np.any(final_mask):
-                final_t = t[final_mask] - final_start
-                
-                # Major chord for triumphant ending
-                chord_freqs = [440, 554, 659]  # A major chord
-                for freq in chord_freqs:
-                    chord_note = np.sin(2 * np.pi * freq * final_t)
-                    chord_envelope = np.exp(-final_t * 1.5) * 0.6
-                    celebration[final_mask] += chord_note * chord_envelope * 0.3
-            
-            # Add some gentle reverb effect
-            reverb_delay = int(0.05 * sample_rate)  # 50ms delay
-            if len(celebration) > reverb_delay:
-                reverb = np.zeros_like(celebration)
-                reverb[reverb_delay:] = celebration[:-reverb_delay] * 0.2
-                celebration += reverb
-            
-            # Apply overall envelope for natural sound
-            overall_envelope = np.ones_like(t)
-            # Gentle fade out at the end
-            fade_start = 1.5
-            fade_mask = t >= fade_start
-            if np.any(fade_mask):
-                fade_t = (t[fade_mask] - fade_start) / (duration - fade_start)
-                overall_envelope[fade_mask] = 1 - fade_t
-            
-            celebration *= overall_envelope
-            
-            # Normalize and convert to pygame sound format
-            celebration = np.clip(celebration, -1, 1)
-            celebration = (celebration * 32767 * 0.7).astype(np.int16)  # Good volume level
-            
-            # Create stereo sound
-            stereo_sound = np.zeros((len(celebration), 2), dtype=np.int16)
-            stereo_sound[:, 0] = celebration  # Left channel
-            stereo_sound[:, 1] = celebration  # Right channel
-            
-            return pygame.sndarray.make_sound(stereo_sound)
-        except Exception as e:
-            logger.error(f"Error generating celebration sound: {e}")
-            return None
-
-    def _generate_buzzer_sound(self):
-        """Generate a buzzer sound for wrong answers."""
-        try:
-            sample_rate = 22050
-            duration = 0.8  # 0.8 seconds
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            
-            # Create buzzer sound with low frequency
-            frequency = 150  # Low buzzer frequency
-            wave = np.sin(2 * np.pi * frequency * t)
-            
-            # Add some harmonics to make it sound more like a buzzer
-            wave += 0.5 * np.sin(2 * np.pi * frequency * 2 * t)  # Octave
-            wave += 0.3 * np.sin(2 * np.pi * frequency * 3 * t)  # Fifth
-            
-            # Apply envelope for natural sound decay
-            envelope = np.exp(-t * 1.5)
-            buzzer = wave * envelope
-            
-            # Normalize and convert to pygame sound format
-            buzzer = np.clip(buzzer, -1, 1)
-            buzzer = (buzzer * 32767).astype(np.int16)
-            
-            # Create stereo sound
-            stereo_sound = np.zeros((len(buzzer), 2), dtype=np.int16)
-            stereo_sound[:, 0] = buzzer  # Left channel
-            stereo_sound[:, 1] = buzzer  # Right channel
-            
-            return pygame.sndarray.make_sound(stereo_sound)
-        except Exception as e:
-            logger.error(f"Error generating buzzer sound: {e}")
-            return None
-
     def play_correct_sound(self):
         """Play applause sound for correct answers."""
         try:
@@ -0,0 +1,362 @@
+"""
+Process-wide Frame Bus for AI Assistant
+One capture thread reads the camera and publishes timestamped frames;
+the face loop, face tracker, gesture controller and identifiers subscribe
+at their own rates instead of opening and reading the camera themselves
+"""
+
+import cv2
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FramePacket:
+    """A published camera frame with lazily computed, shared variants"""
+
+    __slots__ = ('seq', 'timestamp', 'frame', '_variants', '_lock')
+
+    def __init__(self, seq: int, timestamp: float, frame: np.ndarray):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.frame = frame
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def get_variant(self, scale: float = 1.0, gray: bool = False) -> np.ndarray:
+        """
+        Get a downscaled and/or greyscale version of the frame
+        Each variant is computed once per frame and shared by every subscriber asking for it
+        """
+        if scale == 1.0 and not gray:
+            return self.frame
+
+        key = (scale, gray)
+        variant = self._variants.get(key)
+        if variant is not None:
+            return variant
+
+        with self._lock:
+            variant = self._variants.get(key)
+            if variant is None:
+                variant = self.frame
+                if scale != 1.0:
+                    variant = cv2.resize(variant, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                if gray:
+                    variant = cv2.cvtColor(variant, cv2.COLOR_BGR2GRAY)
+                self._variants[key] = variant
+        return variant
+
+
+class FrameSubscriber:
+    """
+    Read handle on the frame bus
+    Exposes the same read()/is_camera_available() interface as CameraHandler so it can be
+    passed anywhere a shared camera is expected
+    """
+
+    def __init__(self, bus: 'FrameBus', name: str, scale: float = 1.0, gray: bool = False,
+                 max_fps: Optional[float] = None, timeout: float = 1.0, copy: bool = False):
+        """
+        Initialize a subscriber
+
+        Args:
+            bus: Frame bus to read from
+            name: Subscriber name used in metrics
+            scale: Downscale factor for frames returned by read() (default 1.0)
+            gray: Return greyscale frames (default False)
+            max_fps: Upper bound on frames returned per second (default unlimited)
+            timeout: Seconds read() waits for a newer frame (default 1.0)
+            copy: Return a private copy for subscribers that draw on frames (default False)
+        """
+        self.bus = bus
+        self.name = name
+        self.scale = scale
+        self.gray = gray
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.timeout = timeout
+        self.copy = copy
+
+        self.last_seq = 0
+        self.last_read_time = 0.0
+
+        # Metrics
+        self.frames_consumed = 0
+        self.frames_dropped = 0
+        self.total_age = 0.0
+        self.max_age = 0.0
+
+    @property
+    def using_imx500(self) -> bool:
+        return getattr(self.bus.source, 'using_imx500', False)
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Read the newest frame this subscriber has not seen yet
+
+        Returns:
+            tuple: (success, frame) - success is bool, frame is numpy array
+        """
+        if self.min_interval:
+            wait = self.last_read_time + self.min_interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+
+        packet = self.bus.wait_for_packet(self.last_seq, self.timeout)
+        if packet is None:
+            return False, None
+
+        self._record(packet)
+        frame = packet.get_variant(self.scale, self.gray)
+        return True, frame.copy() if self.copy else frame
+
+    def read_packet(self) -> Optional[FramePacket]:
+        """Read the newest unseen packet (frame plus timestamp and shared variants)"""
+        packet = self.bus.wait_for_packet(self.last_seq, self.timeout)
+        if packet is not None:
+            self._record(packet)
+        return packet
+
+    def _record(self, packet: FramePacket):
+        """Update consumption metrics for a packet"""
+        now = time.time()
+        if self.last_seq:
+            self.frames_dropped += max(0, packet.seq - self.last_seq - 1)
+        age = now - packet.timestamp
+        self.frames_consumed += 1
+        self.total_age += age
+        self.max_age = max(self.max_age, age)
+        self.last_seq = packet.seq
+        self.last_read_time = now
+
+    def is_camera_available(self) -> bool:
+        """Check if the bus has a working camera"""
+        return self.bus.is_camera_available()
+    
+    def isOpened(self) -> bool:
+        """cv2.VideoCapture-compatible alias of is_camera_available()"""
+        return self.is_camera_available()
+
+    def get_ai_status(self) -> Dict[str, Any]:
+        """Get AI status of the underlying camera"""
+        if hasattr(self.bus.source, 'get_ai_status'):
+            return self.bus.source.get_ai_status()
+        return {'ai_enabled': False}
+
+    def capture_image(self, filename: Optional[str] = None) -> Optional[str]:
+        """Save the latest full-resolution frame to captured_images/"""
+        packet = self.bus.latest_packet()
+        if packet is None:
+            return None
+
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"bus_capture_{timestamp}.jpg"
+
+        capture_dir = "captured_images"
+        os.makedirs(capture_dir, exist_ok=True)
+        filepath = os.path.join(capture_dir, filename)
+
+        if cv2.imwrite(filepath, packet.frame):
+            logger.info(f"📸 Frame bus image captured: {filepath}")
+            return filepath
+        return None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get consumption metrics for this subscriber"""
+        return {
+            'frames_consumed': self.frames_consumed,
+            'frames_dropped': self.frames_dropped,
+            'avg_frame_age': self.total_age / self.frames_consumed if self.frames_consumed else 0.0,
+            'max_frame_age': self.max_age
+        }
+
+    def release(self):
+        """Unsubscribe - the shared camera stays open for other subscribers"""
+        self.bus.unsubscribe(self)
+
+
+class FrameBus:
+    """
+    Single capture thread publishing frames to any number of subscribers
+    Readers take the latest packet reference without locking; only waiting for a
+    newer frame goes through a condition variable
+    """
+
+    def __init__(self, source, ring_size: int = 8, idle_sleep: float = 0.005):
+        """
+        Initialize the frame bus
+
+        Args:
+            source: Camera object with read() -> (success, frame), e.g. CameraHandler
+            ring_size: Number of recent packets kept in the ring buffer
+            idle_sleep: Pause after a failed read before retrying
+        """
+        self.source = source
+        self.ring = deque(maxlen=ring_size)
+        self.idle_sleep = idle_sleep
+
+        self._latest = None
+        self._seq = 0
+        self._new_frame = threading.Condition()
+
+        self.subscribers = []
+        self.subscribers_lock = threading.Lock()
+
+        self.running = False
+        self.thread = None
+
+        # Metrics
+        self.frames_produced = 0
+        self.read_failures = 0
+        self.started_at = None
+
+    def start(self):
+        """Start the capture thread"""
+        if self.running:
+            return
+        self.running = True
+        self.started_at = time.time()
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True, name="FrameBusCapture")
+        self.thread.start()
+        logger.info("🚌 Frame bus capture thread started")
+
+    def stop(self):
+        """Stop the capture thread (the source camera is not released)"""
+        self.running = False
+        with self._new_frame:
+            self._new_frame.notify_all()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+        self.thread = None
+        logger.info("🚌 Frame bus stopped")
+
+    def _capture_loop(self):
+        """Read frames from the source and publish them"""
+        last_frame = None
+        while self.running:
+            try:
+                ret, frame = self.source.read()
+            except Exception as e:
+                logger.error(f"Frame bus read error: {e}")
+                ret, frame = False, None
+
+            if not ret or frame is None:
+                self.read_failures += 1
+                time.sleep(self.idle_sleep if self.read_failures < 10 else 0.5)
+                continue
+
+            self.read_failures = 0
+
+            # Streaming sources return their latest frame without blocking - publish each frame once
+            if frame is last_frame:
+                time.sleep(self.idle_sleep)
+                continue
+
+            last_frame = frame
+            self.publish(frame)
+
+    def publish(self, frame: np.ndarray, timestamp: Optional[float] = None):
+        """Publish a frame to all subscribers"""
+        self._seq += 1
+        packet = FramePacket(self._seq, timestamp or time.time(), frame)
+        self.ring.append(packet)
+        self._latest = packet
+        self.frames_produced += 1
+        with self._new_frame:
+            self._new_frame.notify_all()
+
+    def latest_packet(self) -> Optional[FramePacket]:
+        """Get the most recent packet without waiting"""
+        return self._latest
+
+    def wait_for_packet(self, after_seq: int, timeout: float) -> Optional[FramePacket]:
+        """Get the newest packet with seq greater than after_seq, waiting up to timeout"""
+        packet = self._latest
+        if packet is not None and packet.seq > after_seq:
+            return packet
+
+        deadline = time.time() + timeout
+        with self._new_frame:
+            while self.running:
+                packet = self._latest
+                if packet is not None and packet.seq > after_seq:
+                    return packet
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._new_frame.wait(remaining)
+        return None
+
+    def subscribe(self, name: str, scale: float = 1.0, gray: bool = False,
+                  max_fps: Optional[float] = None, timeout: float = 1.0, copy: bool = False) -> FrameSubscriber:
+        """Create a subscriber (see FrameSubscriber for arguments)"""
+        subscriber = FrameSubscriber(self, name, scale=scale, gray=gray, max_fps=max_fps,
+                                     timeout=timeout, copy=copy)
+        with self.subscribers_lock:
+            self.subscribers.append(subscriber)
+        logger.info(f"🚌 Frame bus subscriber added: {name}")
+        return subscriber
+
+    def unsubscribe(self, subscriber: FrameSubscriber):
+        """Remove a subscriber"""
+        with self.subscribers_lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+                logger.info(f"🚌 Frame bus subscriber removed: {subscriber.name}")
+
+    def is_camera_available(self) -> bool:
+        """Check if the source camera is available"""
+        try:
+            return bool(self.source.is_camera_available())
+        except Exception:
+            return False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get bus-wide and per-subscriber metrics"""
+        elapsed = (time.time() - self.started_at) if self.started_at else 0.0
+        latest = self._latest
+        with self.subscribers_lock:
+            subscribers = {s.name: s.get_metrics() for s in self.subscribers}
+        return {
+            'frames_produced': self.frames_produced,
+            'fps': self.frames_produced / elapsed if elapsed > 0 else 0.0,
+            'latest_frame_age': (time.time() - latest.timestamp) if latest else None,
+            'subscribers': subscribers
+        }
+
+
+# Process-wide bus instance
+_frame_bus = None
+_frame_bus_lock = threading.Lock()
+
+
+def get_frame_bus(source=None, camera_index: int = 0, create: bool = True) -> Optional[FrameBus]:
+    """
+    Get the process-wide frame bus, creating and starting it on first use
+
+    Args:
+        source: Camera to publish from; ignored if the bus already exists
+        camera_index: Camera index for a new CameraHandler when no source is given
+        create: Create the bus if it does not exist yet (default True)
+
+    Returns:
+        FrameBus or None if it does not exist and create is False
+    """
+    global _frame_bus
+    with _frame_bus_lock:
+        if _frame_bus is None and (source is not None or create):
+            if source is None:
+                from camera_handler import CameraHandler
+                source = CameraHandler(camera_index=camera_index)
+            _frame_bus = FrameBus(source)
+            _frame_bus.start()
+        return _frame_bus
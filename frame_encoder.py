@@ -0,0 +1,182 @@
+"""
+Frame Encoder for AI Assistant
+Turns a camera frame into the base64 JPEG a vision request needs, in memory,
+instead of writing it to captured_images/ and reading the file back
+
+- Frames are downscaled to what the vision model actually looks at for the
+  requested detail level (the API resizes larger images server-side anyway):
+  "low" fits 512x512, "high" fits 2048x2048 with the short side at most 768
+- JPEG quality is tuned for photos of toys and handwriting (default 80)
+- Captures are only written to disk when archiving is on, on a background
+  thread, from the already-encoded bytes
+"""
+
+import os
+import time
+import base64
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUALITY = 80
+LOW_DETAIL_SIZE = 512
+HIGH_DETAIL_MAX = 2048
+HIGH_DETAIL_SHORT_SIDE = 768
+
+
+def target_size(width: int, height: int, detail: str = "high") -> Tuple[int, int]:
+    """Largest size the vision model uses at this detail level (never upscales)"""
+    if detail == "low":
+        scale = LOW_DETAIL_SIZE / max(width, height)
+    else:
+        scale = min(HIGH_DETAIL_MAX / max(width, height), HIGH_DETAIL_SHORT_SIDE / min(width, height))
+    scale = min(1.0, scale)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def downscale(frame: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """
+    Shrink a frame to size
+
+    Halves with pyrDown (blur + decimate) while the frame is more than twice too big,
+    then finishes with a linear resize - several times cheaper than INTER_AREA at
+    non-integer ratios like 1920 -> 1365, without its aliasing at large ratios.
+    """
+    while frame.shape[1] >= 2 * size[0] and frame.shape[0] >= 2 * size[1]:
+        frame = cv2.pyrDown(frame)
+    if frame.shape[1::-1] != size:
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+    return frame
+
+
+class EncodedFrame:
+    """A frame ready for a vision request"""
+
+    __slots__ = ('jpeg', 'width', 'height', 'detail', 'seconds', 'archive_path')
+
+    def __init__(self, jpeg: bytes, width: int, height: int, detail: str, seconds: float,
+                 archive_path: Optional[str] = None):
+        self.jpeg = jpeg
+        self.width = width
+        self.height = height
+        self.detail = detail
+        self.seconds = seconds
+        self.archive_path = archive_path
+
+    @property
+    def base64(self) -> str:
+        return base64.b64encode(self.jpeg).decode('ascii')
+
+    def image_content(self) -> Dict[str, Any]:
+        """The image_url part of a chat message"""
+        return {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/jpeg;base64,{self.base64}",
+                "detail": self.detail
+            }
+        }
+
+
+class FrameEncoder:
+    """Shared in-memory JPEG encoder with optional background archiving"""
+
+    def __init__(self, quality: int = DEFAULT_QUALITY, archive: bool = False,
+                 archive_dir: str = "captured_images"):
+        """
+        Args:
+            quality: JPEG quality (0-100)
+            archive: Also save every encoded capture to archive_dir (in the background)
+            archive_dir: Where archived captures go
+        """
+        self.quality = quality
+        self.archive = archive
+        self.archive_dir = archive_dir
+        self._archiver = None
+        self._lock = threading.Lock()
+
+        self.frames = 0
+        self.bytes_out = 0  # JPEG bytes uploaded
+        self.total_time = 0.0
+
+    def encode(self, frame: np.ndarray, detail: str = "high", name: str = "capture") -> EncodedFrame:
+        """
+        Encode a BGR frame for a vision request
+
+        Args:
+            frame: Camera frame
+            detail: Vision detail level the request will use ("low" or "high")
+            name: Prefix for the archived file name
+        """
+        start = time.perf_counter()
+        height, width = frame.shape[:2]
+        size = target_size(width, height, detail)
+        if size != (width, height):
+            frame = downscale(frame, size)
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        jpeg = buffer.tobytes()
+        seconds = time.perf_counter() - start
+
+        archive_path = self._archive(jpeg, name) if self.archive else None
+        with self._lock:
+            self.frames += 1
+            self.bytes_out += len(jpeg)
+            self.total_time += seconds
+        logger.debug(f"Encoded {width}x{height} frame -> {size[0]}x{size[1]} JPEG, "
+                     f"{len(jpeg) / 1024:.0f} KB in {seconds * 1000:.1f} ms")
+        return EncodedFrame(jpeg, size[0], size[1], detail, seconds, archive_path)
+
+    def _archive(self, jpeg: bytes, name: str) -> str:
+        """Queue the JPEG for writing and return the path it will have"""
+        path = os.path.join(self.archive_dir, f"{name}_{time.time():.3f}.jpg")
+        with self._lock:
+            if self._archiver is None:
+                self._archiver = concurrent.futures.ThreadPoolExecutor(max_workers=1,
+                                                                       thread_name_prefix="frame-archive")
+        self._archiver.submit(self._write, path, jpeg)
+        return path
+
+    @staticmethod
+    def _write(path: str, jpeg: bytes):
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(jpeg)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not archive capture {path}: {e}")
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait for queued archive writes (tests and shutdown)"""
+        if self._archiver is not None:
+            self._archiver.submit(lambda: None).result(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'frames': self.frames,
+                'bytes_uploaded': self.bytes_out,
+                'mean_kb': self.bytes_out / self.frames / 1024 if self.frames else 0.0,
+                'mean_ms': self.total_time / self.frames * 1000 if self.frames else 0.0,
+            }
+
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def get_frame_encoder(quality: int = DEFAULT_QUALITY, archive: bool = False,
+                      archive_dir: str = "captured_images") -> FrameEncoder:
+    """Process-wide frame encoder (created by the first caller, whose settings it uses)"""
+    global _encoder
+    with _encoder_lock:
+        if _encoder is None:
+            _encoder = FrameEncoder(quality=quality, archive=archive, archive_dir=archive_dir)
+        return _encoder
@@ -24,9 +24,9 @@ except ImportError:
     MEDIAPIPE_AVAILABLE = False
     mp = None
 
-# Import the camera handler
+# Import the shared frame bus (wraps CameraHandler)
 try:
-    from camera_handler import CameraHandler
+    from frame_bus import get_frame_bus
     CAMERA_HANDLER_AVAILABLE = True
 except ImportError:
     CAMERA_HANDLER_AVAILABLE = False
@@ -65,9 +65,9 @@ class HandGestureController:
             
             # Try to use CameraHandler first (supports Sony IMX500 AI Camera)
             if CAMERA_HANDLER_AVAILABLE:
-                print("[HandGestureController] 🤖 Using CameraHandler (Sony IMX500 AI Camera support)")
-                # Use lower resolution for better gesture detection performance
-                self.camera_handler = CameraHandler(camera_index=camera_index, prefer_imx500=True)
+                print("[HandGestureController] 🤖 Using shared frame bus (Sony IMX500 AI Camera support)")
+                # Subscribe to the process-wide camera instead of opening the device again
+                self.camera_handler = get_frame_bus(camera_index=camera_index).subscribe('gesture_control')
                 
                 if self.camera_handler.is_camera_available():
                     self.enabled = True
@@ -17,16 +17,166 @@ from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import tempfile
 import signal
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
+# JPEG start/end-of-image markers used to split the MJPEG byte stream
+JPEG_SOI = b'\xff\xd8'
+JPEG_EOI = b'\xff\xd9'
+
+
+class MJPEGStreamReader:
+    """
+    Background reader for a continuous MJPEG byte stream
+    Splits the stream into JPEG frames, decodes only the newest complete frame
+    and keeps it in a small ring buffer so read() never waits on the camera
+    """
+    
+    def __init__(self, stream, buffer_size: int = 4, chunk_size: int = 65536):
+        """
+        Initialize the stream reader
+        
+        Args:
+            stream: Binary file-like object (libcamera-vid stdout, pipe or recorded .mjpeg file)
+            buffer_size: Number of decoded frames kept in the ring buffer
+            chunk_size: Bytes requested from the stream per read
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.frames = deque(maxlen=buffer_size)
+        self.frame_lock = threading.Lock()
+        self.frame_event = threading.Event()
+        
+        self.running = False
+        self.thread = None
+        
+        # Stream statistics
+        self.frames_decoded = 0
+        self.frames_skipped = 0
+        self.decode_errors = 0
+        self.bytes_read = 0
+        self.started_at = None
+        self.last_frame_time = None
+    
+    def start(self):
+        """Start the background reader thread"""
+        if self.running:
+            return
+        self.running = True
+        self.started_at = time.time()
+        self.thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Stop the background reader thread"""
+        self.running = False
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+        self.thread = None
+    
+    def is_alive(self) -> bool:
+        """Check whether the reader is still receiving data"""
+        return self.running and self.thread is not None and self.thread.is_alive()
+    
+    def wait_for_frame(self, timeout: float = 5.0) -> bool:
+        """Block until the first frame is decoded or the timeout expires"""
+        return self.frame_event.wait(timeout)
+    
+    def latest(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """
+        Get the most recent decoded frame without blocking on the camera
+        
+        Returns:
+            tuple: (success, frame, timestamp)
+        """
+        with self.frame_lock:
+            if not self.frames:
+                return False, None, 0.0
+            timestamp, frame = self.frames[-1]
+        return True, frame, timestamp
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get stream statistics"""
+        elapsed = (time.time() - self.started_at) if self.started_at else 0.0
+        return {
+            'frames_decoded': self.frames_decoded,
+            'frames_skipped': self.frames_skipped,
+            'decode_errors': self.decode_errors,
+            'bytes_read': self.bytes_read,
+            'fps': self.frames_decoded / elapsed if elapsed > 0 else 0.0,
+            'last_frame_age': (time.time() - self.last_frame_time) if self.last_frame_time else None
+        }
+    
+    def _read_chunk(self) -> bytes:
+        """Read whatever bytes are available from the stream"""
+        if hasattr(self.stream, 'read1'):
+            return self.stream.read1(self.chunk_size)
+        return self.stream.read(self.chunk_size)
+    
+    def _reader_loop(self):
+        """Split the byte stream into JPEG frames and decode the newest one"""
+        buffer = bytearray()
+        
+        try:
+            while self.running:
+                chunk = self._read_chunk()
+                if not chunk:
+                    logger.debug("MJPEG stream ended")
+                    break
+                
+                self.bytes_read += len(chunk)
+                buffer += chunk
+                
+                # Extract every complete JPEG, keeping only the newest one
+                newest_jpeg = None
+                while True:
+                    start = buffer.find(JPEG_SOI)
+                    if start < 0:
+                        # Keep a trailing 0xff in case a marker is split across chunks
+                        del buffer[:-1]
+                        break
+                    end = buffer.find(JPEG_EOI, start + 2)
+                    if end < 0:
+                        del buffer[:start]
+                        break
+                    if newest_jpeg is not None:
+                        self.frames_skipped += 1
+                    newest_jpeg = bytes(buffer[start:end + 2])
+                    del buffer[:end + 2]
+                
+                if newest_jpeg is not None:
+                    self._decode_frame(newest_jpeg)
+                    
+        except Exception as e:
+            if self.running:
+                logger.error(f"MJPEG reader error: {e}")
+        finally:
+            self.running = False
+    
+    def _decode_frame(self, jpeg_bytes: bytes):
+        """Decode one JPEG and push it into the ring buffer"""
+        frame = cv2.imdecode(np.frombuffer(jpeg_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            self.decode_errors += 1
+            return
+        
+        timestamp = time.time()
+        with self.frame_lock:
+            self.frames.append((timestamp, frame))
+        self.frames_decoded += 1
+        self.last_frame_time = timestamp
+        self.frame_event.set()
+
+
 class IMX500CameraHandler:
     """
     Sony IMX500 AI Camera Handler using libcamera system
     Works directly with libcamera commands for maximum compatibility
     """
     
-    def __init__(self, width: int = 1920, height: int = 1080, framerate: int = 30):
+    def __init__(self, width: int = 1920, height: int = 1080, framerate: int = 30,
+                 use_streaming: bool = True, max_frame_age: float = 1.0):
         """
         Initialize IMX500 Camera Handler
         
@@ -34,23 +184,30 @@ class IMX500CameraHandler:
             width: Frame width (default 1920)
             height: Frame height (default 1080) 
             framerate: Frames per second (default 30)
+            use_streaming: Serve read() from a persistent libcamera-vid MJPEG stream (default True)
+            max_frame_age: Oldest streamed frame (seconds) read() will return (default 1.0);
+                           a stream with no new frame for 5x this long is restarted
         """
         self.logger = logging.getLogger(__name__)
         self.width = width
         self.height = height
         self.framerate = framerate
+        self.use_streaming = use_streaming
+        self.max_frame_age = max_frame_age
+        self.stream_stall_timeout = max_frame_age * 5
         
         # Camera state
         self.is_opened = False
         self.is_streaming = False
         self.capture_process = None
+        self.stream_reader = None
+        self.streaming_failed = False
         
         # AI capabilities
         self.ai_enabled = False
         self.ai_model_loaded = False
         
         # Streaming setup
-        self.stream_file = None
         self.frame_buffer = None
         self.last_frame = None
         self.frame_lock = threading.Lock()
@@ -136,33 +293,27 @@ class IMX500CameraHandler:
             return False
     
     def _initialize_streaming(self):
-        """Initialize video streaming using libcamera-vid"""
-        try:
-            # Create temporary file for streaming
-            self.stream_file = tempfile.NamedTemporaryFile(suffix='.h264', delete=False)
-            self.stream_file.close()
-            
-            self.logger.info("🎥 Initializing IMX500 video streaming...")
-            
-        except Exception as e:
-            self.logger.error(f"Error initializing streaming: {e}")
+        """Initialize video streaming using libcamera-vid (started lazily on first read)"""
+        if self.use_streaming:
+            self.logger.info("🎥 IMX500 MJPEG streaming enabled - stream starts on first read")
     
     def start_streaming(self):
-        """Start continuous video streaming"""
+        """Start continuous MJPEG streaming to stdout with a background frame reader"""
         if self.is_streaming:
             return True
             
         try:
-            # Start libcamera-vid for continuous capture
+            # Start libcamera-vid for continuous capture, piping MJPEG frames to stdout
             cmd = [
                 'libcamera-vid',
                 '--width', str(self.width),
                 '--height', str(self.height),
                 '--framerate', str(self.framerate),
                 '--timeout', '0',  # Continuous
-                '--output', self.stream_file.name,
-                '--flush',
-                '--inline'
+                '--codec', 'mjpeg',
+                '--output', '-',
+                '--nopreview',
+                '--flush'
             ]
             
             # Add AI model if available
@@ -174,27 +325,31 @@ class IMX500CameraHandler:
             
             self.logger.info(f"🚀 Starting streaming: {' '.join(cmd)}")
             
+            # stderr is discarded so libcamera's per-frame logging can never fill the pipe and stall capture
             self.capture_process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 preexec_fn=os.setsid
             )
             
-            # Give it time to start
-            time.sleep(2)
+            self.stream_reader = MJPEGStreamReader(self.capture_process.stdout)
+            self.stream_reader.start()
             
-            if self.capture_process.poll() is None:
+            # Wait for the first frame instead of a fixed sleep
+            if self.stream_reader.wait_for_frame(timeout=5.0) and self.capture_process.poll() is None:
                 self.is_streaming = True
                 self.logger.info("✅ IMX500 streaming started")
                 return True
             else:
-                stderr = self.capture_process.stderr.read().decode()
-                self.logger.error(f"❌ Streaming failed: {stderr}")
+                self.logger.error(f"❌ Streaming failed (exit code: {self.capture_process.poll()})")
+                self._teardown_stream()
                 return False
                 
         except Exception as e:
             self.logger.error(f"Error starting streaming: {e}")
+            # The process may already be running (e.g. the reader failed to start)
+            self._teardown_stream()
             return False
     
     def stop_streaming(self):
@@ -202,10 +357,22 @@ class IMX500CameraHandler:
         if not self.is_streaming:
             return
             
+        try:
+            self._teardown_stream()
+            self.logger.info("🛑 IMX500 streaming stopped")
+            
+        except Exception as e:
+            self.logger.error(f"Error stopping streaming: {e}")
+    
+    def _teardown_stream(self):
+        """Stop the libcamera-vid process and the frame reader, however far streaming got"""
         try:
             if self.capture_process:
-                # Send SIGTERM to process group
-                os.killpg(os.getpgid(self.capture_process.pid), signal.SIGTERM)
+                try:
+                    # Send SIGTERM to process group
+                    os.killpg(os.getpgid(self.capture_process.pid), signal.SIGTERM)
+                except ProcessLookupError:
+                    pass  # Already exited
                 
                 # Wait for process to end
                 try:
@@ -217,11 +384,11 @@ class IMX500CameraHandler:
                 
                 self.capture_process = None
             
+            if self.stream_reader:
+                self.stream_reader.stop()
+                self.stream_reader = None
+        finally:
             self.is_streaming = False
-            self.logger.info("🛑 IMX500 streaming stopped")
-            
-        except Exception as e:
-            self.logger.error(f"Error stopping streaming: {e}")
     
     def read(self) -> Tuple[bool, Optional[np.ndarray]]:
         """
@@ -233,6 +400,13 @@ class IMX500CameraHandler:
         if not self.is_opened:
             self.logger.error("Camera not opened")
             return False, None
+        
+        # Fast path: latest frame from the persistent stream (stills only if streaming is unusable,
+        # since libcamera-still cannot open the sensor while libcamera-vid holds it)
+        if self.use_streaming and not self.streaming_failed:
+            success, frame = self._read_from_stream()
+            if success or not self.streaming_failed:
+                return success, frame
             
         # Try multiple capture methods in order of preference
         capture_methods = [
@@ -257,6 +431,36 @@ class IMX500CameraHandler:
         self.logger.error("All capture methods failed")
         return False, None
     
+    def _read_from_stream(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Return the newest streamed frame, starting the stream on first use"""
+        if not self.is_streaming:
+            if not self.start_streaming():
+                self.logger.warning("⚠️ Streaming unavailable - falling back to still capture")
+                self.streaming_failed = True
+                return False, None
+        
+        success, frame, timestamp = self.stream_reader.latest()
+        restart_reason = None
+        if not self.stream_reader.is_alive():
+            restart_reason = "Stream reader stopped"
+        elif success and time.time() - timestamp > self.stream_stall_timeout:
+            # libcamera-vid can hang with the pipe still open, so the reader never sees EOF
+            restart_reason = f"No new frame for {time.time() - timestamp:.1f}s"
+        
+        if restart_reason:
+            self.logger.warning(f"⚠️ {restart_reason} - restarting stream")
+            self.stop_streaming()
+            if not self.start_streaming():
+                self.streaming_failed = True
+                return False, None
+            success, frame, timestamp = self.stream_reader.latest()
+        
+        if success and time.time() - timestamp <= self.max_frame_age:
+            return True, frame
+        
+        self.logger.debug("Streamed frame missing or stale")
+        return False, None
+    
     def _capture_with_basic_still(self) -> Tuple[bool, Optional[np.ndarray]]:
         """Basic libcamera-still capture"""
         with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
@@ -365,6 +569,13 @@ class IMX500CameraHandler:
             
             filepath = os.path.join(self.capture_dir, filename)
             
+            # While streaming, libcamera-still cannot open the sensor - save the latest frame instead
+            if self.is_streaming:
+                success, frame = self._read_from_stream()
+                if success and cv2.imwrite(filepath, frame):
+                    self.logger.info(f"📸 IMX500 image captured from stream: {filepath}")
+                    return filepath
+            
             # Try multiple capture methods for image capture
             capture_methods = [
                 lambda: self._capture_image_with_ai(filepath),
@@ -513,6 +724,7 @@ class IMX500CameraHandler:
             'ai_model_loaded': self.ai_model_loaded,
             'camera_available': self.is_opened,
             'streaming': self.is_streaming,
+            'stream_stats': self.stream_reader.get_stats() if self.stream_reader else None,
             'resolution': f"{self.width}x{self.height}",
             'framerate': self.framerate
         }
@@ -526,10 +738,6 @@ class IMX500CameraHandler:
         try:
             self.stop_streaming()
             
-            # Clean up temp files
-            if self.stream_file and os.path.exists(self.stream_file.name):
-                os.unlink(self.stream_file.name)
-            
             self.is_opened = False
             self.logger.info("📷 IMX500 Camera released")
             
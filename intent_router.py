@@ -0,0 +1,289 @@
+"""
+Compiled Intent Router for AI Assistant
+Finds every command phrase in an utterance in one pass instead of hundreds of
+`phrase in text` scans whose outcome depends on the order of the checks
+
+All command phrases are compiled once into a token trie. Matching walks the
+utterance's words through the trie, so phrases only match whole words ("sing"
+no longer fires inside "using", "ready" inside "already"), and every match
+comes back with its word span.
+
+Priority rules (deterministic, independent of where a phrase is registered):
+1. Intents not available for the current user / game state are skipped
+2. Lower tier wins: active game commands, then device control, then
+   features, then starting a game, then general help
+3. Within a tier the longer phrase wins ("stop auto check" over "auto check",
+   "what is this dinosaur" over "what is this")
+4. Then the earlier match, then registration order
+
+Single everyday words used as commands ("left", "stop", "look", ...) are
+registered as exact phrases: they only match when the rest of the utterance
+is filler ("left", "hey robot left, please"), not inside "I left my book".
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from math_quiz_game import MATH_GAME_COMMANDS
+from filipino_translator import FILIPINO_GAME_COMMANDS, FILIPINO_END_COMMANDS
+
+logger = logging.getLogger(__name__)
+
+# Tiers, best first
+TIER_GAME = 0      # commands of a game in progress
+TIER_DEVICE = 1    # robot movement, face tracking, sounds, parent admin
+TIER_FEATURE = 2   # object identification, singing, images, ...
+TIER_START = 3     # starting a game
+TIER_GENERAL = 4   # help, gesture control
+
+# Words that may surround an exact phrase
+FILLER_WORDS = frozenset({'hey', 'ok', 'okay', 'please', 'now', 'just', 'um', 'uh', 'so',
+                          'robot', 'dino', 'miley', 'assistant'})
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+_END = '$'
+
+GAME_USERS = ('sophia', 'eladriel', 'parent')
+
+READY_PHRASES = [
+    'ready', "i'm ready", 'check my answer', 'done', 'finished',
+    'check it', 'look at this', 'see my answer', 'check this',
+    'here it is', 'all done', 'complete', 'i finished',
+    'can you check', 'please check', 'look', 'see this'
+]
+
+OBJECT_IDENTIFICATION_PHRASES = [
+    'identify this', 'what is this', 'tell me about this', 'what am i holding',
+    'look', 'look at this', 'look at the camera', 'can you see this',
+    "guess what this is", "guess what i'm holding", 'can you recognize',
+    'can you identify', 'what do you see', 'recognize this',
+    'see what i have', 'check this out', 'look what i found'
+]
+
+IMAGE_PHRASES = [
+    'show me', 'draw me', 'create a picture', 'make a picture',
+    'generate an image', 'can you draw', 'picture of', 'image of',
+    'show a picture', 'create an image', 'make an image',
+    'draw a picture', 'generate a picture'
+]
+
+BIRTHDAY_PHRASES = [
+    'sing happy birthday', 'happy birthday song', 'birthday song',
+    'sing birthday', 'happy birthday to', 'birthday for'
+]
+
+SINGING_PHRASES = [
+    'sing', 'sing a song', 'sing me', 'can you sing',
+    'song for', 'sing to', 'sing about'
+]
+
+# Handled by IntelligentFaceTracker.process_voice_command
+FACE_TRACKING_PHRASES = [
+    'look at me', 'track my face', 'track me', 'stop tracking', 'stop looking', 'stop watching',
+    'who are you looking at', 'who are you tracking', 'tracking status',
+    'search for faces', 'find faces', 'look around', 'look left', 'look right', 'look up', 'look down',
+    'center your eyes', 'look forward', 'center view'
+]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of an utterance (apostrophes kept: "i'm", "what's")"""
+    return _TOKEN.findall((text or '').lower().replace('’', "'"))
+
+
+@dataclass
+class IntentMatch:
+    """One intent found in an utterance"""
+    intent: str
+    phrase: str
+    start: int   # first word index
+    end: int     # one past the last word
+    tier: int
+    order: int   # registration order
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+    def sort_key(self) -> Tuple[int, int, int, int]:
+        return (self.tier, -self.length, self.start, self.order)
+
+
+@dataclass
+class _Intent:
+    name: str
+    tier: int
+    order: int
+    requires: Optional[str]
+    users: Optional[Tuple[str, ...]]
+
+
+class IntentRouter:
+    """Token trie of command phrases with deterministic priority"""
+
+    def __init__(self, fillers: Iterable[str] = FILLER_WORDS):
+        self.fillers = frozenset(fillers)
+        self._trie: Dict = {}
+        self._intents: Dict[str, _Intent] = {}
+        self.phrase_count = 0
+
+    def add(self, intent: str, phrases: Sequence[str], tier: int, requires: Optional[str] = None,
+            users: Optional[Sequence[str]] = None, exact: Sequence[str] = ()):
+        """
+        Register phrases for an intent (may be called again to add phrases)
+
+        Args:
+            intent: Intent name, e.g. 'move.left'
+            phrases: Phrases matched anywhere in the utterance (whole words)
+            tier: Priority tier (TIER_*)
+            requires: Context flag that must be active (e.g. 'math' while the math game runs)
+            users: Users the intent is available to (None = everyone)
+            exact: Phrases that must make up the whole utterance, apart from filler words
+        """
+        if intent not in self._intents:
+            self._intents[intent] = _Intent(intent, tier, len(self._intents), requires,
+                                            tuple(users) if users else None)
+        for phrase, is_exact in [(p, False) for p in phrases] + [(p, True) for p in exact]:
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(_END, []).append((intent, phrase.lower(), is_exact))
+            self.phrase_count += 1
+
+    def match(self, text: str) -> List[IntentMatch]:
+        """
+        Every intent whose phrases occur in the text, best first (one match per intent)
+        """
+        tokens = tokenize(text)
+        content = [i for i, token in enumerate(tokens) if token not in self.fillers]
+        best: Dict[str, IntentMatch] = {}
+        for start in range(len(tokens)):
+            node = self._trie
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                for intent, phrase, is_exact in node.get(_END, ()):
+                    # Exact phrases may only be surrounded by filler words
+                    if is_exact and any(i < start or i > end for i in content):
+                        continue
+                    spec = self._intents[intent]
+                    found = IntentMatch(intent, phrase, start, end + 1, spec.tier, spec.order)
+                    if intent not in best or found.sort_key() < best[intent].sort_key():
+                        best[intent] = found
+        return sorted(best.values(), key=IntentMatch.sort_key)
+
+    def route(self, text: str, user: Optional[str] = None, context: Iterable[str] = ()) -> List[IntentMatch]:
+        """
+        Matching intents available to this user in this context, best first
+
+        Args:
+            text: Utterance
+            user: Current user
+            context: Active context flags ('math', 'spelling', 'face_tracking', ...)
+        """
+        active = set(context)
+        routed = []
+        for found in self.match(text):
+            spec = self._intents[found.intent]
+            if spec.requires and spec.requires not in active:
+                continue
+            if spec.users and user not in spec.users:
+                continue
+            routed.append(found)
+        return routed
+
+    def best(self, text: str, user: Optional[str] = None, context: Iterable[str] = ()) -> Optional[IntentMatch]:
+        routed = self.route(text, user, context)
+        return routed[0] if routed else None
+
+    @property
+    def intents(self) -> List[str]:
+        return list(self._intents)
+
+
+def build_assistant_router() -> IntentRouter:
+    """Router with every command handled by AIAssistant.handle_special_commands"""
+    router = IntentRouter()
+
+    # Commands of a game in progress
+    router.add('math.ready', READY_PHRASES, TIER_GAME, requires='math', users=GAME_USERS)
+    router.add('math.end', ['end math', 'stop math', 'quit math', 'end game'], TIER_GAME, requires='math', users=GAME_USERS)
+    router.add('animal.guess', ['guess the animal', 'identify animal', 'what animal'], TIER_GAME,
+               requires='animal', users=GAME_USERS)
+    router.add('animal.stats', ['animal stats', 'my stats', 'game stats'], TIER_GAME, requires='animal', users=GAME_USERS)
+    router.add('animal.help', ['animal help', 'help me', 'how to play'], TIER_GAME, requires='animal', users=GAME_USERS)
+    router.add('animal.end', ['end animal game', 'stop animal', 'quit animal'], TIER_GAME, requires='animal', users=GAME_USERS)
+    router.add('letter.hint', ['hint please', 'give me a hint', 'need a hint', 'extra hint'], TIER_GAME,
+               requires='letter', users=GAME_USERS)
+    router.add('letter.skip', ['skip', 'skip word', 'next word', 'skip this one'], TIER_GAME, requires='letter', users=GAME_USERS)
+    router.add('letter.stats', ['stats', 'my stats', 'game stats', 'score'], TIER_GAME, requires='letter', users=GAME_USERS)
+    router.add('letter.help', ['help', 'how to play', 'game help'], TIER_GAME, requires='letter', users=GAME_USERS)
+    router.add('letter.end', ['end letter game', 'stop letter', 'quit letter', 'end game'], TIER_GAME,
+               requires='letter', users=GAME_USERS)
+    router.add('spelling.ready', READY_PHRASES, TIER_GAME, requires='spelling', users=GAME_USERS)
+    router.add('spelling.auto_check', ['auto check', 'smart check', 'visual check', 'camera check'], TIER_GAME,
+               requires='spelling', users=GAME_USERS)
+    router.add('spelling.stop_auto_check', ['stop auto check', 'stop monitoring', 'manual mode', 'stop watching'],
+               TIER_GAME, requires='spelling', users=GAME_USERS)
+    router.add('spelling.end', ['end game', 'stop game', 'quit game'], TIER_GAME, requires='spelling', users=GAME_USERS)
+    router.add('filipino.end', FILIPINO_END_COMMANDS, TIER_GAME)
+
+    # Robot, camera head, sounds and parent admin
+    router.add('gesture.call', [
+        'hey dino come', 'hey miley come', 'dino come', 'miley come',
+        'come here dino', 'come here miley', 'come to me dino', 'come to me miley',
+        'dino come here', 'miley come here',
+        'hey robot come', 'robot come', 'come here robot', 'robot come here',
+        'activate robot', 'start robot', 'robot control', 'gesture robot'
+    ], TIER_DEVICE)
+    router.add('move.forward', ['go forward', 'move forward'], TIER_DEVICE, exact=['forward'])
+    router.add('move.backward', ['go backward', 'go backwards', 'move backward'], TIER_DEVICE,
+               exact=['backward', 'backwards'])
+    router.add('move.left', ['go left', 'turn left'], TIER_DEVICE, exact=['left'])
+    router.add('move.right', ['go right', 'turn right'], TIER_DEVICE, exact=['right'])
+    router.add('move.stop', ['robot stop', 'stop moving', 'halt', 'dino stop', 'miley stop'], TIER_DEVICE, exact=['stop'])
+    router.add('face_tracking', FACE_TRACKING_PHRASES, TIER_DEVICE, requires='face_tracking')
+    router.add('sounds.off', ['turn off sounds', 'disable sounds', 'no sounds', 'mute sounds'], TIER_DEVICE)
+    router.add('sounds.on', ['turn on sounds', 'enable sounds', 'sounds on', 'unmute sounds'], TIER_DEVICE)
+    router.add('parent.status', ['status report', 'system status'], TIER_DEVICE, users=('parent',), exact=['report'])
+    router.add('parent.diagnostic', ['system check', 'health check', 'diagnostic'], TIER_DEVICE, users=('parent',))
+    router.add('parent.quiet_on', ['quiet mode on', 'enable quiet mode', 'whisper mode'], TIER_DEVICE, users=('parent',))
+    router.add('parent.quiet_off', ['quiet mode off', 'disable quiet mode', 'normal volume'], TIER_DEVICE,
+               users=('parent',))
+    router.add('parent.kids', ['check on kids', 'kids status'], TIER_DEVICE, users=('parent',), exact=['children'])
+
+    # Features
+    router.add('object.identify', [p for p in OBJECT_IDENTIFICATION_PHRASES if p != 'look'], TIER_FEATURE, exact=['look'])
+    router.add('repeat', [
+        'repeat', 'say that again', 'what did you say', 'can you repeat that',
+        'repeat that', 'say it again', 'what was that', "i didn't hear you",
+        'could you repeat', 'please repeat', 'one more time'
+    ], TIER_FEATURE, exact=['again'])
+    router.add('sing', BIRTHDAY_PHRASES + SINGING_PHRASES, TIER_FEATURE)
+    router.add('image', IMAGE_PHRASES, TIER_FEATURE)
+    router.add('dinosaur.identify', ['identify dinosaur', 'what is this dinosaur', 'look at this dinosaur'], TIER_FEATURE,
+               users=('eladriel',))
+    router.add('camera.preview', ['show camera', 'camera preview', 'can you see'], TIER_FEATURE, users=('eladriel',))
+    router.add('dinosaur.tips', ['dinosaur tips', 'how to show'], TIER_FEATURE, users=('eladriel',), exact=['tips'])
+
+    # Starting games
+    router.add('math.start', MATH_GAME_COMMANDS, TIER_START, users=GAME_USERS)
+    router.add('animal.start', ['animal game', 'guess the animal', 'animal guessing', 'identify animal'], TIER_START,
+               users=GAME_USERS)
+    router.add('letter.start', ['letter game', 'letter word game', 'word guessing', 'guess the word', 'play letter game'],
+               TIER_START, users=GAME_USERS)
+    router.add('spelling.start', ['spelling game', 'play spelling', 'start spelling'], TIER_START, users=GAME_USERS)
+    router.add('filipino.start', FILIPINO_GAME_COMMANDS, TIER_START)
+
+    # General
+    router.add('help', ['help', 'what can you do', 'commands'], TIER_GENERAL)
+    router.add('gesture.control', ['gesture control', 'hand control', 'hand gesture'], TIER_GENERAL)
+
+    logger.info(f"🧭 Intent router compiled: {len(router.intents)} intents, {router.phrase_count} phrases")
+    return router
@@ -0,0 +1,446 @@
+"""
+Offline Keyword Spotter for AI Assistant
+On-device wake word detection ("Miley" for Sophia, "Dino" for Eladriel,
+"Assistant" for parents) with no cloud speech recognition in the idle loop
+
+Each family member records a few samples of their wake word; the samples are
+turned into MFCC templates and the live microphone stream is scored against
+them frame by frame (10 ms hop) with subsequence dynamic time warping, so a
+wake word is reported as soon as its last frame has been heard.
+
+Enroll samples with:
+    python keyword_spotter.py enroll sophia --samples 5
+    python keyword_spotter.py check
+"""
+
+import os
+import sys
+import glob
+import wave
+import logging
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Try to import pyaudio (only needed for enrollment from the microphone)
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FEATURE_RATE = 16000
+FRAME_LENGTH = 400  # 25 ms
+FRAME_HOP = 160     # 10 ms
+N_FFT = 512
+N_MELS = 26
+N_CEPS = 12         # c1..c12 (c0 / loudness is left out)
+# A match may take between half and twice the template's duration
+MAX_STRETCH = 1.5
+# Frames to ignore after a detection so one utterance fires once
+REFRACTORY_FRAMES = 100
+# Frames quieter than the noise floor plus this margin count as silence
+SPEECH_MARGIN_DB = 9.0
+# Used when a user only has a single template to calibrate against
+DEFAULT_THRESHOLD = 30.0
+
+
+def _hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+class MFCCExtractor:
+    """Vectorized MFCC features for 16 kHz audio (25 ms frames, 10 ms hop)"""
+
+    def __init__(self, sample_rate: int = FEATURE_RATE):
+        self.sample_rate = sample_rate
+        self.window = np.hamming(FRAME_LENGTH).astype(np.float32)
+
+        # Triangular mel filterbank from 60 Hz to Nyquist
+        mel_points = np.linspace(_hz_to_mel(60), _hz_to_mel(sample_rate / 2), N_MELS + 2)
+        bins = np.floor((N_FFT + 1) * _mel_to_hz(mel_points) / sample_rate).astype(int)
+        filterbank = np.zeros((N_MELS, N_FFT // 2 + 1), dtype=np.float32)
+        for m in range(1, N_MELS + 1):
+            left, center, right = bins[m - 1], bins[m], bins[m + 1]
+            if center > left:
+                filterbank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+            if right > center:
+                filterbank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+        self.filterbank = filterbank.T
+
+        # DCT-II rows for c1..c12 with sinusoidal liftering
+        n = np.arange(N_MELS)
+        k = np.arange(1, N_CEPS + 1)[:, None]
+        dct = np.cos(np.pi * k * (2 * n + 1) / (2 * N_MELS)) * np.sqrt(2.0 / N_MELS)
+        lifter = 1 + (22 / 2) * np.sin(np.pi * np.arange(1, N_CEPS + 1) / 22)
+        self.dct = (dct * lifter[:, None]).T.astype(np.float32)
+
+    def frames(self, samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        MFCCs and log energies for every complete frame in samples
+
+        Args:
+            samples: Float audio at 16 kHz, roughly in -1..1
+
+        Returns:
+            (features, energies_db): arrays of shape (n_frames, N_CEPS) and (n_frames,)
+        """
+        if len(samples) < FRAME_LENGTH:
+            return np.zeros((0, N_CEPS), dtype=np.float32), np.zeros(0, dtype=np.float32)
+        count = 1 + (len(samples) - FRAME_LENGTH) // FRAME_HOP
+        framed = np.lib.stride_tricks.as_strided(
+            samples, shape=(count, FRAME_LENGTH),
+            strides=(samples.strides[0] * FRAME_HOP, samples.strides[0]))
+        framed = framed - framed.mean(axis=1, keepdims=True)
+        energies = 10 * np.log10(np.mean(framed ** 2, axis=1) + 1e-10)
+
+        emphasized = np.empty_like(framed)
+        emphasized[:, 0] = framed[:, 0]
+        emphasized[:, 1:] = framed[:, 1:] - 0.97 * framed[:, :-1]
+        power = np.abs(np.fft.rfft(emphasized * self.window, N_FFT)) ** 2
+        log_mel = np.log(power @ self.filterbank + 1e-6)
+        return (log_mel @ self.dct).astype(np.float32), energies.astype(np.float32)
+
+    def compute(self, samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Features for a whole clip"""
+        return self.frames(np.ascontiguousarray(samples, dtype=np.float32))
+
+
+def to_float(samples: np.ndarray) -> np.ndarray:
+    """int16 PCM (or float) to float32 in -1..1"""
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    return samples.astype(np.float32)
+
+
+def resample(samples: np.ndarray, sample_rate: int, target_rate: int = FEATURE_RATE) -> np.ndarray:
+    """Linear-interpolation resample of a whole clip"""
+    if sample_rate == target_rate or len(samples) < 2:
+        return samples
+    target_length = int(round(len(samples) * target_rate / sample_rate))
+    positions = np.arange(target_length) * (sample_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Load a 16-bit PCM WAV as mono float samples"""
+    with wave.open(path, 'rb') as wav:
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return to_float(samples), sample_rate
+
+
+def write_wav(path: str, samples: np.ndarray, sample_rate: int):
+    """Save mono float or int16 samples as a 16-bit PCM WAV"""
+    if samples.dtype != np.int16:
+        samples = (np.clip(samples, -1, 1) * 32767).astype(np.int16)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+
+
+def trim_silence(features: np.ndarray, energies: np.ndarray, floor_db: float = 30.0) -> np.ndarray:
+    """Cut leading/trailing frames that are background noise or far below the loudest frame"""
+    if len(energies) == 0:
+        return features
+    noise = np.percentile(energies, 10)
+    voiced = np.nonzero(energies > max(energies.max() - floor_db, noise + SPEECH_MARGIN_DB))[0]
+    return features[voiced[0]:voiced[-1] + 1]
+
+
+class KeywordSpotter:
+    """Streaming template-matching wake word spotter for several users"""
+
+    def __init__(self, sample_rate: int = FEATURE_RATE, sensitivity: float = 0.5):
+        """
+        Initialize an empty spotter
+
+        Args:
+            sample_rate: Sample rate of the audio passed to process()
+            sensitivity: 0.0 (strict, fewer false wakes) to 1.0 (lenient, fewer misses)
+        """
+        self.sample_rate = sample_rate
+        self.sensitivity = max(0.0, min(1.0, sensitivity))
+        self.extractor = MFCCExtractor()
+        self.templates: List[Tuple[str, np.ndarray]] = []
+        self.thresholds: Dict[str, float] = {}
+        self._build()
+
+    @property
+    def users(self) -> List[str]:
+        return sorted({user for user, _ in self.templates})
+
+    def add_template(self, user: str, samples: np.ndarray, sample_rate: int):
+        """Add one recorded wake word sample for user (call calibrate() afterwards)"""
+        features, energies = self.extractor.compute(resample(to_float(samples), sample_rate))
+        features = trim_silence(features, energies)
+        if len(features) < 10:
+            raise ValueError(f"Wake word sample for {user} is too short ({len(features) * 10} ms of speech)")
+        self.templates.append((user, features))
+
+    @classmethod
+    def from_directory(cls, samples_dir: str, sample_rate: int = FEATURE_RATE,
+                       sensitivity: float = 0.5) -> 'KeywordSpotter':
+        """
+        Build a calibrated spotter from recorded samples laid out as <samples_dir>/<user>/*.wav
+        """
+        spotter = cls(sample_rate, sensitivity)
+        for path in sorted(glob.glob(os.path.join(samples_dir, '*', '*.wav'))):
+            user = os.path.basename(os.path.dirname(path))
+            try:
+                samples, rate = read_wav(path)
+                spotter.add_template(user, samples, rate)
+            except (OSError, ValueError, EOFError, wave.Error) as e:
+                logger.warning(f"Skipping wake word sample {path}: {e}")
+        spotter.calibrate()
+        return spotter
+
+    def calibrate(self):
+        """
+        Set per-user detection thresholds from how well each user's samples
+        match each other, then reset the streaming state
+        """
+        self.thresholds = {}
+        for user in self.users:
+            indices = [i for i, (owner, _) in enumerate(self.templates) if owner == user]
+            scores = []
+            for i in indices:
+                for j in indices:
+                    if i != j:
+                        scores.append(self._match_cost(self.templates[j][1], self.templates[i][1]))
+            if scores:
+                self.thresholds[user] = float(np.median(scores)) * (1.3 + 0.4 * self.sensitivity)
+            else:
+                self.thresholds[user] = DEFAULT_THRESHOLD
+        self._build()
+        if self.templates:
+            summary = ", ".join(f"{user} ({self.thresholds[user]:.1f})" for user in self.users)
+            logger.info(f"🎯 Keyword spotter: {len(self.templates)} templates for {summary}")
+
+    def _match_cost(self, template: np.ndarray, utterance: np.ndarray) -> float:
+        """Best normalized DTW cost of template anywhere inside utterance"""
+        best = np.inf
+        cost = np.full(len(template), np.inf)
+        length = np.zeros(len(template))
+        for frame in utterance:
+            local = np.linalg.norm(template - frame, axis=1)
+            cost, length = self._step(cost[None, :], length[None, :], local[None, :])
+            cost, length = cost[0], length[0]
+            if length[-1] >= len(template) / MAX_STRETCH:
+                best = min(best, cost[-1] / length[-1])
+        return float(best)
+
+    @staticmethod
+    def _step(cost: np.ndarray, length: np.ndarray, local: np.ndarray):
+        """
+        One stream frame of subsequence DTW for a batch of templates
+
+        Each stream frame may advance a template by 0, 1 or 2 frames; a path
+        may start at any stream frame (template index 0 is always free)
+        """
+        stay = cost
+        advance = np.full_like(cost, np.inf)
+        advance[:, 1:] = cost[:, :-1]
+        skip = np.full_like(cost, np.inf)
+        skip[:, 2:] = cost[:, :-2]
+
+        stay_length = length
+        advance_length = np.zeros_like(length)
+        advance_length[:, 1:] = length[:, :-1]
+        skip_length = np.zeros_like(length)
+        skip_length[:, 2:] = length[:, :-2]
+
+        # Compare average cost so long, cheap paths don't win by length alone
+        candidates = np.stack([stay, advance, skip])
+        lengths = np.stack([stay_length, advance_length, skip_length])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            choice = np.argmin(np.where(np.isfinite(candidates), candidates / np.maximum(lengths, 1), np.inf), axis=0)
+        best = np.take_along_axis(candidates, choice[None], axis=0)[0]
+        best_length = np.take_along_axis(lengths, choice[None], axis=0)[0]
+
+        best[:, 0] = 0.0
+        best_length[:, 0] = 0
+        return best + local, best_length + 1
+
+    def _build(self):
+        """Stack templates into padded arrays for batched per-frame scoring"""
+        count = len(self.templates)
+        longest = max((len(features) for _, features in self.templates), default=1)
+        self._template_stack = np.zeros((count, longest, N_CEPS), dtype=np.float32)
+        self._template_lengths = np.array([len(features) for _, features in self.templates], dtype=int)
+        self._template_users = [user for user, _ in self.templates]
+        self._template_thresholds = np.array(
+            [self.thresholds.get(user, DEFAULT_THRESHOLD) for user in self._template_users])
+        for index, (_, features) in enumerate(self.templates):
+            self._template_stack[index, :len(features)] = features
+        self.reset()
+
+    def reset(self):
+        """Forget buffered audio and partial matches"""
+        count, longest = self._template_stack.shape[:2]
+        self._cost = np.full((count, longest), np.inf)
+        self._length = np.zeros((count, longest))
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._resample_position = 0.0
+        self._refractory = 0
+        self._noise_floor = None
+        self._recent_speech = np.zeros(int(self._template_lengths.max(initial=1) * MAX_STRETCH), dtype=bool)
+        self._frames_seen = 0
+        self.last_scores: Dict[str, float] = {}
+
+    def _resample_stream(self, samples: np.ndarray) -> np.ndarray:
+        """Resample a stream chunk to 16 kHz, carrying the fractional position across chunks"""
+        if self.sample_rate == FEATURE_RATE:
+            return samples
+        step = self.sample_rate / FEATURE_RATE
+        buffered = np.concatenate([self._carry, samples])
+        positions = np.arange(self._resample_position, len(buffered) - 1, step)
+        output = np.interp(positions, np.arange(len(buffered)), buffered).astype(np.float32)
+        next_position = (positions[-1] + step) if len(positions) else self._resample_position
+        consumed = int(next_position)
+        self._carry = buffered[consumed:]
+        self._resample_position = next_position - consumed
+        return output
+
+    def process(self, chunk) -> Optional[Tuple[str, float]]:
+        """
+        Score a chunk of live audio
+
+        Args:
+            chunk: int16 PCM bytes or numpy samples at self.sample_rate
+
+        Returns:
+            (user, score) when a wake word ends inside this chunk, else None
+        """
+        if not self.templates:
+            return None
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = np.frombuffer(chunk, dtype=np.int16)
+        samples = np.concatenate([self._pending, self._resample_stream(to_float(chunk))])
+
+        features, energies = self.extractor.frames(samples)
+        self._pending = samples[len(features) * FRAME_HOP:]
+
+        detection = None
+        for frame, energy in zip(features, energies):
+            result = self._score_frame(frame, energy)
+            if result and detection is None:
+                detection = result
+        return detection
+
+    def _score_frame(self, frame: np.ndarray, energy: float) -> Optional[Tuple[str, float]]:
+        """Advance every template by one 10 ms frame"""
+        self._frames_seen += 1
+
+        # Slowly rising, quickly falling noise floor estimate
+        if self._noise_floor is None or energy < self._noise_floor:
+            self._noise_floor = energy
+        else:
+            self._noise_floor += 0.002 * (energy - self._noise_floor)
+        self._recent_speech = np.roll(self._recent_speech, 1)
+        self._recent_speech[0] = energy > self._noise_floor + SPEECH_MARGIN_DB
+
+        local = np.linalg.norm(self._template_stack - frame, axis=2)
+        self._cost, self._length = self._step(self._cost, self._length, local)
+
+        if self._refractory > 0:
+            self._refractory -= 1
+            return None
+
+        ends = self._template_lengths - 1
+        rows = np.arange(len(ends))
+        end_cost = self._cost[rows, ends]
+        end_length = self._length[rows, ends]
+        valid = ((end_length >= self._template_lengths / MAX_STRETCH) &
+                 (end_length <= self._template_lengths * MAX_STRETCH))
+        scores = np.where(valid, end_cost / np.maximum(end_length, 1), np.inf)
+        self.last_scores = {}
+        for user, score in zip(self._template_users, scores):
+            self.last_scores[user] = min(score, self.last_scores.get(user, np.inf))
+
+        margins = scores / self._template_thresholds
+        best = int(np.argmin(margins))
+        if margins[best] >= 1.0:
+            return None
+        # The matched span must actually contain speech
+        span = int(min(end_length[best], len(self._recent_speech)))
+        if self._recent_speech[:span].mean() < 0.5:
+            return None
+
+        user = self._template_users[best]
+        self._refractory = REFRACTORY_FRAMES
+        self._cost.fill(np.inf)
+        return user, float(scores[best])
+
+
+def record_samples(user: str, samples_dir: str, count: int, seconds: float = 1.5,
+                   sample_rate: int = FEATURE_RATE) -> List[str]:
+    """Record wake word samples from the default microphone"""
+    if not PYAUDIO_AVAILABLE:
+        raise RuntimeError("pyaudio is required to record wake word samples")
+    user_dir = os.path.join(samples_dir, user)
+    os.makedirs(user_dir, exist_ok=True)
+    existing = len(glob.glob(os.path.join(user_dir, '*.wav')))
+
+    audio = pyaudio.PyAudio()
+    paths = []
+    try:
+        for index in range(count):
+            input(f"🎤 Sample {index + 1}/{count}: press Enter, then say the wake word for {user}...")
+            stream = audio.open(format=pyaudio.paInt16, channels=1, rate=sample_rate,
+                                input=True, frames_per_buffer=1024)
+            frames = [stream.read(1024, exception_on_overflow=False)
+                      for _ in range(int(seconds * sample_rate / 1024))]
+            stream.stop_stream()
+            stream.close()
+            path = os.path.join(user_dir, f"{existing + index + 1:02d}.wav")
+            write_wav(path, np.frombuffer(b''.join(frames), dtype=np.int16), sample_rate)
+            paths.append(path)
+            print(f"   ✅ Saved {path}")
+    finally:
+        audio.terminate()
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enroll and check offline wake word samples")
+    parser.add_argument('--dir', default='wake_words', help="Samples directory (<dir>/<user>/*.wav)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    enroll = subparsers.add_parser('enroll', help="Record wake word samples for a user")
+    enroll.add_argument('user', help="sophia, eladriel or parent")
+    enroll.add_argument('--samples', type=int, default=5, help="Number of samples to record")
+    subparsers.add_parser('check', help="Show enrolled users and calibrated thresholds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if args.command == 'enroll':
+        record_samples(args.user, args.dir, args.samples)
+
+    spotter = KeywordSpotter.from_directory(args.dir)
+    if not spotter.templates:
+        print(f"❌ No wake word samples found in {args.dir}/<user>/*.wav")
+        return 1
+    print("\n🎯 Enrolled wake words:")
+    for user in spotter.users:
+        count = sum(1 for owner, _ in spotter.templates if owner == user)
+        print(f"   • {user}: {count} samples, threshold {spotter.thresholds[user]:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
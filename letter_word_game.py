@@ -9,6 +9,8 @@ import logging
 from typing import Dict, Any, List, Optional
 import time
 
+from answer_recognizer import candidates_from
+
 logger = logging.getLogger(__name__)
 
 class LetterWordGame:
@@ -301,6 +303,18 @@ You have {remaining_attempts} more attempt{'s' if remaining_attempts > 1 else ''
 
                 return hint_response
     
+    def get_answer_candidates(self) -> Dict[str, str]:
+        """Spoken answers expected while a word is being guessed ({phrase: text passed to check_answer})"""
+        if not self.game_active or not self.current_word:
+            return {}
+        
+        # Any word in the game (children don't always stick to the letter) plus the game commands
+        words = [entry['word'].lower() for entries in self.word_database.values() for entry in entries]
+        return candidates_from(words + [
+            'hint please', 'give me a hint', 'skip', 'next word', 'my stats', 'help',
+            'how to play', 'end letter game', 'end game'
+        ])
+    
     def _extract_word_from_answer(self, user_answer: str) -> str:
         """Extract the actual word from phrases like 'the answer is fan' or 'it's a fan'."""
         clean_answer = user_answer.strip().upper()
@@ -0,0 +1,243 @@
+"""
+Local Handwriting OCR for AI Assistant
+On-device check of a written answer the game already knows (a spelling word
+or an equation), so most checks don't wait seconds for a vision API call
+
+- Preprocessing tuned for marker on paper: crop to the largest text region,
+  deskew, adaptive threshold, scale to a fixed text height
+- Tesseract reads the crop as a single line, limited to letters for spelling
+  words or digits and operators for equations
+- Only confident readings decide: "match" confirms the expected answer,
+  "mismatch" rejects it, anything else is "unsure" and goes to the cloud model
+"""
+
+import re
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+WORD_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+MATH_CHARS = "0123456789+-=x/"
+CONFIRM_CONFIDENCE = 60.0   # mean Tesseract word confidence (0-100) to confirm the expected answer
+REJECT_CONFIDENCE = 85.0    # higher bar to tell a child their answer is wrong without the cloud check
+TARGET_TEXT_HEIGHT = 64     # pixels; Tesseract reads best at roughly 30-80 px letters
+MAX_DESKEW_DEGREES = 20.0  # larger angles are left to the vision model
+
+# Letters handwriting OCR mixes up with digits
+OCR_CONFUSIONS = str.maketrans({'0': 'o', '1': 'l', '5': 's', '8': 'b', '6': 'g', '|': 'l'})
+
+
+def is_math_answer(expected: str) -> bool:
+    """Equations like "3 + 2 = 5" are read with the digit/operator alphabet"""
+    return bool(re.search(r'\d', expected)) and '=' in expected
+
+
+def normalize_answer(text: str, math: bool) -> str:
+    """Comparable form: spelling words as lowercase letters, equations without spaces and with one operator set"""
+    text = (text or '').strip().lower()
+    if math:
+        text = text.replace('×', 'x').replace('*', 'x').replace('÷', '/').replace('—', '-').replace('–', '-')
+        return re.sub(r'\s+', '', text)
+    return re.sub(r'[^a-z]', '', text.translate(OCR_CONFUSIONS))
+
+
+class OCRResult:
+    """Outcome of one local check"""
+
+    __slots__ = ('text', 'confidence', 'verdict', 'seconds')
+
+    def __init__(self, text: str, confidence: float, verdict: str, seconds: float):
+        self.text = text
+        self.confidence = confidence
+        self.verdict = verdict  # 'match', 'mismatch' or 'unsure'
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f"OCRResult({self.text!r}, {self.confidence:.0f}%, {self.verdict}, {self.seconds * 1000:.0f} ms)"
+
+
+def _odd(value: int) -> int:
+    return max(3, value | 1)
+
+
+def paper_mask(gray: np.ndarray) -> np.ndarray:
+    """Mask of the sheet of paper (largest bright region), shrunk so its edges don't look like ink"""
+    height, width = gray.shape
+    _, bright = cv2.threshold(cv2.GaussianBlur(gray, (5, 5), 0), 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Close over the writing so the sheet is one region
+    bright = cv2.morphologyEx(bright, cv2.MORPH_CLOSE, np.ones((15, 15), np.uint8))
+    contours, _ = cv2.findContours(bright, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    mask = np.full_like(gray, 255)
+    if contours:
+        sheet = max(contours, key=cv2.contourArea)
+        if cv2.contourArea(sheet) > 0.05 * height * width:
+            mask[:] = 0
+            cv2.drawContours(mask, [cv2.convexHull(sheet)], -1, 255, -1)
+    margin = max(3, min(height, width) // 40)
+    return cv2.erode(mask, np.ones((margin, margin), np.uint8))
+
+
+def find_text_region(gray: np.ndarray) -> Tuple[int, int, int, int]:
+    """Bounding box (x, y, w, h) of the largest block of writing on the paper"""
+    height, width = gray.shape
+    ink = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV,
+                                _odd(min(height, width) // 15), 15)
+    ink = cv2.bitwise_and(ink, paper_mask(gray))
+    ink = cv2.morphologyEx(ink, cv2.MORPH_OPEN, np.ones((2, 2), np.uint8))
+    # Smear letters together into word blobs
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, width // 25), max(3, height // 40)))
+    blobs = cv2.dilate(ink, kernel)
+    contours, _ = cv2.findContours(blobs, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    best = None
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w > 0.95 * width or h > 0.9 * height or w * h < 0.001 * width * height:
+            continue
+        if best is None or w * h > best[2] * best[3]:
+            best = (x, y, w, h)
+    if best is None:
+        return 0, 0, width, height
+    x, y, w, h = best
+    pad_x, pad_y = int(0.08 * w) + 4, int(0.2 * h) + 4
+    x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+    return x0, y0, min(width, x + w + pad_x) - x0, min(height, y + h + pad_y) - y0
+
+
+def skew_angle(binary: np.ndarray) -> float:
+    """
+    Rotation (degrees, counter-clockwise) of the text line in a white-on-black ink image
+
+    Projection profile search: the level text line gives the sharpest row profile.
+    Unlike a rectangle fit, this isn't thrown off by ascenders and descenders in short words.
+    """
+    if cv2.countNonZero(binary) < 20:
+        return 0.0
+    scale = min(1.0, 120.0 / max(binary.shape))
+    small = cv2.resize(binary, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    size = int(np.hypot(*small.shape)) + 2
+    canvas = np.zeros((size, size), np.uint8)
+    y0, x0 = (size - small.shape[0]) // 2, (size - small.shape[1]) // 2
+    canvas[y0:y0 + small.shape[0], x0:x0 + small.shape[1]] = small
+    center = (size / 2, size / 2)
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-MAX_DESKEW_DEGREES, MAX_DESKEW_DEGREES + 0.5, 1.0):
+        rotated = cv2.warpAffine(canvas, cv2.getRotationMatrix2D(center, float(angle), 1.0), (size, size))
+        score = float(np.var(rotated.sum(axis=1, dtype=np.float32)))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return -best_angle
+
+
+def preprocess(image: np.ndarray) -> np.ndarray:
+    """Camera frame -> black text on white, cropped, level and scaled for Tesseract"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    x, y, w, h = find_text_region(gray)
+    crop = gray[y:y + h, x:x + w]
+
+    ink = cv2.adaptiveThreshold(crop, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV,
+                                _odd(min(crop.shape) // 4), 15)
+    angle = skew_angle(ink)
+    if 0.5 < abs(angle) <= MAX_DESKEW_DEGREES:
+        center = (crop.shape[1] / 2, crop.shape[0] / 2)
+        rotation = cv2.getRotationMatrix2D(center, -angle, 1.0)
+        crop = cv2.warpAffine(crop, rotation, (crop.shape[1], crop.shape[0]),
+                              flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+    scale = TARGET_TEXT_HEIGHT / max(1, crop.shape[0] * 0.7)
+    crop = cv2.resize(crop, (0, 0), fx=scale, fy=scale,
+                      interpolation=cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA)
+    binary = cv2.adaptiveThreshold(cv2.GaussianBlur(crop, (3, 3), 0), 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                   cv2.THRESH_BINARY, _odd(TARGET_TEXT_HEIGHT // 2), 15)
+    return cv2.copyMakeBorder(binary, 16, 16, 16, 16, cv2.BORDER_CONSTANT, value=255)
+
+
+class HandwritingOCR:
+    """Confirms or rejects a known written answer on the device"""
+
+    def __init__(self, confirm_confidence: float = CONFIRM_CONFIDENCE,
+                 reject_confidence: float = REJECT_CONFIDENCE, tesseract_cmd: Optional[str] = None):
+        """
+        Args:
+            confirm_confidence: Confidence needed to accept the expected answer locally
+            reject_confidence: Confidence needed to call the answer wrong locally
+            tesseract_cmd: Path to the tesseract binary (None = on PATH)
+        """
+        self.confirm_confidence = confirm_confidence
+        self.reject_confidence = reject_confidence
+        if PYTESSERACT_AVAILABLE and tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        self.version = None
+        if PYTESSERACT_AVAILABLE:
+            try:
+                self.version = str(pytesseract.get_tesseract_version())
+            except Exception as e:
+                logger.warning(f"⚠️ Tesseract not usable ({e}); handwriting checks go to the vision API")
+
+        self.checks = 0
+        self.confirmed = 0
+        self.rejected = 0
+        self.escalated = 0
+        self.total_time = 0.0
+
+    def available(self) -> bool:
+        return self.version is not None
+
+    def read(self, image: np.ndarray, math: bool = False) -> Tuple[str, float]:
+        """Text on the largest written line and its mean confidence (0-100)"""
+        binary = preprocess(image)
+        config = f"--psm 7 -c tessedit_char_whitelist={MATH_CHARS if math else WORD_CHARS}"
+        data = pytesseract.image_to_data(binary, config=config, output_type=pytesseract.Output.DICT)
+        words, confidences = [], []
+        for text, confidence in zip(data['text'], data['conf']):
+            confidence = float(confidence)
+            if text.strip() and confidence >= 0:
+                words.append(text.strip())
+                confidences.append(confidence)
+        if not words:
+            return "", 0.0
+        return " ".join(words), sum(confidences) / len(confidences)
+
+    def verify(self, image: np.ndarray, expected: str) -> OCRResult:
+        """Check the writing in image against the expected answer"""
+        start = time.perf_counter()
+        math = is_math_answer(expected)
+        text, confidence = self.read(image, math)
+        seen, wanted = normalize_answer(text, math), normalize_answer(expected, math)
+
+        if seen and seen == wanted and confidence >= self.confirm_confidence:
+            verdict = 'match'
+            self.confirmed += 1
+        elif seen and seen != wanted and len(seen) >= min(2, len(wanted)) and confidence >= self.reject_confidence:
+            verdict = 'mismatch'
+            self.rejected += 1
+        else:
+            verdict = 'unsure'
+            self.escalated += 1
+
+        result = OCRResult(text, confidence, verdict, time.perf_counter() - start)
+        self.checks += 1
+        self.total_time += result.seconds
+        logger.info(f"🔤 Local OCR: expected '{expected}', read '{text}' ({confidence:.0f}%) -> {verdict} "
+                    f"in {result.seconds * 1000:.0f} ms")
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'checks': self.checks,
+            'confirmed': self.confirmed,
+            'rejected': self.rejected,
+            'escalated': self.escalated,
+            'mean_ms': self.total_time / self.checks * 1000 if self.checks else 0.0,
+        }
@@ -14,12 +14,11 @@ import threading
 import queue
 import json
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable
 import re
 import base64
 import tkinter as tk
 from PIL import Image, ImageTk
-import requests
 from io import BytesIO
 import platform
 
@@ -29,19 +28,32 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from config import Config
     from audio_utils import AudioManager, setup_premium_tts_engines
+    from stt_backends import SpeechToText
+    from answer_recognizer import AnswerRecognizer, candidates_from
+    from turn_pipeline import TurnPipeline, Turn, SpeculativeReply
+    from conversation_memory import ConversationMemory
+    from intent_router import (build_assistant_router, GAME_USERS, IMAGE_PHRASES, BIRTHDAY_PHRASES,
+                               SINGING_PHRASES)
+    from speech_pipeline import StreamingSpeechPipeline
+    from openai_loop import get_openai_loop
+    from cloud_transport import get_transport
+    from tts_cache import TTSCache
+    from sound_bank import get_sound_bank
     from wake_word_detector import WakeWordDetector
     from dinosaur_identifier import DinosaurIdentifier
     from object_identifier import ObjectIdentifier
     from smart_camera_detector import SmartCameraDetector
     from filipino_translator import FilipinoTranslator  # NEW: Filipino translation game
     from letter_word_game import LetterWordGame  # NEW: Letter word guessing game
-    import openai
     import pyttsx3
     import speech_recognition as sr
     from voice_activity_detector import VoiceActivityDetector
     from math_quiz_game import MathQuizGame
     from animal_guess_game import AnimalGuessGame
     from camera_handler import CameraHandler
+    from frame_bus import get_frame_bus
+    from scene_gate import SceneChangeGate
+    from model_registry import get_registry_stats
     # Visual feedback system imports
     from visual_feedback import create_visual_feedback
     from visual_config import get_config_for_environment
@@ -80,7 +92,8 @@ class ImageGenerator:
     """Handles AI image generation using DALL-E and displays images on screen."""
     
     def __init__(self, visual_feedback=None):
-        self.client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        # Shared blocking client (one connection pool for the whole assistant)
+        self.client = get_openai_loop(os.getenv('OPENAI_API_KEY')).client
         self.visual_feedback = visual_feedback
         self.current_image_path = None
         
@@ -91,16 +104,8 @@ class ImageGenerator:
         """Detect if the user is requesting image generation."""
         text_lower = text.lower()
         
-        # Image generation phrases
-        image_phrases = [
-            'show me', 'draw me', 'create a picture', 'make a picture',
-            'generate an image', 'can you draw', 'picture of', 'image of',
-            'show a picture', 'create an image', 'make an image',
-            'draw a picture', 'generate a picture'
-        ]
-        
         # Check for image generation requests
-        for phrase in image_phrases:
+        for phrase in IMAGE_PHRASES:
             if phrase in text_lower:
                 # Extract what to generate
                 prompt = self._extract_image_prompt(text, phrase)
@@ -146,7 +151,8 @@ class ImageGenerator:
             enhanced_prompt = self._enhance_prompt_for_kids(prompt, user)
             
             # Generate image with DALL-E 2 (cheapest option)
-            response = self.client.images.generate(
+            response = get_transport().call(
+                'image', self.client.images.generate,
                 model="dall-e-2",  # Changed from dall-e-3 to dall-e-2 (much cheaper!)
                 prompt=enhanced_prompt,
                 size="256x256",    # Changed from 1024x1024 to 256x256 (cheapest size, perfect for 5" screen)
@@ -213,8 +219,7 @@ class ImageGenerator:
         """Download the image from URL and save it locally."""
         try:
             # Download the image
-            response = requests.get(image_url)
-            response.raise_for_status()
+            response = get_transport().get(image_url)
             
             # Create filename
             timestamp = int(time.time())
@@ -277,6 +282,15 @@ class ImageGenerator:
             return result['message']
 
 class AIAssistant:
+    # Spelling auto-check gate: frame size and rate it looks at locally
+    SPELLING_GATE_SCALE = 0.25
+    SPELLING_GATE_FPS = 5.0
+    # Unambiguous object identification requests, worth capturing and identifying the frame before the turn is routed
+    OBJECT_PREFETCH_PHRASES = [
+        'identify this', 'what is this', 'what am i holding', 'look at this', 'can you see this',
+        'guess what this is', 'guess what i\'m holding', 'what do you see', 'recognize this'
+    ]
+    
     def __init__(self):
         """Initialize the AI Assistant with Face Recognition and Universal Object Identification"""
         # Initialize logger first
@@ -287,15 +301,39 @@ class AIAssistant:
         self.running = False
         self.current_user = None
         
-        # Setup OpenAI client
-        self.client = openai.OpenAI(api_key=self.config.openai_api_key)
+        # Cloud calls share one retry/backoff layer with per-endpoint limits and circuit breakers
+        self.transport = get_transport(max_retries=self.config.cloud_max_retries,
+                                       circuit_failures=self.config.cloud_circuit_failures,
+                                       circuit_reset=self.config.cloud_circuit_reset)
+        # Setup OpenAI: one event loop thread and one connection pool shared by every module
+        self.openai = get_openai_loop(self.config.openai_api_key, timeout=self.config.openai_request_timeout)
+        self.client = self.openai.client
         
         # Setup premium OpenAI TTS engines with natural human voices
         logger.info("🎙️ Setting up premium OpenAI text-to-speech voices...")
-        self.sophia_tts, self.eladriel_tts = setup_premium_tts_engines(self.client)
+        self.tts_cache = TTSCache(self.config.tts_cache_dir, max_disk_mb=self.config.tts_cache_max_mb) \
+            if self.config.tts_cache_enabled else None
+        self.sophia_tts, self.eladriel_tts = setup_premium_tts_engines(self.client, cache=self.tts_cache)
         
         # Initialize audio manager with platform-optimized settings
         self.audio_manager = AudioManager()
+        self.audio_manager.preroll_seconds = self.config.speech_preroll
+        self.audio_manager.stt = SpeechToText(
+            self.audio_manager.recognizer,
+            backends=self.config.stt_backends,
+            vosk_model_path=self.config.vosk_model_path,
+            min_confidence=self.config.stt_min_confidence
+        )
+        # Load the local speech model now so the first answer doesn't pay for it
+        self.audio_manager.stt.warm_up()
+        # Game answers are matched against what the active game expects
+        self.answer_recognizer = AnswerRecognizer(self.audio_manager.stt)
+        # Conversation turns: speculative OpenAI replies, prefetch and per-stage timing
+        self.turn_pipeline = TurnPipeline(self.stream_openai_response, self._should_speculate,
+                                          enabled=self.config.speculative_replies)
+        self.turn_pipeline.add_prefetch(self.OBJECT_PREFETCH_PHRASES, self._prefetch_object_identification)
+        # Open the microphone once; every listen reads from its ring buffer
+        self.audio_manager.mic_stream.start()
         
         # Initialize wake word detector with shared AudioManager to prevent resource conflicts
         self.wake_word_detector = WakeWordDetector(self.config, audio_manager=self.audio_manager)
@@ -307,6 +345,8 @@ class AIAssistant:
         logger.info("Setting up camera for visual identification...")
         # Initialize shared camera handler - this will be the ONLY camera instance
         self.camera_handler = CameraHandler()
+        # Process-wide frame bus: one capture thread, every module subscribes instead of calling read()
+        self.frame_bus = get_frame_bus(self.camera_handler)
         
         # Initialize Math Quiz Game (after camera setup)
         logger.info("🧮 Setting up Math Quiz Game...")
@@ -317,7 +357,7 @@ class AIAssistant:
         
         # Initialize Animal Guessing Game (after camera setup)
         logger.info("🦕 Setting up Animal Guessing Game...")
-        self.animal_game = AnimalGuessGame(self, shared_camera=self.camera_handler)
+        self.animal_game = AnimalGuessGame(self, shared_camera=self.frame_bus.subscribe('animal_game'))
         
         # Initialize Letter Word Game
         logger.info("🔤 Setting up Letter Word Game...")
@@ -325,17 +365,26 @@ class AIAssistant:
         
         # Setup dinosaur identifier for Eladriel (specialized for dinosaurs)
         logger.info("Setting up dinosaur identification for Eladriel...")
-        self.dinosaur_identifier = DinosaurIdentifier(self.client, self.config, shared_camera=self.camera_handler)
+        self.dinosaur_identifier = DinosaurIdentifier(self.client, self.config,
+                                                      shared_camera=self.frame_bus.subscribe('dinosaur_identifier'))
         
         # Setup universal object identifier for both users - SHARE camera instead of creating new one
         logger.info("🔍 Setting up universal object identification system...")
-        self.object_identifier = ObjectIdentifier(shared_camera=self.camera_handler)
+        self.object_identifier = ObjectIdentifier(shared_camera=self.frame_bus.subscribe('object_identifier'))
         
         # Setup face recognition system - SHARE camera instead of creating new one
         logger.info("🎭 Setting up face recognition system...")
         self.face_detector = SmartCameraDetector(model_size='n', confidence_threshold=0.4, headless=True)
         # IMPORTANT: Pass the shared camera handler to prevent conflicts
-        self.face_detector.shared_camera = self.camera_handler
+        self.face_detector.shared_camera = self.frame_bus.subscribe('face_detector')
+        # "What is this?" runs the same detector before asking the vision API; its box
+        # around the held-up toy also keys the recognition cache for every identifier
+        self.object_identifier.use_detector(self.face_detector)
+        self.animal_game.object_identifier.use_detector(self.face_detector)
+        self.dinosaur_identifier.use_detector(self.face_detector)
+        self.face_loop_camera = self.frame_bus.subscribe('face_loop')
+        # Spelling auto-check looks at small greyscale frames locally before any vision call
+        self.spelling_camera = self.frame_bus.subscribe('spelling_auto_check')
         self.face_recognition_thread = None
         self.face_recognition_active = False
         self.last_face_greeting = {}  # Track when we last greeted each person
@@ -368,20 +417,18 @@ class AIAssistant:
         self.interrupt_listener_active = False
         self.interrupt_thread = None
         
-        # Conversation memory and context tracking
-        self.conversation_history = {}  # Store conversation history per user
+        # Conversation memory: recent turns plus a rolling summary, within a prompt token budget
+        self.conversation_memory = ConversationMemory(self._summarize_conversation,
+                                                      budget_tokens=self.config.conversation_token_budget,
+                                                      summary_tokens=self.config.conversation_summary_tokens,
+                                                      max_turns=self.config.conversation_max_turns)
         self.last_ai_response = {}  # Store last response per user for repeat functionality
         self.conversation_context = {}  # Store ongoing context per user
-        self.max_history_length = 10  # Keep last 10 exchanges per user
         
         # Audio feedback system
         self.audio_feedback_enabled = True
         self.setup_audio_feedback()
         
-        # Spelling game sound effects (same as Filipino game)
-        self.spelling_correct_sound = self._generate_spelling_celebration_sound()
-        self.spelling_wrong_sound = self._generate_spelling_buzzer_sound()
-        
         # Spelling game settings
         self.spelling_game_active = False
         self.current_spelling_word = None
@@ -496,12 +543,26 @@ class AIAssistant:
         except Exception as face_tracking_error:
             self.logger.error(f"❌ Enhanced Face Tracking setup failed: {face_tracking_error}")
             self.enhanced_face_tracking = None
+        
+        # Voice commands: every command phrase compiled once, matched in one pass
+        self.intent_router = build_assistant_router()
+        self.intent_handlers = self._build_intent_handlers()
+        
+        # Report shared model loading cost (each model/gallery is loaded once per process)
+        registry_stats = get_registry_stats()
+        logger.info(f"📦 Model registry: {len(registry_stats['models'])} models loaded in "
+                    f"{registry_stats['total_load_time']:.1f}s, {registry_stats['saved_loads']} duplicate loads avoided, "
+                    f"RSS {registry_stats['rss_mb']:.0f} MB")
 
     def setup_audio_feedback(self):
         """Setup audio feedback system for interaction cues."""
         try:
             import pygame
             pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            # Cue sounds are rendered once and shared with the game modules
+            self.sound_bank = get_sound_bank()
+            # The microphone pre-roll must not hear our own cues as the start of speech
+            self.sound_bank.add_play_listener(self._suppress_cue_on_microphone)
             self.pygame_available = True
             logger.info("🔊 Audio feedback system initialized")
         except ImportError:
@@ -511,6 +572,12 @@ class AIAssistant:
             logger.error(f"Error initializing audio feedback: {e}")
             self.pygame_available = False
 
+    def _suppress_cue_on_microphone(self, name: str, seconds: float):
+        """Read the microphone as silence while a cue sound plays."""
+        if hasattr(self, 'audio_manager'):
+            now = time.time()
+            self.audio_manager.mic_stream.suppress(now, now + seconds + 0.05)
+
     def play_listening_sound(self):
         """Play a sound to indicate AI is listening."""
         if not self.audio_feedback_enabled:
@@ -518,8 +585,8 @@ class AIAssistant:
             
         try:
             if self.pygame_available:
-                # Create a pleasant "listening" tone - rising notes
-                self._generate_listening_tone()
+                # Pleasant "listening" tone - rising notes
+                self.sound_bank.play('listening')
             else:
                 # Fallback to system beep
                 import os
@@ -534,8 +601,8 @@ class AIAssistant:
             
         try:
             if self.pygame_available:
-                # Create a gentle "completion" tone - descending notes
-                self._generate_completion_tone()
+                # Gentle "completion" tone - descending notes
+                self.sound_bank.play('completion')
             else:
                 # Fallback to system beep
                 import os
@@ -550,8 +617,8 @@ class AIAssistant:
             
         try:
             if self.pygame_available:
-                # Create an acknowledgment tone
-                self._generate_wake_word_tone()
+                # Acknowledgment tone
+                self.sound_bank.play('wake_word')
             else:
                 # Fallback to system beep
                 import os
@@ -559,145 +626,6 @@ class AIAssistant:
         except Exception as e:
             logger.error(f"Error playing wake word sound: {e}")
 
-    def _generate_listening_tone(self):
-        """Generate a pleasant listening tone using pygame."""
-        try:
-            import pygame
-            import numpy as np
-            
-            # Create a rising two-note tone (C to E)
-            sample_rate = 22050
-            duration = 0.3
-            
-            # Generate frequencies (C4 to E4)
-            freq1 = 261.63  # C4
-            freq2 = 329.63  # E4
-            
-            # Create time array
-            t = np.linspace(0, duration, int(sample_rate * duration), False)
-            
-            # Generate first note (rising)
-            note1 = np.sin(freq1 * 2 * np.pi * t) * 0.3
-            # Generate second note
-            note2 = np.sin(freq2 * 2 * np.pi * t) * 0.3
-            
-            # Fade in/out for smoothness
-            fade_samples = int(sample_rate * 0.05)  # 50ms fade
-            note1[:fade_samples] *= np.linspace(0, 1, fade_samples)
-            note1[-fade_samples:] *= np.linspace(1, 0, fade_samples)
-            note2[:fade_samples] *= np.linspace(0, 1, fade_samples)
-            note2[-fade_samples:] *= np.linspace(1, 0, fade_samples)
-            
-            # Combine notes with slight delay
-            combined = np.concatenate([note1, note2])
-            
-            # Convert to 16-bit integers
-            audio_data = (combined * 32767).astype(np.int16)
-            
-            # Ensure array is C-contiguous for pygame
-            audio_data = np.ascontiguousarray(audio_data)
-            
-            # Convert to stereo
-            stereo_data = np.column_stack((audio_data, audio_data))
-            stereo_data = np.ascontiguousarray(stereo_data)
-            
-            # Play the sound
-            sound = pygame.sndarray.make_sound(stereo_data)
-            sound.play()
-            
-        except Exception as e:
-            logger.error(f"Error generating listening tone: {e}")
-
-    def _generate_completion_tone(self):
-        """Generate a gentle completion tone using pygame."""
-        try:
-            import pygame
-            import numpy as np
-            
-            # Create a descending gentle tone (G to C)
-            sample_rate = 22050
-            duration = 0.4
-            
-            # Generate frequencies (G4 to C4)
-            freq1 = 392.00  # G4
-            freq2 = 261.63  # C4
-            
-            # Create time array
-            t = np.linspace(0, duration, int(sample_rate * duration), False)
-            
-            # Generate descending tone with frequency sweep
-            freq_sweep = np.linspace(freq1, freq2, len(t))
-            tone = np.sin(2 * np.pi * freq_sweep * t) * 0.25
-            
-            # Apply gentle envelope
-            envelope = np.exp(-t * 3)  # Gentle decay
-            tone *= envelope
-            
-            # Fade in for smoothness
-            fade_samples = int(sample_rate * 0.05)  # 50ms fade
-            tone[:fade_samples] *= np.linspace(0, 1, fade_samples)
-            
-            # Convert to 16-bit integers
-            audio_data = (tone * 32767).astype(np.int16)
-            
-            # Ensure array is C-contiguous for pygame
-            audio_data = np.ascontiguousarray(audio_data)
-            
-            # Convert to stereo
-            stereo_data = np.column_stack((audio_data, audio_data))
-            stereo_data = np.ascontiguousarray(stereo_data)
-            
-            # Play the sound
-            sound = pygame.sndarray.make_sound(stereo_data)
-            sound.play()
-            
-        except Exception as e:
-            logger.error(f"Error generating completion tone: {e}")
-
-    def _generate_wake_word_tone(self):
-        """Generate a confirmation tone for wake word detection."""
-        try:
-            import pygame
-            import numpy as np
-            
-            # Create a cheerful acknowledgment tone (C-E-G chord)
-            sample_rate = 22050
-            duration = 0.2
-            
-            # Generate frequencies (C-E-G major chord)
-            freq1 = 261.63  # C4
-            freq2 = 329.63  # E4
-            freq3 = 392.00  # G4
-            
-            # Create time array
-            t = np.linspace(0, duration, int(sample_rate * duration), False)
-            
-            # Generate chord
-            chord = (np.sin(freq1 * 2 * np.pi * t) + 
-                    np.sin(freq2 * 2 * np.pi * t) + 
-                    np.sin(freq3 * 2 * np.pi * t)) * 0.15
-            
-            # Apply envelope
-            envelope = np.exp(-t * 5)  # Quick decay
-            chord *= envelope
-            
-            # Convert to 16-bit integers
-            audio_data = (chord * 32767).astype(np.int16)
-            
-            # Ensure array is C-contiguous for pygame
-            audio_data = np.ascontiguousarray(audio_data)
-            
-            # Convert to stereo
-            stereo_data = np.column_stack((audio_data, audio_data))
-            stereo_data = np.ascontiguousarray(stereo_data)
-            
-            # Play the sound
-            sound = pygame.sndarray.make_sound(stereo_data)
-            sound.play()
-            
-        except Exception as e:
-            logger.error(f"Error generating wake word tone: {e}")
-
     def toggle_audio_feedback(self, enabled: bool):
         """Toggle audio feedback on/off."""
         self.audio_feedback_enabled = enabled
@@ -711,8 +639,9 @@ class AIAssistant:
             
         try:
             if self.pygame_available:
-                # Create a clear "you can speak now" tone
-                self._generate_ready_to_speak_tone()
+                # Clear "you can speak now" chime
+                self.sound_bank.play('ready_to_speak')
+                logger.info("🎵 Exciting ready-to-speak cue played")
             else:
                 # Fallback to system beep - use a different sound than completion
                 import os
@@ -720,253 +649,6 @@ class AIAssistant:
         except Exception as e:
             logger.error(f"Error playing ready-to-speak sound: {e}")
 
-    def _generate_ready_to_speak_tone(self):
-        """Generate an exciting, kid-friendly 'your turn to talk!' audio cue."""
-        try:
-            import pygame
-            import numpy as np
-            
-            # Create an exciting, magical "your turn!" sound that kids will love
-            sample_rate = 22050
-            duration = 0.6  # Quick and snappy
-            
-            # Create a playful ascending magical chime sequence
-            # Like a friendly doorbell or game notification that says "your turn!"
-            
-            # Three ascending notes with sparkle - C5, E5, G5 (major triad going up)
-            freq1 = 523  # C5 - bright start
-            freq2 = 659  # E5 - building excitement  
-            freq3 = 784  # G5 - "go ahead!" peak
-            
-            # Each note duration
-            note_duration = duration / 4
-            sparkle_duration = duration / 4
-            
-            # Time arrays for each part
-            t1 = np.linspace(0, note_duration, int(sample_rate * note_duration), False)
-            t2 = np.linspace(0, note_duration, int(sample_rate * note_duration), False)
-            t3 = np.linspace(0, note_duration, int(sample_rate * note_duration), False)
-            t_sparkle = np.linspace(0, sparkle_duration, int(sample_rate * sparkle_duration), False)
-            
-            # Create bell-like tones with harmonics for magical sound
-            def create_bell_note(t, freq, volume=0.4):
-                # Fundamental frequency
-                fundamental = np.sin(2 * np.pi * freq * t)
-                # Add harmonics for bell-like quality
-                harmonic2 = 0.3 * np.sin(2 * np.pi * freq * 2 * t)
-                harmonic3 = 0.1 * np.sin(2 * np.pi * freq * 3 * t)
-                
-                # Bell envelope - quick attack, gentle decay
-                envelope = np.exp(-t * 8) * (1 - np.exp(-t * 30))
-                
-                return (fundamental + harmonic2 + harmonic3) * envelope * volume
-            
-            # Create the three ascending notes
-            note1 = create_bell_note(t1, freq1, 0.35)
-            note2 = create_bell_note(t2, freq2, 0.4) 
-            note3 = create_bell_note(t3, freq3, 0.45)
-            
-            # Create magical sparkle effect for the end
-            sparkle = np.zeros_like(t_sparkle)
-            sparkle_freqs = [1047, 1319, 1568, 2093]  # High magical frequencies
-            
-            for i, freq in enumerate(sparkle_freqs):
-                delay = i * 0.02  # Quick succession
-                if len(t_sparkle) > int(delay * sample_rate):
-                    delayed_t = t_sparkle[int(delay * sample_rate):]
-                    if len(delayed_t) > 0:
-                        # Create twinkling effect
-                        twinkle = np.sin(2 * np.pi * freq * delayed_t)
-                        twinkle *= np.exp(-delayed_t * 12)  # Quick decay
-                        twinkle *= (1 + 0.3 * np.sin(15 * delayed_t))  # Shimmer
-                        
-                        # Add to sparkle
-                        start_idx = int(delay * sample_rate)
-                        end_idx = start_idx + len(twinkle)
-                        if end_idx <= len(sparkle):
-                            sparkle[start_idx:end_idx] += twinkle * 0.2
-            
-            # Combine all parts with tiny gaps for clarity
-            gap_samples = int(sample_rate * 0.02)  # 20ms gaps
-            gap = np.zeros(gap_samples)
-            
-            # Assemble the complete sound: note1 -> gap -> note2 -> gap -> note3 -> sparkle
-            combined = np.concatenate([note1, gap, note2, gap, note3, sparkle])
-            
-            # Add a subtle reverb for magical quality
-            reverb_delay = int(0.03 * sample_rate)  # 30ms delay
-            if len(combined) > reverb_delay:
-                reverb = np.zeros_like(combined)
-                reverb[reverb_delay:] = combined[:-reverb_delay] * 0.15
-                combined += reverb
-            
-            # Convert to 16-bit integers
-            audio_data = np.clip(combined, -1, 1)
-            audio_data = (audio_data * 32767 * 0.8).astype(np.int16)  # Good volume
-            
-            # Ensure array is C-contiguous for pygame
-            audio_data = np.ascontiguousarray(audio_data)
-            
-            # Convert to stereo
-            stereo_data = np.column_stack((audio_data, audio_data))
-            stereo_data = np.ascontiguousarray(stereo_data)
-            
-            # Play the sound
-            sound = pygame.sndarray.make_sound(stereo_data)
-            sound.play()
-            
-            logger.info("🎵 Exciting ready-to-speak cue played")
-            
-        except Exception as e:
-            logger.error(f"Error generating ready-to-speak tone: {e}")
-
-    def _generate_spelling_celebration_sound(self):
-        """Generate a celebratory victory sound for correct spelling answers."""
-        try:
-            import numpy as np
-            import pygame
-            sample_rate = 22050
-            duration = 1.8  # 1.8 seconds
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            
-            # Create a "Ta-Da!" victory sound with ascending musical notes
-            celebration = np.zeros_like(t)
-            
-            # First part: Rising musical phrase (Ta!)
-            first_part_end = 0.6
-            first_mask = t <= first_part_end
-            
-            # Rising chord progression for excitement
-            frequencies_rising = [
-                (220, 0.0, 0.2),   # A3 
-                (277, 0.1, 0.3),   # C#4
-                (330, 0.2, 0.4),   # E4
-                (440, 0.3, 0.6),   # A4 (climax)
-            ]
-            
-            for freq, start_time, end_time in frequencies_rising:
-                note_mask = (t >= start_time) & (t <= end_time)
-                if np.any(note_mask):
-                    note_t = t[note_mask] - start_time
-                    # Create a bell-like tone with harmonics
-                    fundamental = np.sin(2 * np.pi * freq * note_t)
-                    harmonic2 = 0.3 * np.sin(2 * np.pi * freq * 2 * note_t)
-                    harmonic3 = 0.1 * np.sin(2 * np.pi * freq * 3 * note_t)
-                    
-                    # Bell envelope - quick attack, gradual decay
-                    envelope = np.exp(-note_t * 4) * (1 - np.exp(-note_t * 50))
-                    
-                    note = (fundamental + harmonic2 + harmonic3) * envelope
-                    celebration[note_mask] += note * 0.4
-            
-            # Second part: Sparkle effect (Da!)
-            sparkle_start = 0.5
-            sparkle_end = 1.8
-            sparkle_mask = (t >= sparkle_start) & (t <= sparkle_end)
-            
-            if np.any(sparkle_mask):
-                sparkle_t = t[sparkle_mask] - sparkle_start
-                
-                # Add magical sparkle with high frequency components
-                sparkle_freqs = [880, 1108, 1397, 1760, 2217]  # High harmonious frequencies
-                
-                for i, freq in enumerate(sparkle_freqs):
-                    delay = i * 0.08  # Staggered sparkles
-                    if len(sparkle_t) > int(delay * sample_rate):
-                        delayed_t = sparkle_t[int(delay * sample_rate):]
-                        if len(delayed_t) > 0:
-                            # Create shimmering effect
-                            shimmer = np.sin(2 * np.pi * freq * delayed_t)
-                            shimmer *= np.exp(-delayed_t * 2)  # Decay
-                            shimmer *= (1 + 0.5 * np.sin(10 * delayed_t))  # Tremolo effect
-                            
-                            # Add to the celebration sound
-                            start_idx = int((sparkle_start + delay) * sample_rate)
-                            end_idx = start_idx + len(shimmer)
-                            if end_idx <= len(celebration):
-                                celebration[start_idx:end_idx] += shimmer * 0.15
-            
-            # Third part: Final triumphant chord
-            final_start = 1.2
-            final_mask = t >= final_start
-            
-            if np.any(final_mask):
-                final_t = t[final_mask] - final_start
-                
-                # Major chord for triumphant ending
-                chord_freqs = [440, 554, 659]  # A major chord
-                for freq in chord_freqs:
-                    chord_note = np.sin(2 * np.pi * freq * final_t)
-                    chord_envelope = np.exp(-final_t * 1.5) * 0.6
-                    celebration[final_mask] += chord_note * chord_envelope * 0.3
-            
-            # Add some gentle reverb effect
-            reverb_delay = int(0.05 * sample_rate)  # 50ms delay
-            if len(celebration) > reverb_delay:
-                reverb = np.zeros_like(celebration)
-                reverb[reverb_delay:] = celebration[:-reverb_delay] * 0.2
-                celebration += reverb
-            
-            # Apply overall envelope for natural sound
-            overall_envelope = np.ones_like(t)
-            # Gentle fade out at the end
-            fade_start = 1.5
-            fade_mask = t >= fade_start
-            if np.any(fade_mask):
-                fade_t = (t[fade_mask] - fade_start) / (duration - fade_start)
-                overall_envelope[fade_mask] = 1 - fade_t
-            
-            celebration *= overall_envelope
-            
-            # Normalize and convert to pygame sound format
-            celebration = np.clip(celebration, -1, 1)
-            celebration = (celebration * 32767 * 0.7).astype(np.int16)  # Good volume level
-            
-            # Create stereo sound
-            stereo_sound = np.zeros((len(celebration), 2), dtype=np.int16)
-            stereo_sound[:, 0] = celebration  # Left channel
-            stereo_sound[:, 1] = celebration  # Right channel
-            
-            return pygame.sndarray.make_sound(stereo_sound)
-        except Exception as e:
-            logger.error(f"Error generating spelling celebration sound: {e}")
-            return None
-
-    def _generate_spelling_buzzer_sound(self):
-        """Generate a buzzer sound for wrong spelling answers."""
-        try:
-            import numpy as np
-            import pygame
-            sample_rate = 22050
-            duration = 0.8  # 0.8 seconds
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            
-            # Create buzzer sound with low frequency
-            frequency = 150  # Low buzzer frequency
-            wave = np.sin(2 * np.pi * frequency * t)
-            
-            # Add some harmonics to make it sound more like a buzzer
-            wave += 0.5 * np.sin(2 * np.pi * frequency * 2 * t)  # Octave
-            wave += 0.3 * np.sin(2 * np.pi * frequency * 3 * t)  # Fifth
-            
-            # Apply envelope for natural sound decay
-            envelope = np.exp(-t * 1.5)
-            buzzer = wave * envelope
-            
-            # Normalize and convert to pygame sound format
-            buzzer = np.clip(buzzer, -1, 1)
-            buzzer = (buzzer * 32767).astype(np.int16)
-            
-            # Create stereo sound
-            stereo_sound = np.zeros((len(buzzer), 2), dtype=np.int16)
-            stereo_sound[:, 0] = buzzer  # Left channel
-            stereo_sound[:, 1] = buzzer  # Right channel
-            
-            return pygame.sndarray.make_sound(stereo_sound)
-        except Exception as e:
-            logger.error(f"Error generating spelling buzzer sound: {e}")
-            return None
-
     def play_spelling_correct_sound(self):
         """Play celebration sound for correct spelling."""
         if not self.audio_feedback_enabled:
@@ -977,9 +659,8 @@ class AIAssistant:
             self.visual.show_happy("Correct! 🎉")
             
         try:
-            if self.pygame_available and self.spelling_correct_sound:
-                sound_array, sample_rate = self.spelling_correct_sound
-                self._play_sound_array(sound_array, sample_rate)
+            if self.pygame_available and self.sound_bank.has('celebration'):
+                self.sound_bank.play('celebration')
             else:
                 # Fallback celebration
                 import os
@@ -997,9 +678,8 @@ class AIAssistant:
             self.visual.show_thinking("Try again! 🤔")
             
         try:
-            if self.pygame_available and self.spelling_wrong_sound:
-                sound_array, sample_rate = self.spelling_wrong_sound
-                self._play_sound_array(sound_array, sample_rate)
+            if self.pygame_available and self.sound_bank.has('buzzer'):
+                self.sound_bank.play('buzzer')
             else:
                 # Fallback buzzer
                 import os
@@ -1007,24 +687,6 @@ class AIAssistant:
         except Exception as e:
             logger.error(f"Error playing spelling wrong sound: {e}")
 
-    def _play_sound_array(self, sound_array, sample_rate):
-        """Helper method to play sound arrays using pygame."""
-        try:
-            if self.pygame_available:
-                import pygame
-                import numpy as np
-                
-                # Convert numpy array to pygame sound
-                # Ensure the array is in the right format for pygame
-                if sound_array.dtype != np.int16:
-                    sound_array = (sound_array * 32767).astype(np.int16)
-                
-                # Create and play the sound
-                sound = pygame.sndarray.make_sound(sound_array)
-                sound.play()
-        except Exception as e:
-            logger.error(f"Error playing sound array: {e}")
-
     def play_math_correct_sound(self):
         """Play celebration sound for correct math answers (uses same sound as spelling)."""
         self.play_spelling_correct_sound()
@@ -1073,7 +735,7 @@ class AIAssistant:
 
     def handle_face_detection(self):
         """Handle face detection and greetings with personalized visual feedback."""
-        if not self.camera_handler or not self.face_detector:
+        if not self.face_loop_camera or not self.face_detector:
             print("⚠️ Face detection: Camera or detector not available")
             return
         
@@ -1083,8 +745,8 @@ class AIAssistant:
         
         while self.face_recognition_active:
             try:
-                # Capture frame from camera handler
-                ret, frame = self.camera_handler.read()
+                # Capture frame from the shared frame bus
+                ret, frame = self.face_loop_camera.read()
                 if not ret or frame is None:
                     time.sleep(1)
                     continue
@@ -1186,13 +848,14 @@ class AIAssistant:
         max_timeouts = 6 if self.spelling_game_active else 2  # Allow 6 timeouts for spelling game, 2 for normal conversation
         
         while conversation_active and self.running and self.current_user == user:
+            turn = self.turn_pipeline.start_turn(user)
             try:
                 # Set conversation stage to LISTENING
                 if self.enhanced_face_tracking:
                     self.enhanced_face_tracking.set_conversation_stage('listening')
                 
                 # Listen for their request with a 15-second timeout (longer for children)
-                user_input = self.listen_for_speech(timeout=15)
+                user_input = self.listen_for_speech(timeout=15, turn=turn)
 
                 if user_input:
                     conversation_timeout_count = 0  # Reset timeout counter
@@ -1225,10 +888,12 @@ class AIAssistant:
                         conversation_active = False
                         break
                     
-                    # Check for special commands first
-                    special_response = self.handle_special_commands(user_input, user)
+                    # Check for special commands first (the speculative reply keeps streaming meanwhile)
+                    with turn.timer.stage('route'):
+                        special_response = self.handle_special_commands(user_input, user)
                     
                     if special_response:
+                        turn.cancel("handled as a local command")
                         # Add special command to conversation history too
                         self.add_to_conversation_history(user, user_input, special_response)
                         
@@ -1237,25 +902,27 @@ class AIAssistant:
                             self.enhanced_face_tracking.set_conversation_stage('responding')
                         
                         # Use no-interrupt speak for Filipino game responses to prevent recording during explanations
-                        if self.filipino_translator.is_filipino_game_command(user_input) or self.filipino_translator.game_active:
-                            self.speak_no_interrupt(special_response, user)
-                        else:
-                            self.speak(special_response, user)
+                        with turn.timer.stage('speak'):
+                            if self.filipino_translator.is_filipino_game_command(user_input) or self.filipino_translator.game_active:
+                                self.speak_no_interrupt(special_response, user)
+                            else:
+                                self.speak(special_response, user)
                     else:
                         # Process with OpenAI for regular conversation
-                        import asyncio
                         try:
-                            response = asyncio.run(self.process_with_openai(user_input, user))
+                            with turn.timer.stage('reply'):
+                                response = self.ask_openai(user_input, user, turn.take_reply(user_input))
                             
                             # Set conversation stage to RESPONDING
                             if self.enhanced_face_tracking:
                                 self.enhanced_face_tracking.set_conversation_stage('responding')
                             
                             # Use no-interrupt speak if Filipino game is active to prevent recording during explanations
-                            if self.filipino_translator.game_active:
-                                self.speak_no_interrupt(response, user)
-                            else:
-                                self.speak(response, user)
+                            with turn.timer.stage('speak'):
+                                if self.filipino_translator.game_active:
+                                    self.speak_no_interrupt(response, user)
+                                else:
+                                    self.speak(response, user)
                         except Exception as e:
                             logger.error(f"Error processing request: {e}")
                             
@@ -1342,6 +1009,8 @@ class AIAssistant:
                 # End conversation to prevent infinite error loop
                 conversation_active = False
                 break
+            finally:
+                turn.finish()
         
         # Show goodbye state in visual feedback
         if self.visual:
@@ -1537,11 +1206,20 @@ class AIAssistant:
         """DEPRECATED: Interrupt functionality removed. Always returns False."""
         return False
 
-    def listen_for_speech(self, timeout: int = 15) -> Optional[str]:
+    def listen_for_speech(self, timeout: int = 15, fast_start: Optional[bool] = None,
+                          turn: Optional[Turn] = None) -> Optional[str]:
         """
         Listen for speech input from the user with comprehensive debugging.
         Uses AudioManager directly for compatibility with Raspberry Pi 5.
+        
+        Args:
+            timeout: Seconds to wait for the user to start speaking
+            fast_start: Skip the fixed pause after the listening cue (default: config.listen_fast_start);
+                the microphone pre-roll keeps speech that starts while the cue is playing
+            turn: Conversation turn to time and hand transcripts to (starts the speculative reply)
         """
+        if fast_start is None:
+            fast_start = self.config.listen_fast_start
         try:
             logger.info(f"🎤 LISTEN_FOR_SPEECH DEBUG: Starting (timeout={timeout}s)")
             
@@ -1556,8 +1234,9 @@ class AIAssistant:
             self.play_listening_sound()
             
             # Brief pause after listening sound to let it finish completely
-            import time
-            time.sleep(0.3)
+            # (fast start: the cue is suppressed on the microphone instead)
+            if not fast_start:
+                time.sleep(0.3)
             
             logger.info(f"🎤 LISTEN_FOR_SPEECH DEBUG: Audio setup complete, starting capture...")
             
@@ -1585,14 +1264,19 @@ class AIAssistant:
             end_time = time.time()
             actual_duration = end_time - start_time
             logger.info(f"🎤 LISTEN_FOR_SPEECH DEBUG: listen_for_audio returned after {actual_duration:.2f} seconds")
+            if turn:
+                turn.timer.add('capture', actual_duration)
             
             if audio_data:
                 logger.info("🎤 LISTEN_FOR_SPEECH DEBUG: Audio captured successfully, converting to text...")
                 
-                # Convert audio to text
+                # Convert audio to text (game answers first against the answers the game expects)
                 text_start_time = time.time()
-                text = self.audio_manager.audio_to_text(audio_data)
+                on_draft = (lambda draft: turn.on_transcript(self._clean_recognized_text(draft), final=False)) if turn else None
+                text = self._recognize_answer(audio_data, on_draft=on_draft)
                 text_duration = time.time() - text_start_time
+                if turn:
+                    turn.timer.add('stt', text_duration)
                 
                 logger.info(f"🎤 LISTEN_FOR_SPEECH DEBUG: Text conversion took {text_duration:.2f} seconds")
                 
@@ -1610,7 +1294,10 @@ class AIAssistant:
                             logger.info(f"Ready command detected: '{text}' -> '{detected_ready}'")
                             return detected_ready
                     
-                    return self._clean_recognized_text(text)
+                    text = self._clean_recognized_text(text)
+                    if turn:
+                        turn.on_transcript(text)
+                    return text
                 else:
                     logger.warning("🎤 LISTEN_FOR_SPEECH DEBUG: Audio captured but no text recognized")
                     # Show timeout state in visual feedback
@@ -1726,6 +1413,46 @@ class AIAssistant:
         
         return cleaned
 
+    def _active_answer_candidates(self) -> Dict[str, str]:
+        """Answers the active game is waiting for ({spoken phrase: text for handle_special_commands})"""
+        # Same priority as handle_special_commands
+        if self.math_quiz.game_active:
+            return self.math_quiz.get_answer_candidates()
+        if self.letter_word_game.is_game_active():
+            return self.letter_word_game.get_answer_candidates()
+        if self.spelling_game_active:
+            return candidates_from([
+                'ready', "i'm ready", 'check my answer', 'done', 'finished', 'check it',
+                'look at this', 'here it is', 'all done', 'complete', 'please check',
+                'auto check', 'stop auto check', 'manual mode', 'end game'
+            ])
+        if self.filipino_translator.game_active:
+            return self.filipino_translator.get_answer_candidates()
+        return {}
+
+    def _recognize_answer(self, audio_data, on_draft=None) -> Optional[str]:
+        """
+        Speech to text, snapping game answers to what the active game expects
+        
+        With a local model the utterance is decoded against just the expected
+        answers; otherwise the open transcript is matched to them phonetically.
+        Anything that isn't one of the answers is returned as heard.
+        on_draft is called with a likely transcript while a slower backend confirms it.
+        """
+        candidates = self._active_answer_candidates()
+        if candidates:
+            match = self.answer_recognizer.recognize(audio_data, candidates)
+            if match:
+                return match.value
+        
+        text = self.audio_manager.audio_to_text(audio_data, on_draft=None if candidates else on_draft)
+        if text and candidates:
+            match = self.answer_recognizer.match_text(text, candidates)
+            if match:
+                logger.info(f"🎯 Heard '{text}' as answer '{match.value}' ({match.confidence:.2f})")
+                return match.value
+        return text
+
     def detect_ready_command(self, text: str) -> Optional[str]:
         """Enhanced detection of 'ready' and similar commands with fuzzy matching."""
         import difflib
@@ -1757,76 +1484,77 @@ class AIAssistant:
         
             return None
 
-    async def process_with_openai(self, text: str, user: str) -> str:
-        """Process user input with OpenAI and return response with conversation context."""
+    def build_openai_request(self, text: str, user: str) -> Tuple[List[Dict[str, str]], int]:
+        """Build the chat messages (system prompt + conversation context) and token limit for a user turn."""
+        # Create a personalized system prompt based on user
+        user_info = self.users.get(user, {})
+        personality = user_info.get('personality', 'helpful and friendly')
+        user_context = self.get_user_context_info(user)
+        
+        # Log user context for debugging
+        logger.info(f"👤 User context for {user}: {user_context}")
+        
+        system_prompt = (f"You are a helpful AI assistant speaking to {user_context}. Be {personality}. "
+                         "Keep answers friendly, age-appropriate, encouraging, educational and concise, "
+                         "using language and examples that fit their age. Refer back to earlier parts of "
+                         "the conversation when relevant.")
+        
+        # System prompt, conversation memory (summary + recent turns as messages), then this turn
+        messages = [{"role": "system", "content": system_prompt}]
+        messages.extend(self.conversation_memory.messages(user))
+        messages.append({"role": "user", "content": text})
+        logger.info(f"🧮 Prompt for {user}: {self.conversation_memory.counter.count_messages(messages)} tokens, "
+                    f"{len(messages)} messages")
+        
+        # Intelligent token limit based on request type
+        story_keywords = [
+            'story', 'tell me about', 'once upon a time', 'tale', 'adventure',
+            'fairy tale', 'bedtime story', 'fable', 'legend', 'myth',
+            'tell me a story', 'can you tell', 'long story', 'short story'
+        ]
+        
+        detailed_keywords = [
+            'explain', 'how does', 'why does', 'what is', 'describe',
+            'tell me more', 'can you teach', 'help me understand',
+            'learn about', 'what happens when', 'how do you'
+        ]
+        
+        text_lower = text.lower()
+        
+        # Set appropriate token limits
+        if any(keyword in text_lower for keyword in story_keywords):
+            max_tokens = 800  # Allow longer stories (500-600 words)
+            logger.info("🎭 Story request detected - using extended token limit (800)")
+        elif any(keyword in text_lower for keyword in detailed_keywords):
+            max_tokens = 400  # Allow detailed explanations (250-300 words)
+            logger.info("📚 Detailed explanation request - using medium token limit (400)")
+        else:
+            max_tokens = 200  # Regular conversation (130-150 words)
+            logger.info("💬 Regular conversation - using standard token limit (200)")
+        
+        return messages, max_tokens
+
+    async def process_with_openai(self, text: str, user: str, reply: Optional[SpeculativeReply] = None) -> str:
+        """
+        Process user input with OpenAI and return response with conversation context.
+        
+        Args:
+            reply: Speculative reply already requested for this text (used instead of a new request)
+        """
         try:
-            # Create a personalized system prompt based on user
-            user_info = self.users.get(user, {})
-            personality = user_info.get('personality', 'helpful and friendly')
-            user_context = self.get_user_context_info(user)
-            
-            # Get conversation context
-            conversation_context = self.get_conversation_context(user)
-            
-            # Log user context for debugging
-            logger.info(f"👤 User context for {user}: {user_context}")
-            
-            system_prompt = f"""You are a helpful AI assistant speaking to {user_context}. 
-            Be {personality}. Keep responses friendly, age-appropriate, and engaging for children. 
-            Be encouraging and educational when possible. Keep responses concise but informative.
-            
-            Always remember their age and gender when crafting responses. Use appropriate language, 
-            examples, and concepts that match their developmental stage.
-            
-            Remember to reference previous conversation when relevant. You have context of what you discussed earlier."""
-            
-            # Prepare messages with context
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Add conversation history for context (if available)
-            if conversation_context:
-                messages.append({
-                    "role": "system", 
-                    "content": f"Recent conversation context:\n{conversation_context}\n\nUse this context to provide relevant responses and reference earlier topics when appropriate."
-                })
-            
-            # Add current user message
-            messages.append({"role": "user", "content": text})
-            
-            # Intelligent token limit based on request type
-            story_keywords = [
-                'story', 'tell me about', 'once upon a time', 'tale', 'adventure',
-                'fairy tale', 'bedtime story', 'fable', 'legend', 'myth',
-                'tell me a story', 'can you tell', 'long story', 'short story'
-            ]
-            
-            detailed_keywords = [
-                'explain', 'how does', 'why does', 'what is', 'describe',
-                'tell me more', 'can you teach', 'help me understand',
-                'learn about', 'what happens when', 'how do you'
-            ]
-            
-            text_lower = text.lower()
-            
-            # Set appropriate token limits
-            if any(keyword in text_lower for keyword in story_keywords):
-                max_tokens = 800  # Allow longer stories (500-600 words)
-                logger.info("🎭 Story request detected - using extended token limit (800)")
-            elif any(keyword in text_lower for keyword in detailed_keywords):
-                max_tokens = 400  # Allow detailed explanations (250-300 words)
-                logger.info("📚 Detailed explanation request - using medium token limit (400)")
-            else:
-                max_tokens = 200  # Regular conversation (130-150 words)
-                logger.info("💬 Regular conversation - using standard token limit (200)")
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=0.7
-            )
-            
-            ai_response = response.choices[0].message.content.strip()
+            # The speculative reply blocks until its stream ends - wait for it off the event loop
+            ai_response = await asyncio.get_running_loop().run_in_executor(None, reply.result) if reply else ""
+            if not ai_response:
+                messages, max_tokens = self.build_openai_request(text, user)
+                
+                response = await self.openai.achat(
+                    model="gpt-3.5-turbo",
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.7
+                )
+                
+                ai_response = response.choices[0].message.content.strip()
             
             # Add this exchange to conversation history
             self.add_to_conversation_history(user, text, ai_response)
@@ -1842,259 +1570,250 @@ class AIAssistant:
             
             return error_response
 
-    def handle_special_commands(self, user_input: str, user: str) -> Optional[str]:
-        """Handle special commands for each user."""
-        user_input_lower = user_input.lower()
-        
-        # NEW: Voice-triggered gesture control commands
-        gesture_trigger_phrases = [
-            'hey dino come', 'hey miley come', 'dino come', 'miley come',
-            'come here dino', 'come here miley', 'come to me dino', 'come to me miley',
-            'dino come here', 'miley come here',
-            # Parent commands
-            'hey robot come', 'robot come', 'come here robot', 'robot come here',
-            'activate robot', 'start robot', 'robot control', 'gesture robot'
-        ]
+    def ask_openai(self, text: str, user: str, reply: Optional[SpeculativeReply] = None) -> str:
+        """Run process_with_openai on the shared OpenAI loop and wait for the answer (for the sync threads)"""
+        try:
+            return self.openai.run(self.process_with_openai(text, user, reply))
+        except Exception as e:
+            # Timed out or cancelled before process_with_openai could answer
+            logger.error(f"OpenAI request failed: {e!r}")
+            return "I'm sorry, I'm having trouble understanding right now. Can you try again?"
+
+    def stream_openai_response(self, text: str, user: str):
+        """Yield the OpenAI response for a user turn as streamed text deltas."""
+        messages, max_tokens = self.build_openai_request(text, user)
+        
+        # Streams on the shared OpenAI loop; closing this generator cancels the request
+        yield from self.openai.stream_chat(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=0.7
+        )
+
+    def speak_streaming_response(self, text: str, user: str, reply: Optional[SpeculativeReply] = None) -> str:
+        """
+        Stream the OpenAI response and speak it sentence by sentence as it is generated.
+        Falls back to the one-shot speak() path if streaming fails before anything was said;
+        if it fails partway, the part that was said is kept in the conversation history.
         
-        if any(phrase in user_input_lower for phrase in gesture_trigger_phrases):
-            # Determine which character was called
-            if any(word in user_input_lower for word in ['dino', 'dinosaur']):
-                character = 'Dino'
-                target_user = 'eladriel'
-            elif any(word in user_input_lower for word in ['miley']):
-                character = 'Miley'
-                target_user = 'sophia'
-            elif any(word in user_input_lower for word in ['robot']) or user == 'parent':
-                character = 'Assistant Robot'
-                target_user = 'parent'
-            else:
-                character = 'Robot'
-                target_user = user
-            
-            return self.start_voice_triggered_gesture_control(character, target_user)
-        
-        # NEW: Direct voice movement commands (work immediately without gesture control)
-        direct_movement_phrases = {
-            'forward': ['hey robot go forward', 'hey robot move forward', 'robot go forward', 'robot move forward', 
-                       'go forward', 'move forward', 'forward', 'hey dino go forward', 'hey miley go forward',
-                       'dino go forward', 'miley go forward', 'dino move forward', 'miley move forward'],
-            'backward': ['hey robot go backward', 'hey robot go backwards', 'hey robot move backward', 'robot go backward', 
-                        'robot go backwards', 'robot move backward', 'go backward', 'go backwards', 'move backward', 
-                        'backward', 'backwards', 'hey dino go backward', 'hey miley go backward',
-                        'dino go backward', 'miley go backward', 'dino move backward', 'miley move backward'],
-            'left': ['hey robot go left', 'hey robot turn left', 'robot go left', 'robot turn left', 
-                    'go left', 'turn left', 'left', 'hey dino go left', 'hey miley go left',
-                    'dino go left', 'miley go left', 'dino turn left', 'miley turn left'],
-            'right': ['hey robot go right', 'hey robot turn right', 'robot go right', 'robot turn right', 
-                     'go right', 'turn right', 'right', 'hey dino go right', 'hey miley go right',
-                     'dino go right', 'miley go right', 'dino turn right', 'miley turn right'],
-            'stop': ['hey robot stop', 'robot stop', 'stop', 'stop moving', 'halt', 
-                    'hey dino stop', 'hey miley stop', 'dino stop', 'miley stop']
-        }
+        Args:
+            reply: Speculative reply already streaming for this text (spoken instead of a new request)
+        """
+        turn_start = time.time()
         
-        # Check for direct movement commands
-        for action, phrases in direct_movement_phrases.items():
-            if any(phrase in user_input_lower for phrase in phrases):
-                return self.handle_direct_movement_command(action, user)
+        if self.quiet_mode:
+            return self.ask_openai(text, user, reply)
         
-        # Parent-specific admin commands
-        if user == 'parent':
-            if any(phrase in user_input_lower for phrase in ['status report', 'system status', 'report']):
-                return self.get_system_status()
-            
-            elif any(phrase in user_input_lower for phrase in ['system check', 'health check', 'diagnostic']):
-                return self.run_system_diagnostic()
-            
-            elif any(phrase in user_input_lower for phrase in ['quiet mode on', 'enable quiet mode', 'whisper mode']):
-                return self.enable_quiet_mode()
-            
-            elif any(phrase in user_input_lower for phrase in ['quiet mode off', 'disable quiet mode', 'normal volume']):
-                return self.disable_quiet_mode()
-            
-            elif any(phrase in user_input_lower for phrase in ['check on kids', 'kids status', 'children']):
-                return self.check_kids_status()
+        tts_engine = self.users[user]['tts_engine'] if user in self.users else self.sophia_tts
         
-        # Audio feedback controls for all users
-        if any(phrase in user_input_lower for phrase in ['turn off sounds', 'disable sounds', 'no sounds', 'mute sounds']):
-            return self.toggle_audio_feedback(False)
+        def show_sentence(sentence):
+            if self.visual:
+                self.visual.show_speaking(sentence[:50] + "..." if len(sentence) > 50 else sentence)
         
-        if any(phrase in user_input_lower for phrase in ['turn on sounds', 'enable sounds', 'sounds on', 'unmute sounds']):
-            return self.toggle_audio_feedback(True)
+        pipeline = StreamingSpeechPipeline(tts_engine,
+                                           max_concurrent_synthesis=self.config.tts_synthesis_workers,
+                                           on_sentence_start=show_sentence)
+        ai_response = ""
+        stream_failed = False
         
-        # Universal object identification commands for all users - expanded with natural phrases
-        object_identification_phrases = [
-            'identify this', 'what is this', 'tell me about this', 'what am i holding',
-            'look', 'look at this', 'look at the camera', 'can you see this',
-            'guess what this is', 'guess what i\'m holding', 'can you recognize',
-            'can you identify', 'what do you see', 'recognize this',
-            'see what i have', 'check this out', 'look what i found'
-        ]
+        try:
+            logger.info(f"🗣️ STREAM: Streaming response for {user}")
+            tokens = reply.tokens() if reply else self.stream_openai_response(text, user)
+            ai_response = pipeline.speak_stream(tokens, turn_start=turn_start)
+        except Exception as e:
+            logger.error(f"OpenAI streaming error: {e}")
+            ai_response = getattr(e, 'partial_text', "")
+            stream_failed = True
         
-        if any(phrase in user_input_lower for phrase in object_identification_phrases):
-            return self.handle_object_identification(user)
+        metrics = pipeline.get_last_metrics()
         
-        # Repeat functionality for all users
-        repeat_phrases = [
-            'repeat', 'say that again', 'what did you say', 'can you repeat that',
-            'repeat that', 'say it again', 'what was that', 'i didn\'t hear you',
-            'could you repeat', 'please repeat', 'one more time', 'again'
-        ]
+        if not metrics.get('sentences_spoken'):
+            # Nothing was spoken - use the regular request/response path
+            if ai_response:
+                # The reply streamed fine but no sentence could be voiced: speak it without asking again
+                self.add_to_conversation_history(user, text, ai_response)
+            else:
+                ai_response = self.ask_openai(text, user)
+            self.speak(ai_response, user)
+            logger.info(f"⏱️ Turn latency (non-streaming fallback): {time.time() - turn_start:.2f}s")
+            return ai_response
         
-        if any(phrase in user_input_lower for phrase in repeat_phrases):
-            return self.handle_repeat_request(user)
-        
-        # Singing functionality for all users
-        singing_detection = self.detect_singing_request(user_input)
-        if singing_detection['is_singing']:
-            return self.handle_singing_request(user_input, user)
-        
-        # Image generation functionality for all users
-        image_response = self.image_generator.handle_image_request(user_input, user)
-        if image_response:
-            return image_response
-        
-        # Math Quiz Game Commands (for Sophia, Eladriel, and Parent) - CHECK FIRST!
-        if user in ['sophia', 'eladriel', 'parent']:
-            # Math game start commands
-            if self.math_quiz.is_math_game_command(user_input):
-                return self.math_quiz.handle_math_command(user_input, user)
-            
-            # Handle "ready" commands when math game is active - PRIORITY!
-            elif self.math_quiz.game_active:
-                ready_phrases = [
-                    'ready', 'i\'m ready', 'check my answer', 'done', 'finished', 
-                    'check it', 'look at this', 'see my answer', 'check this',
-                    'here it is', 'all done', 'complete', 'i finished',
-                    'can you check', 'please check', 'look', 'see this'
-                ]
-                
-                if any(phrase in user_input_lower for phrase in ready_phrases):
-                    return self.math_quiz.check_math_answer(user)
-                
-                # Handle end game commands
-                elif any(phrase in user_input_lower for phrase in ['end math', 'stop math', 'quit math', 'end game']):
-                    return self.math_quiz.end_game(user)
-                
-                # Handle verbal answers when math game is active (fallback)
-                else:
-                    verbal_answer = self.math_quiz._extract_verbal_answer(user_input_lower)
-                    if verbal_answer is not None:
-                        return self.math_quiz._handle_verbal_answer(verbal_answer, user)
-        
-        # Animal Guessing Game Commands (for Sophia, Eladriel, and Parent)
-        if user in ['sophia', 'eladriel', 'parent']:
-            # Animal game start commands
-            if any(phrase in user_input_lower for phrase in ['animal game', 'guess the animal', 'animal guessing', 'identify animal']):
-                return self.animal_game.handle_animal_guess(user)
-            
-            # Handle animal game commands when active
-            elif self.animal_game.is_game_active():
-                if any(phrase in user_input_lower for phrase in ['guess the animal', 'identify animal', 'what animal']):
-                    return self.animal_game.handle_animal_guess(user)
-                
-                elif any(phrase in user_input_lower for phrase in ['animal stats', 'my stats', 'game stats']):
-                    return self.animal_game.get_game_stats(user)
-                
-                elif any(phrase in user_input_lower for phrase in ['animal help', 'help me', 'how to play']):
-                    return self.animal_game.get_game_help(user)
-                
-                elif any(phrase in user_input_lower for phrase in ['end animal game', 'stop animal', 'quit animal']):
-                    return self.animal_game.end_game(user)
-        
-        # Letter Word Game Commands (for Sophia, Eladriel, and Parent)
-        if user in ['sophia', 'eladriel', 'parent']:
-            # Letter game start commands
-            if any(phrase in user_input_lower for phrase in ['letter game', 'letter word game', 'word guessing', 'guess the word', 'play letter game']):
-                return self.letter_word_game.start_game(user)
-            
-            # Handle letter game commands when active
-            elif self.letter_word_game.is_game_active():
-                # Check for game control commands first
-                if any(phrase in user_input_lower for phrase in ['hint please', 'give me a hint', 'need a hint', 'extra hint']):
-                    return self.letter_word_game.get_hint(user)
-                
-                elif any(phrase in user_input_lower for phrase in ['skip', 'skip word', 'next word', 'skip this one']):
-                    return self.letter_word_game.skip_word(user)
-                
-                elif any(phrase in user_input_lower for phrase in ['stats', 'my stats', 'game stats', 'score']):
-                    return self.letter_word_game.get_game_stats(user)
-                
-                elif any(phrase in user_input_lower for phrase in ['help', 'how to play', 'game help']):
-                    return self.letter_word_game.get_game_help(user)
-                
-                elif any(phrase in user_input_lower for phrase in ['end letter game', 'stop letter', 'quit letter', 'end game']):
-                    return self.letter_word_game.end_game(user)
-                
-                # If none of the control commands match, treat as a word guess
-                else:
-                    return self.letter_word_game.check_answer(user_input, user)
-        
-        # Spelling Game Commands (for Sophia, Eladriel, and Parent)
-        if user in ['sophia', 'eladriel', 'parent']:
-            if any(phrase in user_input_lower for phrase in ['spelling game', 'play spelling', 'start spelling']):
-                return self.start_spelling_game(user)
-            
-            # Enhanced "ready" detection with more variations and automatic visual check option
-            elif self.spelling_game_active:
-                ready_phrases = [
-                    'ready', 'i\'m ready', 'check my answer', 'done', 'finished', 
-                    'check it', 'look at this', 'see my answer', 'check this',
-                    'here it is', 'all done', 'complete', 'i finished',
-                    'can you check', 'please check', 'look', 'see this'
-                ]
-                
-                if any(phrase in user_input_lower for phrase in ready_phrases):
-                    return self.check_spelling_answer(user)
-            
-                # NEW: Visual word detection without saying "ready"
-                elif any(phrase in user_input_lower for phrase in ['auto check', 'smart check', 'visual check', 'camera check']):
-                    return self.start_auto_visual_check(user)
-                
-                # Stop auto check mode
-                elif any(phrase in user_input_lower for phrase in ['stop auto check', 'stop monitoring', 'manual mode', 'stop watching']):
-                    return self.stop_auto_visual_check(user)
-                
-                elif any(phrase in user_input_lower for phrase in ['end game', 'stop game', 'quit game']):
-                    return self.end_spelling_game(user)
+        self.add_to_conversation_history(user, text, ai_response)
         
-        # Filipino Translation Game Commands (for all users)
-        if self.filipino_translator.is_filipino_game_command(user_input):
-            return self.filipino_translator.handle_filipino_command(user_input, user)
+        if stream_failed:
+            # The answer broke off mid-way: remember what was said and let the child know
+            self.speak("Sorry, I lost my train of thought! Can you ask me that again?", user)
+            return ai_response
         
-        # Eladriel's special dinosaur commands (keep existing functionality)
-        if user == 'eladriel':
-            if any(phrase in user_input_lower for phrase in ['identify dinosaur', 'what is this dinosaur', 'look at this dinosaur']):
-                return self.handle_dinosaur_identification()
-            
-            elif any(phrase in user_input_lower for phrase in ['show camera', 'camera preview', 'can you see']):
-                return self.handle_camera_preview()
-            
-            elif any(phrase in user_input_lower for phrase in ['dinosaur tips', 'how to show', 'tips']):
-                return self.dinosaur_identifier.get_dinosaur_tips()
+        # Same post-speech sequence as speak()
+        if self.visual:
+            self.visual.stop_speaking()
+        time.sleep(0.3)  # Prevent the microphone from picking up the AI's own voice
+        self.play_ready_to_speak_sound()
+        time.sleep(0.2)
+        if self.visual:
+            self.visual.show_standby("Ready to listen...")
+        
+        return ai_response
+
+    def _build_intent_handlers(self) -> Dict[str, Callable[[str, str], Optional[str]]]:
+        """Handler for each intent of the compiled router: handler(user_input, user) -> response or None"""
+        return {
+            # Commands of a game in progress
+            'math.ready': lambda text, user: self.math_quiz.check_math_answer(user),
+            'math.end': lambda text, user: self.math_quiz.end_game(user),
+            'animal.guess': lambda text, user: self.animal_game.handle_animal_guess(user),
+            'animal.stats': lambda text, user: self.animal_game.get_game_stats(user),
+            'animal.help': lambda text, user: self.animal_game.get_game_help(user),
+            'animal.end': lambda text, user: self.animal_game.end_game(user),
+            'letter.hint': lambda text, user: self.letter_word_game.get_hint(user),
+            'letter.skip': lambda text, user: self.letter_word_game.skip_word(user),
+            'letter.stats': lambda text, user: self.letter_word_game.get_game_stats(user),
+            'letter.help': lambda text, user: self.letter_word_game.get_game_help(user),
+            'letter.end': lambda text, user: self.letter_word_game.end_game(user),
+            'spelling.ready': lambda text, user: self.check_spelling_answer(user),
+            'spelling.auto_check': lambda text, user: self.start_auto_visual_check(user),
+            'spelling.stop_auto_check': lambda text, user: self.stop_auto_visual_check(user),
+            'spelling.end': lambda text, user: self.end_spelling_game(user),
+            'filipino.end': self.filipino_translator.handle_filipino_command,
+            
+            # Robot, camera head, sounds and parent admin
+            'gesture.call': self._handle_gesture_call,
+            'move.forward': lambda text, user: self.handle_direct_movement_command('forward', user),
+            'move.backward': lambda text, user: self.handle_direct_movement_command('backward', user),
+            'move.left': lambda text, user: self.handle_direct_movement_command('left', user),
+            'move.right': lambda text, user: self.handle_direct_movement_command('right', user),
+            'move.stop': lambda text, user: self.handle_direct_movement_command('stop', user),
+            'face_tracking': self._handle_face_tracking_command,
+            'sounds.off': lambda text, user: self.toggle_audio_feedback(False),
+            'sounds.on': lambda text, user: self.toggle_audio_feedback(True),
+            'parent.status': lambda text, user: self.get_system_status(),
+            'parent.diagnostic': lambda text, user: self.run_system_diagnostic(),
+            'parent.quiet_on': lambda text, user: self.enable_quiet_mode(),
+            'parent.quiet_off': lambda text, user: self.disable_quiet_mode(),
+            'parent.kids': lambda text, user: self.check_kids_status(),
+            
+            # Features
+            'object.identify': lambda text, user: self.handle_object_identification(user),
+            'repeat': lambda text, user: self.handle_repeat_request(user),
+            'sing': self.handle_singing_request,
+            'image': self.image_generator.handle_image_request,
+            'dinosaur.identify': lambda text, user: self.handle_dinosaur_identification(),
+            'camera.preview': lambda text, user: self.handle_camera_preview(),
+            'dinosaur.tips': lambda text, user: self.dinosaur_identifier.get_dinosaur_tips(),
+            
+            # Starting games
+            'math.start': self.math_quiz.handle_math_command,
+            'animal.start': lambda text, user: self.animal_game.handle_animal_guess(user),
+            'letter.start': lambda text, user: self.letter_word_game.start_game(user),
+            'spelling.start': lambda text, user: self.start_spelling_game(user),
+            'filipino.start': self.filipino_translator.handle_filipino_command,
+            
+            # General
+            'help': lambda text, user: self.get_help_message(user),
+            'gesture.control': lambda text, user: self.start_gesture_motor_control(),
+        }
+    
+    def _intent_context(self) -> List[str]:
+        """Context flags that make game and device intents available"""
+        context = []
+        if self.math_quiz.game_active:
+            context.append('math')
+        if self.animal_game.is_game_active():
+            context.append('animal')
+        if self.letter_word_game.is_game_active():
+            context.append('letter')
+        if self.spelling_game_active:
+            context.append('spelling')
+        if self.filipino_translator.game_active:
+            context.append('filipino')
+        if self.enhanced_face_tracking:
+            context.append('face_tracking')
+        return context
+    
+    def handle_special_commands(self, user_input: str, user: str) -> Optional[str]:
+        """
+        Handle special commands for each user.
         
-        # General help commands for all users
-        if any(phrase in user_input_lower for phrase in ['help', 'what can you do', 'commands']):
-            return self.get_help_message(user)
+        All command phrases are matched in one pass by the compiled intent router
+        (see intent_router.py for the priority rules); the best available intent
+        whose handler has something to say wins. Anything else is a game answer
+        if a game is waiting for one.
+        """
+        for match in self.intent_router.route(user_input, user, self._intent_context()):
+            response = self.intent_handlers[match.intent](user_input, user)
+            if response:
+                logger.info(f"🧭 Intent '{match.intent}' from '{match.phrase}'")
+                return response
         
-        # Manual gesture control command (keep as backup)
-        if any(phrase in user_input_lower for phrase in ['gesture control', 'hand control', 'hand gesture']):
-            return self.start_gesture_motor_control()
+        return self._handle_game_answer(user_input, user)
+    
+    def _handle_game_answer(self, user_input: str, user: str) -> Optional[str]:
+        """Treat an utterance that isn't a command as the answer to the active game"""
+        if user in GAME_USERS:
+            # Verbal math answers ("seven")
+            if self.math_quiz.game_active:
+                verbal_answer = self.math_quiz._extract_verbal_answer(user_input.lower())
+                if verbal_answer is not None:
+                    return self.math_quiz._handle_verbal_answer(verbal_answer, user)
+            
+            # Word guesses
+            if self.letter_word_game.is_game_active():
+                return self.letter_word_game.check_answer(user_input, user)
+        
+        # Filipino translations
+        if self.filipino_translator.game_active and self.filipino_translator.current_translation:
+            return self.filipino_translator.handle_filipino_command(user_input, user)
         
-        # Enhanced Face Tracking Commands (for all users) - ADD BEFORE OTHER COMMANDS
-        if self.enhanced_face_tracking:
-            try:
-                face_tracking_result = self.enhanced_face_tracking.process_voice_command(user_input)
-                if face_tracking_result and face_tracking_result.strip():
-                    # Log command processing for performance monitoring
-                    logger.info(f"Enhanced face tracking command processed: {user_input}")
-                    return face_tracking_result
-            except Exception as e:
-                logger.error(f"Error processing face tracking command: {e}")
-                # Continue to other commands if face tracking fails
-                pass
+        return None
+    
+    def _handle_gesture_call(self, user_input: str, user: str) -> str:
+        """Voice-triggered gesture control ("hey dino come")"""
+        user_input_lower = user_input.lower()
+        # Determine which character was called
+        if any(word in user_input_lower for word in ['dino', 'dinosaur']):
+            character = 'Dino'
+            target_user = 'eladriel'
+        elif any(word in user_input_lower for word in ['miley']):
+            character = 'Miley'
+            target_user = 'sophia'
+        elif any(word in user_input_lower for word in ['robot']) or user == 'parent':
+            character = 'Assistant Robot'
+            target_user = 'parent'
+        else:
+            character = 'Robot'
+            target_user = user
         
+        return self.start_voice_triggered_gesture_control(character, target_user)
+    
+    def _handle_face_tracking_command(self, user_input: str, user: str) -> Optional[str]:
+        """Camera head commands ("look at me", "look left")"""
+        try:
+            face_tracking_result = self.enhanced_face_tracking.process_voice_command(user_input)
+            if face_tracking_result and face_tracking_result.strip():
+                # Log command processing for performance monitoring
+                logger.info(f"Enhanced face tracking command processed: {user_input}")
+                return face_tracking_result
+        except Exception as e:
+            logger.error(f"Error processing face tracking command: {e}")
+        # Continue to other commands if face tracking fails
         return None
     
+    def _game_active(self) -> bool:
+        """True while any game is waiting for an answer"""
+        return (self.spelling_game_active or self.math_quiz.game_active or self.filipino_translator.game_active
+                or self.letter_word_game.is_game_active() or self.animal_game.is_game_active())
+    
+    def _should_speculate(self, text: str, user: str) -> bool:
+        """Whether a turn is likely to need an OpenAI reply (game answers and goodbyes are handled locally)"""
+        return not self._game_active() and not self.is_conversation_ending(text)
+    
+    def _prefetch_object_identification(self, text: str, user: str):
+        """Capture and start identifying the frame while the turn is routed and the prompt is spoken"""
+        if not self._game_active():
+            self.object_identifier.prefetch(user)
+    
     def handle_object_identification(self, user: str) -> str:
         """Handle universal object identification for any user."""
         try:
@@ -2106,7 +1825,7 @@ class AIAssistant:
             time.sleep(3)
             
             # Capture and identify the object
-            result = self.object_identifier.capture_and_identify()
+            result = self.object_identifier.capture_and_identify(user)
             
             if result["success"]:
                 return result["message"]
@@ -2576,6 +2295,14 @@ All standard features available with enhanced capabilities for household managem
             face_recognition_status = "Active" if self.face_recognition_active else "Inactive"
             camera_status = "Connected" if self.face_detector.cap and self.face_detector.cap.isOpened() else "Disconnected"
             
+            # Frame bus throughput and per-subscriber drops / frame age
+            bus_metrics = self.frame_bus.get_metrics()
+            subscriber_lines = "\n".join(
+                f"• {name}: {m['frames_consumed']} frames, {m['frames_dropped']} dropped, "
+                f"avg age {m['avg_frame_age'] * 1000:.0f} ms"
+                for name, m in bus_metrics['subscribers'].items()
+            )
+            
             # Get recent activity
             current_time = time.strftime("%I:%M %p")
             
@@ -2592,6 +2319,10 @@ All standard features available with enhanced capabilities for household managem
 • Current User: {self.current_user or 'None (Standby)'}
 • Wake Words: Miley (Sophia), Dino (Eladriel), Assistant (Parent)
 
+📷 FRAME BUS:
+• Frames Produced: {bus_metrics['frames_produced']} ({bus_metrics['fps']:.1f} FPS)
+{subscriber_lines}
+
 📊 OPERATIONAL STATUS:
 • Speech Recognition: Functional
 • Text-to-Speech: Premium OpenAI voices active
@@ -2621,11 +2352,11 @@ All systems operational. Running smoothly."""
             
             # Test OpenAI connection
             try:
-                test_response = self.client.chat.completions.create(
+                test_response = self.openai.chat(
                     model="gpt-3.5-turbo",
                     messages=[{"role": "user", "content": "test"}],
                     max_tokens=5
-                )
+                ).result()
                 openai_test = True
             except:
                 openai_test = False
@@ -2639,6 +2370,9 @@ All systems operational. Running smoothly."""
             tts_test = self.sophia_tts is not None and self.eladriel_tts is not None
             diagnostic_results.append(f"🗣️ Text-to-Speech: {'✅ Pass' if tts_test else '❌ Fail'}")
             
+            # Per-endpoint latency, errors and circuit state of the cloud calls so far
+            logger.info(f"🌐 Cloud transport:\n{self.transport.summary()}")
+            
             results_text = "\n".join(diagnostic_results)
             return f"""System Diagnostic Complete:
 
@@ -2791,9 +2525,10 @@ Everything looks good for when the children wake up!"""
         max_timeouts = 6 if self.spelling_game_active else 2  # Allow 6 timeouts for spelling game, 2 for normal conversation
         
         while conversation_active and self.running and self.current_user == user:
+            turn = self.turn_pipeline.start_turn(user)
             try:
                 # Listen for their request with a 15-second timeout (longer for children)
-                user_input = self.listen_for_speech(timeout=15)
+                user_input = self.listen_for_speech(timeout=15, turn=turn)
 
                 if user_input:
                     conversation_timeout_count = 0  # Reset timeout counter
@@ -2817,29 +2552,40 @@ Everything looks good for when the children wake up!"""
                         conversation_active = False
                         break
                     
-                    # Check for special commands first
-                    special_response = self.handle_special_commands(user_input, user)
+                    # Check for special commands first (the speculative reply keeps streaming meanwhile)
+                    with turn.timer.stage('route'):
+                        special_response = self.handle_special_commands(user_input, user)
                     
                     if special_response:
+                        turn.cancel("handled as a local command")
                         # Add special command to conversation history too
                         self.add_to_conversation_history(user, user_input, special_response)
                         
                         # Use no-interrupt speak for Filipino game responses to prevent recording during explanations
-                        if self.filipino_translator.is_filipino_game_command(user_input) or self.filipino_translator.game_active:
-                            self.speak_no_interrupt(special_response, user)
-                        else:
-                            self.speak(special_response, user)
+                        with turn.timer.stage('speak'):
+                            if self.filipino_translator.is_filipino_game_command(user_input) or self.filipino_translator.game_active:
+                                self.speak_no_interrupt(special_response, user)
+                            else:
+                                self.speak(special_response, user)
                     else:
                         # Process with OpenAI for regular conversation
-                        import asyncio
+                        reply = turn.take_reply(user_input)
                         try:
-                            response = asyncio.run(self.process_with_openai(user_input, user))
-                            
                             # Use no-interrupt speak if Filipino game is active to prevent recording during explanations
                             if self.filipino_translator.game_active:
-                                self.speak_no_interrupt(response, user)
+                                with turn.timer.stage('reply'):
+                                    response = self.ask_openai(user_input, user, reply)
+                                with turn.timer.stage('speak'):
+                                    self.speak_no_interrupt(response, user)
+                            elif self.config.openai_streaming:
+                                # Speak sentence by sentence while the answer is still being generated
+                                with turn.timer.stage('reply+speak'):
+                                    self.speak_streaming_response(user_input, user, reply)
                             else:
-                                self.speak(response, user)
+                                with turn.timer.stage('reply'):
+                                    response = self.ask_openai(user_input, user, reply)
+                                with turn.timer.stage('speak'):
+                                    self.speak(response, user)
                         except Exception as e:
                             logger.error(f"Error processing request: {e}")
                             self.speak("I'm sorry, something went wrong. Let me try again.", user)
@@ -2907,6 +2653,8 @@ Everything looks good for when the children wake up!"""
                 # End conversation to prevent infinite error loop
                 conversation_active = False
                 break
+            finally:
+                turn.finish()
         
         # Show goodbye state in visual feedback
         if self.visual:
@@ -3068,6 +2816,7 @@ Everything looks good for when the children wake up!"""
         # Stop other components
         self.wake_word_detector.stop()
         self.stop_face_recognition()
+        self.frame_bus.stop()
         
         # Cleanup object identification resources
         try:
@@ -3368,45 +3117,29 @@ Word #{self.spelling_word_index + 1}: {next_word.upper()}
 
     def add_to_conversation_history(self, user: str, user_message: str, ai_response: str):
         """Add exchange to conversation history for context."""
-        if user not in self.conversation_history:
-            self.conversation_history[user] = []
-        
-        # Add the exchange
-        exchange = {
-            'timestamp': datetime.now().isoformat(),
-            'user_message': user_message,
-            'ai_response': ai_response
-        }
-        
-        self.conversation_history[user].append(exchange)
-        
-        # Keep only the last N exchanges to prevent memory issues
-        if len(self.conversation_history[user]) > self.max_history_length:
-            self.conversation_history[user] = self.conversation_history[user][-self.max_history_length:]
+        self.conversation_memory.add(user, user_message, ai_response)
         
         # Store last response for repeat functionality
         self.last_ai_response[user] = ai_response
-        
-        logger.info(f"Added to conversation history for {user}: {len(self.conversation_history[user])} exchanges")
 
-    def get_conversation_context(self, user: str) -> str:
-        """Get recent conversation context for the user."""
-        if user not in self.conversation_history or not self.conversation_history[user]:
-            return ""
-        
-        # Get last 3 exchanges for context (not too much to overwhelm the prompt)
-        recent_history = self.conversation_history[user][-3:]
-        
-        context_parts = []
-        for exchange in recent_history:
-            context_parts.append(f"Previous - You asked: '{exchange['user_message']}' | You responded: '{exchange['ai_response']}'")
-        
-        return "\n".join(context_parts)
+    def _summarize_conversation(self, summary: str, exchanges: List[Tuple[str, str]], max_tokens: int) -> str:
+        """Fold older exchanges into the user's running conversation summary (runs on the memory thread)."""
+        transcript = "\n".join(f"Child: {question}\nAssistant: {answer}" for question, answer in exchanges)
+        prompt = (f"Current summary: {summary or '(none)'}\n\nNew exchanges:\n{transcript}\n\n"
+                  f"Write an updated summary in under {max_tokens} tokens. Keep names, topics, "
+                  "preferences, open questions and anything the assistant promised.")
+        response = self.openai.chat(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "system", "content": "You summarize a conversation between a child and a robot assistant."},
+                      {"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0.3
+        ).result()
+        return response.choices[0].message.content
 
     def clear_conversation_history(self, user: str):
         """Clear conversation history for a user (e.g., when they say goodbye)."""
-        if user in self.conversation_history:
-            self.conversation_history[user] = []
+        self.conversation_memory.clear(user)
         if user in self.last_ai_response:
             del self.last_ai_response[user]
         if user in self.conversation_context:
@@ -3597,13 +3330,18 @@ Starting visual monitoring in 3 seconds... Get your paper ready! 📄✏️"""
                 self.auto_check_active = True
                 consecutive_failures = 0
                 max_failures = 8  # Allow 8 failed attempts before suggesting manual check
+                gate = SceneChangeGate()
                 
                 time.sleep(3)  # Give user time to prepare
                 
                 while self.auto_check_active and self.spelling_game_active:
                     try:
-                        # Capture and check for text
-                        result = self.object_identifier.capture_and_identify_text(user, expected_word=correct_word)
+                        # Only send a view to the vision API when a new, steady view with writing appears
+                        frame = self._wait_for_text_view(gate)
+                        if frame is None:
+                            break
+                        result = self.object_identifier.capture_and_identify_text(user, expected_word=correct_word,
+                                                                                  frame=frame)
                         
                         if result["success"]:
                             detected_text = result.get("detected_text", "").strip().lower()
@@ -3628,6 +3366,7 @@ Starting visual monitoring in 3 seconds... Get your paper ready! 📄✏️"""
                         
                         else:
                             consecutive_failures += 1
+                            gate.retry()  # the call failed - the same view may be sent again
                             if consecutive_failures >= max_failures:
                                 # Suggest manual check after too many failures
                                 self.auto_check_active = False
@@ -3638,9 +3377,9 @@ Starting visual monitoring in 3 seconds... Get your paper ready! 📄✏️"""
                     except Exception as e:
                         logger.error(f"Error in auto check monitor: {e}")
                         consecutive_failures += 1
-                    
-                    # Wait before next check (don't spam the camera)
-                    time.sleep(2)
+                        time.sleep(2)
+                
+                self._log_spelling_gate(gate)
                 
                 # Auto check ended
                 if self.spelling_game_active:
@@ -3657,6 +3396,26 @@ Starting visual monitoring in 3 seconds... Get your paper ready! 📄✏️"""
             logger.error(f"Error starting auto visual check: {e}")
             return "Sorry! I had trouble starting the automatic checker. You can still say 'Ready' to check manually!"
 
+    def _wait_for_text_view(self, gate: SceneChangeGate):
+        """Watch the camera until the gate passes a new, steady view with writing (None once auto check stops)."""
+        while self.auto_check_active and self.spelling_game_active:
+            packet = self.spelling_camera.read_packet()
+            if packet is None:
+                # Bus stopped or no frame yet - read_packet() returns at once, so don't spin
+                time.sleep(1.0 / self.SPELLING_GATE_FPS)
+                continue
+            if gate.feed(packet.get_variant(self.SPELLING_GATE_SCALE, gray=True), packet.timestamp):
+                return packet.frame
+            time.sleep(1.0 / self.SPELLING_GATE_FPS)
+        return None
+
+    def _log_spelling_gate(self, gate: SceneChangeGate):
+        """Report the vision calls the auto-check gate saved compared to checking every 2 seconds."""
+        stats = gate.stats(poll_interval=2.0)
+        logger.info(f"📊 Spelling auto-check: {stats['api_calls']} vision calls in {stats['seconds']:.0f}s "
+                    f"({stats['calls_avoided']} avoided; held back {stats['rejected_moving']} moving, "
+                    f"{stats['rejected_unchanged']} unchanged, {stats['rejected_no_text']} without text)")
+
     def start_auto_check_for_current_word(self, user: str):
         """Start auto-check monitoring for the current word (used by persistent mode)."""
         try:
@@ -3674,13 +3433,18 @@ Starting visual monitoring in 3 seconds... Get your paper ready! 📄✏️"""
                 self.auto_check_active = True
                 consecutive_failures = 0
                 max_failures = 8  # Allow 8 failed attempts before suggesting manual check
+                gate = SceneChangeGate()
                 
                 time.sleep(1)  # Brief delay to let user prepare
                 
                 while self.auto_check_active and self.spelling_game_active:
                     try:
-                        # Capture and check for text
-                        result = self.object_identifier.capture_and_identify_text(user, expected_word=correct_word)
+                        # Only send a view to the vision API when a new, steady view with writing appears
+                        frame = self._wait_for_text_view(gate)
+                        if frame is None:
+                            break
+                        result = self.object_identifier.capture_and_identify_text(user, expected_word=correct_word,
+                                                                                  frame=frame)
                         
                         if result["success"]:
                             detected_text = result.get("detected_text", "").strip().lower()
@@ -3705,6 +3469,7 @@ Starting visual monitoring in 3 seconds... Get your paper ready! 📄✏️"""
                         
                         else:
                             consecutive_failures += 1
+                            gate.retry()  # the call failed - the same view may be sent again
                             if consecutive_failures >= max_failures:
                                 # Suggest manual check after too many failures
                                 self.auto_check_active = False
@@ -3715,9 +3480,9 @@ Starting visual monitoring in 3 seconds... Get your paper ready! 📄✏️"""
                     except Exception as e:
                         logger.error(f"Error in auto check monitor: {e}")
                         consecutive_failures += 1
-                    
-                    # Wait before next check (don't spam the camera)
-                    time.sleep(2)
+                        time.sleep(2)
+                
+                self._log_spelling_gate(gate)
                 
                 # Auto check ended
                 if self.spelling_game_active and not self.persistent_auto_check:
@@ -3872,20 +3637,8 @@ Word #{self.spelling_word_index + 1}: {next_word.upper()}
         """Detect if the user is requesting singing and what type of song."""
         text_lower = text.lower()
         
-        # Happy Birthday detection
-        birthday_phrases = [
-            'sing happy birthday', 'happy birthday song', 'birthday song',
-            'sing birthday', 'happy birthday to', 'birthday for'
-        ]
-        
-        # General singing detection
-        singing_phrases = [
-            'sing', 'sing a song', 'sing me', 'can you sing',
-            'song for', 'sing to', 'sing about'
-        ]
-        
         # Check for Happy Birthday specifically
-        if any(phrase in text_lower for phrase in birthday_phrases):
+        if any(phrase in text_lower for phrase in BIRTHDAY_PHRASES):
             # Try to extract the name
             name = self.extract_name_from_birthday_request(text)
             return {
@@ -3896,7 +3649,7 @@ Word #{self.spelling_word_index + 1}: {next_word.upper()}
             }
         
         # Check for general singing
-        elif any(phrase in text_lower for phrase in singing_phrases):
+        elif any(phrase in text_lower for phrase in SINGING_PHRASES):
             return {
                 'is_singing': True,
                 'song_type': 'general',
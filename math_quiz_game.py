@@ -9,8 +9,16 @@ import random
 import re
 from typing import Dict, List, Optional, Tuple
 
+from answer_recognizer import number_words, candidates_from
+
 logger = logging.getLogger(__name__)
 
+# Phrases that start or ask about the math game
+MATH_GAME_COMMANDS = [
+    'math game', 'math quiz', 'math problems', 'word problems',
+    'start math', 'play math', 'math practice', 'solve problems'
+]
+
 class MathQuizGame:
     def __init__(self, camera_handler, ocr_handler=None):
         """Initialize the Math Quiz Game with camera and OCR capabilities."""
@@ -527,12 +535,8 @@ FEATURES:
 
     def is_math_game_command(self, user_input: str) -> bool:
         """Check if user input is a math game command."""
-        math_commands = [
-            'math game', 'math quiz', 'math problems', 'word problems',
-            'start math', 'play math', 'math practice', 'solve problems'
-        ]
         user_input_lower = user_input.lower()
-        return any(cmd in user_input_lower for cmd in math_commands)
+        return any(cmd in user_input_lower for cmd in MATH_GAME_COMMANDS)
 
     def handle_math_command(self, user_input: str, user: str) -> str:
         """Handle math game related commands."""
@@ -569,6 +573,20 @@ FEATURES:
         else:
             return "Say 'Math Game' to start, 'Ready' to check your answer, or 'Math Help' for instructions!"
 
+    def get_answer_candidates(self) -> Dict[str, str]:
+        """Spoken answers expected for the current problem ({phrase: text handled by handle_special_commands})"""
+        if not self.game_active or not self.current_problem:
+            return {}
+        
+        # Numbers are handed on as digits so _extract_verbal_answer picks them up
+        highest = min(999, max(20, self.current_problem['answer'] * 2))
+        candidates = {number_words(n): str(n) for n in range(highest + 1)}
+        candidates.update(candidates_from([
+            'ready', "i'm ready", 'check my answer', 'done', 'finished', 'all done',
+            'end math', 'end game', 'math help'
+        ]))
+        return candidates
+
     def _extract_verbal_answer(self, user_input: str) -> int:
         """Extract numerical answer from verbal input."""
         import re
@@ -0,0 +1,322 @@
+"""
+Shared Microphone Stream for AI Assistant
+One long-lived capture stream feeding a ring buffer of PCM chunks, so
+listening, level metering, wake word detection and calibration all read the
+same audio without reopening the device
+
+- MicrophoneStream: capture thread + ring buffer (last few seconds of audio)
+- MicrophoneReader: independent read cursor into the ring buffer
+- RingBufferSource: speech_recognition AudioSource backed by a reader, so
+  Recognizer.listen() and adjust_for_ambient_noise() work unchanged
+
+The device is opened once; it is only re-probed and reopened after a read error.
+Readers can start up to the buffer length in the past (pre-roll), so speech
+that began before listening was requested is not lost, and windows where the
+robot played its own cue sounds can be suppressed (read back as silence).
+"""
+
+import math
+import time
+import logging
+import threading
+from collections import deque
+from typing import Callable, Optional, Dict, Any
+
+import numpy as np
+import speech_recognition as sr
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_WIDTH = 2  # 16-bit PCM
+# Waits between reopen attempts after a device error (seconds)
+REOPEN_BACKOFF = (0.5, 1.0, 2.0, 5.0)
+
+
+class MicrophoneStream:
+    """Continuously captures the microphone into a ring buffer"""
+
+    def __init__(self, audio, sample_rate: int, chunk_size: int,
+                 device_index_provider: Callable[..., Optional[int]],
+                 sample_format: int = 8, buffer_seconds: float = 10.0):
+        """
+        Initialize the stream (capture starts with start())
+
+        Args:
+            audio: pyaudio.PyAudio instance used to open the input stream
+            sample_rate: Capture sample rate
+            chunk_size: Frames per read
+            device_index_provider: Returns the input device index; called with
+                refresh=True after an error so the device is probed again
+            sample_format: PyAudio sample format (paInt16)
+            buffer_seconds: Seconds of audio kept in the ring buffer
+        """
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.sample_format = sample_format
+        self.device_index_provider = device_index_provider
+        self.chunk_seconds = chunk_size / sample_rate
+
+        max_chunks = max(2, int(math.ceil(buffer_seconds / self.chunk_seconds)))
+        self._chunks = deque(maxlen=max_chunks)
+        self._times = deque(maxlen=max_chunks)  # capture time of the end of each chunk
+        self._suppressed = deque(maxlen=32)  # (start, end) windows read back as silence
+        self._next_seq = 0  # sequence number of the next chunk to be captured
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._stream = None
+
+        self.opens = 0
+        self.reprobes = 0
+        self.read_errors = 0
+        self.started_at = None
+
+    # --- capture ---------------------------------------------------------
+
+    def start(self) -> bool:
+        """Start capturing (no-op if already running)"""
+        with self._condition:
+            if self._running:
+                return True
+            self._running = True
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._capture_loop, name="mic-capture", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop capturing and close the device"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._close()
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _open(self, refresh: bool):
+        device_index = self.device_index_provider(refresh=refresh)
+        if refresh:
+            self.reprobes += 1
+        self._stream = self.audio.open(
+            format=self.sample_format,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=self.chunk_size
+        )
+        self.opens += 1
+        logger.info(f"🎤 Microphone stream opened (device {device_index}, {self.sample_rate}Hz, "
+                    f"chunk {self.chunk_size}, open #{self.opens})")
+
+    def _close(self):
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            try:
+                stream.stop_stream()
+                stream.close()
+            except Exception:
+                pass
+
+    def _capture_loop(self):
+        failures = 0
+        while self._running:
+            try:
+                if self._stream is None:
+                    self._open(refresh=failures > 0)
+                data = self._stream.read(self.chunk_size, exception_on_overflow=False)
+                failures = 0
+            except Exception as e:
+                self.read_errors += 1
+                logger.error(f"🎤 Microphone stream error: {e} - re-probing device")
+                self._close()
+                delay = REOPEN_BACKOFF[min(failures, len(REOPEN_BACKOFF) - 1)]
+                failures += 1
+                with self._condition:
+                    self._condition.wait(delay)
+                continue
+
+            with self._condition:
+                self._chunks.append(data)
+                self._times.append(time.time())
+                self._next_seq += 1
+                self._condition.notify_all()
+        self._close()
+
+    # --- reading ---------------------------------------------------------
+
+    def reader(self, preroll: float = 0.0, not_before: Optional[float] = None) -> 'MicrophoneReader':
+        """
+        New read cursor
+
+        Args:
+            preroll: Seconds of already-captured audio the reader starts with
+            not_before: Never start with audio captured before this time.time() value
+        """
+        self.start()
+        with self._condition:
+            back = int(math.ceil(preroll / self.chunk_seconds)) if preroll > 0 else 0
+            seq = max(self._first_seq(), self._next_seq - back)
+            if not_before is not None:
+                first = self._first_seq()
+                while seq < self._next_seq and self._times[seq - first] - self.chunk_seconds < not_before:
+                    seq += 1
+            return MicrophoneReader(self, seq)
+
+    def suppress(self, start: float, end: float):
+        """Read audio captured between start and end (time.time()) back as silence, e.g. the robot's own cue sounds"""
+        with self._condition:
+            self._suppressed.append((start, end))
+
+    def _is_suppressed(self, captured_at: float) -> bool:
+        """True if the chunk ending at captured_at overlaps a suppressed window (lock held)"""
+        chunk_start = captured_at - self.chunk_seconds
+        return any(start < captured_at and chunk_start < end for start, end in self._suppressed)
+
+    def _first_seq(self) -> int:
+        """Sequence number of the oldest chunk still buffered (lock held)"""
+        return self._next_seq - len(self._chunks)
+
+    def _get(self, seq: int, timeout: float):
+        """
+        Chunk with sequence number seq, waiting for it to be captured
+
+        Returns:
+            (seq, data): seq may be later than requested if the reader fell
+            behind the ring buffer; data is None on timeout or after stop()
+        """
+        deadline = time.time() + timeout
+        with self._condition:
+            while seq >= self._next_seq:
+                remaining = deadline - time.time()
+                if not self._running or remaining <= 0:
+                    return seq, None
+                self._condition.wait(remaining)
+            first = self._first_seq()
+            if seq < first:
+                logger.debug(f"🎤 Reader overrun, skipped {first - seq} chunks")
+                seq = first
+            data = self._chunks[seq - first]
+            if self._suppressed and self._is_suppressed(self._times[seq - first]):
+                data = bytes(len(data))
+            return seq, data
+
+    def recent(self, duration: float) -> bytes:
+        """The last `duration` seconds of captured audio (may be shorter right after start)"""
+        with self._condition:
+            count = min(len(self._chunks), int(math.ceil(duration / self.chunk_seconds)))
+            return b''.join(list(self._chunks)[len(self._chunks) - count:])
+
+    def level(self, duration: float = 0.1) -> float:
+        """RMS level of the most recent audio, waiting up to `duration` if nothing is buffered yet"""
+        self.start()
+        with self._condition:
+            if not self._chunks:
+                self._condition.wait(duration + self.chunk_seconds)
+        data = self.recent(duration)
+        if not data:
+            return 0.0
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float64)
+        return float(np.sqrt(np.mean(samples ** 2)))
+
+    def noise_level(self, duration: float = 2.0, percentile: float = 20.0) -> Optional[float]:
+        """
+        Ambient RMS level from recently captured audio, without waiting
+
+        Uses a low percentile of per-chunk RMS over the last `duration`
+        seconds (suppressed chunks excluded), so speech or cue sounds in the
+        window don't inflate the estimate
+
+        Returns:
+            RMS level, or None if no usable audio is buffered yet
+        """
+        with self._condition:
+            count = min(len(self._chunks), int(math.ceil(duration / self.chunk_seconds)))
+            start = len(self._chunks) - count
+            chunks = [self._chunks[i] for i in range(start, len(self._chunks))
+                      if not self._is_suppressed(self._times[i])]
+        if not chunks:
+            return None
+        levels = [np.sqrt(np.mean(np.frombuffer(chunk, dtype=np.int16).astype(np.float64) ** 2))
+                  for chunk in chunks]
+        return float(np.percentile(levels, percentile))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Device open/error counters"""
+        return {
+            'running': self._running,
+            'opens': self.opens,
+            'reprobes': self.reprobes,
+            'read_errors': self.read_errors,
+            'chunks_captured': self._next_seq,
+            'buffered_seconds': len(self._chunks) * self.chunk_seconds,
+            'uptime': time.time() - self.started_at if self.started_at else 0.0
+        }
+
+
+class MicrophoneReader:
+    """Independent cursor over a MicrophoneStream's ring buffer"""
+
+    def __init__(self, mic_stream: MicrophoneStream, seq: int):
+        self.mic_stream = mic_stream
+        self.seq = seq
+        self._pending = b''
+
+    def read_chunk(self, timeout: float = 1.0) -> Optional[bytes]:
+        """Next captured chunk, or None if nothing arrived within timeout"""
+        seq, data = self.mic_stream._get(self.seq, timeout)
+        if data is None:
+            return None
+        self.seq = seq + 1
+        return data
+
+    def read(self, frames: int, timeout: float = 5.0) -> bytes:
+        """
+        Exactly `frames` frames of audio (PyAudio stream.read() signature)
+
+        Returns fewer bytes (possibly b'') only if the stream stopped or stalled
+        """
+        wanted = frames * SAMPLE_WIDTH
+        while len(self._pending) < wanted:
+            data = self.read_chunk(timeout)
+            if data is None:
+                break
+            self._pending += data
+        data, self._pending = self._pending[:wanted], self._pending[wanted:]
+        return data
+
+    def available(self) -> int:
+        """Captured chunks not read yet"""
+        with self.mic_stream._condition:
+            return max(0, self.mic_stream._next_seq - self.seq)
+
+
+class RingBufferSource(sr.AudioSource):
+    """speech_recognition audio source that reads from the shared microphone stream"""
+
+    def __init__(self, mic_stream: MicrophoneStream, preroll: float = 0.0, not_before: Optional[float] = None):
+        """
+        Args:
+            mic_stream: Running shared stream
+            preroll: Seconds of already-captured audio to start from
+            not_before: Don't start with audio captured before this time.time() value
+        """
+        self.mic_stream = mic_stream
+        self.preroll = preroll
+        self.not_before = not_before
+        self.SAMPLE_RATE = mic_stream.sample_rate
+        self.SAMPLE_WIDTH = SAMPLE_WIDTH
+        self.CHUNK = mic_stream.chunk_size
+        self.stream = None
+
+    def __enter__(self):
+        self.stream = self.mic_stream.reader(self.preroll, self.not_before)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
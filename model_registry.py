@@ -0,0 +1,139 @@
+"""
+Process-level Model Registry for AI Assistant
+Loads each YOLO model, the face gallery and the local speech model exactly once and hands out shared,
+thread-safe handles, so the face detector, face tracker and AI camera handler
+do not each pay the startup time and memory again
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+_registry_lock = threading.Lock()
+_key_locks = {}
+_load_stats = {}
+
+
+def _rss_mb() -> float:
+    """Resident memory of this process in MB"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    except ImportError:
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+        except (OSError, ValueError):
+            return 0.0
+
+
+class SharedModel:
+    """
+    Thread-safe handle on a shared model
+    Inference calls are serialized with a lock; other attributes (e.g. names) pass through
+    """
+
+    def __init__(self, model):
+        self._model = model
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            return self._model(*args, **kwargs)
+
+    def predict(self, *args, **kwargs):
+        with self._lock:
+            return self._model.predict(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+def _get_or_load(key: str, loader):
+    """Return the registered object for key, loading it once on first request"""
+    with _registry_lock:
+        if key in _registry:
+            _load_stats[key]['hits'] += 1
+            return _registry[key]
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    # Load outside the registry lock so different models can load in parallel
+    with key_lock:
+        with _registry_lock:
+            if key in _registry:
+                _load_stats[key]['hits'] += 1
+                return _registry[key]
+
+        rss_before = _rss_mb()
+        start_time = time.time()
+        value = loader()
+        load_time = time.time() - start_time
+        rss_after = _rss_mb()
+
+        with _registry_lock:
+            _registry[key] = value
+            _load_stats[key] = {
+                'load_time': load_time,
+                'rss_before_mb': rss_before,
+                'rss_after_mb': rss_after,
+                'hits': 0
+            }
+
+        logger.info(f"📦 Loaded {key} in {load_time:.2f}s "
+                    f"(RSS {rss_before:.0f} MB -> {rss_after:.0f} MB)")
+        return value
+
+
+def get_yolo_model(model_path: str = 'yolov8n.pt') -> SharedModel:
+    """Get the shared YOLO model for model_path, loading it on first use"""
+    def load():
+        from ultralytics import YOLO
+        print(f"🤖 Loading YOLOv8 model: {model_path}")
+        return SharedModel(YOLO(model_path))
+
+    return _get_or_load(f"yolo:{model_path}", load)
+
+
+def get_face_gallery(people_dir: str = "people"):
+    """Get the shared face gallery for people_dir, encoding it on first use"""
+    def load():
+        from face_gallery import FaceGallery
+        return FaceGallery(people_dir).load()
+
+    return _get_or_load(f"faces:{os.path.abspath(people_dir)}", load)
+
+
+def get_vosk_model(model_path: str):
+    """Get the shared Vosk speech model for model_path, loading it on first use"""
+    def load():
+        import vosk
+        return vosk.Model(model_path)
+
+    return _get_or_load(f"vosk:{os.path.abspath(model_path)}", load)
+
+
+def get_ocr_engine(tesseract_cmd: str = "", confirm_confidence: float = 60.0, reject_confidence: float = 85.0):
+    """Get the shared local handwriting OCR engine, probing Tesseract on first use"""
+    def load():
+        from local_ocr import HandwritingOCR
+        return HandwritingOCR(confirm_confidence=confirm_confidence, reject_confidence=reject_confidence,
+                              tesseract_cmd=tesseract_cmd or None)
+
+    return _get_or_load(f"ocr:{tesseract_cmd or 'tesseract'}", load)
+
+
+def get_registry_stats() -> Dict[str, Any]:
+    """Load time, RSS before/after and reuse count for every registered model"""
+    with _registry_lock:
+        stats = {key: dict(value) for key, value in _load_stats.items()}
+    return {
+        'models': stats,
+        'total_load_time': sum(s['load_time'] for s in stats.values()),
+        'saved_loads': sum(s['hits'] for s in stats.values()),
+        'rss_mb': _rss_mb()
+    }
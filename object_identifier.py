@@ -4,19 +4,32 @@ Universal Object Identification Module for Sophia and Eladriel
 Uses OpenAI GPT-4 Vision to identify any object and provide educational information
 """
 
+import re
 import base64
 import logging
 from typing import Optional, Dict, Any
 import openai
 from camera_utils import CameraManager
-import os
+from openai_loop import get_openai_loop
+from model_registry import get_ocr_engine
+from local_ocr import is_math_answer, normalize_answer
+from frame_encoder import get_frame_encoder
+from recognition_cache import get_recognition_cache, image_signature
+from object_preclassifier import ObjectPreclassifier
 from pathlib import Path
 import cv2
+import numpy as np
 import time
+import threading
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# A prefetched identification is reused if the scene changed less than this (mean gray level 0-255)
+PREFETCH_MAX_SCENE_CHANGE = 12.0
+# ...and if it was captured within this many seconds
+PREFETCH_MAX_AGE = 20.0
+
 class ObjectIdentifier:
     """Identifies any object from camera images and provides comprehensive educational content."""
     
@@ -41,8 +54,20 @@ class ObjectIdentifier:
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI API: {e}")
         
-        # We need the OpenAI client for API calls
-        self.client = openai.OpenAI(api_key=self.config.openai_api_key)
+        # Shared OpenAI clients and event loop (one connection pool for the whole assistant)
+        self.openai = get_openai_loop(self.config.openai_api_key, timeout=self.config.openai_request_timeout)
+        self.client = self.openai.client
+        
+        # Frames go to the vision API as in-memory JPEGs (no captured_images/ round trip)
+        self.encoder = get_frame_encoder(self.config.vision_jpeg_quality, self.config.vision_archive_captures,
+                                         self.config.vision_archive_dir)
+        
+        # Results for toys seen before are reused (per user and kind of question)
+        self.recognition_cache = get_recognition_cache(
+            self.config.recognition_cache_file,
+            ttl_seconds=self.config.recognition_cache_ttl_hours * 3600,
+            max_entries=self.config.recognition_cache_max_entries
+        ) if self.config.recognition_cache_enabled else None
         
         # Object categories for enhanced responses
         self.object_categories = {
@@ -88,8 +113,32 @@ class ObjectIdentifier:
             }
         }
         
+        # Local detector pass before the vision API (set up by use_detector())
+        self.preclassifier = None
+        
+        # Identification started early from the frame seen when the request was spoken
+        self._prefetch = None
+        self._prefetch_lock = threading.Lock()
+        
         logger.info("ObjectIdentifier initialized for comprehensive object recognition!")
-    
+
+    def use_detector(self, detector):
+        """
+        Run this on-device detector (a SmartCameraDetector) on each frame before the vision API
+        
+        Confident detections of everyday objects are answered locally; everything
+        else is sent to the vision model as a crop with the detected label as a hint.
+        """
+        if not self.config.local_detector_enabled or detector is None:
+            return
+        self.preclassifier = ObjectPreclassifier(detector, self.object_categories,
+                                                 answer_confidence=self.config.local_detector_answer_confidence)
+        logger.info("🎯 Local detector will pre-classify objects before the vision API")
+
+    def _chat(self, endpoint: str = 'vision', **kwargs):
+        """Chat completion on the shared OpenAI loop; blocks only the calling thread, with the request timeout"""
+        return self.openai.chat(endpoint=endpoint, **kwargs).result()
+
     def encode_image(self, image_path: str) -> str:
         """Encode image to base64 string."""
         try:
@@ -141,7 +190,7 @@ Please be detailed and educational in your response."""
 Please be thorough and educational in your response, as if teaching someone who is curious to learn."""
             
             # Make API call to OpenAI
-            response = self.client.chat.completions.create(
+            response = self._chat(
                 model="gpt-4o",  # Updated to current model
                 messages=[
                     {
@@ -210,7 +259,8 @@ Include:
 
 Please be detailed and educational."""
             
-            response = self.client.chat.completions.create(
+            response = self._chat(
+                'chat',
                 model="gpt-4o",  # Updated to current model
                 messages=[
                     {
@@ -239,8 +289,8 @@ Please be detailed and educational."""
                 "object_name": object_name
             }
     
-    def capture_and_identify(self) -> Dict[str, Any]:
-        """Capture an image and identify the object."""
+    def capture_and_identify(self, user: Optional[str] = None) -> Dict[str, Any]:
+        """Capture an image and identify the object (user scopes the recognition cache)."""
         try:
             # Check camera availability
             if self.using_shared_camera and not self.shared_camera:
@@ -251,43 +301,29 @@ Please be detailed and educational."""
                 }
             
             # Capture image
-            if self.using_shared_camera:
-                ret, frame = self.shared_camera.read()
-                if not ret:
-                    return {
-                        "success": False,
-                        "error": "Failed to capture image from shared camera",
-                        "message": "I couldn't take a picture. The camera might be busy."
-                    }
-            else:
-                ret, frame = self.camera_manager.read_frame()
-                if not ret or frame is None:
-                    return {
-                        "success": False,
-                        "error": "Failed to capture frame",
-                        "message": "I couldn't take a picture. Please check the camera connection."
-                    }
-            
-            # Create directory for captured images
-            capture_dir = "captured_images"
-            os.makedirs(capture_dir, exist_ok=True)
-            
-            # Save the captured image
-            timestamp = int(time.time())
-            image_path = os.path.join(capture_dir, f"object_{timestamp}.jpg")
-            
-            success = cv2.imwrite(image_path, frame)
-            if not success:
+            ret, frame = self.capture_frame()
+            if not ret or frame is None:
                 return {
                     "success": False,
-                    "error": "Failed to save image",
-                    "message": "I took a picture but couldn't save it."
+                    "error": "Failed to capture frame",
+                    "message": "I couldn't take a picture. The camera might be busy."
                 }
             
-            logger.info(f"Image captured and saved: {image_path}")
+            # The local detector finds the held-up object; its box keys the recognition cache
+            found = self.locate(frame)
             
-            # Identify the object using GPT-4 Vision
-            return self._identify_object_with_vision(image_path)
+            # Seen this toy before: answer from memory
+            signature, remembered = self.recall(user or "default", "object", frame, found)
+            if remembered is not None:
+                return remembered
+            
+            # The object was already being held up when the question was asked: use that answer
+            result = self._take_prefetched(frame)
+            if result is None:
+                # Identify the object: local answer if the detector is sure, else GPT-4 Vision
+                result = self._identify_object(frame, found)
+            self.remember(user or "default", "object", signature, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error in capture_and_identify: {e}")
@@ -297,31 +333,155 @@ Please be detailed and educational."""
                 "message": "An error occurred while trying to identify the object."
             }
     
-    def _identify_object_with_vision(self, image_path: str) -> Dict[str, Any]:
+    def locate(self, frame: np.ndarray):
+        """Run the local detector on frame; returns its Preclassification, or None without a detector"""
+        if self.preclassifier is None:
+            return None
+        try:
+            return self.preclassifier.classify(frame)
+        except Exception as e:
+            logger.warning(f"⚠️ Local detector failed: {e}")
+            return None
+    
+    @staticmethod
+    def object_signature(frame: np.ndarray, found):
+        """Recognition cache key for the detected object (None without a usable detector box)"""
+        if found is None or found.box is None:
+            return None
+        return image_signature(frame, found.box, found.detection['bbox'])
+    
+    def recall(self, user: str, kind: str, frame: np.ndarray, found=None):
+        """
+        Look the object in frame up in the recognition cache
+        
+        Only objects the local detector boxed are looked up (found from locate(),
+        run here if not given): without a box the frame is mostly the child and
+        the room, and different toys would look the same.
+        
+        Returns:
+            (signature, remembered result or None); pass the signature to remember() after a vision call
+        """
+        if self.recognition_cache is None:
+            return None, None
+        signature = self.object_signature(frame, found if found is not None else self.locate(frame))
+        if signature is None:
+            return None, None
+        return signature, self.recognition_cache.lookup(user, kind, signature)
+    
+    def remember(self, user: str, kind: str, signature, result: Dict[str, Any]):
+        """Store a successful vision result under the signature from recall()"""
+        if self.recognition_cache is not None and signature is not None and result.get("success"):
+            self.recognition_cache.put(user, kind, signature, result)
+    
+    def capture_frame(self):
+        """Read the current frame from whichever camera is in use; returns (ret, frame)"""
+        if self.using_shared_camera:
+            return self.shared_camera.read() if self.shared_camera else (False, None)
+        return self.camera_manager.read_frame()
+    
+    @staticmethod
+    def _scene_thumbnail(frame):
+        """Tiny grayscale copy for telling whether the scene changed"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.resize(gray, (32, 24), interpolation=cv2.INTER_AREA).astype('float32')
+    
+    def prefetch(self, user: Optional[str] = None):
+        """
+        Start identifying the current frame in the background
+        
+        Called as soon as "what is this" is heard; capture_and_identify() then
+        reuses the answer if the scene is still the same after the
+        "hold it steady" prompt, instead of waiting for a fresh vision call.
+        Toys the recognition cache already knows are not sent.
+        """
+        with self._prefetch_lock:
+            if self._prefetch and time.time() - self._prefetch['captured_at'] < 1.0:
+                return
+        
+        ret, frame = self.capture_frame()
+        if not ret or frame is None:
+            return
+        
+        entry = {
+            'captured_at': time.time(),
+            'thumbnail': self._scene_thumbnail(frame),
+            'result': None,
+            'done': threading.Event()
+        }
+        
+        def identify():
+            try:
+                found = self.locate(frame)
+                if self.recognition_cache is not None and self.recognition_cache.contains(
+                        user or "default", "object", self.object_signature(frame, found)):
+                    return
+                entry['result'] = self._identify_object(frame, found)
+            finally:
+                entry['done'].set()
+        
+        with self._prefetch_lock:
+            self._prefetch = entry
+        threading.Thread(target=identify, name="object-prefetch", daemon=True).start()
+        logger.info("🏎️ Prefetched frame - identifying it while the prompt is spoken")
+    
+    def _take_prefetched(self, frame, timeout: float = 15.0) -> Optional[Dict[str, Any]]:
+        """Prefetched result if it is recent and the scene hasn't changed since (waits for it if needed)"""
+        with self._prefetch_lock:
+            entry, self._prefetch = self._prefetch, None
+        if entry is None or time.time() - entry['captured_at'] > PREFETCH_MAX_AGE:
+            return None
+        
+        change = float(abs(self._scene_thumbnail(frame) - entry['thumbnail']).mean())
+        if change > PREFETCH_MAX_SCENE_CHANGE:
+            logger.info(f"Scene changed since the prefetch ({change:.1f}) - identifying the new frame")
+            return None
+        if not entry['done'].wait(timeout) or not entry['result'] or not entry['result'].get('success'):
+            return None
+        logger.info(f"🏎️ Using prefetched identification (scene change {change:.1f}, "
+                    f"captured {time.time() - entry['captured_at']:.1f}s ago)")
+        return entry['result']
+    
+    def _identify_object(self, frame: np.ndarray, found=None) -> Dict[str, Any]:
+        """Answer from the local detector when it's sure, otherwise ask the vision model about its crop."""
+        if found is None:
+            found = self.locate(frame)
+        if found is None:
+            return self._identify_object_with_vision(frame)
+        
+        if found.answer is not None:
+            logger.info(f"🎯 Answered locally: {found.label} ({found.confidence:.0%}) "
+                        f"in {found.seconds * 1000:.0f} ms")
+            return {
+                "success": True,
+                "ai_response": found.answer,
+                "image_path": None,
+                "message": found.answer,
+                "model_used": "local-detector",
+                "detected_label": found.label,
+                "detection_confidence": found.confidence
+            }
+        if found.crop is None:
+            return self._identify_object_with_vision(frame)
+        
+        logger.info(f"🎯 Sending the {found.label} crop ({found.confidence:.0%}) to the vision model")
+        result = self._identify_object_with_vision(found.crop, hint=found.hint())
+        if result.get("success"):
+            result["detected_label"] = found.label
+            result["detection_confidence"] = found.confidence
+        return result
+    
+    def _identify_object_with_vision(self, frame: np.ndarray, hint: str = "") -> Dict[str, Any]:
         """Use OpenAI GPT-4 Vision to identify the object and provide educational information."""
         try:
-            # Encode image to base64
-            if self.using_shared_camera:
-                # For shared camera, encode the image file directly
-                with open(image_path, "rb") as image_file:
-                    base64_image = base64.b64encode(image_file.read()).decode('utf-8')
-            else:
-                # For standalone camera manager, encode the image file directly
-                with open(image_path, "rb") as image_file:
-                    base64_image = base64.b64encode(image_file.read()).decode('utf-8')
-            
-            if not base64_image:
-                return {
-                    "success": False,
-                    "error": "Failed to encode image",
-                    "message": "I couldn't process the image properly."
-                }
+            # Encode the frame in memory, sized for high detail
+            image = self.encoder.encode(frame, detail="high", name="object")
 
             # Create personalized vision prompt based on user
             if self.using_shared_camera:
                 prompt = self._get_shared_camera_prompt()
             else:
                 prompt = self._get_standalone_camera_prompt()
+            prompt += hint
             
             messages = [
                 {
@@ -331,19 +491,13 @@ Please be detailed and educational."""
                             "type": "text",
                             "text": prompt
                         },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{base64_image}",
-                                "detail": "high"
-                            }
-                        }
+                        image.image_content()
                     ]
                 }
             ]
             
             # Call GPT-4 Vision
-            response = self.client.chat.completions.create(
+            response = self._chat(
                 model="gpt-4o",
                 messages=messages,
                 max_tokens=400,
@@ -355,7 +509,7 @@ Please be detailed and educational."""
             return {
                 "success": True,
                 "ai_response": ai_response,
-                "image_path": image_path,
+                "image_path": image.archive_path,
                 "message": ai_response,
                 "model_used": "gpt-4o"
             }
@@ -521,13 +675,55 @@ I love helping you learn about the world around you! Show me anything you're cur
             return response + enhancement
         return response 
 
-    def capture_and_identify_text(self, user: str = "sophia", expected_word: str = None) -> Dict[str, Any]:
+    def _check_text_locally(self, frame: np.ndarray, expected_word: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Check the expected answer with the on-device OCR.
+        
+        Returns:
+            A result in the vision format if the local reading was confident, None to ask the vision API
+        """
+        if not expected_word or not self.config.local_ocr_enabled:
+            return None
+        try:
+            ocr = get_ocr_engine(self.config.tesseract_cmd, self.config.ocr_confirm_confidence,
+                                 self.config.ocr_reject_confidence)
+            if not ocr.available():
+                return None
+            reading = ocr.verify(frame, expected_word)
+        except Exception as e:
+            logger.warning(f"Local OCR failed, using vision API: {e}")
+            return None
+        if reading.verdict == 'unsure':
+            return None
+        
+        match = reading.verdict == 'match'
+        # Same shape the games parse from the vision answer: a lowercase word, or "3 + 2 = 5"
+        if match:
+            detected_text = expected_word.strip().lower()
+        elif is_math_answer(expected_word):
+            detected_text = re.sub(r'\s*([-+x/=])\s*', r' \1 ', reading.text)
+            detected_text = detected_text.replace(' x ', ' × ').replace(' / ', ' ÷ ').strip()
+        else:
+            detected_text = normalize_answer(reading.text, math=False)
+        return {
+            "success": True,
+            "message": f"DETECTED TEXT: {detected_text}\nSPELLING MATCH: {'YES' if match else 'NO'}\n"
+                       f"DESCRIPTION: Read on the device ({reading.confidence:.0f}% confidence)",
+            "detected_text": detected_text,
+            "image_path": None,
+            "model_used": "local-ocr",
+            "expected_word": expected_word
+        }
+    
+    def capture_and_identify_text(self, user: str = "sophia", expected_word: str = None,
+                                  frame: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """
         Capture an image and identify text/handwriting with enhanced OCR for spelling verification.
         
         Args:
             user: The user for personalized messaging
             expected_word: The word we expect to see (for spelling games)
+            frame: Frame already picked by the caller (e.g. the spelling auto-check gate) instead of a new capture
             
         Returns:
             Dictionary with text detection results
@@ -536,62 +732,28 @@ I love helping you learn about the world around you! Show me anything you're cur
             logger.info(f"Capturing image for text identification - Expected: '{expected_word}'")
             
             # Capture image using appropriate camera handler
-            if self.using_shared_camera:
-                # Use shared camera handler
-                if not self.shared_camera:
+            if frame is None:
+                if self.using_shared_camera and not self.shared_camera:
                     return {
                         "success": False,
                         "message": "Shared camera not available for text capture.",
                         "detected_text": "",
                         "image_path": None
                     }
-                
-                # Capture frame and save as image
-                ret, frame = self.shared_camera.read()
-                if not ret:
+                ret, frame = self.capture_frame()
+                if not ret or frame is None:
                     return {
                         "success": False,
                         "message": "Failed to capture image for text reading.",
                         "detected_text": "",
                         "image_path": None
                     }
-                
-                # Save frame as image file
-                timestamp = int(time.time())
-                image_path = f"captured_images/text_capture_{timestamp}.jpg"
-                
-                # Create directory if it doesn't exist
-                os.makedirs("captured_images", exist_ok=True)
-                
-                # Save the captured frame
-                success = cv2.imwrite(image_path, frame)
-                if not success:
-                    return {
-                        "success": False,
-                        "message": "Failed to save captured image for text reading.",
-                        "detected_text": "",
-                        "image_path": None
-                    }
-            else:
-                # Use standalone camera manager
-                capture_result = self.camera_manager.capture_image()
-                if not capture_result or not capture_result.get('success', False):
-                    return {
-                        "success": False,
-                        "message": "Failed to capture image. Please check the camera.",
-                        "detected_text": "",
-                        "image_path": None
-                    }
-                image_path = capture_result.get('filepath')
             
-            # Identify text with enhanced prompts for handwriting
-            result = self._identify_text_with_vision(image_path, user, expected_word)
-            
-            # Cleanup - remove temporary image file
-            try:
-                os.remove(image_path)
-            except:
-                pass
+            # Known answer: try to confirm or reject it on the device first
+            result = self._check_text_locally(frame, expected_word)
+            if result is None:
+                # Identify text with enhanced prompts for handwriting
+                result = self._identify_text_with_vision(frame, user, expected_word)
             
             return result
             
@@ -604,11 +766,12 @@ I love helping you learn about the world around you! Show me anything you're cur
                 "image_path": None
             }
 
-    def _identify_text_with_vision(self, image_path: str, user: str, expected_word: str = None) -> Dict[str, Any]:
+    def _identify_text_with_vision(self, frame: np.ndarray, user: str, expected_word: str = None) -> Dict[str, Any]:
         """Use GPT-4 Vision to identify handwritten text with OCR focus."""
+        image = None
         try:
-            # Encode image for Vision API
-            base64_image = self.encode_image(image_path)
+            # Encode the frame in memory for the Vision API
+            image = self.encoder.encode(frame, detail="high", name="text_capture")
             
             # Create enhanced prompt for text/handwriting recognition
             if expected_word:
@@ -647,7 +810,7 @@ Provide:
 Be as precise as possible in identifying text and letters."""
             
             # Make Vision API call
-            response = self.client.chat.completions.create(
+            response = self._chat(
                 model="gpt-4o",
                 messages=[
                     {
@@ -657,13 +820,7 @@ Be as precise as possible in identifying text and letters."""
                                 "type": "text",
                                 "text": prompt
                             },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}",
-                                    "detail": "high"
-                                }
-                            }
+                            image.image_content()
                         ]
                     }
                 ],
@@ -683,7 +840,7 @@ Be as precise as possible in identifying text and letters."""
                 "success": True,
                 "message": ai_response,
                 "detected_text": detected_text,
-                "image_path": image_path,
+                "image_path": image.archive_path,
                 "model_used": "gpt-4o",
                 "expected_word": expected_word
             }
@@ -694,7 +851,7 @@ Be as precise as possible in identifying text and letters."""
                 "success": False,
                 "message": f"Sorry, I had trouble reading the text in your image. Error: {str(e)}",
                 "detected_text": "",
-                "image_path": image_path
+                "image_path": image.archive_path if image else None
             }
 
     def _extract_detected_text(self, ai_response: str) -> str:
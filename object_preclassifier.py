@@ -0,0 +1,233 @@
+"""
+Local Object Pre-classification for AI Assistant
+Runs the on-device YOLO detector on a "what is this?" frame before anything is
+sent to the vision API
+
+- The most salient detection (confident, big and near the middle of the frame)
+  is taken as the object being held up; the child holding it and the table
+  under it are ignored
+- Confident detections of everyday COCO classes are answered right away from a
+  small knowledge table built on ObjectIdentifier.object_categories
+- Anything else goes to the vision model as a crop around that box, with the
+  detector's label as a hint, instead of the full camera frame
+"""
+
+import math
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CONFIDENCE = 0.8  # detector confidence needed to answer without the vision API
+HINT_CONFIDENCE = 0.4    # below this the label is not worth mentioning to the vision model
+MIN_AREA = 0.02          # boxes smaller than this fraction of the frame are not what is being held up
+CROP_PADDING = 0.2       # context kept around the box, as a fraction of its size
+MIN_CROP_SIDE = 160      # pixels; tiny crops give the vision model too little to go on
+
+# Detections that are never the object in question
+IGNORED_LABELS = {'person', 'dining table', 'bed', 'couch'}
+
+# COCO label: (object_categories key, fun fact)
+# 'bird' is left out on purpose: YOLO calls most toy dinosaurs birds
+LOCAL_KNOWLEDGE = {
+    # Toys
+    'teddy bear': ("toys", "Teddy bears are named after US President Theodore \"Teddy\" Roosevelt, "
+                           "who refused to shoot a bear on a hunting trip in 1902!"),
+    'sports ball': ("toys", "Children have played with balls for more than 4,000 years - "
+                            "ancient Egyptians made them from leather and linen!"),
+    'kite': ("toys", "Kites were invented in China more than 2,000 years ago!"),
+    'frisbee': ("toys", "Frisbees are named after the Frisbie Pie Company - "
+                        "students used to throw its empty pie tins to each other!"),
+    # Books
+    'book': ("books", "The oldest dated printed book, the Diamond Sutra, was made in China in the year 868!"),
+    # Nature
+    'cat': ("nature_items", "Cats sleep for about two thirds of the day!"),
+    'dog': ("nature_items", "Every dog's nose print is unique, just like your fingerprint!"),
+    'horse': ("nature_items", "Horses can sleep standing up!"),
+    'sheep': ("nature_items", "Sheep have rectangle-shaped pupils that let them see almost all the way around!"),
+    'cow': ("nature_items", "A cow's stomach has four parts to help it digest grass!"),
+    'elephant': ("nature_items", "Elephants are the biggest land animals, and a trunk has "
+                                 "tens of thousands of muscles!"),
+    'bear': ("nature_items", "A polar bear's fur looks white, but the skin underneath is black!"),
+    'zebra': ("nature_items", "No two zebras have exactly the same stripes!"),
+    'giraffe': ("nature_items", "A giraffe's tongue is dark purple and about as long as your arm!"),
+    'potted plant': ("nature_items", "Plants make their own food from sunlight, water and air - "
+                                     "it's called photosynthesis!"),
+    # Food
+    'banana': ("food_items", "Bananas are berries - but strawberries aren't!"),
+    'apple': ("food_items", "Apples float in water because they are about a quarter air!"),
+    'orange': ("food_items", "The colour orange was named after the fruit!"),
+    'broccoli': ("food_items", "Broccoli is a bunch of flower buds - those little trees would bloom "
+                               "into yellow flowers!"),
+    'carrot': ("food_items", "The first carrots were purple and yellow - orange ones came much later!"),
+    'pizza': ("food_items", "Pizza as we know it was first made in Naples, Italy!"),
+    # Vehicles
+    'car': ("vehicles", "Some of the very first cars were slower than a bicycle!"),
+    'bicycle': ("vehicles", "The first bicycles had no pedals - riders pushed along with their feet!"),
+    'airplane': ("vehicles", "The Wright brothers' first flight in 1903 lasted only 12 seconds!"),
+    'train': ("vehicles", "Bullet trains can go faster than 300 kilometres an hour!"),
+    'boat': ("vehicles", "People have been building boats for at least 10,000 years!"),
+    'bus': ("vehicles", "A double-decker bus can carry more than 80 people!"),
+    # Electronics
+    'cell phone': ("electronics", "A phone has more computing power than the computers that helped "
+                                  "astronauts land on the Moon!"),
+    'keyboard': ("electronics", "The QWERTY letter layout was invented for typewriters in the 1870s!"),
+    'laptop': ("electronics", "The first laptops weighed about as much as a big watermelon!"),
+    # Household items and tools
+    'clock': ("household_items", "The first mechanical clocks had only an hour hand - no minute hand!"),
+    'toothbrush': ("household_items", "Before toothbrushes, people cleaned their teeth by chewing on twigs!"),
+    'umbrella': ("household_items", "The first umbrellas were for shade from the sun, not rain!"),
+    'scissors': ("tools", "People in ancient Egypt used scissors more than 3,000 years ago!"),
+}
+
+
+def salience(detection: Dict[str, Any], width: int, height: int) -> float:
+    """How likely a detection is the object being held up: confidence x size x closeness to the centre"""
+    x1, y1, x2, y2 = detection['bbox']
+    area = max(0.0, x2 - x1) * max(0.0, y2 - y1) / float(width * height)
+    if area < MIN_AREA:
+        return 0.0
+    dx = ((x1 + x2) / 2 - width / 2) / (width / 2)
+    dy = ((y1 + y2) / 2 - height / 2) / (height / 2)
+    centrality = max(0.25, 1.0 - math.hypot(dx, dy) / math.sqrt(2))
+    return float(detection['confidence']) * math.sqrt(area) * centrality
+
+
+def most_salient(detections: List[Dict[str, Any]], width: int, height: int) -> Optional[Dict[str, Any]]:
+    """The detection most likely to be the object in question, or None"""
+    best, best_score = None, 0.0
+    for detection in detections:
+        if detection.get('class') in IGNORED_LABELS:
+            continue
+        score = salience(detection, width, height)
+        if score > best_score:
+            best, best_score = detection, score
+    return best
+
+
+def crop_box(frame: np.ndarray, bbox, padding: float = CROP_PADDING,
+             min_side: int = MIN_CROP_SIDE) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+    """Crop a box (x1, y1, x2, y2) with some context around it; returns (crop, padded box)"""
+    height, width = frame.shape[:2]
+    x1, y1, x2, y2 = bbox
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    half_w = max((x2 - x1) * (1 + 2 * padding), min_side) / 2
+    half_h = max((y2 - y1) * (1 + 2 * padding), min_side) / 2
+    box = (max(0, int(cx - half_w)), max(0, int(cy - half_h)),
+           min(width, int(math.ceil(cx + half_w))), min(height, int(math.ceil(cy + half_h))))
+    return frame[box[1]:box[3], box[0]:box[2]], box
+
+
+def local_answer(label: str, categories: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Answer for a detected label from the knowledge table, or None if the label isn't in it"""
+    if label not in LOCAL_KNOWLEDGE:
+        return None
+    category, fact = LOCAL_KNOWLEDGE[label]
+    article = "An" if label[0] in "aeiou" else "A"
+    answer = f"🔍 WHAT IS IT: {article} {label}!\n✨ COOL TRIVIA: {fact}"
+    info = categories.get(category)
+    if info:
+        focus = info['educational_focus']
+        answer += (f"\n🌟 WHY IT'S AWESOME: {category.replace('_', ' ').title()} are "
+                   f"{info['description'][0].lower()}{info['description'][1:]} - "
+                   f"great for {focus[0]} and {focus[1]}!")
+    return answer
+
+
+class Preclassification:
+    """What the local detector made of a frame"""
+
+    __slots__ = ('detection', 'crop', 'box', 'answer', 'seconds')
+
+    def __init__(self, detection: Optional[Dict[str, Any]] = None, crop: Optional[np.ndarray] = None,
+                 box: Optional[Tuple[int, int, int, int]] = None, answer: Optional[str] = None,
+                 seconds: float = 0.0):
+        self.detection = detection
+        self.crop = crop      # region to send to the vision model (None = the full frame)
+        self.box = box        # where crop was taken from (x1, y1, x2, y2)
+        self.answer = answer  # local answer (None = ask the vision model)
+        self.seconds = seconds
+
+    @property
+    def label(self) -> Optional[str]:
+        return self.detection['class'] if self.detection else None
+
+    @property
+    def confidence(self) -> float:
+        return float(self.detection['confidence']) if self.detection else 0.0
+
+    def hint(self) -> str:
+        """Prompt addition telling the vision model what the detector saw"""
+        if not self.detection or self.confidence < HINT_CONFIDENCE:
+            return ""
+        return (f"\n\nHint: a quick on-device detector thinks this is a {self.label} "
+                f"({self.confidence:.0%} sure). Check the picture yourself - the detector only knows "
+                f"everyday objects, so toys like dinosaurs often get the wrong label.")
+
+    def __repr__(self):
+        outcome = "answer" if self.answer else ("crop" if self.crop is not None else "full frame")
+        return f"Preclassification({self.label!r}, {self.confidence:.2f}, {outcome}, {self.seconds * 1000:.0f} ms)"
+
+
+class ObjectPreclassifier:
+    """Local detector pass in front of the vision API"""
+
+    def __init__(self, detector, categories: Dict[str, Dict[str, Any]],
+                 answer_confidence: float = ANSWER_CONFIDENCE):
+        """
+        Args:
+            detector: Anything with detect_objects(frame) returning SmartCameraDetector-style
+                      detections ({'class', 'confidence', 'bbox': [x1, y1, x2, y2]})
+            categories: ObjectIdentifier.object_categories, for local answers
+            answer_confidence: Detector confidence needed to answer without the vision API
+        """
+        self.detector = detector
+        self.categories = categories
+        self.answer_confidence = answer_confidence
+        self._lock = threading.Lock()
+
+        self.frames = 0
+        self.local_answers = 0
+        self.crops = 0
+        self.full_frames = 0
+        self.total_time = 0.0
+
+    def classify(self, frame: np.ndarray) -> Preclassification:
+        """Detect, pick the object being held up, and answer it locally or crop to it"""
+        start = time.perf_counter()
+        height, width = frame.shape[:2]
+        detection = most_salient(self.detector.detect_objects(frame) or [], width, height)
+
+        result = Preclassification(detection)
+        if detection is not None:
+            # The box also keys the recognition cache, so it is set even for local answers
+            result.crop, result.box = crop_box(frame, detection['bbox'])
+            if detection['confidence'] >= self.answer_confidence:
+                result.answer = local_answer(detection['class'], self.categories)
+        result.seconds = time.perf_counter() - start
+
+        with self._lock:
+            self.frames += 1
+            self.total_time += result.seconds
+            if result.answer is not None:
+                self.local_answers += 1
+            elif result.crop is not None:
+                self.crops += 1
+            else:
+                self.full_frames += 1
+        logger.debug(f"Pre-classified frame: {result}")
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'frames': self.frames,
+                'local_answers': self.local_answers,
+                'crops': self.crops,
+                'full_frames': self.full_frames,
+                'mean_ms': self.total_time / self.frames * 1000 if self.frames else 0.0,
+            }
@@ -0,0 +1,202 @@
+"""
+Shared OpenAI Event Loop for AI Assistant
+One long-lived asyncio loop thread and one set of OpenAI clients for the whole
+process, instead of a client per module and a fresh event loop per turn
+
+- AsyncOpenAI client on the loop thread; its connection pool (HTTP/2 when the
+  h2 package is installed) is kept alive between turns, so a turn doesn't pay
+  for TCP + TLS setup again
+- submit() runs a coroutine on the loop from any thread (conversation,
+  spelling auto-check, face loop) and returns a concurrent Future that can be
+  cancelled; every request gets a timeout
+- stream_chat() bridges a streamed chat completion to a plain iterator;
+  closing the iterator cancels the request
+- A shared synchronous client for code that still makes blocking calls (TTS,
+  image generation), so it reuses one connection pool too
+- Retries are left to the cloud transport (the clients' own retries are off),
+  so every request gets the same backoff, limits and circuit breaker
+"""
+
+import queue
+import asyncio
+import logging
+import threading
+import importlib.util
+import concurrent.futures
+from typing import Any, Awaitable, Dict, Iterator, Optional
+
+import openai
+
+from cloud_transport import CloudTransport, get_transport
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# httpx only needs h2 to be installed to enable HTTP/2
+HTTP2_AVAILABLE = HTTPX_AVAILABLE and importlib.util.find_spec('h2') is not None
+
+logger = logging.getLogger(__name__)
+
+# Per-request timeout (seconds) unless the caller gives one
+DEFAULT_TIMEOUT = 30.0
+# Idle connections are kept this long (httpx's default of 5 s drops them between turns)
+KEEPALIVE_EXPIRY = 120.0
+MAX_CONNECTIONS = 10
+CONNECT_TIMEOUT = 5.0
+
+_DONE = object()
+
+_openai_loop = None
+_openai_loop_lock = threading.Lock()
+
+
+class OpenAILoop:
+    """Event loop thread with shared OpenAI clients"""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 timeout: float = DEFAULT_TIMEOUT, transport: Optional[CloudTransport] = None):
+        """
+        Args:
+            api_key: OpenAI API key (None = OPENAI_API_KEY from the environment)
+            base_url: API base URL (None = the default, or OPENAI_BASE_URL)
+            timeout: Default per-request timeout in seconds
+            transport: Retry/limit/circuit layer (None = the process-wide one)
+        """
+        self.timeout = timeout
+        self.transport = transport or get_transport()
+        self.requests = 0
+        self.timeouts = 0
+        self.cancelled = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="openai-loop", daemon=True)
+        self._thread.start()
+
+        self.async_client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0,
+                                               http_client=self._http_client(async_client=True))
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0,
+                                    http_client=self._http_client(async_client=False))
+        logger.info(f"🔌 OpenAI loop started (HTTP/2: {'on' if HTTP2_AVAILABLE else 'off'}, "
+                    f"keep-alive {KEEPALIVE_EXPIRY:.0f}s, timeout {timeout:.0f}s)")
+
+    def _http_client(self, async_client: bool):
+        """Pooled HTTP client with long keep-alive, or None for the library's default"""
+        if not HTTPX_AVAILABLE:
+            return None
+        limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS,
+                              keepalive_expiry=KEEPALIVE_EXPIRY)
+        timeout = httpx.Timeout(self.timeout, connect=CONNECT_TIMEOUT)
+        if async_client:
+            return httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits, timeout=timeout)
+        return httpx.Client(http2=HTTP2_AVAILABLE, limits=limits, timeout=timeout)
+
+    def submit(self, coro: Awaitable, timeout: Optional[float] = None) -> concurrent.futures.Future:
+        """
+        Run a coroutine on the loop thread
+
+        Args:
+            coro: Coroutine to run (e.g. self.async_client.chat.completions.create(...))
+            timeout: Seconds before it is cancelled (None = the default timeout, 0 = no timeout)
+
+        Returns:
+            Future; future.cancel() cancels the request, future.result() raises
+            TimeoutError if it took too long
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("submit() called from the OpenAI loop thread - await the coroutine instead")
+        timeout = self.timeout if timeout is None else timeout
+        self.requests += 1
+        return asyncio.run_coroutine_threadsafe(self._guard(coro, timeout), self._loop)
+
+    async def _guard(self, coro: Awaitable, timeout: float) -> Any:
+        try:
+            if timeout:
+                return await asyncio.wait_for(coro, timeout)
+            return await coro
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"⏱️ OpenAI request timed out after {timeout:g}s")
+            raise
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and wait for its result (blocks the calling thread only)"""
+        return self.submit(coro, timeout).result()
+
+    async def achat(self, endpoint: str = 'chat', **kwargs) -> Any:
+        """Chat completion through the transport (await on the loop); kwargs go to chat.completions.create"""
+        return await self.transport.acall(endpoint, lambda: self.async_client.chat.completions.create(**kwargs))
+
+    def chat(self, timeout: Optional[float] = None, endpoint: str = 'chat', **kwargs) -> concurrent.futures.Future:
+        """
+        Chat completion request from a sync thread
+
+        Args:
+            timeout: Seconds for the whole request, retries included (None = the default timeout)
+            endpoint: Transport endpoint it is limited and measured under ('chat', 'vision', ...)
+            **kwargs: Passed to chat.completions.create
+        """
+        return self.submit(self.achat(endpoint, **kwargs), timeout)
+
+    def stream_chat(self, timeout: Optional[float] = None, **kwargs) -> Iterator[str]:
+        """
+        Streamed chat completion as text deltas
+
+        Args:
+            timeout: Longest wait for the next chunk (None = the default timeout)
+            **kwargs: Passed to chat.completions.create
+
+        Closing the iterator early cancels the request and its HTTP stream.
+        """
+        kwargs['timeout'] = self.timeout if timeout is None else timeout
+        deltas = queue.Queue()
+
+        async def pump():
+            # Retries only cover opening the stream; a stream that breaks halfway is not replayed
+            stream = await self.transport.acall(
+                'chat', lambda: self.async_client.chat.completions.create(stream=True, **kwargs))
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        deltas.put(chunk.choices[0].delta.content)
+            finally:
+                await stream.close()
+
+        future = self.submit(pump(), timeout=0)
+        future.add_done_callback(lambda _: deltas.put(_DONE))
+        try:
+            while True:
+                delta = deltas.get()
+                if delta is _DONE:
+                    break
+                yield delta
+            future.result()
+        finally:
+            future.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        return {'requests': self.requests, 'timeouts': self.timeouts, 'cancelled': self.cancelled}
+
+    def close(self):
+        """Close the clients' connections and stop the loop thread"""
+        try:
+            self.run(self.async_client.close(), timeout=CONNECT_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"⚠️ Closing the async OpenAI client failed: {e}")
+        self.client.close()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=CONNECT_TIMEOUT)
+
+
+def get_openai_loop(api_key: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT) -> OpenAILoop:
+    """Process-wide OpenAI loop (created by the first caller, whose settings it uses)"""
+    global _openai_loop
+    with _openai_loop_lock:
+        if _openai_loop is None:
+            _openai_loop = OpenAILoop(api_key=api_key, timeout=timeout)
+        return _openai_loop
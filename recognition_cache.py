@@ -0,0 +1,325 @@
+"""
+Recognition Cache for AI Assistant
+Remembers what the vision model said about a toy, so holding up the same
+dinosaur or stuffed animal again is answered instantly instead of with a
+fresh vision API call
+
+- Key: a compact embedding of the object region - a 16x16 contrast-normalized
+  thumbnail of its shape and markings plus a hue/saturation histogram (so a
+  red and a green toy of the same shape don't match). The region is the
+  local detector's box around the held-up object, so position and size don't
+  matter. Without a box, or when the object fills too little of it (the
+  region would mostly be the child and the room), nothing is cached
+- Lookup: nearest neighbour within a shape and a colour threshold, scoped
+  per user and per kind of question ("object", "dinosaur", "animal")
+- Entries expire after a TTL, the least recently used are evicted past a size
+  limit, and the cache is saved to a JSON file so it survives restarts
+- Hits come back with a varied "I remember this one" opener so repeats don't
+  sound canned
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = 16
+HISTOGRAM_BINS = (12, 4)    # hue x saturation
+MAX_SHAPE_DISTANCE = 0.2    # 1 - correlation of the thumbnails (0 = identical, 2 = inverted)
+MAX_COLOR_DISTANCE = 0.15   # share of the colour histogram that differs (0-1)
+MIN_OBJECT_SHARE = 0.25     # the detected object must fill this much of the region to be remembered
+DEFAULT_TTL = 3 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 200
+
+REMEMBER_OPENERS = {
+    "object": [
+        "Oh, I remember this one!",
+        "I've seen this before!",
+        "Hey, I know this one!",
+        "This looks familiar!",
+    ],
+    "dinosaur": [
+        "Roar! I remember this dinosaur!",
+        "I know this dinosaur already!",
+        "Hey, it's our dinosaur friend again!",
+        "I'd recognize this dinosaur anywhere!",
+    ],
+    "animal": [
+        "I remember this animal!",
+        "Oh, it's this one again!",
+        "I know this animal!",
+        "Welcome back, little friend!",
+    ],
+}
+
+
+class Signature:
+    """Compact embedding of an object region"""
+
+    __slots__ = ('shape', 'colors')
+
+    def __init__(self, shape: np.ndarray, colors: np.ndarray):
+        self.shape = shape    # unit-length contrast-normalized thumbnail
+        self.colors = colors  # hue/saturation histogram summing to 1
+
+    def distance(self, other: 'Signature') -> Tuple[float, float]:
+        """(shape distance, colour distance)"""
+        return 1.0 - float(np.dot(self.shape, other.shape)), 0.5 * float(np.abs(self.colors - other.colors).sum())
+
+    def to_json(self) -> Dict[str, Any]:
+        return {'shape': [round(float(v), 4) for v in self.shape],
+                'colors': [round(float(v), 4) for v in self.colors]}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'Signature':
+        return cls(np.array(data['shape'], np.float32), np.array(data['colors'], np.float32))
+
+
+def object_region(frame: np.ndarray, box, object_box=None) -> Optional[np.ndarray]:
+    """
+    Crop to the region around the object
+
+    Args:
+        frame: BGR frame
+        box: Region (x1, y1, x2, y2) around the held-up object, e.g. Preclassification.box
+        object_box: The detection itself, if box includes context around it
+
+    Returns:
+        The region, or None without a usable box or when the object fills less
+        than MIN_OBJECT_SHARE of it
+    """
+    if box is None:
+        return None
+    height, width = frame.shape[:2]
+    x1, y1, x2, y2 = (int(v) for v in box)
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(width, x2), min(height, y2)
+    if x2 - x1 < 8 or y2 - y1 < 8:
+        return None
+    if object_box is not None:
+        ox1, oy1, ox2, oy2 = object_box
+        overlap = max(0.0, min(ox2, x2) - max(ox1, x1)) * max(0.0, min(oy2, y2) - max(oy1, y1))
+        if overlap < MIN_OBJECT_SHARE * (x2 - x1) * (y2 - y1):
+            return None
+    return frame[y1:y2, x1:x2]
+
+
+def image_signature(frame: np.ndarray, box, object_box=None) -> Optional[Signature]:
+    """Signature of the object in box (see object_region), or None if it can't be told apart reliably"""
+    region = object_region(frame, box, object_box)
+    if region is None:
+        return None
+    gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY) if region.ndim == 3 else region
+    thumbnail = cv2.resize(gray, (THUMBNAIL_SIZE, THUMBNAIL_SIZE), interpolation=cv2.INTER_AREA).astype(np.float32)
+    thumbnail = cv2.GaussianBlur(thumbnail, (3, 3), 0).flatten()
+    thumbnail -= thumbnail.mean()
+    shape = thumbnail / (np.linalg.norm(thumbnail) + 1e-6)
+
+    if region.ndim == 3:
+        hsv = cv2.cvtColor(region, cv2.COLOR_BGR2HSV)
+        colors = cv2.calcHist([hsv], [0, 1], None, list(HISTOGRAM_BINS), [0, 180, 0, 256]).flatten()
+        colors /= max(1.0, float(colors.sum()))
+    else:
+        colors = np.zeros(HISTOGRAM_BINS[0] * HISTOGRAM_BINS[1], np.float32)
+    return Signature(shape.astype(np.float32), colors.astype(np.float32))
+
+
+class RecognitionCache:
+    """Nearest-neighbour cache of vision results, persisted to a JSON file"""
+
+    def __init__(self, path: str = "recognition_cache/results.json", ttl_seconds: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_shape_distance: float = MAX_SHAPE_DISTANCE,
+                 max_color_distance: float = MAX_COLOR_DISTANCE):
+        """
+        Args:
+            path: JSON file the cache is saved to (None keeps it in memory only)
+            ttl_seconds: How long a result is reused
+            max_entries: Least recently used entries beyond this are evicted
+            max_shape_distance: Thumbnail distance that still counts as the same object
+            max_color_distance: Colour histogram distance that still counts as the same object
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_shape_distance = max_shape_distance
+        self.max_color_distance = max_color_distance
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()  # least recently used first
+        self._next_id = 0
+        self._last_opener = {}
+        self._writer = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="recognition-cache")
+        self._save_pending = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Could not read recognition cache {self.path}: {e}")
+            return
+        now = time.time()
+        for entry in sorted(stored.get('entries', []), key=lambda e: e.get('last_used', 0)):
+            if now - entry.get('created', 0) > self.ttl_seconds:
+                continue
+            entry['signature'] = Signature.from_json(entry['signature'])
+            self._entries[self._next_id] = entry
+            self._next_id += 1
+        logger.info(f"🧠 Recognition cache: {len(self._entries)} remembered results from {self.path}")
+
+    def lookup(self, user: str, kind: str, signature: Optional[Signature]) -> Optional[Dict[str, Any]]:
+        """
+        Cached result for the nearest matching object, or None
+
+        The returned result is a copy marked 'cached': True, with a varied opener
+        prepended to its message. Objects without a signature (None) are never looked up.
+        """
+        if signature is None:
+            return None
+        now = time.time()
+        with self._lock:
+            best_id, best_distance = self._nearest(user, kind, signature, now)
+            if best_id is None:
+                self.misses += 1
+                return None
+            entry = self._entries[best_id]
+            self._entries.move_to_end(best_id)
+            entry['last_used'] = now
+            entry['hits'] += 1
+            self.hits += 1
+            result = dict(entry['result'])
+            self._schedule_save()
+
+        result['cached'] = True
+        result['message'] = self._vary(kind, result.get('message', ''))
+        if 'ai_response' in result:
+            result['ai_response'] = result['message']
+        logger.info(f"🧠 Recognition cache hit for {user}/{kind} (distance {best_distance:.2f}, "
+                    f"seen {entry['hits']} times)")
+        return result
+
+    def contains(self, user: str, kind: str, signature: Optional[Signature]) -> bool:
+        """True if lookup() would hit (without counting it as a hit)"""
+        if signature is None:
+            return False
+        with self._lock:
+            return self._nearest(user, kind, signature, time.time())[0] is not None
+
+    def _nearest(self, user: str, kind: str, signature: Signature, now: float) -> Tuple[Optional[int], float]:
+        """Id and distance of the closest matching entry, dropping expired ones on the way (lock held)"""
+        best_id, best_distance = None, 0.0
+        for entry_id, entry in list(self._entries.items()):
+            if now - entry['created'] > self.ttl_seconds:
+                del self._entries[entry_id]
+                self.evictions += 1
+                continue
+            if entry['user'] != user or entry['kind'] != kind:
+                continue
+            shape, color = signature.distance(entry['signature'])
+            if shape <= self.max_shape_distance and color <= self.max_color_distance:
+                if best_id is None or shape + color < best_distance:
+                    best_id, best_distance = entry_id, shape + color
+        return best_id, best_distance
+
+    def put(self, user: str, kind: str, signature: Optional[Signature], result: Dict[str, Any]):
+        """Remember a successful vision result for this object (no-op without a signature)"""
+        if signature is None:
+            return
+        now = time.time()
+        stored = {k: v for k, v in result.items() if k not in ('cached', 'image_path')}
+        with self._lock:
+            self._entries[self._next_id] = {
+                'user': user,
+                'kind': kind,
+                'signature': signature,
+                'result': stored,
+                'created': now,
+                'last_used': now,
+                'hits': 0,
+            }
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._schedule_save()
+
+    def _vary(self, kind: str, message: str) -> str:
+        """Prepend an opener, never the same one twice in a row"""
+        openers = REMEMBER_OPENERS.get(kind, REMEMBER_OPENERS["object"])
+        choices = [o for o in openers if o != self._last_opener.get(kind)] or openers
+        opener = random.choice(choices)
+        self._last_opener[kind] = opener
+        return f"{opener} {message}".strip()
+
+    def _schedule_save(self):
+        """Write the cache file in the background, coalescing bursts of changes (lock held)"""
+        if not self.path or self._save_pending:
+            return
+        self._save_pending = True
+        self._writer.submit(self._save)
+
+    def _save(self):
+        with self._lock:
+            self._save_pending = False
+            entries = [dict(entry, signature=entry['signature'].to_json()) for entry in self._entries.values()]
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({'entries': entries}, f)
+            os.replace(temp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"⚠️ Could not save recognition cache: {e}")
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait for pending saves (tests and shutdown)"""
+        self._writer.submit(lambda: None).result(timeout)
+
+    def clear(self, user: Optional[str] = None):
+        """Forget everything, or everything remembered for one user"""
+        with self._lock:
+            for entry_id in [i for i, e in self._entries.items() if user is None or e['user'] == user]:
+                del self._entries[entry_id]
+            self._schedule_save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_recognition_cache(path: str = "recognition_cache/results.json", ttl_seconds: float = DEFAULT_TTL,
+                          max_entries: int = DEFAULT_MAX_ENTRIES) -> RecognitionCache:
+    """Process-wide recognition cache (created by the first caller, whose settings it uses)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RecognitionCache(path, ttl_seconds=ttl_seconds, max_entries=max_entries)
+        return _cache
@@ -0,0 +1,177 @@
+"""
+Scene Change Gate for AI Assistant
+Decides locally when a camera view is worth a vision API call, so the
+spelling auto-check doesn't send a frame every 2 seconds while nothing changes
+
+A frame passes the gate only when all three hold:
+- Stability: frame-to-frame difference has stayed low for a short window
+  (the paper is being held still, not moved into place)
+- Novelty: the steady view differs from the last view that was sent
+- Text: the view has letter-sized dark strokes on a lighter background
+  (adaptive threshold + connected components, with an edge density check)
+
+Works on small greyscale frames (e.g. a frame bus variant at scale 0.25) and
+costs well under a millisecond per frame.
+"""
+
+import time
+import logging
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_WIDTH = 160        # frames are resized to this width before analysis
+SIGNATURE_SIZE = (64, 48)   # thumbnail compared against the last sent view
+MOTION_THRESHOLD = 4.0      # mean abs difference (0-255) between frames that counts as movement
+STABLE_SECONDS = 0.8        # how long the view must be still
+PIXEL_CHANGE = 25           # thumbnail pixels that moved this much count as changed...
+CHANGE_THRESHOLD = 0.005    # ...and this fraction of changed pixels makes a view new (one fixed letter is enough)
+MIN_TEXT_COMPONENTS = 1     # letter-shaped strokes needed (joined-up handwriting is one stroke per word)
+MAX_STROKE_FILL = 0.6       # strokes cover little of their bounding box; solid blobs cover most of it
+EDGE_DENSITY_RANGE = (0.01, 0.25)
+
+
+class SceneChangeGate:
+    """Local pre-filter in front of a vision API call"""
+
+    def __init__(self, stable_seconds: float = STABLE_SECONDS, motion_threshold: float = MOTION_THRESHOLD,
+                 change_threshold: float = CHANGE_THRESHOLD, min_text_components: int = MIN_TEXT_COMPONENTS):
+        """
+        Args:
+            stable_seconds: How long the view must be still before it can be sent
+            motion_threshold: Frame-to-frame difference that counts as movement
+            change_threshold: Fraction of changed thumbnail pixels that makes a view new
+            min_text_components: Letter-sized strokes needed for a view to count as text
+        """
+        self.stable_seconds = stable_seconds
+        self.motion_threshold = motion_threshold
+        self.change_threshold = change_threshold
+        self.min_text_components = min_text_components
+
+        self._previous = None
+        self._still_since = None
+        self._sent_signature = None
+        self._rejected_signature = None  # steady view already found to have no text
+
+        self.frames = 0
+        self.passed = 0
+        self.rejected_moving = 0
+        self.rejected_unchanged = 0
+        self.rejected_no_text = 0
+        self.first_frame_at = None
+        self.last_frame_at = None
+        self.last_reason = ""
+
+    @staticmethod
+    def _prepare(frame: np.ndarray) -> np.ndarray:
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if frame.shape[1] != ANALYSIS_WIDTH:
+            height = max(1, round(frame.shape[0] * ANALYSIS_WIDTH / frame.shape[1]))
+            frame = cv2.resize(frame, (ANALYSIS_WIDTH, height), interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(frame, (3, 3), 0)
+
+    @staticmethod
+    def _signature(gray: np.ndarray) -> np.ndarray:
+        return cv2.resize(gray, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    @staticmethod
+    def _differs(a: Optional[np.ndarray], b: np.ndarray, threshold: float) -> bool:
+        return a is None or float(np.mean(np.abs(a - b) > PIXEL_CHANGE)) > threshold
+
+    def text_components(self, gray: np.ndarray) -> int:
+        """Number of letter-sized dark strokes (0 if the edge density rules out text)"""
+        edges = cv2.Canny(gray, 50, 150)
+        density = float(np.count_nonzero(edges)) / edges.size
+        if not EDGE_DENSITY_RANGE[0] <= density <= EDGE_DENSITY_RANGE[1]:
+            return 0
+
+        ink = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV, 15, 10)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+        height, width = gray.shape
+        min_area, max_area = 0.0003 * gray.size, 0.05 * gray.size
+        letters = 0
+        for x, y, w, h, area in stats[1:]:
+            if not min_area <= area <= max_area:
+                continue
+            if not 0.03 * height <= h <= 0.45 * height or w > 0.6 * width:
+                continue
+            if not 0.1 <= w / h <= 15.0 or area > MAX_STROKE_FILL * w * h:
+                continue
+            letters += 1
+        return letters
+
+    def feed(self, frame: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """
+        Look at the next camera frame
+
+        Returns:
+            True if this frame shows a new, steady view with text in it - send it
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        gray = self._prepare(frame)
+        previous, self._previous = self._previous, gray
+        self.frames += 1
+        if self.first_frame_at is None:
+            self.first_frame_at = timestamp
+        self.last_frame_at = timestamp
+
+        if previous is None or previous.shape != gray.shape or \
+                float(cv2.absdiff(previous, gray).mean()) > self.motion_threshold:
+            self._still_since = None
+            self.rejected_moving += 1
+            self.last_reason = "moving"
+            return False
+        if self._still_since is None:
+            self._still_since = timestamp
+        if timestamp - self._still_since < self.stable_seconds:
+            self.rejected_moving += 1
+            self.last_reason = "settling"
+            return False
+
+        signature = self._signature(gray)
+        if not self._differs(self._sent_signature, signature, self.change_threshold) or \
+                not self._differs(self._rejected_signature, signature, self.change_threshold):
+            self.rejected_unchanged += 1
+            self.last_reason = "unchanged"
+            return False
+
+        letters = self.text_components(gray)
+        if letters < self.min_text_components:
+            self._rejected_signature = signature
+            self.rejected_no_text += 1
+            self.last_reason = f"no text ({letters} strokes)"
+            return False
+
+        self._sent_signature = signature
+        self._rejected_signature = None
+        self.passed += 1
+        self.last_reason = f"new text view ({letters} strokes)"
+        return True
+
+    def retry(self):
+        """Forget the last sent view (e.g. the API call failed), so it can pass again"""
+        self._sent_signature = None
+
+    def stats(self, poll_interval: float = 2.0) -> Dict[str, Any]:
+        """
+        Gate counters, and the calls a fixed poll every poll_interval seconds would have made
+
+        Args:
+            poll_interval: Interval of the old unconditional auto-check
+        """
+        elapsed = self.last_frame_at - self.first_frame_at if self.frames else 0.0
+        polled = int(elapsed / poll_interval)
+        return {
+            'seconds': elapsed,
+            'frames': self.frames,
+            'api_calls': self.passed,
+            'polling_calls': polled,
+            'calls_avoided': max(0, polled - self.passed),
+            'rejected_moving': self.rejected_moving,
+            'rejected_unchanged': self.rejected_unchanged,
+            'rejected_no_text': self.rejected_no_text,
+        }
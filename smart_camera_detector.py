@@ -7,10 +7,9 @@ Natural conversation flow with personalized greetings
 import cv2
 import time
 import numpy as np
-import os
 import logging
 from typing import Optional, List, Dict, Any
-from ultralytics import YOLO
+from model_registry import get_yolo_model, get_face_gallery
 
 # Try to import face recognition
 try:
@@ -49,14 +48,16 @@ class SmartCameraDetector:
         self.model = None
         self.device = 'cpu'  # Default to CPU for compatibility
         self.model_path = f'yolov8{model_size}.pt'
-        print(f"🤖 Loading YOLOv8 model: {self.model_path}")
-        self.model = YOLO(self.model_path)
+        # Shared, process-wide model - loaded once no matter how many detectors exist
+        self.model = get_yolo_model(self.model_path)
         
         # Face recognition setup
         self.face_recognition_enabled = FACE_RECOGNITION_AVAILABLE
         self.known_face_encodings = []
         self.known_face_names = []
+        self.face_gallery = None
         self.face_detection_threshold = 0.6
+        self.face_match_top_k = 1  # 1 = closest photo per person, >1 = mean of k closest photos
         
         # Greeting system
         self.last_greeting_time = {}
@@ -87,53 +88,13 @@ class SmartCameraDetector:
             self.load_known_faces()
         
     def load_known_faces(self):
-        """Load known faces from the people directory."""
+        """Load known faces from the shared people/ gallery (encoded once per process)."""
         if not self.face_recognition_enabled:
             return
         
-        people_dir = "people"
-        if not os.path.exists(people_dir):
-            print(f"⚠️ People directory '{people_dir}' not found")
-            return
-        
-        print("👤 Loading known faces...")
-        
-        for person_name in os.listdir(people_dir):
-            person_path = os.path.join(people_dir, person_name)
-            if not os.path.isdir(person_path):
-                continue
-            
-            print(f"   Loading faces for {person_name.title()}...")
-            person_encodings = []
-            
-            # Load all images for this person
-            for image_file in os.listdir(person_path):
-                if image_file.lower().endswith(('.jpg', '.jpeg', '.png')):
-                    image_path = os.path.join(person_path, image_file)
-                    
-                    try:
-                        # Load image
-                        image = face_recognition.load_image_file(image_path)
-                        
-                        # Get face encodings
-                        encodings = face_recognition.face_encodings(image)
-                        
-                        if encodings:
-                            person_encodings.extend(encodings)
-                            print(f"     ✅ Loaded {len(encodings)} face(s) from {image_file}")
-                        else:
-                            print(f"     ⚠️ No face found in {image_file}")
-                    
-                    except Exception as e:
-                        print(f"     ❌ Error loading {image_file}: {e}")
-            
-            # Add all encodings for this person
-            if person_encodings:
-                self.known_face_encodings.extend(person_encodings)
-                self.known_face_names.extend([person_name] * len(person_encodings))
-                print(f"   ✅ Total {len(person_encodings)} face encodings loaded for {person_name.title()}")
-        
-        print(f"🎉 Face recognition ready! Loaded {len(self.known_face_names)} face encodings for {len(set(self.known_face_names))} people")
+        self.face_gallery = get_face_gallery("people")
+        self.known_face_encodings = self.face_gallery.encodings
+        self.known_face_names = self.face_gallery.names
 
     def detect_faces(self, frame):
         """Detect and recognize faces - enhanced with AITRIOS AI when available"""
@@ -178,19 +139,13 @@ class SmartCameraDetector:
             
             face_detections = []
             
-            for face_encoding, face_location in zip(face_encodings, face_locations):
-                # Compare with known faces
-                matches = face_recognition.compare_faces(self.known_face_encodings, face_encoding, tolerance=self.face_detection_threshold)
-                face_distances = face_recognition.face_distance(self.known_face_encodings, face_encoding)
-                
-                name = "Unknown"
-                confidence = 0.0
-                
-                if any(matches):
-                    best_match_index = np.argmin(face_distances)
-                    if matches[best_match_index]:
-                        name = self.known_face_names[best_match_index]
-                        confidence = 1.0 - face_distances[best_match_index]
+            # Match all faces in the frame against the gallery in one batched operation
+            matches = self.face_gallery.match(face_encodings, tolerance=self.face_detection_threshold,
+                                              top_k=self.face_match_top_k) if self.face_gallery else \
+                [("Unknown", 1.0)] * len(face_encodings)
+            
+            for (name, distance), face_location in zip(matches, face_locations):
+                confidence = 1.0 - distance if name != "Unknown" else 0.0
                 
                 # Scale back up face locations
                 top, right, bottom, left = face_location
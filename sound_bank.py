@@ -0,0 +1,304 @@
+"""
+Sound Bank for AI Assistant
+Synthesizes every UI cue sound once (listening, completion, wake word,
+ready-to-speak, celebration, buzzer) and keeps them as ready pygame Sounds
+shared by the assistant and the game modules
+
+Cues used to be regenerated with numpy on every call, several times per
+conversational turn; play(name) is now a dictionary lookup plus Sound.play().
+Rendered cues are also written to a WAV directory so later starts just load them.
+"""
+
+import os
+import wave
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+# Try to import pygame
+try:
+    import pygame
+    PYGAME_AVAILABLE = True
+except ImportError:
+    PYGAME_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 22050
+# Bump when a generator changes so cached WAVs are re-rendered
+SOUND_BANK_VERSION = 1
+
+_sound_bank = None
+_sound_bank_lock = threading.Lock()
+
+
+def _listening_tone(sample_rate: int) -> np.ndarray:
+    """Rising two-note tone (C4 to E4)"""
+    duration = 0.3
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+
+    note1 = np.sin(261.63 * 2 * np.pi * t) * 0.3  # C4
+    note2 = np.sin(329.63 * 2 * np.pi * t) * 0.3  # E4
+
+    # Fade in/out for smoothness
+    fade_samples = int(sample_rate * 0.05)  # 50ms fade
+    for note in (note1, note2):
+        note[:fade_samples] *= np.linspace(0, 1, fade_samples)
+        note[-fade_samples:] *= np.linspace(1, 0, fade_samples)
+
+    return np.concatenate([note1, note2])
+
+
+def _completion_tone(sample_rate: int) -> np.ndarray:
+    """Gentle descending sweep (G4 to C4)"""
+    duration = 0.4
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+
+    freq_sweep = np.linspace(392.00, 261.63, len(t))
+    tone = np.sin(2 * np.pi * freq_sweep * t) * 0.25
+    tone *= np.exp(-t * 3)  # Gentle decay
+
+    fade_samples = int(sample_rate * 0.05)  # 50ms fade
+    tone[:fade_samples] *= np.linspace(0, 1, fade_samples)
+    return tone
+
+
+def _wake_word_tone(sample_rate: int) -> np.ndarray:
+    """Cheerful C-E-G chord acknowledgment"""
+    duration = 0.2
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+
+    chord = (np.sin(261.63 * 2 * np.pi * t) +
+             np.sin(329.63 * 2 * np.pi * t) +
+             np.sin(392.00 * 2 * np.pi * t)) * 0.15
+    return chord * np.exp(-t * 5)  # Quick decay
+
+
+def _ready_to_speak_tone(sample_rate: int) -> np.ndarray:
+    """Kid-friendly 'your turn to talk!' chime: C5-E5-G5 bells plus sparkle"""
+    duration = 0.6
+    note_duration = duration / 4
+    sparkle_duration = duration / 4
+
+    t_note = np.linspace(0, note_duration, int(sample_rate * note_duration), False)
+    t_sparkle = np.linspace(0, sparkle_duration, int(sample_rate * sparkle_duration), False)
+
+    def bell_note(freq, volume):
+        # Fundamental plus harmonics, quick attack and gentle decay
+        fundamental = np.sin(2 * np.pi * freq * t_note)
+        harmonic2 = 0.3 * np.sin(2 * np.pi * freq * 2 * t_note)
+        harmonic3 = 0.1 * np.sin(2 * np.pi * freq * 3 * t_note)
+        envelope = np.exp(-t_note * 8) * (1 - np.exp(-t_note * 30))
+        return (fundamental + harmonic2 + harmonic3) * envelope * volume
+
+    note1 = bell_note(523, 0.35)  # C5 - bright start
+    note2 = bell_note(659, 0.4)   # E5 - building excitement
+    note3 = bell_note(784, 0.45)  # G5 - "go ahead!" peak
+
+    # Twinkling sparkle at the end
+    sparkle = np.zeros_like(t_sparkle)
+    for i, freq in enumerate([1047, 1319, 1568, 2093]):
+        start_idx = int(i * 0.02 * sample_rate)
+        delayed_t = t_sparkle[start_idx:]
+        if len(delayed_t) > 0:
+            twinkle = np.sin(2 * np.pi * freq * delayed_t)
+            twinkle *= np.exp(-delayed_t * 12)
+            twinkle *= (1 + 0.3 * np.sin(15 * delayed_t))  # Shimmer
+            sparkle[start_idx:start_idx + len(twinkle)] += twinkle * 0.2
+
+    gap = np.zeros(int(sample_rate * 0.02))  # 20ms gaps
+    combined = np.concatenate([note1, gap, note2, gap, note3, sparkle])
+
+    # Subtle reverb
+    reverb_delay = int(0.03 * sample_rate)
+    if len(combined) > reverb_delay:
+        reverb = np.zeros_like(combined)
+        reverb[reverb_delay:] = combined[:-reverb_delay] * 0.15
+        combined += reverb
+
+    return np.clip(combined, -1, 1) * 0.8
+
+
+def _celebration_sound(sample_rate: int) -> np.ndarray:
+    """'Ta-Da!' victory sound for correct answers"""
+    duration = 1.8
+    t = np.linspace(0, duration, int(sample_rate * duration))
+    celebration = np.zeros_like(t)
+
+    # Rising bell notes A3, C#4, E4, A4 (Ta!)
+    for freq, start_time, end_time in [(220, 0.0, 0.2), (277, 0.1, 0.3), (330, 0.2, 0.4), (440, 0.3, 0.6)]:
+        note_mask = (t >= start_time) & (t <= end_time)
+        if np.any(note_mask):
+            note_t = t[note_mask] - start_time
+            fundamental = np.sin(2 * np.pi * freq * note_t)
+            harmonic2 = 0.3 * np.sin(2 * np.pi * freq * 2 * note_t)
+            harmonic3 = 0.1 * np.sin(2 * np.pi * freq * 3 * note_t)
+            envelope = np.exp(-note_t * 4) * (1 - np.exp(-note_t * 50))
+            celebration[note_mask] += (fundamental + harmonic2 + harmonic3) * envelope * 0.4
+
+    # Staggered shimmering sparkles (Da!)
+    sparkle_start = 0.5
+    sparkle_t = t[(t >= sparkle_start) & (t <= duration)] - sparkle_start
+    for i, freq in enumerate([880, 1108, 1397, 1760, 2217]):
+        delay = i * 0.08
+        delayed_t = sparkle_t[int(delay * sample_rate):]
+        if len(delayed_t) > 0:
+            shimmer = np.sin(2 * np.pi * freq * delayed_t)
+            shimmer *= np.exp(-delayed_t * 2)
+            shimmer *= (1 + 0.5 * np.sin(10 * delayed_t))  # Tremolo
+            start_idx = int((sparkle_start + delay) * sample_rate)
+            end_idx = start_idx + len(shimmer)
+            if end_idx <= len(celebration):
+                celebration[start_idx:end_idx] += shimmer * 0.15
+
+    # Final triumphant A major chord
+    final_start = 1.2
+    final_mask = t >= final_start
+    final_t = t[final_mask] - final_start
+    for freq in [440, 554, 659]:
+        celebration[final_mask] += np.sin(2 * np.pi * freq * final_t) * np.exp(-final_t * 1.5) * 0.6 * 0.3
+
+    # Gentle reverb
+    reverb_delay = int(0.05 * sample_rate)
+    reverb = np.zeros_like(celebration)
+    reverb[reverb_delay:] = celebration[:-reverb_delay] * 0.2
+    celebration += reverb
+
+    # Fade out at the end
+    fade_start = 1.5
+    fade_mask = t >= fade_start
+    celebration[fade_mask] *= 1 - (t[fade_mask] - fade_start) / (duration - fade_start)
+
+    return np.clip(celebration, -1, 1) * 0.7
+
+
+def _buzzer_sound(sample_rate: int) -> np.ndarray:
+    """Low buzzer for wrong answers"""
+    duration = 0.8
+    t = np.linspace(0, duration, int(sample_rate * duration))
+
+    frequency = 150
+    buzz = np.sin(2 * np.pi * frequency * t)
+    buzz += 0.5 * np.sin(2 * np.pi * frequency * 2 * t)  # Octave
+    buzz += 0.3 * np.sin(2 * np.pi * frequency * 3 * t)  # Fifth
+    return np.clip(buzz * np.exp(-t * 1.5), -1, 1)
+
+
+SOUND_GENERATORS: Dict[str, Callable[[int], np.ndarray]] = {
+    'listening': _listening_tone,
+    'completion': _completion_tone,
+    'wake_word': _wake_word_tone,
+    'ready_to_speak': _ready_to_speak_tone,
+    'celebration': _celebration_sound,
+    'buzzer': _buzzer_sound,
+}
+
+
+class SoundBank:
+    """Pre-rendered cue sounds, played by name"""
+
+    def __init__(self, cache_dir: Optional[str] = "sound_cache"):
+        """
+        Initialize an empty sound bank
+
+        Args:
+            cache_dir: Directory for rendered WAV files (None = render in memory every start)
+        """
+        self.cache_dir = cache_dir
+        self.sounds = {}
+        self.loaded = False
+        self._play_listeners = []
+
+    def load(self) -> 'SoundBank':
+        """Render (or load from the WAV cache) every cue sound"""
+        if not PYGAME_AVAILABLE:
+            logger.warning("pygame not available - sound bank disabled")
+            return self
+
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=2, buffer=512)
+        sample_rate, _, channels = pygame.mixer.get_init()
+
+        rendered = 0
+        for name, generator in SOUND_GENERATORS.items():
+            try:
+                sound = self._load_cached(name, sample_rate)
+                if sound is None:
+                    samples = (np.clip(generator(sample_rate), -1, 1) * 32767).astype(np.int16)
+                    self._write_cached(name, sample_rate, samples)
+                    if channels > 1:
+                        samples = np.repeat(samples[:, None], channels, axis=1)
+                    sound = pygame.mixer.Sound(buffer=np.ascontiguousarray(samples).tobytes())
+                    rendered += 1
+                self.sounds[name] = sound
+            except Exception as e:
+                logger.error(f"Error preparing '{name}' sound: {e}")
+
+        self.loaded = True
+        logger.info(f"🔊 Sound bank ready: {len(self.sounds)} cue sounds "
+                    f"({rendered} rendered, {len(self.sounds) - rendered} from cache)")
+        return self
+
+    def play(self, name: str):
+        """Play a cue sound without waiting (returns the pygame Channel, or None)"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        channel = sound.play()
+        for listener in self._play_listeners:
+            listener(name, sound.get_length())
+        return channel
+
+    def add_play_listener(self, listener: Callable[[str, float], None]):
+        """Call listener(name, seconds) whenever a cue starts playing (e.g. to mute the microphone)"""
+        self._play_listeners.append(listener)
+
+    def get(self, name: str):
+        """The pygame Sound for name, or None"""
+        return self.sounds.get(name)
+
+    def has(self, name: str) -> bool:
+        return name in self.sounds
+
+    def _cache_path(self, name: str, sample_rate: int) -> str:
+        return os.path.join(self.cache_dir, f"{name}-v{SOUND_BANK_VERSION}-{sample_rate}.wav")
+
+    def _load_cached(self, name: str, sample_rate: int):
+        """Load a previously rendered WAV, or None"""
+        if not self.cache_dir:
+            return None
+        path = self._cache_path(name, sample_rate)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pygame.mixer.Sound(file=path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached sound {path}: {e}")
+            return None
+
+    def _write_cached(self, name: str, sample_rate: int, samples: np.ndarray):
+        """Save a rendered cue as a mono 16-bit WAV"""
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._cache_path(name, sample_rate)
+            with wave.open(path + '.tmp', 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(sample_rate)
+                wav.writeframes(samples.tobytes())
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.warning(f"Could not cache '{name}' sound: {e}")
+
+
+def get_sound_bank(cache_dir: Optional[str] = "sound_cache") -> SoundBank:
+    """Process-wide sound bank, rendered on first use"""
+    global _sound_bank
+    with _sound_bank_lock:
+        if _sound_bank is None:
+            _sound_bank = SoundBank(cache_dir).load()
+        return _sound_bank
@@ -0,0 +1,224 @@
+"""
+Streaming Speech Pipeline for AI Assistant
+Turns a stream of chat completion tokens into speech while the answer is still
+being generated: tokens are segmented into sentences, each sentence is
+synthesized concurrently, and finished audio is played back in order
+
+Time-to-first-token, time-to-first-audio and total turn latency are recorded
+for every turn so the speed-up over the one-shot speak() path can be measured
+"""
+
+import re
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Callable, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by whitespace
+SENTENCE_END = re.compile(r'([.!?]+["\')\]]*)\s+|\n+')
+
+
+class SentenceSegmenter:
+    """Incrementally splits streamed text into speakable sentences"""
+
+    def __init__(self, min_chars: int = 20, max_chars: int = 250):
+        """
+        Initialize the segmenter
+
+        Args:
+            min_chars: Sentences shorter than this are merged with the next one
+                       ("Wow!" alone is a very short TTS request)
+            max_chars: Force a split at a comma or space when no sentence end arrives
+        """
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.buffer = ""
+        self.pending = ""  # Short sentence waiting to be merged
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return any sentences that are now complete"""
+        self.buffer += text
+        sentences = []
+
+        while True:
+            match = SENTENCE_END.search(self.buffer)
+            if not match:
+                break
+            sentence = self.buffer[:match.end(1) if match.group(1) else match.start()].strip()
+            self.buffer = self.buffer[match.end():]
+            self._emit(sentence, sentences)
+
+        if len(self.buffer) > self.max_chars:
+            split_at = max(self.buffer.rfind(',', 0, self.max_chars), self.buffer.rfind(' ', 0, self.max_chars))
+            if split_at > 0:
+                self._emit(self.buffer[:split_at + 1].strip(), sentences)
+                self.buffer = self.buffer[split_at + 1:]
+
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever is left once the stream has ended"""
+        sentences = []
+        remainder = (self.pending + " " + self.buffer).strip()
+        self.pending = ""
+        self.buffer = ""
+        if remainder:
+            sentences.append(remainder)
+        return sentences
+
+    def _emit(self, sentence: str, sentences: List[str]):
+        """Append a sentence, holding back short fragments to merge with the next one"""
+        if not sentence:
+            return
+        sentence = (self.pending + " " + sentence).strip() if self.pending else sentence
+        if len(sentence) < self.min_chars:
+            self.pending = sentence
+        else:
+            self.pending = ""
+            sentences.append(sentence)
+
+
+class StreamingSpeechPipeline:
+    """
+    Speaks a token stream sentence by sentence
+    Synthesis runs on a small thread pool so sentence N+1 is being synthesized
+    while sentence N plays; playback runs on its own thread in strict order
+    """
+
+    def __init__(self, tts_engine, max_concurrent_synthesis: int = 2,
+                 on_sentence_start: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the pipeline
+
+        Args:
+            tts_engine: OpenAITTSEngine (synthesize/play_audio) or any engine with say/runAndWait
+            max_concurrent_synthesis: Number of sentences synthesized in parallel
+            on_sentence_start: Called with each sentence right before it plays (e.g. visual feedback)
+        """
+        self.tts_engine = tts_engine
+        self.max_concurrent_synthesis = max(1, max_concurrent_synthesis)
+        self.on_sentence_start = on_sentence_start
+        self.can_synthesize = hasattr(tts_engine, 'synthesize') and hasattr(tts_engine, 'play_audio')
+        self.last_metrics = {}
+
+    def speak_stream(self, tokens: Iterable[str], turn_start: Optional[float] = None) -> str:
+        """
+        Speak a stream of text tokens, returning once the last sentence has played
+
+        Args:
+            tokens: Iterable of text deltas (e.g. streamed chat completion content)
+            turn_start: time.time() when the user turn started (defaults to now)
+
+        Returns:
+            str: The full text that was streamed
+
+        If the token stream fails partway, the exception is re-raised once the sentences
+        already submitted have played, with the text streamed so far as e.partial_text
+        """
+        turn_start = turn_start or time.time()
+        metrics = {
+            'time_to_first_token': None,
+            'time_to_first_sentence': None,
+            'time_to_first_audio': None,
+            'total_latency': None,
+            'sentences': 0,          # submitted for synthesis
+            'sentences_spoken': 0,   # actually played (cloud or offline voice)
+            'synthesis_failures': 0
+        }
+        segmenter = SentenceSegmenter()
+        playback_queue = queue.Queue()
+        text_parts = []
+
+        player = threading.Thread(target=self._playback_loop, args=(playback_queue, metrics, turn_start),
+                                  name="speech-playback", daemon=True)
+        player.start()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent_synthesis,
+                                      thread_name_prefix="speech-synth")
+        try:
+            for token in tokens:
+                if not token:
+                    continue
+                if metrics['time_to_first_token'] is None:
+                    metrics['time_to_first_token'] = time.time() - turn_start
+                text_parts.append(token)
+                for sentence in segmenter.feed(token):
+                    self._submit(executor, playback_queue, sentence, metrics, turn_start)
+
+            for sentence in segmenter.flush():
+                self._submit(executor, playback_queue, sentence, metrics, turn_start)
+        except Exception as e:
+            e.partial_text = "".join(text_parts).strip()
+            raise
+        finally:
+            playback_queue.put(None)
+            player.join()
+            executor.shutdown(wait=True)
+
+            metrics['total_latency'] = time.time() - turn_start
+            self.last_metrics = metrics
+            logger.info(f"⏱️ Streaming turn: first token {self._format(metrics['time_to_first_token'])}, "
+                        f"first audio {self._format(metrics['time_to_first_audio'])}, "
+                        f"total {metrics['total_latency']:.2f}s "
+                        f"({metrics['sentences_spoken']}/{metrics['sentences']} sentences spoken)")
+
+        return "".join(text_parts).strip()
+
+    def _submit(self, executor: ThreadPoolExecutor, playback_queue: queue.Queue, sentence: str,
+                metrics: Dict[str, Any], turn_start: float):
+        """Start synthesizing a sentence and queue it for ordered playback"""
+        if metrics['time_to_first_sentence'] is None:
+            metrics['time_to_first_sentence'] = time.time() - turn_start
+        metrics['sentences'] += 1
+        logger.info(f"🗣️ STREAM: Sentence {metrics['sentences']} ready: '{sentence[:50]}'")
+        future = executor.submit(self.tts_engine.synthesize, sentence) if self.can_synthesize else None
+        playback_queue.put((sentence, future))
+
+    def _playback_loop(self, playback_queue: queue.Queue, metrics: Dict[str, Any], turn_start: float):
+        """Play synthesized sentences back to back in submission order"""
+        while True:
+            item = playback_queue.get()
+            if item is None:
+                break
+            sentence, future = item
+
+            try:
+                audio_bytes = future.result() if future is not None else None
+                if future is not None and not audio_bytes:
+                    metrics['synthesis_failures'] += 1
+                    # OpenAI TTS unavailable: keep talking with the local voice if the engine has one
+                    say_offline = getattr(self.tts_engine, 'say_offline', None)
+                    if say_offline is None:
+                        continue
+                    if self.on_sentence_start:
+                        self.on_sentence_start(sentence)
+                    if say_offline(sentence):
+                        metrics['sentences_spoken'] += 1
+                    continue
+
+                if metrics['time_to_first_audio'] is None:
+                    metrics['time_to_first_audio'] = time.time() - turn_start
+                if self.on_sentence_start:
+                    self.on_sentence_start(sentence)
+
+                if future is not None:
+                    self.tts_engine.play_audio(audio_bytes, sentence)
+                else:
+                    self.tts_engine.say(sentence)
+                    self.tts_engine.runAndWait()
+                metrics['sentences_spoken'] += 1
+            except Exception as e:
+                metrics['synthesis_failures'] += 1
+                logger.error(f"🗣️ STREAM: Could not speak sentence '{sentence[:50]}': {e}")
+
+    def get_last_metrics(self) -> Dict[str, Any]:
+        """Latency metrics from the most recent speak_stream call"""
+        return dict(self.last_metrics)
+
+    @staticmethod
+    def _format(value: Optional[float]) -> str:
+        return f"{value:.2f}s" if value is not None else "n/a"
@@ -0,0 +1,310 @@
+"""
+Speech-to-Text Backends for AI Assistant
+Pluggable recognizers behind AudioManager.audio_to_text, so simple answers
+don't have to wait for (or fail without) the internet
+
+- VoskSTTBackend: local CPU recognizer, model loaded once and kept warm;
+  with a vocabulary it decodes against a restricted grammar of just those
+  words/phrases (fast and accurate for game answers)
+- GoogleSTTBackend: cloud recognition through speech_recognition, behind the
+  shared transport's 'stt' circuit breaker
+- SpeechToText: tries backends in order (cloud first for open speech, the
+  grammar-capable local backend first when a vocabulary is given), falls back
+  when a backend is unavailable, offline, or not confident enough, and records
+  latency per backend
+
+Get a local model (about 40 MB) with:
+    wget https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip
+    unzip vosk-model-small-en-us-0.15.zip -d models
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any
+
+import speech_recognition as sr
+
+# Try to import Vosk (optional local recognizer)
+try:
+    import vosk
+    vosk.SetLogLevel(-1)
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+from model_registry import get_vosk_model
+from cloud_transport import get_transport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VOSK_MODEL = os.path.join('models', 'vosk-model-small-en-us-0.15')
+LOCAL_SAMPLE_RATE = 16000
+UNKNOWN_WORD = '[unk]'
+
+
+@dataclass
+class Transcript:
+    """Recognized text with the backend's confidence (0-1) and how long it took"""
+    text: str
+    confidence: float
+    backend: str
+    latency: float = 0.0
+
+
+class STTBackend:
+    """Interface for a speech-to-text backend"""
+
+    name = 'base'
+    local = False               # runs on this machine (no network)
+    supports_vocabulary = False  # can restrict decoding to given words/phrases
+
+    def available(self) -> bool:
+        """True if the backend can be used right now"""
+        return True
+
+    def warm_up(self):
+        """Load models ahead of the first request (no-op for cloud backends)"""
+
+    def recognize(self, audio_data: sr.AudioData, language: str = 'en-US',
+                  vocabulary: Optional[List[str]] = None) -> Optional[Transcript]:
+        """
+        Recognize one utterance
+
+        Args:
+            audio_data: Captured utterance
+            language: BCP-47 language code
+            vocabulary: Expected words/phrases (only used by vocabulary-capable backends)
+
+        Returns:
+            Transcript, or None if nothing intelligible was heard
+
+        Raises:
+            sr.RequestError: Backend failed (offline, quota, missing model)
+        """
+        raise NotImplementedError
+
+
+class GoogleSTTBackend(STTBackend):
+    """Google Web Speech API (needs internet)"""
+
+    name = 'google'
+
+    def __init__(self, recognizer: sr.Recognizer, transport=None):
+        self.recognizer = recognizer
+        self.transport = transport or get_transport()
+
+    def available(self) -> bool:
+        # Skipped while the circuit is open, so the local model answers without waiting
+        return self.transport.available('stt')
+
+    def recognize(self, audio_data, language='en-US', vocabulary=None):
+        try:
+            with self.transport.track('stt'):
+                try:
+                    text = self.recognizer.recognize_google(audio_data, language=language)
+                except sr.UnknownValueError:
+                    return None
+                except sr.RequestError as e:
+                    # Unreachable: counts towards the circuit breaker
+                    raise ConnectionError(str(e)) from e
+        except ConnectionError as e:
+            raise sr.RequestError(str(e)) from e
+        return Transcript(text, 1.0, self.name) if text.strip() else None
+
+
+class VoskSTTBackend(STTBackend):
+    """Offline Kaldi recognizer (Vosk) with optional restricted grammar"""
+
+    name = 'vosk'
+    local = True
+    supports_vocabulary = True
+
+    def __init__(self, model_path: str = DEFAULT_VOSK_MODEL, language: str = 'en'):
+        """
+        Args:
+            model_path: Unpacked Vosk model directory
+            language: Language of the model; other languages are left to the next backend
+        """
+        self.model_path = model_path
+        self.language = language.lower()
+
+    def available(self) -> bool:
+        return VOSK_AVAILABLE and os.path.isdir(self.model_path)
+
+    def warm_up(self):
+        if self.available():
+            # First decode initialises the decoding graph; do it before the first answer
+            recognizer = vosk.KaldiRecognizer(get_vosk_model(self.model_path), LOCAL_SAMPLE_RATE)
+            recognizer.AcceptWaveform(bytes(LOCAL_SAMPLE_RATE // 5))
+            recognizer.FinalResult()
+
+    def recognize(self, audio_data, language='en-US', vocabulary=None):
+        if not self.available():
+            raise sr.RequestError(f"Vosk model not available at {self.model_path}")
+        if not language.lower().startswith(self.language):
+            return None
+
+        model = get_vosk_model(self.model_path)
+        if vocabulary:
+            grammar = sorted({phrase.lower().strip() for phrase in vocabulary if phrase.strip()})
+            recognizer = vosk.KaldiRecognizer(model, LOCAL_SAMPLE_RATE, json.dumps(grammar + [UNKNOWN_WORD]))
+        else:
+            recognizer = vosk.KaldiRecognizer(model, LOCAL_SAMPLE_RATE)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio_data.get_raw_data(convert_rate=LOCAL_SAMPLE_RATE, convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+
+        heard = result.get('result', [])
+        words = [w for w in heard if w.get('word') != UNKNOWN_WORD]
+        text = ' '.join(w['word'] for w in words)
+        if not text:
+            return None
+        # Speech outside the grammar comes back as [unk]; it lowers confidence in the rest
+        confidence = sum(w.get('conf', 0.0) for w in words) / len(heard)
+        return Transcript(text, confidence, self.name)
+
+
+class SpeechToText:
+    """Ordered chain of STT backends with fallback and per-backend latency stats"""
+
+    def __init__(self, recognizer: sr.Recognizer, backends: str = 'google,vosk',
+                 vosk_model_path: str = DEFAULT_VOSK_MODEL, min_confidence: float = 0.6):
+        """
+        Args:
+            recognizer: speech_recognition Recognizer used by cloud backends
+            backends: Comma-separated backend names in the order they are tried for open
+                      speech (cloud first: open-vocabulary local results can be confidently wrong)
+            vosk_model_path: Model directory for the local backend
+            min_confidence: Results below this confidence fall through to the next backend
+        """
+        self.min_confidence = min_confidence
+        factories = {
+            'google': lambda: GoogleSTTBackend(recognizer),
+            'vosk': lambda: VoskSTTBackend(vosk_model_path),
+        }
+        self.backends: List[STTBackend] = []
+        for name in [n.strip().lower() for n in backends.split(',') if n.strip()]:
+            if name in factories:
+                self.backends.append(factories[name]())
+            else:
+                logger.warning(f"⚠️ Unknown speech-to-text backend '{name}' - ignored")
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+        usable = [b.name for b in self.backends if b.available()]
+        logger.info(f"🗣️ Speech-to-text backends: {', '.join(usable) or 'none available'}")
+        if VOSK_AVAILABLE and any(b.name == 'vosk' and not b.available() for b in self.backends):
+            logger.info(f"💡 Local speech recognition disabled - no Vosk model at {vosk_model_path}")
+
+    def add_backend(self, backend: STTBackend, first: bool = False):
+        """Plug in another backend (tried first or last)"""
+        if first:
+            self.backends.insert(0, backend)
+        else:
+            self.backends.append(backend)
+
+    def local_vocabulary_backend(self) -> Optional[STTBackend]:
+        """First usable local backend that can decode against a restricted vocabulary"""
+        for backend in self.backends:
+            if backend.local and backend.supports_vocabulary and backend.available():
+                return backend
+        return None
+
+    def warm_up(self, background: bool = True):
+        """Load local models now instead of on the first utterance"""
+        def load():
+            for backend in self.backends:
+                if backend.local and backend.available():
+                    try:
+                        start = time.time()
+                        backend.warm_up()
+                        logger.info(f"🔥 {backend.name} speech model warm in {time.time() - start:.1f}s")
+                    except Exception as e:
+                        logger.warning(f"⚠️ Could not warm up {backend.name}: {e}")
+
+        if background:
+            threading.Thread(target=load, name="stt-warmup", daemon=True).start()
+        else:
+            load()
+
+    def _ordered(self, vocabulary: Optional[List[str]]) -> List[STTBackend]:
+        """Usable backends; with a vocabulary, the ones that can use it go first
+
+        A cloud backend whose circuit is open is not usable, so the local model
+        answers open speech too while the connection is down.
+        """
+        usable = [b for b in self.backends if b.available()]
+        if vocabulary:
+            usable.sort(key=lambda b: not b.supports_vocabulary)
+        return usable
+
+    def recognize(self, audio_data: sr.AudioData, language: str = 'en-US',
+                  vocabulary: Optional[List[str]] = None,
+                  on_draft: Optional[Callable[[Transcript], None]] = None) -> Optional[Transcript]:
+        """
+        Recognize an utterance with the first backend that gives a confident answer
+
+        Args:
+            audio_data: Captured utterance
+            language: BCP-47 language code
+            vocabulary: Expected answers for a constrained fast path (game answers)
+            on_draft: Called with an unsure result while the next backend re-checks it,
+                so callers can start work on the likely transcript early
+
+        Returns:
+            Best transcript, or None if no backend heard anything
+        """
+        best = None
+        for backend in self._ordered(vocabulary):
+            start = time.time()
+            try:
+                transcript = backend.recognize(audio_data, language, vocabulary if backend.supports_vocabulary else None)
+            except sr.RequestError as e:
+                self._record(backend.name, time.time() - start, failed=True)
+                logger.warning(f"⚠️ {backend.name} speech recognition unavailable: {e}")
+                continue
+            except Exception as e:
+                self._record(backend.name, time.time() - start, failed=True)
+                logger.error(f"❌ {backend.name} speech recognition error: {e}")
+                continue
+
+            latency = time.time() - start
+            self._record(backend.name, latency, hit=transcript is not None)
+            if transcript is None:
+                continue
+            transcript.latency = latency
+            if transcript.confidence >= self.min_confidence:
+                return transcript
+            logger.info(f"🤔 {backend.name} unsure ({transcript.confidence:.2f}): '{transcript.text}' - trying next backend")
+            if best is None or transcript.confidence > best.confidence:
+                best = transcript
+                if on_draft:
+                    on_draft(transcript)
+        return best
+
+    def _record(self, name: str, latency: float, hit: bool = False, failed: bool = False):
+        with self._stats_lock:
+            stats = self._stats.setdefault(name, {'calls': 0, 'hits': 0, 'failures': 0, 'total_latency': 0.0})
+            stats['calls'] += 1
+            stats['hits'] += hit
+            stats['failures'] += failed
+            stats['total_latency'] += latency
+            stats['last_latency'] = latency
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Calls, results, failures and average latency (ms) per backend"""
+        with self._stats_lock:
+            return {
+                name: {
+                    'calls': s['calls'],
+                    'hits': s['hits'],
+                    'failures': s['failures'],
+                    'avg_latency_ms': 1000 * s['total_latency'] / max(s['calls'], 1),
+                    'last_latency_ms': 1000 * s['last_latency']
+                }
+                for name, s in self._stats.items()
+            }
@@ -79,7 +79,7 @@ def test_voice_activity_detector(audio_manager):
     print("=" * 50)
     
     try:
-        vad = VoiceActivityDetector(audio_manager.recognizer)
+        vad = VoiceActivityDetector(audio_manager.recognizer, mic_stream=audio_manager.mic_stream)
         
         print(f"✅ Platform Info: {vad.platform_info}")
         
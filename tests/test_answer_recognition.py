@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Game answer recognition test
+Compares the phonetic answer matcher with the old string matching (substring
+check + difflib ratio, as in detect_ready_command) on transcripts that open
+speech recognition typically produces for children's answers, then optionally
+compares open recognition with restricted-grammar decoding on recordings
+
+Fixture layout:
+    <dir>/<name>.wav    16-bit mono recording of one answer
+    <dir>/<name>.txt    first line: the expected answer (game text, e.g. "7")
+                        second line: "candidates: seven=7, eight=8, ready, ..."
+
+Usage:
+    python tests/test_answer_recognition.py [--fixtures answer_fixtures] [--model models/vosk-model-small-en-us-0.15]
+"""
+
+import os
+import sys
+import glob
+import time
+import difflib
+import argparse
+import platform
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from answer_recognizer import AnswerRecognizer, number_words, candidates_from
+from stt_backends import SpeechToText, DEFAULT_VOSK_MODEL
+
+MATH = {number_words(n): str(n) for n in range(31)}
+MATH.update(candidates_from(['ready', "i'm ready", 'done', 'end math']))
+READY = candidates_from(['ready', "i'm ready", 'check my answer', 'done', 'finished', 'all done', 'end game'])
+FILIPINO = {'kumusta': 'kumusta', 'como esta': 'kumusta', 'salamat': 'salamat', 'aso': 'aso',
+            'pusa': 'pusa', 'tubig': 'tubig', 'bahay': 'bahay', 'isa': 'isa', 'dalawa': 'dalawa'}
+LETTERS = candidates_from(['apple', 'ant', 'ball', 'banana', 'cat', 'tree', 'train', 'three', 'dog', 'duck'])
+
+# (open-recognition transcript, candidates, expected game text or None)
+CASES = [
+    ('seven', MATH, '7'), ('sven', MATH, '7'), ("i think it's sven", MATH, '7'),
+    ('the answer is twenty one', MATH, '21'), ('for', MATH, '4'), ('ate', MATH, '8'),
+    ('twelve', MATH, '12'), ('nanny', MATH, None), ('read he', MATH, 'ready'),
+    ('red e', READY, 'ready'), ("i'm ready", READY, "i'm ready"), ('al dun', READY, 'all done'),
+    ('what is a dinosaur', READY, None),
+    ('como esta', FILIPINO, 'kumusta'), ('kumosta', FILIPINO, 'kumusta'), ('sala mat', FILIPINO, 'salamat'),
+    ('pusa', FILIPINO, 'pusa'), ('to big', FILIPINO, 'tubig'), ('bahai', FILIPINO, 'bahay'),
+    ('tree', LETTERS, 'tree'), ('an apple', LETTERS, 'apple'), ('bananas', LETTERS, 'banana'),
+    ('dug', LETTERS, 'dog'), ('the moon', LETTERS, None),
+]
+
+
+def old_match(text, candidates):
+    """Previous approach: substring, then difflib ratio > 0.7 on the whole transcript"""
+    text = text.lower()
+    for spoken in sorted(candidates, key=len, reverse=True):
+        if f' {spoken} ' in f' {text} ':
+            return candidates[spoken]
+    best = max(candidates, key=lambda spoken: difflib.SequenceMatcher(None, text, spoken).ratio())
+    return candidates[best] if difflib.SequenceMatcher(None, text, best).ratio() > 0.7 else None
+
+
+def compare_matchers():
+    """Accuracy and latency of the old and phonetic matchers over CASES"""
+    recognizer = AnswerRecognizer()
+    results = {}
+    for label, match in (('old (difflib)', old_match),
+                         ('phonetic', lambda text, c: getattr(recognizer.match_text(text, c), 'value', None))):
+        correct, latencies, wrong = 0, [], []
+        for text, candidates, expected in CASES:
+            start = time.perf_counter()
+            value = match(text, candidates)
+            latencies.append(time.perf_counter() - start)
+            if value == expected:
+                correct += 1
+            else:
+                wrong.append(f"'{text}' -> {value}")
+        results[label] = (correct, np.array(latencies) * 1000, wrong)
+    return results
+
+
+def load_fixtures(fixtures_dir):
+    """[(name, AudioData, expected game text, candidates)]"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.wav'))):
+        with open(os.path.splitext(path)[0] + '.txt') as f:
+            lines = [line.strip() for line in f if line.strip()]
+        candidates = {}
+        for item in lines[1].split(':', 1)[1].split(','):
+            spoken, _, value = item.strip().lower().partition('=')
+            if spoken:
+                candidates[spoken] = value or spoken
+        with sr.AudioFile(path) as source:
+            audio = sr.Recognizer().record(source)
+        fixtures.append((os.path.basename(path), audio, lines[0].lower(), candidates))
+    return fixtures
+
+
+def compare_recognition(fixtures, model_path):
+    """Open recognition + old matching against the grammar/phonetic answer recognizer"""
+    stt = SpeechToText(sr.Recognizer(), vosk_model_path=model_path)
+    stt.warm_up(background=False)
+    answers = AnswerRecognizer(stt)
+    if stt.local_vocabulary_backend() is None:
+        print(f"   No local grammar decoder (Vosk model at {model_path}) - grammar path uses the phonetic fallback")
+
+    def open_path(audio, candidates):
+        text = stt.recognize(audio)
+        return old_match(text.text, candidates) if text else None
+
+    def answer_path(audio, candidates):
+        match = answers.recognize(audio, candidates)
+        if match is None:
+            text = stt.recognize(audio)
+            match = answers.match_text(text.text, candidates) if text else None
+        return match.value if match else None
+
+    print(f"\n{'Path':<22} {'runs':>5} {'accuracy':>9} {'median':>9} {'p90':>9}")
+    for label, path in (('open + difflib', open_path), ('answer recognizer', answer_path)):
+        latencies, correct = [], 0
+        for name, audio, expected, candidates in fixtures:
+            start = time.perf_counter()
+            value = path(audio, candidates)
+            latencies.append(time.perf_counter() - start)
+            correct += value == expected
+        ms = np.array(latencies) * 1000
+        print(f"{label:<22} {len(fixtures):>5} {correct / len(fixtures) * 100:>8.0f}% "
+              f"{np.median(ms):>7.0f}ms {np.percentile(ms, 90):>7.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Game answer recognition test")
+    parser.add_argument('--fixtures', help="Directory of <name>.wav + <name>.txt fixtures")
+    parser.add_argument('--model', default=DEFAULT_VOSK_MODEL, help="Vosk model directory")
+    args = parser.parse_args()
+
+    print("🎯 Game Answer Recognition Test")
+    print("=" * 60)
+    print(f"Platform: {platform.machine()} / Python {platform.python_version()}")
+
+    results = compare_matchers()
+    print(f"\n{len(CASES)} typical misrecognitions")
+    for label, (correct, ms, wrong) in results.items():
+        print(f"   • {label:<14} {correct}/{len(CASES)} correct, median {np.median(ms):.2f} ms, worst {np.max(ms):.2f} ms")
+        for item in wrong:
+            print(f"        ✗ {item}")
+
+    old_correct = results['old (difflib)'][0]
+    new_correct = results['phonetic'][0]
+    ok = new_correct > old_correct and new_correct >= len(CASES) - 2
+    print(f"\n{'✅' if ok else '❌'} Phonetic matching {'beats' if ok else 'does not beat'} the old string matching")
+
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+        print(f"\n{len(fixtures)} recorded answers from {args.fixtures}")
+        compare_recognition(fixtures, args.model)
+    else:
+        print("\nNo --fixtures given - record a few answers (wav + txt) to compare recognition latency")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
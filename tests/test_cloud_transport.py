@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Cloud transport test
+Checks retries with jittered backoff, the circuit breaker's fast offline
+failure, per-endpoint concurrency limits, metrics, and connection reuse of the
+pooled download session against a local HTTP server
+
+Usage:
+    python tests/test_cloud_transport.py
+"""
+
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cloud_transport import CloudTransport, CircuitOpenError, BACKOFF_CAP
+
+FAILED_CALL_TIME = 0.2   # one timed-out attempt (stands in for the 15 s TTS timeout)
+
+
+class StatusError(Exception):
+    """Error with an HTTP status, like openai.APIStatusError"""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FlakyService:
+    """Fails the first `failures` calls with the given error, then answers"""
+
+    def __init__(self, failures, error=ConnectionError("connection reset")):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        ImageHandler.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = b"\x89PNG" + b"\0" * 2048
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def timed_out():
+    time.sleep(FAILED_CALL_TIME)
+    raise TimeoutError("request timed out")
+
+
+def main():
+    print("🌐 Cloud Transport Test")
+    print("=" * 60)
+    ok = True
+
+    # Transient errors are retried, with jittered backoff below the cap
+    transport = CloudTransport(max_retries=2)
+    service = FlakyService(failures=2)
+    if transport.call('chat', service) != "ok" or service.calls != 3 or transport.stats()['chat']['retries'] != 2:
+        print(f"❌ Transient failures were not retried ({service.calls} calls)")
+        ok = False
+    else:
+        print("✅ Connection errors are retried until the call succeeds")
+    delays = [transport.backoff(attempt) for attempt in range(10) for _ in range(50)]
+    if min(delays) < 0 or max(delays) > BACKOFF_CAP:
+        print("❌ Backoff outside its bounds")
+        ok = False
+
+    # Client errors are not retried and don't count against the endpoint
+    service = FlakyService(failures=5, error=StatusError(400))
+    try:
+        transport.call('vision', service)
+    except StatusError:
+        pass
+    if service.calls != 1 or not transport.available('vision'):
+        print(f"❌ Bad request was retried or took the endpoint offline ({service.calls} calls)")
+        ok = False
+    else:
+        print("✅ Bad requests fail once without opening the circuit")
+
+    # Circuit breaker: a dead endpoint stops costing time
+    transport = CloudTransport(max_retries=2, circuit_failures=3, circuit_reset=0.5)
+    transport.backoff = lambda attempt: 0.0
+    calls = 5
+    start = time.perf_counter()
+    for _ in range(calls):
+        try:
+            transport.call('tts', timed_out)
+        except (TimeoutError, CircuitOpenError):
+            pass
+    with_breaker = time.perf_counter() - start
+    without_breaker = calls * 3 * FAILED_CALL_TIME
+    stats = transport.stats()['tts']
+    print(f"{calls} calls to a dead endpoint: {with_breaker * 1000:.0f} ms with the breaker, "
+          f"{without_breaker * 1000:.0f} ms retrying every call")
+    if stats['circuit'] != 'open' or stats['rejected'] != calls - 1 or with_breaker > 4 * FAILED_CALL_TIME:
+        print(f"❌ Circuit did not open ({stats['circuit']}, {stats['rejected']} skipped)")
+        ok = False
+    else:
+        print(f"✅ Circuit opens after 3 failed attempts; the next {stats['rejected']} calls fail instantly")
+
+    # After the cool-down one trial call closes it again
+    time.sleep(0.55)
+    if transport.call('tts', lambda: "back") != "back" or transport.stats()['tts']['circuit'] != 'closed':
+        print("❌ Circuit did not close after a successful trial call")
+        ok = False
+    else:
+        print("✅ Trial call after the cool-down brings the endpoint back")
+
+    # Per-endpoint concurrency limit
+    transport = CloudTransport(limits={'image': 2})
+    running = [0, 0]
+    lock = threading.Lock()
+
+    def slow_image():
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    threads = [threading.Thread(target=transport.call, args=('image', slow_image)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if running[1] != 2:
+        print(f"❌ {running[1]} image calls ran at once (limit 2)")
+        ok = False
+    else:
+        print("✅ Endpoint concurrency limit holds (2 of 6 at a time)")
+
+    # Metrics
+    stats = transport.stats()['image']
+    if stats['requests'] != 6 or sum(stats['histogram'].values()) != 6 or stats['p50_ms'] != 100:
+        print(f"❌ Metrics are off: {stats}")
+        ok = False
+    else:
+        print(f"✅ Metrics: {transport.summary()}")
+
+    # Downloads reuse one pooled connection
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ImageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/image.png"
+    sizes = [len(transport.get(url).content) for _ in range(5)]
+    server.shutdown()
+    if ImageHandler.connections != 1 or sizes != [2052] * 5:
+        print(f"❌ Downloads opened {ImageHandler.connections} connections")
+        ok = False
+    else:
+        print("✅ 5 image downloads over 1 pooled connection")
+
+    print(f"\n{'✅' if ok else '❌'} Cloud transport {'works' if ok else 'has problems'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
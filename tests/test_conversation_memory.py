@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Conversation memory test
+Replays a 30-turn conversation and compares the prompt the old history code
+built (long system prompt + last 3 exchanges as one formatted string) with the
+token-budgeted memory, then checks that facts from early turns survive in the
+rolling summary and that summarizing never blocks a turn
+
+Usage:
+    python tests/test_conversation_memory.py [--budget 400]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from conversation_memory import ConversationMemory, TokenCounter
+
+SUMMARY_DELAY = 0.3  # stands in for the summary request
+
+OLD_SYSTEM_PROMPT = """You are a helpful AI assistant speaking to Sophia (a 9-year-old girl).
+        Be helpful and friendly. Keep responses friendly, age-appropriate, and engaging for children.
+        Be encouraging and educational when possible. Keep responses concise but informative.
+
+        Always remember their age and gender when crafting responses. Use appropriate language,
+        examples, and concepts that match their developmental stage.
+
+        Remember to reference previous conversation when relevant. You have context of what you discussed earlier."""
+
+NEW_SYSTEM_PROMPT = ("You are a helpful AI assistant speaking to Sophia (a 9-year-old girl). Be helpful and "
+                     "friendly. Keep answers friendly, age-appropriate, encouraging, educational and concise, "
+                     "using language and examples that fit their age. Refer back to earlier parts of "
+                     "the conversation when relevant.")
+
+
+def conversation(turns):
+    """Scripted exchanges; the first one carries a fact asked about at the end"""
+    exchanges = [("My cat is called Mochi.", "Mochi is a lovely name for a cat! What color is Mochi?")]
+    topics = ["volcanoes", "the moon", "dolphins", "rainbows", "dinosaurs", "planets", "bees", "rockets"]
+    for i in range(1, turns):
+        topic = topics[i % len(topics)]
+        exchanges.append((f"Can you tell me something cool about {topic}?",
+                          f"Sure! Here is a fun fact about {topic}: scientists are still discovering new things "
+                          f"about {topic} every year. Some of the biggest discoveries started with a question "
+                          f"just like yours, asked by someone who was curious and kept wondering why. People "
+                          f"who study {topic} use telescopes, microscopes, computers and lots of patience, and "
+                          f"they share what they learn so everyone can enjoy it. Would you like to hear another "
+                          f"amazing fact, or maybe try a little experiment at home? You could be one of those "
+                          f"scientists when you grow up!"))
+    return exchanges
+
+
+def old_prompt(history, text):
+    """Previous build_openai_request: last 3 exchanges re-rendered into one system message"""
+    messages = [{"role": "system", "content": OLD_SYSTEM_PROMPT}]
+    if history:
+        context = "\n".join(f"Previous - You asked: '{q}' | You responded: '{a}'" for q, a in history[-3:])
+        messages.append({"role": "system", "content": f"Recent conversation context:\n{context}\n\n"
+                         "Use this context to provide relevant responses and reference earlier topics when appropriate."})
+    messages.append({"role": "user", "content": text})
+    return messages
+
+
+def fake_summarize(previous, exchanges, max_tokens):
+    """Keeps the first sentence of each question, like a real summary keeps the facts"""
+    time.sleep(SUMMARY_DELAY)
+    facts = [q.split('?')[0].split('.')[0] for q, _ in exchanges]
+    return "; ".join(([previous] if previous else []) + facts)[:max_tokens * 4]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conversation memory test")
+    parser.add_argument('--budget', type=int, default=400)
+    parser.add_argument('--turns', type=int, default=30)
+    args = parser.parse_args()
+
+    print("🧠 Conversation Memory Test")
+    print("=" * 60)
+    ok = True
+    counter = TokenCounter()
+    print(f"Token counting: {'tiktoken (exact)' if counter.exact else 'estimate'}")
+
+    memory = ConversationMemory(fake_summarize, budget_tokens=args.budget, summary_tokens=120)
+    exchanges = conversation(args.turns)
+    old_tokens, new_tokens, add_times = [], [], []
+    for i, (question, answer) in enumerate(exchanges):
+        old_tokens.append(counter.count_messages(old_prompt(exchanges[:i], question)))
+        messages = [{"role": "system", "content": NEW_SYSTEM_PROMPT}] + memory.messages('sophia') + \
+                   [{"role": "user", "content": question}]
+        new_tokens.append(counter.count_messages(messages))
+        start = time.perf_counter()
+        memory.add('sophia', question, answer)
+        add_times.append(time.perf_counter() - start)
+
+    old_mean = sum(old_tokens) / len(old_tokens)
+    new_mean = sum(new_tokens) / len(new_tokens)
+    print(f"Prompt tokens per turn: old {old_mean:.0f} (remembers 3 turns), new {new_mean:.0f} "
+          f"(budget {args.budget}, remembers all {args.turns} via summary)")
+
+    history_tokens = [n - counter.count_messages([{"role": "system", "content": NEW_SYSTEM_PROMPT},
+                                                  {"role": "user", "content": q}])
+                      for n, (q, _) in zip(new_tokens, exchanges)]
+    if max(history_tokens) > args.budget:
+        print(f"❌ History went over budget: {max(history_tokens)} tokens")
+        ok = False
+    else:
+        print(f"✅ History stays within budget (max {max(history_tokens)} tokens)")
+
+    if max(add_times) > SUMMARY_DELAY / 2:
+        print(f"❌ Recording a turn waited for the summary ({max(add_times) * 1000:.0f} ms)")
+        ok = False
+    else:
+        print(f"✅ Summaries run in the background (slowest add {max(add_times) * 1000:.1f} ms)")
+
+    memory.wait_for_summaries(timeout=10)
+    history = memory.messages('sophia')
+    summary = history[0]['content'] if history and history[0]['role'] == 'system' else ""
+    if "Mochi" not in summary:
+        print("❌ The first turn's fact was lost")
+        ok = False
+    else:
+        print(f"✅ Turn 1 fact survives in the summary after {args.turns} turns ({memory.summaries} summary updates)")
+
+    if history[-1]['content'] != exchanges[-1][1] or history[-2]['content'] != exchanges[-1][0]:
+        print("❌ Latest exchange is not at the end of the history")
+        ok = False
+    else:
+        print("✅ Recent turns are sent as user/assistant messages, newest last")
+
+    # A summary that finishes after clear() is dropped
+    memory = ConversationMemory(fake_summarize, budget_tokens=60, summary_tokens=20)
+    for question, answer in exchanges[:4]:
+        memory.add('eladriel', question, answer)
+    memory.clear('eladriel')
+    memory.wait_for_summaries(timeout=10)
+    if memory.messages('eladriel'):
+        print("❌ Summary written after clear() brought the old conversation back")
+        ok = False
+    else:
+        print("✅ clear() forgets the conversation, including summaries still running")
+
+    print(f"\n{'✅' if ok else '❌'} Conversation memory {'works' if ok else 'has problems'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
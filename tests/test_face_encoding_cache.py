@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk face encoding cache
+Uses a counting stand-in for the dlib encoder so it shows exactly which
+photos get re-encoded after restarts, additions, renames and removals
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import types
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import face_gallery
+from face_gallery import FaceGallery
+
+PEOPLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'people')
+
+encoded_photos = []
+
+
+def _counting_encoder():
+    """Encoder stand-in that records every photo it is asked to encode"""
+    def face_encodings(image_path):
+        encoded_photos.append(os.path.basename(image_path))
+        return [np.random.rand(128)]
+    return types.SimpleNamespace(load_image_file=lambda path: path, face_encodings=face_encodings)
+
+
+def _load(people_dir):
+    encoded_photos.clear()
+    return FaceGallery(people_dir).load()
+
+
+def test_incremental_cache():
+    """Only new or changed photos are encoded after the first boot"""
+    original_encoder = getattr(face_gallery, 'face_recognition', None)
+    original_available = face_gallery.FACE_RECOGNITION_AVAILABLE
+    face_gallery.face_recognition = _counting_encoder()
+    face_gallery.FACE_RECOGNITION_AVAILABLE = True
+
+    work_dir = tempfile.mkdtemp()
+    people_dir = os.path.join(work_dir, 'people')
+    shutil.copytree(PEOPLE_DIR, people_dir)
+
+    try:
+        first = _load(people_dir)
+        total_photos = len(encoded_photos)
+        assert total_photos == len(first)
+
+        # Restart: everything comes from the cache
+        second = _load(people_dir)
+        assert encoded_photos == []
+        assert np.allclose(np.asarray(first.encodings), np.asarray(second.encodings))
+
+        # Add a new photo and remove one
+        person = first.get_people()[0]
+        person_dir = os.path.join(people_dir, person)
+        photos = sorted(os.listdir(person_dir))
+        with open(os.path.join(person_dir, 'brand_new.jpg'), 'wb') as f:
+            f.write(b'new photo bytes')
+        os.remove(os.path.join(person_dir, photos[0]))
+
+        third = _load(people_dir)
+        assert encoded_photos == ['brand_new.jpg']
+        assert len(third) == total_photos
+
+        # Touching a file without changing content does not re-encode it
+        os.utime(os.path.join(person_dir, 'brand_new.jpg'), (0, 0))
+        _load(people_dir)
+        assert encoded_photos == []
+    finally:
+        shutil.rmtree(work_dir)
+        face_gallery.face_recognition = original_encoder
+        face_gallery.FACE_RECOGNITION_AVAILABLE = original_available
+
+
+def main():
+    print("💾 Face Encoding Cache Test")
+    print("=" * 40)
+    try:
+        test_incremental_cache()
+        print("✅ Incremental cache works - restarts only encode new photos")
+        return True
+    except AssertionError as e:
+        print(f"❌ Cache test failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for batched face matching
+Compares the old per-face compare_faces + face_distance loop over a Python
+list with FaceGallery.match on synthetic galleries of 10, 1k and 10k encodings
+
+Usage:
+    python tests/test_face_matching_benchmark.py [--faces 3] [--repeats 50]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from face_gallery import FaceGallery
+
+GALLERY_SIZES = (10, 1000, 10000)
+PEOPLE = 4
+
+
+def build_gallery(size, rng):
+    """Synthetic gallery: PEOPLE clusters of 128-d encodings"""
+    gallery = FaceGallery('synthetic', use_cache=False)
+    centers = rng.normal(0, 0.1, size=(PEOPLE, 128))
+    per_person = size // PEOPLE
+    for index in range(PEOPLE):
+        count = per_person + (1 if index < size % PEOPLE else 0)
+        encodings = centers[index] + rng.normal(0, 0.02, size=(count, 128))
+        gallery._add_person(f"person{index}", list(encodings))
+    gallery._build_matrix()
+    return gallery, centers
+
+
+def legacy_match(known_encodings, known_names, face_encodings, tolerance=0.6):
+    """The previous per-face loop (same maths as face_recognition.compare_faces/face_distance)"""
+    names = []
+    for face_encoding in face_encodings:
+        matches = list(np.linalg.norm(np.array(known_encodings) - face_encoding, axis=1) <= tolerance)
+        face_distances = np.linalg.norm(np.array(known_encodings) - face_encoding, axis=1)
+        name = "Unknown"
+        if any(matches):
+            best_match_index = np.argmin(face_distances)
+            if matches[best_match_index]:
+                name = known_names[best_match_index]
+        names.append(name)
+    return names
+
+
+def time_call(function, repeats):
+    """Median wall time of repeated calls"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Face matching micro-benchmark")
+    parser.add_argument('--faces', type=int, default=3, help="Faces per frame")
+    parser.add_argument('--repeats', type=int, default=50, help="Timed repetitions")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+
+    print("🎭 Face Matching Benchmark")
+    print("=" * 60)
+    print(f"{'Gallery':>8} | {'Legacy loop':>12} | {'Batched':>10} | {'top-3 mean':>10} | {'Speedup':>7}")
+    print("-" * 60)
+
+    all_agree = True
+    for size in GALLERY_SIZES:
+        gallery, centers = build_gallery(size, rng)
+        queries = centers[rng.integers(0, PEOPLE, size=args.faces)] + rng.normal(0, 0.02, size=(args.faces, 128))
+
+        legacy_time = time_call(lambda: legacy_match(gallery.encodings, gallery.names, queries), args.repeats)
+        batched_time = time_call(lambda: gallery.match(queries), args.repeats)
+        topk_time = time_call(lambda: gallery.match(queries, top_k=3), args.repeats)
+
+        agree = legacy_match(gallery.encodings, gallery.names, queries) == [n for n, _ in gallery.match(queries)]
+        all_agree = all_agree and agree
+
+        print(f"{size:>8} | {legacy_time * 1000:>9.3f} ms | {batched_time * 1000:>7.3f} ms | "
+              f"{topk_time * 1000:>7.3f} ms | {legacy_time / batched_time:>6.1f}x")
+
+    print(f"\n{'✅' if all_agree else '❌'} Batched results {'match' if all_agree else 'differ from'} the legacy loop")
+    return all_agree
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
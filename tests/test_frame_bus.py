@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared frame bus
+Uses a simulated 30 FPS camera so it runs without hardware
+"""
+
+import os
+import sys
+import time
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from frame_bus import FrameBus
+
+
+class SimulatedCamera:
+    """Fake camera producing numbered frames at a fixed rate"""
+
+    def __init__(self, fps=30):
+        self.interval = 1.0 / fps
+        self.count = 0
+
+    def read(self):
+        time.sleep(self.interval)
+        self.count += 1
+        return True, np.full((480, 640, 3), self.count % 255, dtype=np.uint8)
+
+    def is_camera_available(self):
+        return True
+
+
+def test_fan_out_single_device_read():
+    """Several subscribers share one capture thread"""
+    camera = SimulatedCamera()
+    bus = FrameBus(camera)
+    bus.start()
+
+    face_loop = bus.subscribe('face_loop')
+    gesture = bus.subscribe('gesture_control', max_fps=10)
+
+    def consume(subscriber, count):
+        for _ in range(count):
+            ret, frame = subscriber.read()
+            assert ret and frame is not None
+
+    threads = [threading.Thread(target=consume, args=(face_loop, 30)),
+               threading.Thread(target=consume, args=(gesture, 10))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    bus.stop()
+
+    metrics = bus.get_metrics()
+    print(f"   📊 {metrics['frames_produced']} frames produced, {camera.count} device reads")
+    assert camera.count <= metrics['frames_produced'] + 1
+    assert metrics['subscribers']['face_loop']['frames_dropped'] <= 2
+    assert metrics['subscribers']['gesture_control']['frames_dropped'] > 0
+
+
+def test_shared_variants_computed_once():
+    """Downscaled grey variants are shared between subscribers"""
+    bus = FrameBus(SimulatedCamera())
+    bus.start()
+
+    first = bus.subscribe('detector', scale=0.5, gray=True)
+    second = bus.subscribe('tracker', scale=0.5, gray=True)
+
+    packet = first.read_packet()
+    second.last_seq = packet.seq - 1
+    ret, frame = second.read()
+    bus.stop()
+
+    assert ret
+    assert frame.shape == (240, 320)
+    assert frame is packet.get_variant(0.5, True)
+
+
+def test_copy_subscriber_isolated():
+    """Drawing subscribers get private copies"""
+    bus = FrameBus(SimulatedCamera())
+    bus.start()
+
+    drawing = bus.subscribe('preview', copy=True)
+    ret, frame = drawing.read()
+    frame[:] = 0
+    bus.stop()
+
+    assert bus.latest_packet().frame.any()
+
+
+def main():
+    print("🚌 Frame Bus Tests")
+    print("=" * 40)
+
+    tests = [test_fan_out_single_device_read, test_shared_variants_computed_once, test_copy_subscriber_isolated]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n🎯 {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Vision upload encoding benchmark
+Compares the old path for getting a camera frame into a vision request
+(cv2.imwrite to captured_images/, read the file back, base64 it) with the
+in-memory frame encoder, on full-size camera frames
+
+Reports bytes uploaded and time per frame for both, and checks that the encoder
+sizes images for the model's detail level and archives in the background.
+
+Usage:
+    python tests/test_frame_encoder_benchmark.py [--frames 20] [--width 1920 --height 1080]
+"""
+
+import os
+import sys
+import time
+import base64
+import argparse
+import tempfile
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from frame_encoder import FrameEncoder, target_size
+
+
+def camera_frame(width, height, rng):
+    """A desk with a toy on it: smooth background, a textured object, sensor noise"""
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    frame = np.dstack([90 + 40 * x / width, 110 + 30 * y / height, 130 + 20 * np.sin(x / 200.0)])
+    grain = cv2.GaussianBlur(rng.normal(0, 18, (height, width)).astype(np.float32), (0, 0), 3)
+    frame += grain[..., None]
+    center = (width // 2 + int(rng.integers(-100, 100)), height // 2 + int(rng.integers(-60, 60)))
+    cv2.ellipse(frame, center, (width // 6, height // 4), 15, 0, 360, (60, 140, 70), -1)
+    cv2.ellipse(frame, center, (width // 6, height // 4), 15, 0, 360, (20, 50, 25), 6)
+    for _ in range(40):
+        spot = (center[0] + int(rng.integers(-width // 8, width // 8)),
+                center[1] + int(rng.integers(-height // 6, height // 6)))
+        cv2.circle(frame, spot, int(rng.integers(8, 30)), (40, 100, 50), -1)
+    frame += rng.normal(0, 3, frame.shape)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def old_path(frame, directory, reads=1):
+    """imwrite to disk, then read the file back for base64 (the animal game read it twice)"""
+    start = time.perf_counter()
+    path = os.path.join(directory, f"object_{time.time():.3f}.jpg")
+    cv2.imwrite(path, frame)
+    for _ in range(reads):
+        with open(path, "rb") as image_file:
+            encoded = base64.b64encode(image_file.read()).decode('utf-8')
+    os.remove(path)
+    return encoded, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vision upload encoding benchmark")
+    parser.add_argument('--frames', type=int, default=20)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    print("🖼️ Vision Upload Encoding Benchmark")
+    print("=" * 60)
+    rng = np.random.default_rng(5)
+    frames = [camera_frame(args.width, args.height, rng) for _ in range(args.frames)]
+    ok = True
+
+    with tempfile.TemporaryDirectory() as directory:
+        old = [old_path(frame, directory) for frame in frames]
+        encoder = FrameEncoder()
+        new = []
+        for frame in frames:
+            start = time.perf_counter()
+            encoded = encoder.encode(frame, detail="high").base64
+            new.append((encoded, time.perf_counter() - start))
+
+        old_kb = np.mean([len(e) for e, _ in old]) / 1024
+        new_kb = np.mean([len(e) for e, _ in new]) / 1024
+        old_ms = np.mean([t for _, t in old]) * 1000
+        new_ms = np.mean([t for _, t in new]) * 1000
+        size = target_size(args.width, args.height, "high")
+        print(f"Frames: {args.frames} x {args.width}x{args.height}")
+        print(f"Before: {old_kb:6.0f} KB uploaded, {old_ms:6.1f} ms per frame "
+              f"(full-size JPEG q95 written to disk and read back)")
+        print(f"After:  {new_kb:6.0f} KB uploaded, {new_ms:6.1f} ms per frame "
+              f"({size[0]}x{size[1]} JPEG q{encoder.quality} in memory)")
+        print(f"Upload {old_kb / new_kb:.1f}x smaller, encoding {old_ms / new_ms:.1f}x faster")
+        if new_kb >= old_kb or new_ms >= old_ms:
+            print("❌ In-memory encoding is not smaller and faster")
+            ok = False
+        else:
+            print("✅ In-memory encoding is smaller and faster")
+
+        decoded = cv2.imdecode(np.frombuffer(base64.b64decode(new[0][0]), np.uint8), cv2.IMREAD_COLOR)
+        low = encoder.encode(frames[0], detail="low")
+        if decoded.shape[1::-1] != size or max(low.width, low.height) != 512 or min(size) != 768:
+            print(f"❌ Wrong upload size: high {decoded.shape[1::-1]}, low {low.width}x{low.height}")
+            ok = False
+        else:
+            print(f"✅ Sized for the model: high detail {size[0]}x{size[1]}, low detail {low.width}x{low.height}")
+
+        small = encoder.encode(cv2.resize(frames[0], (320, 180)), detail="high")
+        if (small.width, small.height) != (320, 180):
+            print("❌ Small frames were upscaled")
+            ok = False
+
+        archive_dir = os.path.join(directory, "archive")
+        archiving = FrameEncoder(archive=True, archive_dir=archive_dir)
+        start = time.perf_counter()
+        result = archiving.encode(frames[0], name="object")
+        elapsed = time.perf_counter() - start
+        archiving.flush(timeout=10)
+        if not result.archive_path or not os.path.exists(result.archive_path):
+            print("❌ Archived capture was not written")
+            ok = False
+        else:
+            with open(result.archive_path, "rb") as f:
+                same = f.read() == result.jpeg
+            print(f"{'✅' if same else '❌'} Archiving writes the uploaded JPEG in the background "
+                  f"(encode returned in {elapsed * 1000:.1f} ms)")
+            ok = ok and same
+
+    print(f"\n{'✅' if ok else '❌'} Frame encoder {'works' if ok else 'has problems'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
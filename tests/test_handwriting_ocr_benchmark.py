@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Handwriting OCR benchmark
+Runs the on-device OCR over a set of photographed handwritten words and reports
+how often it settles the spelling check locally, how often it would be wrong,
+and how long it takes
+
+Each fixture is checked twice: against its own word (should be confirmed) and
+against a misspelling of it (must never be confirmed). Fixture files are named
+after the word they show, e.g. cat_1.jpg or 3+2=5_1.jpg. Without --fixtures, a
+synthetic set is drawn: script-font words on paper, rotated and lit unevenly,
+lying on a desk.
+
+Usage:
+    python tests/test_handwriting_ocr_benchmark.py [--fixtures photos/] [--tesseract /usr/bin/tesseract]
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from local_ocr import HandwritingOCR, find_text_region, preprocess, skew_angle
+
+WORDS = ["cat", "dog", "sun", "fish", "tree", "house", "water", "happy", "school", "friend"]
+EQUATIONS = ["3+2=5", "8-3=5", "10-4=6", "15+8=23"]
+VISION_SECONDS = 2.5  # typical vision API round trip for a text check
+
+
+def misspell(answer):
+    """A wrong answer a child might write"""
+    if '=' in answer:
+        equation, result = answer.split('=')
+        return f"{equation}={int(result) + 1}"
+    return answer[1] + answer[0] + answer[2:] if len(answer) > 1 else answer + answer
+
+
+def synthetic_photo(text, angle, rng):
+    """Photo of a sheet with text written on it; returns the image and the text's true box"""
+    sheet = np.full((240, 420), 238, np.uint8)
+    scale = 2.4 if len(text) <= 5 else 1.8
+    (w, h), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SCRIPT_SIMPLEX, scale, 5)
+    origin = ((420 - w) // 2, (240 + h) // 2)
+    cv2.putText(sheet, text, origin, cv2.FONT_HERSHEY_SCRIPT_SIMPLEX, scale, 30, 5, cv2.LINE_AA)
+    rotation = cv2.getRotationMatrix2D((210, 120), angle, 1.0)
+    sheet = cv2.warpAffine(sheet, rotation, (420, 240), borderValue=238)
+
+    frame = np.full((480, 640), 90, np.uint8)
+    frame += rng.integers(0, 20, frame.shape, dtype=np.uint8)
+    x0, y0 = 110 + int(rng.integers(-30, 30)), 120 + int(rng.integers(-30, 30))
+    frame[y0:y0 + 240, x0:x0 + 420] = sheet
+    # Uneven light: a lamp on one side
+    light = np.tile(np.linspace(0.75, 1.05, 640, dtype=np.float32), (480, 1))
+    frame = np.clip(frame * light + rng.normal(0, 4, frame.shape), 0, 255).astype(np.uint8)
+    box = (x0 + origin[0], y0 + origin[1] - h, w, h)
+    return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR), box
+
+
+def load_fixtures(directory):
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, '*'))):
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        answer = os.path.splitext(os.path.basename(path))[0].rsplit('_', 1)[0]
+        fixtures.append((answer, image, None, None))
+    return fixtures
+
+
+def synthetic_fixtures(rng):
+    fixtures = []
+    for answer in WORDS + EQUATIONS:
+        for angle in (-8.0, 0.0, 6.0):
+            image, box = synthetic_photo(answer, angle, rng)
+            fixtures.append((answer, image, box, angle))
+    return fixtures
+
+
+def check_preprocessing(fixtures):
+    """Crop covers the writing, skew is measured, and it is fast"""
+    ok = True
+    times, angle_errors, missed = [], [], 0
+    for answer, image, box, angle in fixtures:
+        start = time.perf_counter()
+        preprocess(image)
+        times.append(time.perf_counter() - start)
+        if box is None:
+            continue
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        x, y, w, h = find_text_region(gray)
+        bx, by, bw, bh = box
+        cx, cy = bx + bw / 2, by + bh / 2
+        if not (x <= cx <= x + w and y <= cy <= y + h) or w > 0.8 * gray.shape[1]:
+            missed += 1
+        crop = gray[y:y + h, x:x + w]
+        ink = cv2.adaptiveThreshold(crop, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV,
+                                    max(3, (min(crop.shape) // 4) | 1), 15)
+        angle_errors.append(abs(skew_angle(ink) - angle))
+
+    print(f"Preprocessing: {np.mean(times) * 1000:.1f} ms mean, {np.max(times) * 1000:.1f} ms max "
+          f"over {len(times)} photos")
+    if angle_errors:
+        if missed:
+            print(f"❌ Text region missed in {missed} of {len(angle_errors)} photos")
+            ok = False
+        else:
+            print(f"✅ Crop finds the writing in all {len(angle_errors)} photos")
+        if np.median(angle_errors) > 3.0:
+            print(f"❌ Skew estimate off by {np.median(angle_errors):.1f}° (median)")
+            ok = False
+        else:
+            print(f"✅ Skew measured within {np.median(angle_errors):.1f}° (median)")
+    return ok
+
+
+def check_ocr(ocr, fixtures):
+    """Confirm / reject / escalate split and false confirmations"""
+    true_answers = [ocr.verify(image, answer) for answer, image, _, _ in fixtures]
+    wrong_answers = [ocr.verify(image, misspell(answer)) for answer, image, _, _ in fixtures]
+
+    confirmed = sum(r.verdict == 'match' for r in true_answers)
+    wrongly_rejected = sum(r.verdict == 'mismatch' for r in true_answers)
+    wrongly_confirmed = sum(r.verdict == 'match' for r in wrong_answers)
+    caught = sum(r.verdict == 'mismatch' for r in wrong_answers)
+    results = true_answers + wrong_answers
+    local = sum(r.verdict != 'unsure' for r in results)
+    latencies = sorted(r.seconds for r in results)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+
+    print(f"Correct answers: {confirmed}/{len(fixtures)} confirmed locally, {wrongly_rejected} wrongly rejected")
+    print(f"Misspelled answers: {caught}/{len(fixtures)} rejected locally, {wrongly_confirmed} wrongly confirmed")
+    print(f"Settled on the device: {local}/{len(results)} checks; the rest go to the vision API")
+    print(f"Local check latency: {np.mean(latencies) * 1000:.0f} ms mean, {p95 * 1000:.0f} ms p95")
+    escalated = len(results) - local
+    expected = (sum(latencies) + escalated * VISION_SECONDS) / len(results)
+    print(f"Mean time per check: {expected:.2f} s vs {VISION_SECONDS:.1f} s vision-only")
+
+    ok = True
+    if wrongly_confirmed:
+        print(f"❌ {wrongly_confirmed} wrong answers were accepted")
+        ok = False
+    else:
+        print("✅ No wrong answer was accepted")
+    if p95 > 1.0:
+        print(f"❌ Local check is not sub-second (p95 {p95:.2f} s)")
+        ok = False
+    else:
+        print("✅ Local check is sub-second")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Handwriting OCR benchmark")
+    parser.add_argument('--fixtures', help="Directory of photos named <answer>_<n>.jpg")
+    parser.add_argument('--tesseract', help="Path to the tesseract binary")
+    args = parser.parse_args()
+
+    print("🔤 Handwriting OCR Benchmark")
+    print("=" * 60)
+    rng = np.random.default_rng(3)
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(rng)
+    print(f"Fixtures: {len(fixtures)} {'photos from ' + args.fixtures if args.fixtures else 'synthetic photos'}")
+
+    ok = check_preprocessing(fixtures)
+
+    ocr = HandwritingOCR(tesseract_cmd=args.tesseract)
+    if not ocr.available():
+        print("⚠️ Tesseract not available - OCR accuracy and latency not measured "
+              "(sudo apt install tesseract-ocr && pip install pytesseract)")
+    else:
+        print(f"Tesseract {ocr.version}")
+        ok = check_ocr(ocr, fixtures) and ok
+
+    print(f"\n{'✅' if ok else '❌'} Handwriting OCR {'benchmark passed' if ok else 'has problems'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Intent router test
+Checks the compiled intent router against a golden corpus of utterances,
+compares its routing with the old chain of `phrase in text` checks (in the
+order handle_special_commands used to run them) and times both
+
+Usage:
+    python tests/test_intent_router.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from intent_router import (build_assistant_router, READY_PHRASES, OBJECT_IDENTIFICATION_PHRASES,
+                           IMAGE_PHRASES, BIRTHDAY_PHRASES, SINGING_PHRASES, GAME_USERS)
+from math_quiz_game import MATH_GAME_COMMANDS
+from filipino_translator import FILIPINO_GAME_COMMANDS
+
+ALL = ('face_tracking',)
+
+# (utterance, user, active context, expected intent or None)
+GOLDEN = [
+    # Robot movement
+    ("go forward", 'sophia', ALL, 'move.forward'),
+    ("hey robot, turn left please", 'sophia', ALL, 'move.left'),
+    ("left", 'eladriel', ALL, 'move.left'),
+    ("right", 'parent', ALL, 'move.right'),
+    ("backwards", 'sophia', ALL, 'move.backward'),
+    ("stop", 'sophia', ALL, 'move.stop'),
+    ("miley stop", 'sophia', ALL, 'move.stop'),
+    ("I left my book at school", 'sophia', ALL, None),
+    ("is that right", 'sophia', ALL, None),
+    ("the bus didn't stop", 'eladriel', ALL, None),
+    ("hey dino come here", 'eladriel', ALL, 'gesture.call'),
+    ("activate robot", 'parent', ALL, 'gesture.call'),
+    # Camera head
+    ("look at me", 'sophia', ALL, 'face_tracking'),
+    ("look left", 'eladriel', ALL, 'face_tracking'),
+    ("track my face", 'sophia', ALL, 'face_tracking'),
+    ("look left", 'eladriel', (), None),
+    # Parent admin
+    ("system status", 'parent', ALL, 'parent.status'),
+    ("report", 'parent', ALL, 'parent.status'),
+    ("read me a book report", 'parent', ALL, None),
+    ("enable quiet mode", 'parent', ALL, 'parent.quiet_on'),
+    ("how are the children", 'parent', ALL, None),
+    ("check on kids", 'parent', ALL, 'parent.kids'),
+    ("system status", 'sophia', ALL, None),
+    # Sounds
+    ("turn off sounds", 'sophia', ALL, 'sounds.off'),
+    ("sounds on", 'eladriel', ALL, 'sounds.on'),
+    # Features
+    ("what is this", 'sophia', ALL, 'object.identify'),
+    ("look", 'sophia', ALL, 'object.identify'),
+    ("look what i found", 'eladriel', ALL, 'object.identify'),
+    ("what is this dinosaur", 'eladriel', ALL, 'dinosaur.identify'),
+    ("what is this dinosaur", 'sophia', ALL, 'object.identify'),
+    ("tips", 'eladriel', ALL, 'dinosaur.tips'),
+    ("can you see the camera", 'eladriel', ALL, 'camera.preview'),
+    ("say that again", 'sophia', ALL, 'repeat'),
+    ("again", 'sophia', ALL, 'repeat'),
+    ("let's play again tomorrow", 'sophia', ALL, None),
+    ("sing happy birthday to mom", 'sophia', ALL, 'sing'),
+    ("can you sing", 'eladriel', ALL, 'sing'),
+    ("I'm using a pencil", 'sophia', ALL, None),
+    ("draw me a unicorn", 'sophia', ALL, 'image'),
+    ("show me a picture of a t rex", 'eladriel', ALL, 'image'),
+    # Starting games
+    ("let's play the math game", 'sophia', ALL, 'math.start'),
+    ("math game", 'sophia', ALL, 'math.start'),
+    ("math game", 'guest', ALL, None),
+    ("animal game", 'eladriel', ALL, 'animal.start'),
+    ("letter game", 'sophia', ALL, 'letter.start'),
+    ("spelling game", 'sophia', ALL, 'spelling.start'),
+    ("filipino game", 'sophia', ALL, 'filipino.start'),
+    # Games in progress
+    ("I'm ready", 'sophia', ('math',), 'math.ready'),
+    ("look at this", 'sophia', ('math',), 'math.ready'),
+    ("I already know", 'sophia', ('math',), None),
+    ("end game", 'sophia', ('math',), 'math.end'),
+    ("stop math", 'sophia', ('math',), 'math.end'),
+    ("what animal", 'eladriel', ('animal',), 'animal.guess'),
+    ("help me", 'eladriel', ('animal',), 'animal.help'),
+    ("give me a hint", 'sophia', ('letter',), 'letter.hint'),
+    ("help", 'sophia', ('letter',), 'letter.help'),
+    ("skip", 'sophia', ('letter',), 'letter.skip'),
+    ("auto check", 'sophia', ('spelling',), 'spelling.auto_check'),
+    ("stop auto check", 'sophia', ('spelling',), 'spelling.stop_auto_check'),
+    ("done", 'eladriel', ('spelling',), 'spelling.ready'),
+    ("end filipino game", 'sophia', ('filipino',), 'filipino.end'),
+    # General
+    ("help", 'sophia', ALL, 'help'),
+    ("what can you do", 'eladriel', ALL, 'help'),
+    ("gesture control", 'parent', ALL, 'gesture.control'),
+    ("tell me about dinosaurs", 'eladriel', ALL, None),
+]
+
+
+def old_route(text, user, context):
+    """The old handle_special_commands order of substring checks (which branch would have run)"""
+    text = text.lower()
+    has = lambda phrases: any(phrase in text for phrase in phrases)
+    if has(['hey dino come', 'hey miley come', 'dino come', 'miley come', 'come here dino', 'come here miley',
+            'come to me dino', 'come to me miley', 'dino come here', 'miley come here', 'hey robot come',
+            'robot come', 'come here robot', 'robot come here', 'activate robot', 'start robot',
+            'robot control', 'gesture robot']):
+        return 'gesture.call'
+    for action, phrases in (('forward', ['go forward', 'move forward', 'forward']),
+                            ('backward', ['go backward', 'move backward', 'backward', 'backwards']),
+                            ('left', ['go left', 'turn left', 'left']),
+                            ('right', ['go right', 'turn right', 'right']),
+                            ('stop', ['stop', 'stop moving', 'halt'])):
+        if has(phrases):
+            return f'move.{action}'
+    if user == 'parent':
+        for intent, phrases in (('parent.status', ['status report', 'system status', 'report']),
+                                ('parent.diagnostic', ['system check', 'health check', 'diagnostic']),
+                                ('parent.quiet_on', ['quiet mode on', 'enable quiet mode', 'whisper mode']),
+                                ('parent.quiet_off', ['quiet mode off', 'disable quiet mode', 'normal volume']),
+                                ('parent.kids', ['check on kids', 'kids status', 'children'])):
+            if has(phrases):
+                return intent
+    if has(['turn off sounds', 'disable sounds', 'no sounds', 'mute sounds']):
+        return 'sounds.off'
+    if has(['turn on sounds', 'enable sounds', 'sounds on', 'unmute sounds']):
+        return 'sounds.on'
+    if has(OBJECT_IDENTIFICATION_PHRASES):
+        return 'object.identify'
+    if has(['repeat', 'say that again', 'what did you say', 'what was that', 'one more time', 'again']):
+        return 'repeat'
+    if has(BIRTHDAY_PHRASES + SINGING_PHRASES):
+        return 'sing'
+    if has(IMAGE_PHRASES):
+        return 'image'
+    if user in GAME_USERS:
+        if has(MATH_GAME_COMMANDS):
+            return 'math.start'
+        if 'math' in context:
+            if has(READY_PHRASES):
+                return 'math.ready'
+            if has(['end math', 'stop math', 'quit math', 'end game']):
+                return 'math.end'
+        if has(['animal game', 'guess the animal', 'animal guessing', 'identify animal']):
+            return 'animal.start'
+        if 'animal' in context:
+            for intent, phrases in (('animal.guess', ['guess the animal', 'identify animal', 'what animal']),
+                                    ('animal.stats', ['animal stats', 'my stats', 'game stats']),
+                                    ('animal.help', ['animal help', 'help me', 'how to play'])):
+                if has(phrases):
+                    return intent
+        if has(['letter game', 'letter word game', 'word guessing', 'guess the word', 'play letter game']):
+            return 'letter.start'
+        if 'letter' in context:
+            for intent, phrases in (('letter.hint', ['hint please', 'give me a hint', 'need a hint', 'extra hint']),
+                                    ('letter.skip', ['skip', 'skip word', 'next word']),
+                                    ('letter.help', ['help', 'how to play', 'game help'])):
+                if has(phrases):
+                    return intent
+        if has(['spelling game', 'play spelling', 'start spelling']):
+            return 'spelling.start'
+        if 'spelling' in context:
+            for intent, phrases in (('spelling.ready', READY_PHRASES),
+                                    ('spelling.auto_check', ['auto check', 'smart check', 'visual check']),
+                                    ('spelling.stop_auto_check', ['stop auto check', 'stop monitoring'])):
+                if has(phrases):
+                    return intent
+    if has(FILIPINO_GAME_COMMANDS):
+        return 'filipino.start'
+    if user == 'eladriel':
+        for intent, phrases in (('dinosaur.identify', ['identify dinosaur', 'what is this dinosaur']),
+                                ('camera.preview', ['show camera', 'camera preview', 'can you see']),
+                                ('dinosaur.tips', ['dinosaur tips', 'how to show', 'tips'])):
+            if has(phrases):
+                return intent
+    if has(['help', 'what can you do', 'commands']):
+        return 'help'
+    if has(['gesture control', 'hand control', 'hand gesture']):
+        return 'gesture.control'
+    if 'face_tracking' in context and has(['look at me', 'track my face', 'look left']):
+        return 'face_tracking'
+    return None
+
+
+def benchmark(route, runs=200):
+    """Microseconds per utterance over the golden corpus"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for text, user, context, _ in GOLDEN:
+            route(text, user, context)
+        timings.append((time.perf_counter() - start) / len(GOLDEN))
+    return np.array(timings) * 1e6
+
+
+def main():
+    print("🧭 Intent Router Test")
+    print("=" * 60)
+    ok = True
+
+    start = time.perf_counter()
+    router = build_assistant_router()
+    print(f"Compiled {len(router.intents)} intents / {router.phrase_count} phrases "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def new_route(text, user, context):
+        best = router.best(text, user, context)
+        return best.intent if best else None
+
+    # Golden corpus
+    failures = []
+    for text, user, context, expected in GOLDEN:
+        got = new_route(text, user, context)
+        if got != expected:
+            failures.append(f"'{text}' ({user}, {context}) -> {got}, expected {expected}")
+    print(f"\nGolden corpus: {len(GOLDEN) - len(failures)}/{len(GOLDEN)} routed as expected")
+    for failure in failures:
+        print(f"   ✗ {failure}")
+    ok = ok and not failures
+
+    # What the old order got wrong
+    old_failures = [(text, old_route(text, user, context), expected) for text, user, context, expected in GOLDEN
+                    if old_route(text, user, context) != expected]
+    print(f"\nOld substring chain: {len(GOLDEN) - len(old_failures)}/{len(GOLDEN)} - routed differently:")
+    for text, got, expected in old_failures:
+        print(f"   • '{text}': {got} -> now {expected}")
+
+    # Latency
+    old_us = benchmark(old_route)
+    new_us = benchmark(new_route)
+    print(f"\nPer utterance: old median {np.median(old_us):.1f} µs, router median {np.median(new_us):.1f} µs "
+          f"(p90 {np.percentile(new_us, 90):.1f} µs)")
+    if np.median(new_us) > 1000:
+        print("❌ Routing takes over a millisecond")
+        ok = False
+
+    print(f"\n{'✅' if ok else '❌'} Intent router {'passes' if ok else 'fails'} the golden corpus")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
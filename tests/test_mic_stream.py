@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared microphone stream
+Replays a WAV (or a generated speech/silence pattern) in real time as the
+"device", then runs several listening turns, level checks and a concurrent
+wake word reader against one MicrophoneStream and checks the device is opened
+exactly once, re-probed only after an error, and how much per-turn setup
+time the ring buffer saves
+
+Usage:
+    python tests/test_mic_stream.py [--wav recording.wav]
+"""
+
+import os
+import sys
+import time
+import wave
+import argparse
+import threading
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from mic_stream import MicrophoneStream, RingBufferSource
+from voice_activity_detector import VoiceActivityDetector
+
+RATE = 16000
+CHUNK = 1024
+
+
+class ReplayStream:
+    """Input stream that returns WAV audio at real-time pace"""
+
+    def __init__(self, samples, fail_after=None):
+        self.samples = samples
+        self.position = 0
+        self.fail_after = fail_after
+        self.reads = 0
+        self.next_read = time.time()
+
+    def read(self, frames, exception_on_overflow=True):
+        self.reads += 1
+        if self.fail_after is not None and self.reads > self.fail_after:
+            raise IOError("Input overflowed / device unplugged")
+        self.next_read += frames / RATE
+        time.sleep(max(0.0, self.next_read - time.time()))
+        indices = (self.position + np.arange(frames)) % len(self.samples)
+        self.position += frames
+        return self.samples[indices].tobytes()
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ReplayAudio:
+    """Stands in for the PyAudio instance: every open() replays the same recording"""
+
+    def __init__(self, samples, fail_first_after=None):
+        self.samples = samples
+        self.fail_first_after = fail_first_after
+        self.opened = 0
+
+    def open(self, **kwargs):
+        self.opened += 1
+        fail_after = self.fail_first_after if self.opened == 1 else None
+        return ReplayStream(self.samples, fail_after)
+
+
+def speech_pattern(seconds=12.0):
+    """Quiet room noise with a 0.8 s voiced burst every 2 s"""
+    rng = np.random.default_rng(1)
+    t = np.arange(int(seconds * RATE)) / RATE
+    audio = rng.normal(0, 60, len(t))
+    burst = (t % 2.0 > 0.6) & (t % 2.0 < 1.4)
+    audio[burst] += 4000 * np.sin(2 * np.pi * 180 * t[burst]) * (1 + 0.5 * np.sin(2 * np.pi * 4 * t[burst]))
+    return audio.astype(np.int16)
+
+
+def load_wav(path):
+    with wave.open(path, 'rb') as wav:
+        assert wav.getframerate() == RATE and wav.getsampwidth() == 2, "expected 16 kHz 16-bit WAV"
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        if wav.getnchannels() > 1:
+            samples = samples[::wav.getnchannels()]
+    return samples
+
+
+class DeviceProbe:
+    """Records how often the device choice is (re-)probed"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, refresh=False):
+        self.calls.append(refresh)
+        return 3
+
+
+def make_recognizer():
+    recognizer = sr.Recognizer()
+    recognizer.energy_threshold = 300
+    recognizer.dynamic_energy_threshold = False
+    recognizer.pause_threshold = 0.4
+    recognizer.non_speaking_duration = 0.3
+    return recognizer
+
+
+def test_single_open(samples, turns=3):
+    """Listening turns, level checks and a wake word reader share one device open"""
+    audio = ReplayAudio(samples)
+    probe = DeviceProbe()
+    mic = MicrophoneStream(audio, RATE, CHUNK, probe)
+    mic.start()
+
+    # Concurrent consumer, like the offline wake word spotter
+    wake_chunks = []
+    stop_wake = threading.Event()
+
+    def wake_loop():
+        reader = mic.reader()
+        while not stop_wake.is_set():
+            chunk = reader.read_chunk(timeout=0.5)
+            if chunk:
+                wake_chunks.append(chunk)
+
+    wake_thread = threading.Thread(target=wake_loop, daemon=True)
+    wake_thread.start()
+
+    recognizer = make_recognizer()
+    setup_times = []
+    try:
+        time.sleep(0.5)
+        for _ in range(turns):
+            mic.level(0.1)
+            start = time.perf_counter()
+            with RingBufferSource(mic, preroll=0.3) as source:
+                recognizer.adjust_for_ambient_noise(source, duration=0.3)
+                setup_times.append(time.perf_counter() - start)
+                recognizer.energy_threshold = 300
+                phrase = recognizer.listen(source, timeout=5, phrase_time_limit=5)
+            seconds = len(phrase.frame_data) / (2 * RATE)
+            assert 0.8 <= seconds <= 2.0, f"phrase length {seconds:.2f}s"
+            mic.level(0.1)
+    finally:
+        stop_wake.set()
+        wake_thread.join()
+        mic.stop()
+
+    assert audio.opened == 1, f"device opened {audio.opened} times"
+    assert probe.calls == [False], probe.calls
+    assert len(wake_chunks) > 0
+    return float(np.median(setup_times))
+
+
+def test_reprobe_on_error(samples):
+    """A read error closes the stream, re-probes the device and reopens it"""
+    audio = ReplayAudio(samples, fail_first_after=5)
+    probe = DeviceProbe()
+    mic = MicrophoneStream(audio, RATE, CHUNK, probe)
+    reader = mic.reader()
+    try:
+        received = 0
+        deadline = time.time() + 5
+        while received < 15 and time.time() < deadline:
+            if reader.read_chunk(timeout=1.0):
+                received += 1
+    finally:
+        mic.stop()
+    assert received == 15, received
+    assert audio.opened == 2 and probe.calls == [False, True], (audio.opened, probe.calls)
+    assert mic.read_errors == 1
+
+
+def test_preroll_stops_at_not_before():
+    """Pre-roll never starts before not_before (e.g. the end of the robot's own speech)"""
+    mic = MicrophoneStream(ReplayAudio(speech_pattern(3.0)), RATE, CHUNK, DeviceProbe())
+    mic.start()
+    try:
+        time.sleep(1.2)
+        speech_ended = time.time() - 0.3
+        full = mic.reader(preroll=1.0).available()
+        limited = mic.reader(preroll=1.0, not_before=speech_ended).available()
+    finally:
+        mic.stop()
+    chunk_seconds = CHUNK / RATE
+    assert full * chunk_seconds >= 0.9, full
+    assert limited * chunk_seconds <= 0.3 + chunk_seconds, limited
+
+
+class UtteranceLengthDetector(VoiceActivityDetector):
+    """Reports the length of the captured utterance instead of sending it to speech recognition"""
+
+    def _process_audio_chunks(self, audio_chunks, game_mode=None):
+        audio = audio_chunks[0]
+        return f"{len(audio.get_raw_data()) / (audio.sample_width * audio.sample_rate):.2f}"
+
+
+def test_voice_detector_on_stream():
+    """VoiceActivityDetector reads the shared stream (no second device open) and finds one utterance"""
+    # Room noise with one 0.8 s utterance starting 2.5 s in
+    rng = np.random.default_rng(2)
+    t = np.arange(6 * RATE) / RATE
+    samples = rng.normal(0, 60, len(t))
+    spoken = (t >= 2.5) & (t < 3.3)
+    samples[spoken] += 4000 * np.sin(2 * np.pi * 180 * t[spoken])
+    audio = ReplayAudio(samples.astype(np.int16))
+    mic = MicrophoneStream(audio, RATE, CHUNK, DeviceProbe())
+    mic.start()
+    time.sleep(1.5)  # background audio for the noise floor is already buffered
+    detector = UtteranceLengthDetector(make_recognizer(), mic_stream=mic)
+    try:
+        text = detector.listen_with_speaker_detection(timeout=5, silence_threshold=0.3, max_total_time=6)
+    finally:
+        mic.stop()
+    assert text is not None, "no utterance found on the shared stream"
+    assert 0.6 <= float(text) <= 2.0, f"utterance length {text}s"
+    assert audio.opened == 1, f"device opened {audio.opened} times"
+
+
+def fresh_open_setup(samples):
+    """Per-turn setup of the old path: open a new stream and calibrate on 0.3 s of live audio"""
+    audio = ReplayAudio(samples)
+    start = time.perf_counter()
+    stream = audio.open(rate=RATE, frames_per_buffer=CHUNK)
+    seconds_per_buffer = CHUNK / RATE
+    elapsed = 0.0
+    while elapsed + seconds_per_buffer <= 0.3:
+        stream.read(CHUNK)
+        elapsed += seconds_per_buffer
+    stream.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared microphone stream test")
+    parser.add_argument('--wav', help="16 kHz mono recording with speech bursts to replay")
+    args = parser.parse_args()
+
+    print("🎤 Shared Microphone Stream Test")
+    print("=" * 50)
+    samples = load_wav(args.wav) if args.wav else speech_pattern()
+    try:
+        ring_setup = test_single_open(samples)
+        print("✅ 3 listening turns, 6 level checks and a wake word reader used one device open")
+        test_reprobe_on_error(samples)
+        print("✅ Device re-probed and reopened only after a read error")
+        test_preroll_stops_at_not_before()
+        print("✅ Pre-roll stops at the end of the assistant's own speech")
+        test_voice_detector_on_stream()
+        print("✅ Voice activity detector listens on the shared stream")
+        fresh_setup = fresh_open_setup(samples)
+    except AssertionError as e:
+        print(f"❌ Microphone stream test failed: {e}")
+        return False
+
+    print("\nPer-turn microphone setup before listening:")
+    print(f"   • New stream + live 0.3s calibration: {fresh_setup * 1000:6.1f} ms "
+          f"(plus device probe/open, and 2 x 0.1s level streams)")
+    print(f"   • Shared ring buffer:                 {ring_setup * 1000:6.1f} ms")
+    return ring_setup < fresh_setup
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the shared model registry
+Compares the old behaviour (every consumer loads YOLO and encodes people/ itself)
+with the registry (loaded once, shared) and reports startup time and RSS
+
+Each mode runs in a fresh Python process so memory numbers are not mixed.
+
+Usage:
+    python tests/test_model_registry.py [--consumers 4]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, PROJECT_DIR)
+
+CHILD_SCRIPT = '''
+import json, sys, time
+sys.path.insert(0, {project_dir!r})
+from model_registry import _rss_mb
+
+consumers = {consumers}
+rss_start = _rss_mb()
+start = time.time()
+
+if {use_registry}:
+    from model_registry import get_yolo_model, get_face_gallery
+    for _ in range(consumers):
+        get_yolo_model('yolov8n.pt')
+        get_face_gallery('people')
+else:
+    from ultralytics import YOLO
+    from face_gallery import FaceGallery
+    handles = []
+    for _ in range(consumers):
+        handles.append((YOLO('yolov8n.pt'), FaceGallery('people').load()))
+
+print(json.dumps({{'time': time.time() - start, 'rss_start': rss_start, 'rss_end': _rss_mb()}}))
+'''
+
+
+def run_mode(use_registry, consumers):
+    """Run one benchmark mode in a child process"""
+    script = CHILD_SCRIPT.format(project_dir=PROJECT_DIR, consumers=consumers, use_registry=use_registry)
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, cwd=PROJECT_DIR)
+    if result.returncode != 0:
+        print(f"❌ Benchmark child failed:\n{result.stderr}")
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model registry startup benchmark")
+    parser.add_argument('--consumers', type=int, default=4,
+                        help="Number of model consumers (detector, tracker detector, face tracker, AI camera)")
+    args = parser.parse_args()
+
+    print("📦 Model Registry Startup Benchmark")
+    print("=" * 50)
+
+    before = run_mode(False, args.consumers)
+    after = run_mode(True, args.consumers)
+    if not before or not after:
+        return False
+
+    for label, result in (("Before (per-consumer loads)", before), ("After (shared registry)", after)):
+        print(f"\n{label}:")
+        print(f"   • Startup time: {result['time']:.2f}s")
+        print(f"   • RSS: {result['rss_start']:.0f} MB -> {result['rss_end']:.0f} MB "
+              f"(+{result['rss_end'] - result['rss_start']:.0f} MB)")
+
+    print(f"\n🎯 Saved {before['time'] - after['time']:.2f}s and "
+          f"{before['rss_end'] - after['rss_end']:.0f} MB with {args.consumers} consumers")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Object pre-classification benchmark
+Compares sending the full camera frame to the vision API for "what is this?"
+with the local detector pass: answer confident everyday objects on the device,
+upload only a crop around the held-up object (plus the label as a hint) otherwise
+
+Reports bytes uploaded, vision calls and end-to-end answer latency for both.
+Upload time is modelled from --uplink-mbps and the vision round trip from
+--vision-seconds; detection, cropping and encoding are measured.
+
+With --frames DIR the recorded frames (*.jpg / *.png) are run through YOLOv8
+(needs ultralytics). Without it, a synthetic session is used: a child holding up
+toys in front of the camera, with the detections YOLO gives for such frames
+replayed (a confident teddy bear, a toy dinosaur YOLO calls a bird, ...).
+
+Usage:
+    python tests/test_object_preclassifier_benchmark.py [--frames DIR] [--uplink-mbps 5] [--vision-seconds 3.0]
+"""
+
+import os
+import sys
+import glob
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from frame_encoder import FrameEncoder
+from object_preclassifier import ObjectPreclassifier, most_salient, local_answer, LOCAL_KNOWLEDGE
+
+WIDTH, HEIGHT = 1280, 720
+
+CATEGORIES = {
+    "toys": {"description": "Fun playthings that help children learn and develop",
+             "educational_focus": ["creativity", "motor skills", "imagination", "social skills"]},
+    "books": {"description": "Sources of knowledge and entertainment",
+              "educational_focus": ["reading", "learning", "imagination", "knowledge"]},
+    "food_items": {"description": "Things we eat for nutrition and enjoyment",
+                   "educational_focus": ["nutrition", "health", "cooking", "cultural diversity"]},
+}
+
+# Held-up object: (what YOLO calls it, its confidence, BGR colour, size in pixels)
+SHOWINGS = [
+    ("teddy bear", 0.91, (60, 110, 160), 300),
+    ("bird", 0.55, (60, 150, 70), 280),        # toy dinosaur
+    ("book", 0.86, (40, 40, 120), 260),
+    ("banana", 0.83, (40, 210, 230), 220),
+    ("vase", 0.47, (150, 60, 130), 240),       # toy rocket
+    (None, 0.0, (170, 90, 40), 260),           # toy YOLO doesn't detect at all
+]
+
+
+class ReplayedDetector:
+    """Detections recorded for the synthetic frames, in SmartCameraDetector.detect_objects format"""
+
+    def __init__(self):
+        self.detections = []
+
+    def detect_objects(self, frame):
+        return self.detections
+
+
+def session_frame(label, confidence, color, size, rng):
+    """A child holding a toy up to the camera, and a cup on the table in the corner"""
+    y, x = np.mgrid[0:HEIGHT, 0:WIDTH].astype(np.float32)
+    frame = np.dstack([100 + 40 * x / WIDTH, 120 + 30 * y / HEIGHT, 140 + 20 * np.sin(x / 150.0)])
+    frame += cv2.GaussianBlur(rng.normal(0, 14, (HEIGHT, WIDTH)).astype(np.float32), (0, 0), 3)[..., None]
+    person = (WIDTH // 2 + int(rng.integers(-60, 60)), HEIGHT // 2 + 120)
+    cv2.ellipse(frame, person, (260, 330), 0, 0, 360, (120, 150, 200), -1)
+    cv2.circle(frame, (person[0], person[1] - 330), 110, (140, 170, 220), -1)
+    cv2.rectangle(frame, (60, 560), (150, 680), (200, 200, 210), -1)
+
+    cx, cy = WIDTH // 2 + int(rng.integers(-120, 120)), HEIGHT // 2 + int(rng.integers(-60, 60))
+    half = size // 2
+    cv2.ellipse(frame, (cx, cy), (half, int(half * 0.8)), float(rng.uniform(-20, 20)), 0, 360, color, -1)
+    for _ in range(30):
+        spot = (cx + int(rng.integers(-half // 2, half // 2)), cy + int(rng.integers(-half // 2, half // 2)))
+        cv2.circle(frame, spot, int(rng.integers(5, 20)), tuple(c * 0.6 for c in color), -1)
+    frame = np.clip(frame + rng.normal(0, 3, frame.shape), 0, 255).astype(np.uint8)
+
+    detections = [
+        {'class': 'person', 'confidence': 0.93, 'bbox': [person[0] - 260.0, 0.0, person[0] + 260.0, HEIGHT - 1.0]},
+        {'class': 'cup', 'confidence': 0.88, 'bbox': [60.0, 560.0, 150.0, 680.0]},
+    ]
+    if label:
+        jitter = rng.normal(0, 6, 4)
+        detections.append({'class': label, 'confidence': confidence,
+                           'bbox': [cx - half + jitter[0], cy - half * 0.8 + jitter[1],
+                                    cx + half + jitter[2], cy + half * 0.8 + jitter[3]]})
+    return frame, detections
+
+
+def yolo_detector():
+    """The assistant's own detector, if YOLO can run here"""
+    try:
+        from smart_camera_detector import SmartCameraDetector
+        return SmartCameraDetector(model_size='n', confidence_threshold=0.4, headless=True)
+    except Exception as e:
+        print(f"⚠️ YOLO detector unavailable ({e})")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Object pre-classification benchmark")
+    parser.add_argument('--frames', help="Directory of recorded camera frames (needs ultralytics)")
+    parser.add_argument('--rounds', type=int, default=5, help="Synthetic session repeats")
+    parser.add_argument('--uplink-mbps', type=float, default=5.0, help="Home upload bandwidth")
+    parser.add_argument('--vision-seconds', type=float, default=3.0, help="Vision API round trip (excl. upload)")
+    args = parser.parse_args()
+
+    print("🎯 Object Pre-classification Benchmark")
+    print("=" * 60)
+    rng = np.random.default_rng(3)
+    encoder = FrameEncoder()
+    ok = True
+
+    if args.frames:
+        detector = yolo_detector()
+        if detector is None:
+            print("❌ Recorded frames need the YOLO detector (pip install ultralytics)")
+            return False
+        paths = sorted(glob.glob(os.path.join(args.frames, '*.jpg')) + glob.glob(os.path.join(args.frames, '*.png')))
+        session = [(cv2.imread(path), None) for path in paths]
+        print(f"Recorded frames: {len(session)} from {args.frames} (YOLOv8n)")
+    else:
+        detector = ReplayedDetector()
+        session = [session_frame(*showing, rng) for _ in range(args.rounds) for showing in SHOWINGS]
+        print(f"Synthetic session: {len(session)} frames {WIDTH}x{HEIGHT} "
+              f"(detections replayed - detector time not included)")
+    if not session:
+        print("❌ No frames to run")
+        return False
+
+    preclassifier = ObjectPreclassifier(detector, CATEGORIES)
+    upload_seconds = lambda size: size * 8 / (args.uplink_mbps * 1e6)
+    before, after, before_bytes, after_bytes, vision_calls, wrong_box = [], [], [], [], 0, 0
+
+    for frame, detections in session:
+        if detections is not None:
+            detector.detections = detections
+        full = encoder.encode(frame, detail="high")
+        before_bytes.append(len(full.jpeg))
+        before.append(full.seconds + upload_seconds(len(full.jpeg)) + args.vision_seconds)
+
+        found = preclassifier.classify(frame)
+        if found.answer is not None:
+            after_bytes.append(0)
+            after.append(found.seconds)
+            continue
+        image = encoder.encode(found.crop if found.crop is not None else frame, detail="high")
+        vision_calls += 1
+        after_bytes.append(len(image.jpeg))
+        after.append(found.seconds + image.seconds + upload_seconds(len(image.jpeg)) + args.vision_seconds)
+        if detections is not None and found.label in ('person', 'cup'):
+            wrong_box += 1
+
+    before_kb, after_kb = np.mean(before_bytes) / 1024, np.mean(after_bytes) / 1024
+    stats = preclassifier.get_stats()
+    print(f"Before: {before_kb:6.0f} KB uploaded per question, {len(session)} vision calls, "
+          f"{np.mean(before):.2f} s mean answer")
+    print(f"After:  {after_kb:6.0f} KB uploaded per question, {vision_calls} vision calls, "
+          f"{np.mean(after):.2f} s mean answer")
+    print(f"        {stats['local_answers']} answered locally, {stats['crops']} crops, "
+          f"{stats['full_frames']} full frames; pre-classification {stats['mean_ms']:.1f} ms per frame")
+    if after_kb >= before_kb or np.mean(after) >= np.mean(before):
+        print("❌ Pre-classification did not cut upload size and answer latency")
+        ok = False
+    else:
+        print(f"✅ Upload {before_kb / max(after_kb, 1e-9):.1f}x smaller, answers "
+              f"{np.mean(before) / np.mean(after):.1f}x faster on average")
+
+    if detections is not None:
+        if wrong_box:
+            print(f"❌ {wrong_box} frames cropped to the child or the cup instead of the toy")
+            ok = False
+        else:
+            print("✅ Crops pick the held-up toy, not the child holding it or the cup in the corner")
+
+        frame, detections = session_frame(*SHOWINGS[1], rng)
+        detector.detections = detections
+        found = preclassifier.classify(frame)
+        x1, y1, x2, y2 = most_salient(detections, WIDTH, HEIGHT)['bbox']
+        bx1, by1, bx2, by2 = found.box
+        inside = bx1 <= x1 and by1 <= y1 and bx2 >= x2 and by2 >= y2
+        if found.answer is not None or not inside or "bird" not in found.hint():
+            print(f"❌ Unsure detection handled wrongly: {found}")
+            ok = False
+        else:
+            print(f"✅ Unsure detections go to the vision model as a padded "
+                  f"{found.crop.shape[1]}x{found.crop.shape[0]} crop with a '{found.label}' hint")
+
+    answer = local_answer('teddy bear', CATEGORIES)
+    if not answer or 'teddy bear' not in answer or 'Toys are' not in answer or local_answer('vase', CATEGORIES):
+        print("❌ Local knowledge table answers are wrong")
+        ok = False
+    else:
+        print(f"✅ Local answers for {len(LOCAL_KNOWLEDGE)} everyday objects, with their learning category")
+
+    print(f"\n{'✅' if ok else '❌'} Object pre-classification {'works' if ok else 'has problems'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
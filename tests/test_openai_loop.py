@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Shared OpenAI loop test
+Runs chat requests against a local mock of the chat completions endpoint and
+compares the old path (a fresh client and asyncio.run() per turn) with the
+shared OpenAILoop, counting the connections each one opens. New connections
+pay a simulated TCP + TLS handshake, which is what keep-alive saves on the
+real API. Then checks streaming, per-request timeouts and cancellation.
+
+Usage:
+    python tests/test_openai_loop.py [--turns 10] [--handshake 0.08]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import concurrent.futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import openai
+from openai_loop import OpenAILoop
+
+SLOW_PROMPT = "slow"
+SLOW_SECONDS = 1.0
+STREAM_TOKENS = ["Hello ", "there, ", "Sophia!"]
+
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    """Minimal /v1/chat/completions: JSON or SSE, HTTP/1.1 keep-alive"""
+
+    protocol_version = 'HTTP/1.1'
+    handshake = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with MockChatHandler.lock:
+            MockChatHandler.connections += 1
+        time.sleep(self.handshake)
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if request['messages'][-1]['content'] == SLOW_PROMPT:
+            time.sleep(SLOW_SECONDS)
+        if request.get('stream'):
+            chunks = [{'id': 'c', 'object': 'chat.completion.chunk', 'created': 0, 'model': request['model'],
+                       'choices': [{'index': 0, 'delta': {'content': token}, 'finish_reason': None}]}
+                      for token in STREAM_TOKENS]
+            body = ''.join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+            content_type = 'text/event-stream'
+        else:
+            body = json.dumps({'id': 'c', 'object': 'chat.completion', 'created': 0, 'model': request['model'],
+                               'choices': [{'index': 0, 'finish_reason': 'stop',
+                                            'message': {'role': 'assistant', 'content': ''.join(STREAM_TOKENS)}}]})
+            content_type = 'application/json'
+        data = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start_server(handshake):
+    MockChatHandler.handshake = handshake
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockChatHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def chat_kwargs(prompt="hi"):
+    return {'model': 'gpt-3.5-turbo', 'messages': [{'role': 'user', 'content': prompt}], 'max_tokens': 20}
+
+
+def legacy_turns(base_url, turns):
+    """Old path: each module's own client, a fresh event loop per turn"""
+    async def process():
+        client = openai.AsyncOpenAI(api_key="test", base_url=base_url, max_retries=0)
+        try:
+            response = await client.chat.completions.create(**chat_kwargs())
+            return response.choices[0].message.content
+        finally:
+            await client.close()
+
+    timings = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        asyncio.run(process())
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def shared_turns(loop, turns):
+    timings = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        loop.chat(**chat_kwargs()).result()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_connections(action):
+    before = MockChatHandler.connections
+    result = action()
+    return result, MockChatHandler.connections - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared OpenAI loop test")
+    parser.add_argument('--turns', type=int, default=10)
+    parser.add_argument('--handshake', type=float, default=0.08, help="Simulated TCP + TLS setup (s)")
+    args = parser.parse_args()
+
+    print("🔌 Shared OpenAI Loop Test")
+    print("=" * 60)
+    ok = True
+    server, base_url = start_server(args.handshake)
+    loop = OpenAILoop(api_key="test", base_url=base_url, timeout=5)
+
+    # Connection reuse across turns
+    legacy, legacy_connections = run_connections(lambda: legacy_turns(base_url, args.turns))
+    shared, shared_connections = run_connections(lambda: shared_turns(loop, args.turns))
+    legacy_ms = sum(legacy) / len(legacy) * 1000
+    shared_ms = sum(shared) / len(shared) * 1000
+    print(f"Per turn: fresh client + asyncio.run {legacy_ms:.0f} ms ({legacy_connections} connections), "
+          f"shared loop {shared_ms:.0f} ms ({shared_connections} connections)")
+    print(f"   Saved {legacy_ms - shared_ms:.0f} ms per turn with a {args.handshake * 1000:.0f} ms handshake")
+    if shared_connections > 1 or shared_ms >= legacy_ms:
+        print("❌ Shared loop did not reuse its connection")
+        ok = False
+    else:
+        print("✅ Turns reuse one keep-alive connection")
+
+    # Streaming through the loop
+    tokens = list(loop.stream_chat(**chat_kwargs()))
+    if tokens != STREAM_TOKENS:
+        print(f"❌ Streamed tokens came back as {tokens}")
+        ok = False
+    else:
+        print("✅ stream_chat() yields the deltas in order")
+
+    # Per-request timeout
+    start = time.perf_counter()
+    try:
+        loop.chat(timeout=0.2, **chat_kwargs(SLOW_PROMPT)).result()
+        print("❌ Slow request did not time out")
+        ok = False
+    except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+        print(f"✅ Slow request timed out after {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    # Cancellation from a sync thread
+    future = loop.chat(**chat_kwargs(SLOW_PROMPT))
+    time.sleep(0.1)
+    future.cancel()
+    time.sleep(0.1)
+    if not future.cancelled() or loop.stats()['cancelled'] != 1:
+        print(f"❌ Cancel did not reach the request ({loop.stats()})")
+        ok = False
+    else:
+        print("✅ future.cancel() cancels the request on the loop")
+
+    # Requests from several threads at once share the one loop
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+        answers = list(pool.map(lambda _: loop.chat(**chat_kwargs()).result().choices[0].message.content, range(8)))
+    if answers != [''.join(STREAM_TOKENS)] * 8:
+        print("❌ Concurrent requests from several threads failed")
+        ok = False
+    else:
+        print("✅ Several threads submit to the same loop")
+
+    loop.close()
+    server.shutdown()
+    print(f"\n{'✅' if ok else '❌'} Shared OpenAI loop {'works' if ok else 'has problems'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
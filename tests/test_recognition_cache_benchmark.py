@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Recognition cache replay benchmark
+Replays a session of kids holding up toys ("what is this?") through the
+recognition cache and counts the vision API calls it saves
+
+The synthetic session has eight toys - two of them the same shape in
+different colours - held up 40 times at slightly different positions,
+angles, sizes and lighting. Signatures are taken from the region the local
+detector would crop (the toy's box plus padding). A hit on the wrong toy is
+counted as an error. Also checks that small, different toys held up by the
+same child are told apart (or not cached at all), per-user scoping, TTL
+expiry, LRU eviction and that the cache survives a restart.
+
+Usage:
+    python tests/test_recognition_cache_benchmark.py [--showings 40] [--vision-seconds 3.0]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from recognition_cache import RecognitionCache, image_signature
+from object_preclassifier import crop_box
+
+WIDTH, HEIGHT = 640, 480
+
+TOYS = {
+    # name: (shape, BGR colour)
+    "green dinosaur": ("dino", (60, 150, 70)),
+    "red dinosaur": ("dino", (50, 50, 200)),
+    "teddy bear": ("bear", (60, 110, 160)),
+    "blue car": ("car", (170, 90, 40)),
+    "yellow duck": ("duck", (40, 210, 230)),
+    "purple ball": ("ball", (150, 60, 130)),
+    "book": ("book", (40, 40, 120)),
+    "orange fish": ("fish", (30, 130, 240)),
+}
+
+
+def draw_toy(shape, color, size=200):
+    """Toy on a transparent square: (BGR image, alpha mask)"""
+    image = np.zeros((size, size, 3), np.uint8)
+    mask = np.zeros((size, size), np.uint8)
+    dark = tuple(int(c * 0.5) for c in color)
+    for target, value in ((image, color), (mask, 255)):
+        if shape == "dino":
+            cv2.ellipse(target, (100, 115), (60, 35), 0, 0, 360, value, -1)
+            cv2.ellipse(target, (150, 70), (22, 16), -20, 0, 360, value, -1)
+            cv2.line(target, (135, 90), (150, 70), value, 16)
+            cv2.line(target, (45, 115), (10, 140), value, 12)
+            for x in (75, 125):
+                cv2.rectangle(target, (x - 8, 140), (x + 8, 180), value, -1)
+        elif shape == "bear":
+            cv2.circle(target, (100, 125), 55, value, -1)
+            cv2.circle(target, (100, 60), 35, value, -1)
+            cv2.circle(target, (70, 32), 14, value, -1)
+            cv2.circle(target, (130, 32), 14, value, -1)
+        elif shape == "car":
+            cv2.rectangle(target, (15, 90), (185, 145), value, -1)
+            cv2.rectangle(target, (55, 55), (145, 95), value, -1)
+            cv2.circle(target, (55, 150), 22, value, -1)
+            cv2.circle(target, (145, 150), 22, value, -1)
+        elif shape == "duck":
+            cv2.ellipse(target, (95, 130), (65, 40), 0, 0, 360, value, -1)
+            cv2.circle(target, (145, 70), 30, value, -1)
+            cv2.fillPoly(target, [np.array([[170, 65], [195, 75], [170, 82]])], value)
+        elif shape == "ball":
+            cv2.circle(target, (100, 100), 75, value, -1)
+        elif shape == "book":
+            cv2.rectangle(target, (40, 25), (160, 175), value, -1)
+        elif shape == "fish":
+            cv2.ellipse(target, (90, 100), (65, 35), 0, 0, 360, value, -1)
+            cv2.fillPoly(target, [np.array([[150, 100], [190, 65], [190, 135]])], value)
+    # Details in a darker shade: eyes, stripes, wheels
+    if shape == "dino":
+        for x in range(60, 140, 20):
+            cv2.line(image, (x, 90), (x + 8, 130), dark, 4)
+        cv2.circle(image, (158, 66), 4, (20, 20, 20), -1)
+    elif shape == "bear":
+        cv2.circle(image, (88, 55), 5, (20, 20, 20), -1)
+        cv2.circle(image, (112, 55), 5, (20, 20, 20), -1)
+        cv2.ellipse(image, (100, 130), (30, 35), 0, 0, 360, dark, -1)
+    elif shape == "car":
+        cv2.rectangle(image, (65, 62), (95, 90), (230, 230, 230), -1)
+        cv2.rectangle(image, (105, 62), (135, 90), (230, 230, 230), -1)
+        cv2.circle(image, (55, 150), 10, (30, 30, 30), -1)
+        cv2.circle(image, (145, 150), 10, (30, 30, 30), -1)
+    elif shape == "duck":
+        cv2.circle(image, (152, 62), 5, (20, 20, 20), -1)
+        cv2.ellipse(image, (90, 125), (30, 15), 10, 0, 360, dark, -1)
+    elif shape == "ball":
+        cv2.line(image, (30, 100), (170, 100), (240, 240, 240), 10)
+        cv2.line(image, (100, 28), (100, 172), (240, 240, 240), 10)
+    elif shape == "book":
+        cv2.putText(image, "ABC", (55, 110), cv2.FONT_HERSHEY_SIMPLEX, 1.3, (230, 230, 230), 4)
+        cv2.line(image, (48, 25), (48, 175), dark, 6)
+    elif shape == "fish":
+        for x in (60, 85, 110):
+            cv2.line(image, (x, 72), (x, 128), dark, 6)
+        cv2.circle(image, (45, 92), 5, (20, 20, 20), -1)
+    return image, mask
+
+
+def desk(rng):
+    background = np.full((HEIGHT, WIDTH, 3), (120, 140, 160), np.float32)
+    grain = cv2.GaussianBlur(rng.normal(0, 10, (HEIGHT, WIDTH)).astype(np.float32), (0, 0), 5)
+    return np.clip(background + grain[..., None], 0, 255).astype(np.uint8)
+
+
+def showing(background, toy, rng):
+    """Camera frame of a toy held up in front of the robot, and the detector's (crop box, object box)"""
+    image, mask = draw_toy(*TOYS[toy])
+    scale = rng.uniform(0.92, 1.08)
+    angle = rng.uniform(-8, 8)
+    matrix = cv2.getRotationMatrix2D((100, 100), angle, scale)
+    image = cv2.warpAffine(image, matrix, (200, 200))
+    mask = cv2.warpAffine(mask, matrix, (200, 200))
+    x = WIDTH // 2 - 100 + int(rng.integers(-25, 25))
+    y = HEIGHT // 2 - 100 + int(rng.integers(-20, 20))
+    frame = background.astype(np.float32)
+    alpha = (mask.astype(np.float32) / 255.0)[..., None]
+    frame[y:y + 200, x:x + 200] = frame[y:y + 200, x:x + 200] * (1 - alpha) + image * alpha
+    frame = frame * rng.uniform(0.9, 1.1) + rng.normal(0, 3, frame.shape)
+    frame = np.clip(frame, 0, 255).astype(np.uint8)
+    return frame, detection_boxes(frame, mask, x, y)
+
+
+def detection_boxes(frame, mask, x, y):
+    """What the local detector reports for a pasted toy: the padded crop box and the toy's own box"""
+    xs, ys = np.nonzero(mask.max(axis=0))[0], np.nonzero(mask.max(axis=1))[0]
+    jitter = np.random.default_rng(int(x * 1000 + y)).normal(0, 2, 4)
+    bbox = [x + xs[0] + jitter[0], y + ys[0] + jitter[1], x + xs[-1] + jitter[2], y + ys[-1] + jitter[3]]
+    return crop_box(frame, bbox)[1], bbox
+
+
+def signature(shown):
+    frame, (box, bbox) = shown
+    return image_signature(frame, box, bbox)
+
+
+def held_by_child(toy_color, shape, size, rng):
+    """The same child (person-sized, filling most of the frame) holding up a small toy"""
+    frame = np.full((HEIGHT, WIDTH, 3), (150, 160, 170), np.float32)
+    cv2.ellipse(frame, (WIDTH // 2, HEIGHT), (230, 330), 0, 0, 360, (90, 120, 200), -1)      # shirt
+    cv2.circle(frame, (WIDTH // 2, 120), 90, (120, 160, 215), -1)                             # face
+    cv2.circle(frame, (WIDTH // 2, 70), 95, (40, 50, 70), -1)                                 # hair
+    cv2.circle(frame, (WIDTH // 2, 140), 75, (120, 160, 215), -1)
+    cx, cy = WIDTH // 2 + int(rng.integers(-10, 10)), 300 + int(rng.integers(-10, 10))
+    mask = np.zeros((HEIGHT, WIDTH), np.uint8)
+    for target, value in ((frame, toy_color), (mask, 255)):
+        if shape == "circle":
+            cv2.circle(target, (cx, cy), size // 2, value, -1)
+        else:
+            cv2.rectangle(target, (cx - size // 2, cy - size // 2), (cx + size // 2, cy + size // 2), value, -1)
+    cv2.ellipse(frame, (cx, cy + size // 2), (30, 18), 0, 0, 360, (120, 160, 215), -1)      # hand
+    frame = np.clip(frame + rng.normal(0, 3, frame.shape), 0, 255).astype(np.uint8)
+    return frame, detection_boxes(frame, mask, 0, 0)
+
+
+def check_small_toys(rng):
+    """Two different toys held up by the same child never share an answer"""
+    ok = True
+    for size in (60, 130):
+        cache = RecognitionCache(None)
+        circle = signature(held_by_child((60, 170, 60), "circle", size, rng))
+        square = signature(held_by_child((50, 50, 210), "square", size, rng))
+        if circle is None or square is None:
+            # Too small a share of the detector's crop to key on: both go to the vision model
+            if size > 100:
+                print(f"❌ {size} px toys were not cached")
+                ok = False
+            else:
+                print(f"   {size} px toys: too small a share of the detector crop - not cached, both asked")
+            continue
+        cache.put("sophia", "object", circle, {"success": True, "message": "circle", "toy": "circle"})
+        wrong = cache.lookup("sophia", "object", square)
+        again = cache.lookup("sophia", "object", signature(held_by_child((60, 170, 60), "circle", size, rng)))
+        shape, color = circle.distance(square)
+        print(f"   {size} px toys: shape distance {shape:.2f}, colour distance {color:.2f}")
+        if wrong is not None or again is None:
+            print(f"❌ {size} px toys: {'another toy answered from the cache' if wrong else 'repeat missed'}")
+            ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recognition cache replay benchmark")
+    parser.add_argument('--showings', type=int, default=40)
+    parser.add_argument('--vision-seconds', type=float, default=3.0, help="Typical vision API round trip")
+    args = parser.parse_args()
+
+    print("🧠 Recognition Cache Replay")
+    print("=" * 60)
+    rng = np.random.default_rng(11)
+    background = desk(rng)
+    names = list(TOYS)
+    # Favourite toys come back often
+    weights = np.array([5, 1, 4, 2, 3, 1, 2, 1], np.float64)
+    session = rng.choice(names, size=args.showings, p=weights / weights.sum())
+    ok = True
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.json")
+        cache = RecognitionCache(path)
+        seen, hits, wrong, missed, lookup_times = set(), 0, 0, 0, []
+        for toy in session:
+            shown = showing(background, toy, rng)
+            start = time.perf_counter()
+            key = signature(shown)
+            result = cache.lookup("eladriel", "object", key)
+            lookup_times.append(time.perf_counter() - start)
+            if result is None:
+                if toy in seen:
+                    missed += 1
+                cache.put("eladriel", "object", key, {"success": True, "message": f"That's a {toy}!",
+                                                     "toy": toy})
+                seen.add(toy)
+            else:
+                hits += 1
+                if result["toy"] != toy:
+                    wrong += 1
+                    print(f"   ❌ {toy} answered as {result['toy']}")
+
+        calls = args.showings - hits
+        lookup_ms = np.mean(lookup_times) * 1000
+        print(f"Session: {args.showings} showings of {len(set(session))} toys")
+        print(f"Vision API calls: {args.showings} without the cache, {calls} with it "
+              f"(hit rate {hits / args.showings:.0%}, {missed} repeats missed)")
+        mean_before = args.vision_seconds
+        mean_after = (calls * args.vision_seconds + sum(lookup_times)) / args.showings
+        print(f"Answer latency: {mean_before:.2f} s -> {mean_after:.2f} s mean "
+              f"(a hit answers in {lookup_ms:.1f} ms including the signature)")
+        if wrong:
+            print(f"❌ {wrong} hits returned another toy's answer")
+            ok = False
+        else:
+            print("✅ No hit returned another toy's answer (including the same-shape dinosaurs)")
+        repeats = args.showings - len(set(session))
+        if hits < 0.6 * repeats:
+            print(f"❌ Only {hits} of {repeats} repeat showings were answered from the cache")
+            ok = False
+        else:
+            print(f"✅ {hits} of {repeats} repeat showings answered from the cache")
+
+        teddy = signature(showing(background, "teddy bear", rng))
+        openers = {cache.lookup("eladriel", "object", teddy)["message"].split("!")[0] for _ in range(6)}
+        print(f"{'✅' if len(openers) > 1 else '❌'} Hits vary their phrasing ({len(openers)} openers in 6 hits)")
+        ok = ok and len(openers) > 1
+
+        if cache.lookup("sophia", "object", teddy) is not None or \
+                cache.lookup("eladriel", "dinosaur", teddy) is not None:
+            print("❌ Results leaked across users or question kinds")
+            ok = False
+        else:
+            print("✅ Results are scoped per user and per kind of question")
+
+        cache.flush(timeout=10)
+        restarted = RecognitionCache(path)
+        if restarted.lookup("eladriel", "object", teddy) is None:
+            print("❌ Cache did not survive a restart")
+            ok = False
+        else:
+            print(f"✅ Cache survives a restart ({restarted.get_stats()['entries']} entries reloaded)")
+
+        expired = RecognitionCache(path, ttl_seconds=0.0)
+        small = RecognitionCache(None, max_entries=2)
+        for toy in ("book", "blue car", "purple ball"):
+            small.put("sophia", "object", signature(showing(background, toy, rng)), {"success": True, "message": toy})
+        evicted = small.lookup("sophia", "object", signature(showing(background, "book", rng))) is None
+        if expired.get_stats()['entries'] or not evicted:
+            print("❌ TTL expiry or LRU eviction is not working")
+            ok = False
+        else:
+            print("✅ Expired entries are dropped on load and the least recently used are evicted")
+
+    if check_small_toys(rng):
+        print("✅ Small different toys held by the same child don't share answers")
+    else:
+        ok = False
+    frame, _ = showing(background, "book", rng)
+    if image_signature(frame, None) is not None:
+        print("❌ A frame without a detector box was keyed")
+        ok = False
+
+    print(f"\n{'✅' if ok else '❌'} Recognition cache {'works' if ok else 'has problems'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared sound bank
+Checks every cue renders, the WAV cache round-trips, the bank is shared, and
+compares play(name) against re-synthesizing the cue on every call
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import numpy as np
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import sound_bank
+from sound_bank import SoundBank, SOUND_GENERATORS, get_sound_bank
+
+EXPECTED_LENGTHS = {'listening': 0.6, 'completion': 0.4, 'wake_word': 0.2,
+                    'ready_to_speak': 0.64, 'celebration': 1.8, 'buzzer': 0.8}
+
+
+def test_render_and_cache(cache_dir):
+    """All cues render with the right length and reload identically from WAV"""
+    rendered = SoundBank(cache_dir).load()
+    assert set(rendered.sounds) == set(SOUND_GENERATORS)
+    for name, length in EXPECTED_LENGTHS.items():
+        assert abs(rendered.get(name).get_length() - length) < 0.01, name
+    assert len(os.listdir(cache_dir)) == len(SOUND_GENERATORS)
+
+    # SDL's mono-to-stereo conversion may round by one LSB
+    cached = SoundBank(cache_dir).load()
+    for name in SOUND_GENERATORS:
+        original = np.frombuffer(rendered.get(name).get_raw(), dtype=np.int16).astype(np.int32)
+        reloaded = np.frombuffer(cached.get(name).get_raw(), dtype=np.int16).astype(np.int32)
+        assert original.shape == reloaded.shape and np.abs(original - reloaded).max() <= 1, name
+
+
+def test_shared_instance():
+    """Assistant and game modules get the same bank"""
+    sound_bank._sound_bank = None
+    assert get_sound_bank(None) is get_sound_bank(None)
+    assert get_sound_bank().play('missing') is None
+
+
+def benchmark(repeats=20):
+    """Per-call cost of the old generate-and-play versus play(name)"""
+    bank = get_sound_bank(None)
+    print(f"\n{'Cue':<16}{'Synthesize+play':>16}{'play(name)':>12}")
+    for name, generator in SOUND_GENERATORS.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            samples = (generator(22050) * 32767).astype(np.int16)
+            pygame.sndarray.make_sound(np.ascontiguousarray(np.column_stack((samples, samples)))).play()
+        synthesize = (time.perf_counter() - start) / repeats
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            bank.play(name)
+        play = (time.perf_counter() - start) / repeats
+        print(f"{name:<16}{synthesize * 1000:>13.2f} ms{play * 1000:>9.3f} ms")
+    pygame.mixer.stop()
+
+
+def main():
+    print("🔊 Sound Bank Test")
+    print("=" * 44)
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    work_dir = tempfile.mkdtemp()
+    try:
+        test_render_and_cache(os.path.join(work_dir, 'sounds'))
+        print("✅ All cues rendered and reloaded from the WAV cache")
+        test_shared_instance()
+        print("✅ One shared bank per process")
+        benchmark()
+        return True
+    except AssertionError as e:
+        print(f"❌ Sound bank test failed: {e}")
+        return False
+    finally:
+        shutil.rmtree(work_dir)
+        pygame.mixer.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Test script for the microphone pre-roll
+Replays an utterance in real time so it starts shortly before (or after)
+listening is requested, and compares what two listening paths capture from
+the same audio:
+
+- old: fixed 0.3 s pause, fresh stream at call time, 0.3 s live calibration
+- new: fast start, reader begins `--preroll` seconds in the past, threshold
+  from buffered room noise
+
+Without a recording a synthetic two-word utterance is used and a first word
+counts as recognized when none of it was clipped. With --wav (16 kHz mono,
+speech after some room noise) and --recognize, both captures are also sent to
+Google Speech Recognition and the first recognized word is compared with --text.
+
+Usage:
+    python tests/test_speech_preroll.py [--wav hey_miley.wav --text "hey miley" --recognize]
+"""
+
+import os
+import sys
+import time
+import wave
+import argparse
+import threading
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from mic_stream import MicrophoneStream, RingBufferSource
+
+RATE = 16000
+CHUNK = 1024
+LEAD_SECONDS = 2.0
+# Speech onset relative to the moment listening is requested (negative = before)
+ONSET_OFFSETS = (-0.4, -0.3, -0.2, -0.1, 0.0, 0.2)
+
+
+class TimelineStream:
+    """Input stream that plays one timeline at real-time pace, then room noise"""
+
+    def __init__(self, timeline, noise):
+        self.timeline = timeline
+        self.noise = noise
+        self.position = 0
+        self.opened_at = time.time()
+        self.next_read = self.opened_at
+
+    def read(self, frames, exception_on_overflow=True):
+        self.next_read += frames / RATE
+        time.sleep(max(0.0, self.next_read - time.time()))
+        start, self.position = self.position, self.position + frames
+        if self.position <= len(self.timeline):
+            return self.timeline[start:self.position].tobytes()
+        indices = (np.arange(start, self.position) % len(self.noise))
+        return self.noise[indices].tobytes()
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TimelineAudio:
+    """Stands in for the PyAudio instance"""
+
+    def __init__(self, timeline, noise):
+        self.timeline = timeline
+        self.noise = noise
+        self.stream = None
+
+    def open(self, **kwargs):
+        self.stream = TimelineStream(self.timeline, self.noise)
+        return self.stream
+
+
+def synthetic_utterance(rng):
+    """Two voiced 'words' (0.35 s and 0.5 s) with a short gap; returns (samples, first word seconds)"""
+    def word(seconds, pitch):
+        t = np.arange(int(seconds * RATE)) / RATE
+        envelope = np.minimum(1, np.minimum(t, t[-1] - t) / 0.02)
+        voiced = sum(np.sin(2 * np.pi * pitch * h * t) / h for h in range(1, 8))
+        return 2500 * voiced * envelope * (1 + 0.3 * np.sin(2 * np.pi * 5 * t))
+    first = word(0.35, 220 * rng.uniform(0.95, 1.05))
+    gap = np.zeros(int(0.15 * RATE))
+    return np.concatenate([first, gap, word(0.5, 190)]), 0.35
+
+
+def load_utterance(path):
+    """Speech from a recording (leading/trailing quiet trimmed)"""
+    with wave.open(path, 'rb') as wav:
+        assert wav.getframerate() == RATE and wav.getsampwidth() == 2, "expected 16 kHz 16-bit WAV"
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        if wav.getnchannels() > 1:
+            samples = samples[::wav.getnchannels()]
+    block = RATE // 100
+    levels = np.array([np.sqrt(np.mean(samples[i:i + block].astype(np.float64) ** 2))
+                       for i in range(0, len(samples) - block, block)])
+    loud = np.nonzero(levels > max(levels.max() * 0.05, np.percentile(levels, 20) * 3))[0]
+    return samples[loud[0] * block:(loud[-1] + 1) * block].astype(np.float64), None
+
+
+def make_recognizer():
+    recognizer = sr.Recognizer()
+    recognizer.energy_threshold = 300
+    recognizer.dynamic_energy_threshold = True
+    recognizer.pause_threshold = 0.8
+    return recognizer
+
+
+def old_listen(mic, recognizer, results):
+    """Previous listen_for_speech + listen_for_audio: pause, open, calibrate live, listen"""
+    time.sleep(0.3)
+    with RingBufferSource(mic) as source:
+        recognizer.adjust_for_ambient_noise(source, duration=0.3)
+        try:
+            results['old'] = recognizer.listen(source, timeout=5, phrase_time_limit=8)
+        except sr.WaitTimeoutError:
+            pass  # calibrated on speech, threshold ended up above the voice
+
+
+def new_listen(mic, recognizer, results, preroll):
+    """Fast start with pre-roll, as listen_for_audio does now"""
+    noise_level = mic.noise_level()
+    if noise_level is not None:
+        recognizer.energy_threshold = max(150, noise_level * recognizer.dynamic_energy_ratio)
+    recognizer.non_speaking_duration = min(preroll, recognizer.pause_threshold)
+    with RingBufferSource(mic, preroll=preroll) as source:
+        try:
+            results['new'] = recognizer.listen(source, timeout=5, phrase_time_limit=8)
+        except sr.WaitTimeoutError:
+            pass
+
+
+def capture_start(timeline, audio_data):
+    """Timeline position (seconds) of the first captured sample, located from the captured tail"""
+    captured = np.frombuffer(audio_data.frame_data, dtype=np.int16)
+    probe = captured[-64:]
+    windows = np.lib.stride_tricks.sliding_window_view(timeline, len(probe))
+    matches = np.nonzero((windows == probe).all(axis=1))[0]
+    return (matches[0] - len(captured) + len(probe)) / RATE if len(matches) else None
+
+
+def start_stream(timeline, noise):
+    """Shared stream replaying the timeline; returns (stream, time.time() of timeline position 0)"""
+    audio = TimelineAudio(timeline, noise)
+    mic = MicrophoneStream(audio, RATE, CHUNK, lambda refresh=False: None)
+    mic.start()
+    while audio.stream is None:
+        time.sleep(0.001)
+    return mic, audio.stream.opened_at
+
+
+def run_trial(utterance, offset, preroll, rng):
+    """Replay one turn; returns {path: (clipped seconds, AudioData)}"""
+    noise = rng.normal(0, 40, RATE * 4).astype(np.int16)
+    onset = LEAD_SECONDS
+    timeline = np.concatenate([rng.normal(0, 40, int(onset * RATE)),
+                               utterance + rng.normal(0, 40, len(utterance)),
+                               rng.normal(0, 40, RATE * 2)]).astype(np.int16)
+
+    mic, opened_at = start_stream(timeline, noise)
+    # Request listening `offset` seconds relative to the speech onset
+    time.sleep(max(0.0, opened_at + onset - offset - time.time()))
+
+    results = {}
+    threads = [threading.Thread(target=old_listen, args=(mic, make_recognizer(), results)),
+               threading.Thread(target=new_listen, args=(mic, make_recognizer(), results, preroll))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    mic.stop()
+
+    trial = {}
+    for path, audio_data in results.items():
+        start = capture_start(timeline, audio_data)
+        trial[path] = (max(0.0, start - onset) if start is not None else None, audio_data)
+    return trial
+
+
+def test_cue_suppression(utterance, preroll, rng):
+    """A cue sound just before listening is inside the pre-roll but must not start the phrase"""
+    cue_start, cue_end, onset = LEAD_SECONDS - 0.6, LEAD_SECONDS - 0.1, LEAD_SECONDS + 0.5
+    t = np.arange(int((cue_end - cue_start) * RATE)) / RATE
+    timeline = rng.normal(0, 40, int((onset + len(utterance) / RATE + 2) * RATE))
+    timeline[int(cue_start * RATE):int(cue_start * RATE) + len(t)] += 6000 * np.sin(2 * np.pi * 880 * t)
+    timeline[int(onset * RATE):int(onset * RATE) + len(utterance)] += utterance
+    timeline = timeline.astype(np.int16)
+
+    mic, opened_at = start_stream(timeline, rng.normal(0, 40, RATE * 4).astype(np.int16))
+    # What main.py does when the sound bank plays a cue
+    mic.suppress(opened_at + cue_start, opened_at + cue_end + 0.05)
+    time.sleep(max(0.0, opened_at + LEAD_SECONDS - time.time()))
+    results = {}
+    new_listen(mic, make_recognizer(), results, preroll)
+    mic.stop()
+
+    assert 'new' in results, "no phrase captured"
+    start = capture_start(timeline, results['new'])
+    assert start is not None and start >= cue_end - 0.05, f"phrase started at {start}s, inside the cue"
+    assert start <= onset, f"speech clipped by {(start - onset) * 1000:.0f} ms"
+
+
+def first_word(text):
+    return text.split()[0].lower() if text else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microphone pre-roll test")
+    parser.add_argument('--wav', help="16 kHz mono recording of an utterance")
+    parser.add_argument('--text', help="What is said in the recording (for --recognize)")
+    parser.add_argument('--recognize', action='store_true', help="Also run Google Speech Recognition on both captures")
+    parser.add_argument('--preroll', type=float, default=0.5, help="Pre-roll seconds for the new path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    utterance, first_word_seconds = load_utterance(args.wav) if args.wav else synthetic_utterance(rng)
+    recognizer = sr.Recognizer()
+
+    print("🎤 Speech Pre-Roll Test")
+    print("=" * 60)
+    print(f"{'Speech starts':>22} | {'old: clipped':>13} | {'new: clipped':>13}")
+    recognized = {'old': 0, 'new': 0}
+    for offset in ONSET_OFFSETS:
+        trial = run_trial(utterance, -offset, args.preroll, rng)
+        row = []
+        for path in ('old', 'new'):
+            clipped, audio_data = trial.get(path, (None, None))
+            if args.recognize and audio_data is not None:
+                try:
+                    heard = recognizer.recognize_google(audio_data)
+                except (sr.UnknownValueError, sr.RequestError):
+                    heard = None
+                ok = first_word(heard) == first_word(args.text)
+                row.append(f"{heard or '-'}"[:13])
+            else:
+                ok = clipped is not None and (first_word_seconds is None or clipped < 0.03)
+                row.append(f"{clipped * 1000:8.0f} ms" if clipped is not None else "missed")
+            recognized[path] += ok
+        when = f"{abs(offset) * 1000:.0f} ms {'before' if offset < 0 else 'after'} listen"
+        print(f"{when:>22} | {row[0]:>13} | {row[1]:>13}")
+
+    try:
+        test_cue_suppression(utterance, args.preroll, rng)
+        print("\n✅ Cue sound inside the pre-roll window was suppressed")
+    except AssertionError as e:
+        print(f"\n❌ Cue suppression failed: {e}")
+        return False
+
+    total = len(ONSET_OFFSETS)
+    print(f"\nFirst word intact: old {recognized['old']}/{total}, new {recognized['new']}/{total} "
+          f"(pre-roll {args.preroll:.1f}s, no fixed pause)")
+    ok = recognized['new'] == total and recognized['new'] > recognized['old']
+    print(f"{'✅' if ok else '❌'} Pre-roll keeps the start of speech")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
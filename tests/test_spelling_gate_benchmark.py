@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Spelling auto-check gate replay benchmark
+Replays a spelling game session through the scene change gate and counts the
+vision API calls it lets through against the old auto-check, which sent a
+frame every 2 seconds no matter what the camera saw
+
+The default session is synthetic: an empty desk, paper slid into view with a
+misspelled word, the word being fixed, the correct word held up, the paper
+taken away and a long pause. A recorded video can be replayed instead.
+
+Usage:
+    python tests/test_spelling_gate_benchmark.py [--video session.mp4] [--fps 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scene_gate import SceneChangeGate
+
+WIDTH, HEIGHT = 640, 480
+POLL_INTERVAL = 2.0  # old auto-check
+
+
+def make_desk(rng):
+    desk = np.full((HEIGHT, WIDTH, 3), (70, 95, 120), np.uint8)
+    grain = cv2.GaussianBlur(rng.normal(0, 12, (HEIGHT, WIDTH)).astype(np.float32), (0, 0), 6)
+    return np.clip(desk + grain[..., None], 0, 255).astype(np.uint8)
+
+
+def paper(word):
+    sheet = np.full((220, 360, 3), 235, np.uint8)
+    if word:
+        cv2.putText(sheet, word, (25, 135), cv2.FONT_HERSHEY_SIMPLEX, 2.6, (40, 40, 40), 7, cv2.LINE_AA)
+    return sheet
+
+
+def compose(desk, sheet, x, y):
+    frame = desk.copy()
+    if sheet is not None:
+        h, w = sheet.shape[:2]
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(WIDTH, x + w), min(HEIGHT, y + h)
+        if x1 > x0 and y1 > y0:
+            frame[y0:y1, x0:x1] = sheet[y0 - y:y1 - y, x0 - x:x1 - x]
+    return frame
+
+
+def synthetic_session(fps, rng):
+    """(timestamp, frame, label) for a scripted 60 s session; label marks views that should be sent"""
+    desk = make_desk(rng)
+    home = (140, 130)
+    script = [
+        # (seconds, sheet word, start x, end x, label)
+        (10.0, None, None, None, "empty desk"),
+        (1.5, "CAT", -360, home[0], "paper slides in"),
+        (6.0, "CAT", home[0], home[0], "misspelled word held up"),
+        (2.0, None, None, None, "fixing the word (hand in the way)"),
+        (6.0, "CART", home[0], home[0], "correct word held up"),
+        (1.5, "CART", home[0], WIDTH, "paper taken away"),
+        (33.0, None, None, None, "thinking about the next word"),
+    ]
+    t = 0.0
+    for seconds, word, start_x, end_x, label in script:
+        frames = int(seconds * fps)
+        for i in range(frames):
+            if label.startswith("fixing"):
+                # Hand covering the paper, moving around
+                frame = compose(desk, paper("CA"), *home)
+                hx = home[0] + int(120 * np.sin(i / 2.0))
+                cv2.ellipse(frame, (hx + 180, home[1] + 150), (70, 110), 20, 0, 360, (120, 150, 200), -1)
+            elif word is None:
+                frame = desk.copy()
+            else:
+                x = int(start_x + (end_x - start_x) * i / max(1, frames - 1))
+                frame = compose(desk, paper(word), x, home[1])
+            noise = rng.normal(0, 2.0, frame.shape)
+            yield t, np.clip(frame + noise, 0, 255).astype(np.uint8), label
+            t += 1.0 / fps
+
+
+def video_session(path, fps):
+    capture = cv2.VideoCapture(path)
+    source_fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(1, round(source_fps / fps))
+    index = 0
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        if index % step == 0:
+            yield index / source_fps, frame, ""
+        index += 1
+    capture.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spelling auto-check gate replay benchmark")
+    parser.add_argument('--video', help="Recorded session to replay instead of the synthetic one")
+    parser.add_argument('--fps', type=float, default=5.0, help="Frames per second the gate looks at")
+    args = parser.parse_args()
+
+    print("📝 Spelling Auto-Check Gate Replay")
+    print("=" * 60)
+    rng = np.random.default_rng(7)
+    frames = video_session(args.video, args.fps) if args.video else synthetic_session(args.fps, rng)
+
+    gate = SceneChangeGate()
+    sent = []
+    gate_time = 0.0
+    for timestamp, frame, label in frames:
+        small = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25, interpolation=cv2.INTER_AREA)
+        start = time.perf_counter()
+        fire = gate.feed(small, timestamp)
+        gate_time += time.perf_counter() - start
+        if fire:
+            sent.append((timestamp, label))
+            print(f"   📤 {timestamp:5.1f}s  vision call  ({label or gate.last_reason})")
+
+    stats = gate.stats(POLL_INTERVAL)
+    print(f"\nSession: {stats['seconds']:.0f} s, {stats['frames']} frames checked locally "
+          f"({gate_time / max(1, stats['frames']) * 1000:.2f} ms per frame)")
+    print(f"Vision API calls: old auto-check {stats['polling_calls']}, gated {stats['api_calls']} "
+          f"({stats['calls_avoided']} avoided)")
+    print(f"Frames held back: {stats['rejected_moving']} moving/settling, {stats['rejected_unchanged']} unchanged, "
+          f"{stats['rejected_no_text']} without text")
+
+    if args.video:
+        return True
+
+    labels = [label for _, label in sent]
+    ok = labels == ["misspelled word held up", "correct word held up"]
+    print(f"\n{'✅' if ok else '❌'} Gate {'sends exactly the two written words' if ok else f'sent {labels}'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Latency test for the streaming LLM-to-TTS pipeline
+Runs a local fake OpenAI server (streamed chat completions + /v1/audio/speech
+with realistic delays) and compares time-to-first-audio and total turn latency
+of the one-shot path (full answer -> full TTS -> play) with the streaming pipeline
+
+Usage:
+    python tests/test_streaming_speech.py [--token-delay 0.03] [--tts-delay 0.6]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from speech_pipeline import StreamingSpeechPipeline, SentenceSegmenter
+
+STORY = ("Once upon a time, a little dinosaur named Rex lived near a volcano. "
+         "Every morning he stomped down to the river to drink. "
+         "One day he found a shiny egg hidden under a fern! "
+         "He carried it home very carefully and kept it warm all night. "
+         "In the morning the egg cracked, and out popped a tiny friend. "
+         "From then on, Rex was never lonely again.")
+
+# Fake audio: bytes per second of "speech" so playback time scales with text length
+AUDIO_BYTES_PER_CHAR = 100
+PLAYBACK_SECONDS_PER_CHAR = 0.004
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Minimal chat completions (streamed or not) and speech endpoints"""
+    token_delay = 0.03
+    first_token_delay = 0.4
+    tts_delay = 0.6
+    tts_seconds_per_char = 0.002
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self.path.endswith('/chat/completions'):
+            self._chat(body)
+        elif self.path.endswith('/audio/speech'):
+            self._speech(body)
+        else:
+            self.send_error(404)
+
+    def _chat(self, body):
+        tokens = [word + " " for word in STORY.split(" ")]
+        time.sleep(self.first_token_delay)
+        if not body.get('stream'):
+            time.sleep(self.token_delay * len(tokens))
+            self._json({'id': 'fake', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+                        'choices': [{'index': 0, 'finish_reason': 'stop',
+                                     'message': {'role': 'assistant', 'content': STORY}}]})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for token in tokens:
+            chunk = {'id': 'fake', 'object': 'chat.completion.chunk', 'created': 0, 'model': body['model'],
+                     'choices': [{'index': 0, 'delta': {'content': token}, 'finish_reason': None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(self.token_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _speech(self, body):
+        time.sleep(self.tts_delay + self.tts_seconds_per_char * len(body['input']))
+        audio = b'\x00' * (AUDIO_BYTES_PER_CHAR * len(body['input']))
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/mpeg')
+        self.send_header('Content-Length', str(len(audio)))
+        self.end_headers()
+        self.wfile.write(audio)
+
+    def _json(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakePlayerEngine:
+    """OpenAITTSEngine stand-in: real API calls to the fake server, simulated speaker"""
+
+    def __init__(self, client):
+        self.client = client
+        self.first_audio_time = None
+
+    def synthesize(self, text):
+        response = self.client.audio.speech.create(model="tts-1-hd", voice="nova", input=text)
+        return response.content
+
+    def play_audio(self, audio_bytes, text=""):
+        if self.first_audio_time is None:
+            self.first_audio_time = time.time()
+        time.sleep(len(audio_bytes) / AUDIO_BYTES_PER_CHAR * PLAYBACK_SECONDS_PER_CHAR)
+
+    def say(self, text):
+        audio_bytes = self.synthesize(text)
+        if audio_bytes:
+            self.play_audio(audio_bytes, text)
+
+
+def run_one_shot(client):
+    """Previous behaviour: full completion, then full TTS, then playback"""
+    engine = FakePlayerEngine(client)
+    start = time.time()
+    response = client.chat.completions.create(model="gpt-3.5-turbo", max_tokens=800,
+                                              messages=[{"role": "user", "content": "Tell me a story"}])
+    engine.say(response.choices[0].message.content)
+    return {'time_to_first_audio': engine.first_audio_time - start, 'total_latency': time.time() - start}
+
+
+def run_streaming(client, workers):
+    """Streaming pipeline: speak each sentence as soon as it is complete"""
+    engine = FakePlayerEngine(client)
+    pipeline = StreamingSpeechPipeline(engine, max_concurrent_synthesis=workers)
+
+    def tokens():
+        stream = client.chat.completions.create(model="gpt-3.5-turbo", max_tokens=800, stream=True,
+                                                messages=[{"role": "user", "content": "Tell me a story"}])
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    text = pipeline.speak_stream(tokens())
+    metrics = pipeline.get_last_metrics()
+    metrics['text_matches'] = text.split() == STORY.split()
+    return metrics
+
+
+def test_segmenter():
+    """Sentences are split at punctuation and short fragments are merged"""
+    segmenter = SentenceSegmenter(min_chars=10)
+    sentences = []
+    for piece in ["Wow! ", "That is a big ", "dinosaur. It has 3.5 m", " long legs!\nThe end"]:
+        sentences.extend(segmenter.feed(piece))
+    sentences.extend(segmenter.flush())
+    assert sentences == ["Wow! That is a big dinosaur.", "It has 3.5 m long legs!", "The end"], sentences
+
+
+class SilentEngine:
+    """Engine whose TTS always fails and has no offline voice"""
+
+    def synthesize(self, text):
+        return None
+
+    def play_audio(self, audio_bytes, text=""):
+        raise AssertionError("nothing should be played")
+
+
+def test_failed_sentences_are_not_counted_as_spoken():
+    """When every sentence fails to synthesize, sentences_spoken stays 0 so the caller falls back"""
+    pipeline = StreamingSpeechPipeline(SilentEngine())
+    pipeline.speak_stream(iter(["Hello there. ", "How are you today? ", "Let's play a game!"]))
+    metrics = pipeline.get_last_metrics()
+    assert metrics['sentences'] > 0 and metrics['sentences_spoken'] == 0, metrics
+    assert metrics['synthesis_failures'] == metrics['sentences'], metrics
+
+
+class RecordingEngine:
+    """Engine that 'plays' instantly and records what was spoken"""
+
+    def __init__(self):
+        self.spoken = []
+
+    def synthesize(self, text):
+        return b"audio"
+
+    def play_audio(self, audio_bytes, text=""):
+        self.spoken.append(text)
+
+
+def test_broken_stream_keeps_partial_text():
+    """A stream that fails partway still plays what it had and reports the partial text"""
+    def tokens():
+        yield "Dinosaurs lived long ago. "
+        yield "The biggest ones were "
+        raise ConnectionError("stream dropped")
+
+    engine = RecordingEngine()
+    pipeline = StreamingSpeechPipeline(engine)
+    try:
+        pipeline.speak_stream(tokens())
+    except ConnectionError as e:
+        assert e.partial_text == "Dinosaurs lived long ago. The biggest ones were", e.partial_text
+    else:
+        raise AssertionError("the stream error should be re-raised")
+    assert engine.spoken == ["Dinosaurs lived long ago."], engine.spoken
+    assert pipeline.get_last_metrics()['sentences_spoken'] == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming speech latency test")
+    parser.add_argument('--token-delay', type=float, default=0.03, help="Seconds between streamed tokens")
+    parser.add_argument('--tts-delay', type=float, default=0.6, help="Base TTS request latency in seconds")
+    parser.add_argument('--workers', type=int, default=2, help="Concurrent sentence synthesis requests")
+    args = parser.parse_args()
+
+    FakeOpenAIHandler.token_delay = args.token_delay
+    FakeOpenAIHandler.tts_delay = args.tts_delay
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = openai.OpenAI(api_key="test", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1")
+
+    print("🗣️ Streaming Speech Latency Test")
+    print("=" * 50)
+
+    try:
+        test_segmenter()
+        print("✅ Sentence segmentation")
+        test_failed_sentences_are_not_counted_as_spoken()
+        print("✅ Sentences that fail to synthesize don't count as spoken")
+        test_broken_stream_keeps_partial_text()
+        print("✅ A stream that breaks partway keeps the text streamed so far")
+
+        one_shot = run_one_shot(client)
+        streaming = run_streaming(client, args.workers)
+    finally:
+        server.shutdown()
+
+    print(f"\n{'':<22}{'One-shot':>12}{'Streaming':>12}")
+    print(f"{'Time to first token':<22}{'-':>12}{streaming['time_to_first_token']:>11.2f}s")
+    print(f"{'Time to first audio':<22}{one_shot['time_to_first_audio']:>11.2f}s"
+          f"{streaming['time_to_first_audio']:>11.2f}s")
+    print(f"{'Total turn latency':<22}{one_shot['total_latency']:>11.2f}s{streaming['total_latency']:>11.2f}s")
+    print(f"\n📝 {streaming['sentences_spoken']}/{streaming['sentences']} sentences spoken, "
+          f"{streaming['synthesis_failures']} synthesis failures")
+
+    ok = (streaming['text_matches'] and streaming['synthesis_failures'] == 0 and
+          streaming['sentences_spoken'] == streaming['sentences'] and
+          streaming['time_to_first_audio'] < one_shot['time_to_first_audio'])
+    print(f"{'✅' if ok else '❌'} Streaming starts speaking "
+          f"{one_shot['time_to_first_audio'] - streaming['time_to_first_audio']:.2f}s earlier")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Speech-to-text backend latency test
+Runs recorded fixtures through every available backend (local Vosk, open and
+restricted-grammar, and Google cloud) and reports recognition latency and
+accuracy per backend, then checks the fallback behaviour of the backend chain
+
+Fixture layout:
+    <dir>/<name>.wav    16-bit mono recording of one utterance
+    <dir>/<name>.txt    first line: what was said
+                        optional second line: "vocabulary: ready, one, two, ..."
+
+Usage:
+    python tests/test_stt_latency.py [--fixtures stt_fixtures] [--model models/vosk-model-small-en-us-0.15] [--no-cloud]
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import platform
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stt_backends import (SpeechToText, STTBackend, Transcript, GoogleSTTBackend,
+                          VoskSTTBackend, DEFAULT_VOSK_MODEL, VOSK_AVAILABLE)
+from cloud_transport import CloudTransport
+
+
+def load_fixtures(fixtures_dir):
+    """[(name, AudioData, expected text, vocabulary or None)]"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.wav'))):
+        with open(os.path.splitext(path)[0] + '.txt') as f:
+            lines = [line.strip() for line in f if line.strip()]
+        vocabulary = None
+        if len(lines) > 1 and lines[1].lower().startswith('vocabulary:'):
+            vocabulary = [w.strip() for w in lines[1].split(':', 1)[1].split(',') if w.strip()]
+        with sr.AudioFile(path) as source:
+            audio = sr.Recognizer().record(source)
+        fixtures.append((os.path.basename(path), audio, lines[0].lower(), vocabulary))
+    return fixtures
+
+
+def normalize(text):
+    return ' '.join(''.join(c for c in (text or '').lower() if c.isalnum() or c.isspace()).split())
+
+
+def measure(backend, fixtures, constrained=False):
+    """Latencies (s) and correct count for one backend over the fixtures"""
+    latencies, correct, runs = [], 0, 0
+    for name, audio, expected, vocabulary in fixtures:
+        if constrained and not vocabulary:
+            continue
+        start = time.perf_counter()
+        try:
+            transcript = backend.recognize(audio, 'en-US', vocabulary if constrained else None)
+        except sr.RequestError as e:
+            print(f"   ⚠️ {backend.name}: {e}")
+            return None
+        latencies.append(time.perf_counter() - start)
+        runs += 1
+        correct += transcript is not None and normalize(transcript.text) == normalize(expected)
+    return latencies, correct, runs
+
+
+class ScriptedBackend(STTBackend):
+    """Backend with a fixed answer, standing in for an engine in the chain checks"""
+
+    def __init__(self, name, text=None, confidence=1.0, offline=False, local=False, vocabulary=False):
+        self.name = name
+        self.text = text
+        self.confidence = confidence
+        self.offline = offline
+        self.local = local
+        self.supports_vocabulary = vocabulary
+        self.calls = 0
+
+    def recognize(self, audio_data, language='en-US', vocabulary=None):
+        self.calls += 1
+        if self.offline:
+            raise sr.RequestError("network unreachable")
+        return Transcript(self.text, self.confidence, self.name) if self.text else None
+
+
+class OfflineRecognizer(sr.Recognizer):
+    """Recognizer whose Google requests fail as if the Wi-Fi dropped"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def recognize_google(self, audio_data, **kwargs):
+        self.calls += 1
+        raise sr.RequestError("recognition connection failed: network unreachable")
+
+
+def check_chain():
+    """Fallback rules of SpeechToText"""
+    audio = sr.AudioData(bytes(3200), 16000, 2)
+
+    def chain(*backends):
+        stt = SpeechToText(sr.Recognizer(), backends='')
+        for backend in backends:
+            stt.add_backend(backend)
+        return stt
+
+    # Cloud down (Wi-Fi dropped): local answer is used
+    stt = chain(ScriptedBackend('cloud', offline=True), ScriptedBackend('local', 'ready', local=True))
+    result = stt.recognize(audio)
+    assert result and result.backend == 'local', result
+    assert stt.get_stats()['cloud']['failures'] == 1
+
+    # Unsure local answer is double-checked by the cloud
+    stt = chain(ScriptedBackend('local', 'read he', 0.3, local=True), ScriptedBackend('cloud', 'ready'))
+    assert stt.recognize(audio).backend == 'cloud'
+
+    # The unsure answer is offered as a draft while the cloud re-checks it
+    drafts = []
+    stt = chain(ScriptedBackend('local', 'read he', 0.3, local=True), ScriptedBackend('cloud', 'ready'))
+    stt.recognize(audio, on_draft=lambda draft: drafts.append(draft.text))
+    assert drafts == ['read he'], drafts
+
+    # ...but kept if the cloud is unreachable
+    stt = chain(ScriptedBackend('local', 'read he', 0.3, local=True), ScriptedBackend('cloud', offline=True))
+    assert stt.recognize(audio).text == 'read he'
+
+    # A vocabulary moves grammar-capable backends to the front
+    cloud = ScriptedBackend('cloud', 'seven')
+    stt = chain(cloud, ScriptedBackend('local', 'seven', local=True, vocabulary=True))
+    assert stt.recognize(audio, vocabulary=['six', 'seven']).backend == 'local' and cloud.calls == 0
+
+    # The default order asks the cloud first for open speech
+    assert [b.name for b in SpeechToText(sr.Recognizer()).backends] == ['google', 'vosk']
+
+    # Once Google's circuit opens, the local backend answers without waiting for the cloud
+    recognizer = OfflineRecognizer()
+    google = GoogleSTTBackend(recognizer, transport=CloudTransport(circuit_failures=2))
+    stt = chain(google, ScriptedBackend('local', 'ready', local=True))
+    for _ in range(3):
+        assert stt.recognize(audio).backend == 'local'
+    assert recognizer.calls == 2 and not google.available(), recognizer.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speech-to-text backend latency test")
+    parser.add_argument('--fixtures', help="Directory of <name>.wav + <name>.txt fixtures")
+    parser.add_argument('--model', default=DEFAULT_VOSK_MODEL, help="Vosk model directory")
+    parser.add_argument('--no-cloud', action='store_true', help="Skip Google recognition")
+    args = parser.parse_args()
+
+    print("🗣️ Speech-to-Text Backend Latency Test")
+    print("=" * 60)
+    print(f"Platform: {platform.machine()} / Python {platform.python_version()}")
+
+    try:
+        check_chain()
+        print("✅ Backend chain falls back on offline and low-confidence results")
+    except AssertionError as e:
+        print(f"❌ Backend chain check failed: {e}")
+        return False
+
+    if not args.fixtures:
+        print("\nNo --fixtures given - record a few answers (wav + txt) to measure latency")
+        return True
+
+    fixtures = load_fixtures(args.fixtures)
+    print(f"\n{len(fixtures)} fixtures from {args.fixtures}")
+    runs = []
+    vosk = VoskSTTBackend(args.model)
+    if vosk.available():
+        start = time.perf_counter()
+        vosk.warm_up()
+        print(f"   Vosk model loaded and warm in {time.perf_counter() - start:.1f}s")
+        runs += [('vosk (open)', vosk, False), ('vosk (grammar)', vosk, True)]
+    else:
+        print(f"   Vosk skipped ({'no model at ' + args.model if VOSK_AVAILABLE else 'pip install vosk'})")
+    if not args.no_cloud:
+        runs.append(('google', GoogleSTTBackend(sr.Recognizer()), False))
+
+    print(f"\n{'Backend':<16} {'runs':>5} {'accuracy':>9} {'median':>9} {'p90':>9}")
+    for label, backend, constrained in runs:
+        result = measure(backend, fixtures, constrained)
+        if result is None or not result[0]:
+            print(f"{label:<16} {'-':>5}")
+            continue
+        latencies, correct, count = result
+        ms = np.array(latencies) * 1000
+        print(f"{label:<16} {count:>5} {correct / count * 100:>8.0f}% "
+              f"{np.median(ms):>7.0f}ms {np.percentile(ms, 90):>7.0f}ms")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
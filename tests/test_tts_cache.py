@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the content-addressed TTS cache
+Checks keying, the memory tier, LRU eviction, persistence across restarts and
+that the prewarm script finds the static phrases
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tts_cache import TTSCache
+from tts_prewarm import collect_static_phrases, voices_for_phrase
+
+CLIP = b'\xff\xf3' * 50000  # ~100 KB of fake MP3
+
+
+def test_keying_and_tiers():
+    """Voice, model and speed are part of the key; hits come from memory first"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        check_keying_and_tiers(cache_dir)
+
+
+def check_keying_and_tiers(cache_dir):
+    cache = TTSCache(cache_dir, memory_clips=2)
+    cache.put("Hello Sophia!", "nova", "tts-1-hd", 1.0, CLIP)
+
+    assert cache.get("Hello Sophia!", "nova", "tts-1-hd", 1.0) == CLIP
+    assert cache.get("Hello Sophia!", "alloy", "tts-1-hd", 1.0) is None
+    assert cache.get("Hello Sophia!", "nova", "tts-1", 1.0) is None
+    assert cache.get("Hello Sophia!", "nova", "tts-1-hd", 0.9) is None
+
+    stats = cache.get_stats()
+    assert stats['memory_hits'] == 1 and stats['misses'] == 3
+
+    # A fresh process reads from disk, then serves from memory
+    restarted = TTSCache(cache_dir, memory_clips=2)
+    assert restarted.get("Hello Sophia!", "nova", "tts-1-hd", 1.0) == CLIP
+    assert restarted.get("Hello Sophia!", "nova", "tts-1-hd", 1.0) == CLIP
+    stats = restarted.get_stats()
+    assert stats['disk_hits'] == 1 and stats['memory_hits'] == 1
+
+
+def test_lru_eviction():
+    """Least recently used clips are deleted once the size limit is exceeded"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        check_lru_eviction(cache_dir)
+
+
+def check_lru_eviction(cache_dir):
+    cache = TTSCache(cache_dir, max_disk_mb=0.35, memory_clips=0)
+    for index in range(3):
+        cache.put(f"phrase {index}", "nova", "tts-1-hd", 1.0, CLIP)
+        time.sleep(0.01)
+
+    cache.get("phrase 0", "nova", "tts-1-hd", 1.0)  # phrase 0 is now the most recent
+    cache.put("phrase 3", "nova", "tts-1-hd", 1.0, CLIP)
+
+    assert cache.contains("phrase 0", "nova", "tts-1-hd")
+    assert not cache.contains("phrase 1", "nova", "tts-1-hd")
+    assert cache.get_stats()['evictions'] == 1
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_prewarm_phrases():
+    """Static phrases are collected from main.py and the game modules"""
+    phrases = collect_static_phrases()
+    assert any(phrase.startswith("Goodbye Sophia!") for phrase in phrases)
+    assert any("MATH GAME HELP" in phrase for phrase in phrases)
+    assert not any("{" in phrase and "}" in phrase for phrase in phrases)
+    assert voices_for_phrase("See you later Eladriel!") == ['alloy']
+    assert voices_for_phrase("Goodbye! Talk to you soon!") == ['alloy', 'nova']
+
+
+def main():
+    print("🔊 TTS Cache Test")
+    print("=" * 40)
+    try:
+        test_keying_and_tiers()
+        print("✅ Keying, memory tier and persistence")
+        test_lru_eviction()
+        print("✅ LRU eviction")
+        test_prewarm_phrases()
+        print(f"✅ Prewarm collects {len(collect_static_phrases())} static phrases")
+        return True
+    except AssertionError as e:
+        print(f"❌ TTS cache test failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark for in-memory TTS playback
+Compares per-utterance overhead of the old path (write a temp file, load it
+into pygame.mixer.music, poll get_busy() every 100 ms, unlink) with the
+in-memory player, and measures time-to-first-audio for chunked PCM playback
+
+Runs headless with SDL's dummy audio driver unless a real one is configured.
+
+Usage:
+    python tests/test_tts_playback_benchmark.py [--clip 1.37] [--repeats 5] [--mp3 speech.mp3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audio_playback import InMemoryPlayer, pcm_to_wav, OPENAI_PCM_RATE
+
+
+def make_speech_pcm(seconds):
+    """Stand-in for TTS output: 24 kHz 16-bit mono PCM"""
+    t = np.arange(int(seconds * OPENAI_PCM_RATE)) / OPENAI_PCM_RATE
+    wave = 0.3 * np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+    return (wave * 32767).astype(np.int16).tobytes()
+
+
+def legacy_play(audio_bytes, suffix):
+    """Previous OpenAITTSEngine playback path"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        temp_file.write(audio_bytes)
+        temp_file_path = temp_file.name
+    try:
+        pygame.mixer.music.load(temp_file_path)
+        pygame.mixer.music.play()
+        while pygame.mixer.music.get_busy():
+            pygame.time.wait(100)
+    finally:
+        os.unlink(temp_file_path)
+
+
+def overhead(function, clip_length, repeats):
+    """Median wall time beyond the clip's own duration"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start - clip_length)
+    return float(np.median(timings))
+
+
+def chunked_first_audio(player, pcm, bytes_per_second):
+    """Feed PCM at a simulated download speed; return (first audio, download time, total)"""
+    chunk_size = 4096
+    start = time.perf_counter()
+    first_audio = []
+    downloaded = []
+
+    def chunks():
+        for offset in range(0, len(pcm), chunk_size):
+            time.sleep(chunk_size / bytes_per_second)
+            if not first_audio and player.is_playing():
+                first_audio.append(time.perf_counter() - start)
+            yield pcm[offset:offset + chunk_size]
+        downloaded.append(time.perf_counter() - start)
+
+    received, completed = player.play_pcm_stream(chunks())
+    total = time.perf_counter() - start
+    assert received == pcm and completed
+    return (first_audio[0] if first_audio else total), downloaded[0], total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS playback overhead benchmark")
+    parser.add_argument('--clip', type=float, default=1.37, help="Clip length in seconds")
+    parser.add_argument('--repeats', type=int, default=5, help="Timed repetitions")
+    parser.add_argument('--mp3', help="Optional real TTS MP3 to benchmark instead of a generated WAV")
+    args = parser.parse_args()
+
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    player = InMemoryPlayer()
+
+    pcm = make_speech_pcm(args.clip)
+    if args.mp3:
+        with open(args.mp3, 'rb') as f:
+            audio_bytes, suffix = f.read(), '.mp3'
+    else:
+        audio_bytes, suffix = pcm_to_wav(pcm), '.wav'
+    clip_length = player.decode(audio_bytes).get_length()
+
+    print("🔊 TTS Playback Benchmark")
+    print("=" * 50)
+    print(f"Clip: {clip_length:.2f}s {suffix[1:].upper()} ({len(audio_bytes) // 1024} KB), "
+          f"audio driver: {os.environ.get('SDL_AUDIODRIVER')}")
+
+    legacy = overhead(lambda: legacy_play(audio_bytes, suffix), clip_length, args.repeats)
+    in_memory = overhead(lambda: player.play_bytes(audio_bytes), clip_length, args.repeats)
+    replay = overhead(lambda: player.play_bytes(audio_bytes, cache_key='clip'), clip_length, args.repeats)
+
+    print("\nPer-utterance overhead (beyond clip duration):")
+    print(f"   • Temp file + music polling: {legacy * 1000:7.1f} ms")
+    print(f"   • In-memory decode + event:  {in_memory * 1000:7.1f} ms")
+    print(f"   • Decoded replay (cached):   {replay * 1000:7.1f} ms")
+
+    # Download at 2x realtime, like a streaming TTS response
+    first_audio, download, total = chunked_first_audio(player, pcm, OPENAI_PCM_RATE * 2 * 2)
+    print(f"\nChunked PCM playback ({args.clip:.1f}s clip, download at 2x realtime):")
+    print(f"   • First audio after {first_audio:.2f}s (download finished at {download:.2f}s, "
+          f"playback done at {total:.2f}s)")
+
+    ok = in_memory < legacy and first_audio < download
+    print(f"\n{'✅' if ok else '❌'} In-memory playback saves {(legacy - in_memory) * 1000:.0f} ms per utterance")
+    pygame.mixer.quit()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
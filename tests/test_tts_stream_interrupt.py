@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test that interrupted streaming speech is not cached
+Runs a local fake OpenAI speech endpoint that streams PCM slower than realtime,
+stops playback halfway through one phrase and checks the TTS cache has no
+entry for it, while a phrase that plays to the end is cached in full
+
+Runs headless with SDL's dummy audio driver unless a real one is configured.
+
+Usage:
+    python tests/test_tts_stream_interrupt.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import openai
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audio_utils import OpenAITTSEngine
+from audio_playback import OPENAI_PCM_RATE
+from tts_cache import TTSCache
+
+CLIP_SECONDS = 1.5
+CHUNK = 4800  # 0.1 s of 24 kHz 16-bit mono
+
+
+class SlowSpeechHandler(BaseHTTPRequestHandler):
+    """/v1/audio/speech streaming raw PCM at about realtime"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        pcm = b'\x10\x00' * int(CLIP_SECONDS * OPENAI_PCM_RATE)
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/pcm')
+        self.send_header('Content-Length', str(len(pcm)))
+        self.end_headers()
+        try:
+            for offset in range(0, len(pcm), CHUNK):
+                self.wfile.write(pcm[offset:offset + CHUNK])
+                self.wfile.flush()
+                time.sleep(CHUNK / 2 / OPENAI_PCM_RATE)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def make_engine(cache_dir):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowSpeechHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = openai.OpenAI(api_key="test", base_url=f"http://127.0.0.1:{server.server_port}/v1")
+    cache = TTSCache(cache_dir, memory_clips=4)
+    return OpenAITTSEngine(client, voice="nova", cache=cache), server
+
+
+def test_stopped_stream_is_not_cached():
+    """stop() halfway through a streamed phrase leaves no cache entry for it"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        engine, server = make_engine(cache_dir)
+        try:
+            phrase = "This sentence gets interrupted halfway through."
+            threading.Timer(CLIP_SECONDS / 2, engine.player.stop).start()
+            start = time.time()
+            engine.say(phrase)
+            assert time.time() - start < CLIP_SECONDS, "playback was not stopped"
+            assert not engine.cache.contains(phrase, engine.voice, engine.model, engine.rate)
+
+            finished = "This sentence plays to the end."
+            engine.say(finished)
+            assert engine.cache.contains(finished, engine.voice, engine.model, engine.rate)
+        finally:
+            server.shutdown()
+
+
+def main():
+    print("🔊 TTS Stream Interrupt Test")
+    print("=" * 40)
+    try:
+        test_stopped_stream_is_not_cached()
+        print("✅ Interrupted speech is not cached; completed speech is")
+        return True
+    except AssertionError as e:
+        print(f"❌ TTS stream interrupt test failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Pipelined conversation turn test
+Simulates turns with a scripted recognizer and OpenAI stream and compares the
+time to the first reply token with the old sequential order (recognize ->
+route -> request) against the pipelined turn (speculative reply started from
+the draft transcript), then checks cancellation and prefetch behaviour
+
+Usage:
+    python tests/test_turn_pipeline.py
+"""
+
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from turn_pipeline import TurnPipeline
+
+DRAFT_AFTER = 0.15    # local recognizer result (unsure)
+FINAL_AFTER = 0.90    # cloud recognizer confirms
+ROUTE_TIME = 0.01     # handle_special_commands
+FIRST_TOKEN = 0.60    # OpenAI time to first token
+TOKEN_GAP = 0.02
+TOKENS = ["Dinosaurs ", "lived ", "millions ", "of ", "years ", "ago. "] * 5
+
+
+class ScriptedLLM:
+    """Streams a fixed reply and records what happened to each stream"""
+
+    def __init__(self):
+        self.started = []
+        self.closed = 0
+        self.tokens_sent = 0
+        self.lock = threading.Lock()
+
+    def stream(self, text, user):
+        with self.lock:
+            self.started.append(text)
+        try:
+            time.sleep(FIRST_TOKEN)
+            for token in TOKENS:
+                with self.lock:
+                    self.tokens_sent += 1
+                yield token
+                time.sleep(TOKEN_GAP)
+        finally:
+            with self.lock:
+                self.closed += 1
+
+
+def sequential_turn(llm, final_text):
+    """Old order: wait for the final transcript, route, then request"""
+    start = time.time()
+    time.sleep(FINAL_AFTER)
+    time.sleep(ROUTE_TIME)
+    first = next(iter(llm.stream(final_text, 'sophia')))
+    return time.time() - start, first
+
+
+def pipelined_turn(pipeline, draft_text, final_text, local_command=False):
+    """Draft transcript starts the reply; the final transcript confirms or replaces it"""
+    start = time.time()
+    turn = pipeline.start_turn('sophia')
+    time.sleep(DRAFT_AFTER)
+    turn.on_transcript(draft_text, final=False)
+    time.sleep(FINAL_AFTER - DRAFT_AFTER)
+    turn.on_transcript(final_text)
+    with turn.timer.stage('route'):
+        time.sleep(ROUTE_TIME)
+    if local_command:
+        turn.cancel("handled as a local command")
+        turn.finish()
+        return None, None
+    reply = turn.take_reply(final_text)
+    tokens = reply.tokens() if reply else pipeline.start_stream(final_text, 'sophia')
+    first = next(iter(tokens))
+    elapsed = time.time() - start
+    turn.finish()
+    return elapsed, first
+
+
+def main():
+    print("🏎️ Pipelined Conversation Turn Test")
+    print("=" * 60)
+    ok = True
+
+    # Time to first reply token
+    sequential, _ = sequential_turn(ScriptedLLM(), "tell me about dinosaurs")
+    llm = ScriptedLLM()
+    pipelined, first = pipelined_turn(TurnPipeline(llm.stream), "tell me about dinosaurs", "Tell me about dinosaurs.")
+    saved = sequential - pipelined
+    print(f"First reply token: sequential {sequential * 1000:.0f} ms, pipelined {pipelined * 1000:.0f} ms "
+          f"({saved * 1000:.0f} ms saved)")
+    if first != TOKENS[0] or len(llm.started) != 1 or saved < 0.4:
+        print("❌ Speculative reply from the draft transcript was not reused")
+        ok = False
+
+    # Draft differs from the final transcript: speculation is replaced
+    llm = ScriptedLLM()
+    pipelined_turn(TurnPipeline(llm.stream), "tell me about dinah sore", "tell me about dinosaurs")
+    time.sleep(FIRST_TOKEN + 0.1)
+    if llm.started != ["tell me about dinah sore", "tell me about dinosaurs"] or llm.closed < 1:
+        print(f"❌ Wrong draft was not cancelled and replaced: {llm.started}")
+        ok = False
+    else:
+        print("✅ Draft that differs from the final transcript is cancelled and restarted")
+
+    # Local command: the reply is cancelled and its stream closed early
+    llm = ScriptedLLM()
+    pipelined_turn(TurnPipeline(llm.stream), "turn left", "turn left", local_command=True)
+    time.sleep(FIRST_TOKEN + 0.2)
+    if llm.closed != 1 or llm.tokens_sent >= len(TOKENS):
+        print(f"❌ Cancelled reply kept streaming ({llm.tokens_sent} tokens, closed={llm.closed})")
+        ok = False
+    else:
+        print(f"✅ Local command cancels the reply (stream closed after {llm.tokens_sent}/{len(TOKENS)} tokens)")
+
+    # Gate: game answers never start a request
+    llm = ScriptedLLM()
+    gated = TurnPipeline(llm.stream, should_speculate=lambda text, user: False)
+    turn = gated.start_turn('sophia')
+    turn.on_transcript("seven")
+    if turn.take_reply("seven") is not None or llm.started:
+        print("❌ Speculation started although should_speculate said no")
+        ok = False
+    else:
+        print("✅ Gated turns (game answers, goodbyes) don't start a request")
+
+    # Prefetch fires once per turn, in the background
+    prefetched = []
+    pipeline = TurnPipeline(ScriptedLLM().stream, enabled=False)
+    pipeline.add_prefetch(['what is this'], lambda text, user: prefetched.append((text, user)))
+    turn = pipeline.start_turn('eladriel')
+    turn.on_transcript("what is this", final=False)
+    turn.on_transcript("what is this?")
+    time.sleep(0.05)
+    turn.finish()
+    if prefetched != [("what is this", 'eladriel')]:
+        print(f"❌ Prefetch ran {len(prefetched)} times")
+        ok = False
+    else:
+        print("✅ Prefetch runs once as soon as the intent appears")
+
+    print(f"\n{'✅' if ok else '❌'} Turn pipeline {'overlaps' if ok else 'does not overlap'} recognition with the reply")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the frame-level VAD engine
+Streams labelled recordings through VADEngine in microphone-sized chunks and
+reports frame accuracy, utterance boundary error and CPU per second of audio
+
+Fixture layout (labels as exported from an Audacity label track):
+    <dir>/<name>.wav    16-bit mono recording
+    <dir>/<name>.txt    one "start<TAB>end[<TAB>label]" line per utterance (seconds)
+
+Without --fixtures a synthetic set is generated: child-pitched voiced words
+with fricative onsets over quiet room noise, a fan, and keyboard clicks.
+
+Usage:
+    python tests/test_vad_benchmark.py [--fixtures vad_fixtures]
+"""
+
+import os
+import sys
+import glob
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from vad_engine import VADEngine
+from keyword_spotter import read_wav, write_wav
+
+RATE = 16000
+CHUNK = 1024
+RESOLUTION = 0.01  # frame accuracy is scored on a 10 ms grid
+BACKGROUNDS = ('quiet', 'fan', 'clicks')
+
+
+def synthesize_word(rng, seconds, amplitude):
+    """Voiced 'word' with a child-like pitch, optionally starting with a short fricative"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    f0 = rng.uniform(220, 320) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(1, 3) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / RATE
+    f1, f2 = rng.uniform(300, 800), rng.uniform(1000, 2500)
+    word = np.zeros(len(t))
+    for harmonic in range(1, 14):
+        frequency = f0 * harmonic
+        gain = np.exp(-((frequency - f1) / 200) ** 2) + 0.5 * np.exp(-((frequency - f2) / 300) ** 2) + 0.05
+        word += gain * np.sin(harmonic * phase)
+    word *= np.minimum(1, np.minimum(t, t[-1] - t) / 0.03)
+    word = amplitude * word / np.abs(word).max()
+    if rng.random() < 0.4:
+        # "s"/"f"-like onset: high-passed noise
+        hiss = np.diff(rng.normal(0, 1, int(0.08 * RATE) + 1))
+        word = np.concatenate([amplitude * 0.15 * hiss / np.abs(hiss).max(), word])
+    return word
+
+
+def background(rng, kind, length):
+    noise = rng.normal(0, 30, length)
+    if kind == 'fan':
+        brown = np.cumsum(rng.normal(0, 1, length))
+        brown -= np.convolve(brown, np.ones(400) / 400, mode='same')
+        t = np.arange(length) / RATE
+        noise += 120 * brown / (np.std(brown) + 1e-9) + 80 * np.sin(2 * np.pi * 120 * t)
+    elif kind == 'clicks':
+        for position in rng.integers(0, length - 200, int(length / RATE * 3)):
+            click = rng.normal(0, 1, 80) * np.exp(-np.arange(80) / 15)
+            noise[position:position + 80] += 3000 * click
+    return noise
+
+
+def build_fixture(rng, kind, seconds=12.0):
+    """One synthetic recording; returns (samples, [(start, end), ...])"""
+    audio = background(rng, kind, int(seconds * RATE))
+    labels = []
+    position = rng.uniform(0.8, 1.5)
+    while True:
+        amplitude = rng.uniform(800, 5000)
+        words = [synthesize_word(rng, rng.uniform(0.18, 0.45), amplitude) for _ in range(rng.integers(1, 4))]
+        gaps = [np.zeros(int(rng.uniform(0.05, 0.15) * RATE)) for _ in words[1:]] + [np.zeros(0)]
+        utterance = np.concatenate([part for pair in zip(words, gaps) for part in pair])
+        start = int(position * RATE)
+        if start + len(utterance) > len(audio) - RATE:
+            break
+        audio[start:start + len(utterance)] += utterance
+        labels.append((start / RATE, (start + len(utterance)) / RATE))
+        position = labels[-1][1] + rng.uniform(1.0, 2.5)
+    return np.clip(audio, -32768, 32767).astype(np.int16), labels
+
+
+def build_synthetic_set(root, rng, per_background=4):
+    for kind in BACKGROUNDS:
+        for index in range(per_background):
+            samples, labels = build_fixture(rng, kind)
+            name = os.path.join(root, f"{kind}_{index:02d}")
+            write_wav(name + '.wav', samples / 32768.0, RATE)
+            with open(name + '.txt', 'w') as f:
+                f.writelines(f"{start:.3f}\t{end:.3f}\tspeech\n" for start, end in labels)
+
+
+def load_fixture(wav_path):
+    samples, sample_rate = read_wav(wav_path)
+    labels = []
+    with open(os.path.splitext(wav_path)[0] + '.txt') as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) >= 2:
+                labels.append((float(fields[0]), float(fields[1])))
+    return (np.clip(samples, -1, 1) * 32767).astype(np.int16), sample_rate, labels
+
+
+def to_mask(intervals, seconds):
+    mask = np.zeros(int(np.ceil(seconds / RESOLUTION)), dtype=bool)
+    for start, end in intervals:
+        mask[int(start / RESOLUTION):int(end / RESOLUTION)] = True
+    return mask
+
+
+def run_fixture(samples, sample_rate, labels):
+    """Stream one recording through the engine; returns per-file statistics"""
+    engine = VADEngine(sample_rate)
+    segments = []
+    busy = 0.0
+    for offset in range(0, len(samples), CHUNK):
+        start = time.perf_counter()
+        segments.extend(engine.process(samples[offset:offset + CHUNK]))
+        busy += time.perf_counter() - start
+    last = engine.flush()
+    if last:
+        segments.append(last)
+
+    seconds = len(samples) / sample_rate
+    reference = to_mask(labels, seconds)
+    hypothesis = to_mask([(s.start, s.end) for s in segments], seconds)
+    onset_errors, offset_errors, missed = [], [], 0
+    for start, end in labels:
+        overlapping = [s for s in segments if s.start < end and s.end > start]
+        if not overlapping:
+            missed += 1
+            continue
+        onset_errors.append(overlapping[0].start - start)
+        offset_errors.append(overlapping[-1].end - end)
+    false_segments = sum(1 for s in segments if not any(s.start < end and s.end > start for start, end in labels))
+    return {
+        'seconds': seconds, 'busy': busy, 'utterances': len(labels), 'segments': len(segments),
+        'missed': missed, 'false_segments': false_segments,
+        'true_positive': int(np.sum(reference & hypothesis)),
+        'reference': int(np.sum(reference)), 'hypothesis': int(np.sum(hypothesis)),
+        'onset_errors': onset_errors, 'offset_errors': offset_errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VAD engine benchmark")
+    parser.add_argument('--fixtures', help="Directory of <name>.wav + <name>.txt label files")
+    args = parser.parse_args()
+
+    print("🎙️ VAD Engine Benchmark")
+    print("=" * 50)
+    print(f"Platform: {platform.machine()} / Python {platform.python_version()}")
+    work_dir = None
+    try:
+        fixtures_dir = args.fixtures
+        if not fixtures_dir:
+            work_dir = fixtures_dir = tempfile.mkdtemp()
+            build_synthetic_set(work_dir, np.random.default_rng(11))
+            print(f"No fixtures given - using synthetic recordings ({', '.join(BACKGROUNDS)} backgrounds)")
+
+        totals = {}
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.wav'))):
+            stats = run_fixture(*load_fixture(path))
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value if not isinstance(value, list) else totals.get(key, []) + value
+        if not totals:
+            print(f"❌ No fixtures in {fixtures_dir}")
+            return False
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir)
+
+    precision = totals['true_positive'] / max(totals['hypothesis'], 1)
+    recall = totals['true_positive'] / max(totals['reference'], 1)
+    cpu = totals['busy'] / totals['seconds']
+    onsets = np.array(totals['onset_errors']) * 1000
+    offsets = np.array(totals['offset_errors']) * 1000
+
+    print(f"\n{totals['seconds']:.0f}s of audio, {totals['utterances']} labelled utterances")
+    print(f"   • Frame precision / recall:  {precision * 100:5.1f}% / {recall * 100:5.1f}%")
+    print(f"   • Utterances missed:         {totals['missed']}")
+    print(f"   • False segments:            {totals['false_segments']}")
+    print(f"   • Onset error:               median {np.median(onsets):+.0f} ms, worst {np.max(np.abs(onsets)):.0f} ms")
+    print(f"   • End error:                 median {np.median(offsets):+.0f} ms, worst {np.max(np.abs(offsets)):.0f} ms")
+    print(f"   • STT requests:              {totals['segments']} (one per detected segment)")
+    print(f"   • CPU:                       {cpu * 1000:.1f} ms per second of audio ({cpu * 100:.2f}% of one core)")
+
+    ok = (precision >= 0.85 and recall >= 0.9 and totals['missed'] == 0
+          and totals['false_segments'] <= 1 and cpu < 0.05)
+    print(f"\n{'✅' if ok else '❌'} VAD engine {'meets' if ok else 'misses'} the accuracy/CPU targets")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the offline keyword spotter
+Replays WAV files through KeywordSpotter in 30 ms chunks, exactly as the live
+microphone stream would arrive, and reports detection latency, false accept
+and false reject rates, and CPU cost
+
+Layout of a real recording set:
+    <enroll>/<user>/*.wav     wake word samples used as templates
+    <eval>/<user>/*.wav       held-out wake word utterances (positives)
+    <eval>/negative/*.wav     speech/noise without wake words
+
+Without --enroll/--eval a synthetic set of formant "words" is generated, so
+the harness runs anywhere without recordings.
+
+Usage:
+    python tests/test_wake_word_benchmark.py [--enroll wake_words --eval wake_word_eval] [--sensitivity 0.5]
+"""
+
+import os
+import sys
+import glob
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from keyword_spotter import KeywordSpotter, read_wav, write_wav
+
+RATE = 16000
+CHUNK_SECONDS = 0.03
+PADDING_SECONDS = 1.0
+
+# Each synthetic word is a sequence of (F1, F2, seconds) vowel segments
+SYNTHETIC_WORDS = {
+    'sophia': [(300, 2300, 0.12), (650, 1100, 0.18), (400, 2000, 0.15)],     # "mi-ley"
+    'eladriel': [(350, 2200, 0.12), (500, 1500, 0.10), (450, 900, 0.20)],    # "di-no"
+    'parent': [(700, 1200, 0.10), (450, 1900, 0.14), (300, 2300, 0.10), (550, 1700, 0.16)],
+}
+# Other vowels for non-wake-word speech (wake word fragments are mixed in separately)
+NEGATIVE_VOWELS = [(600, 1000), (350, 800), (250, 1700), (750, 1400), (500, 2100),
+                   (400, 1300), (650, 1800), (300, 1000)]
+
+
+def synthesize_word(segments, rng, stretch=1.0, pitch=160.0):
+    """Harmonic voiced sound shaped by two formants per segment, with gliding transitions"""
+    rate_jitter = rng.uniform(0.9, 1.1)
+    pitch = pitch * rng.uniform(0.9, 1.1)
+    durations = [seconds * stretch * rng.uniform(0.92, 1.08) for _, _, seconds in segments]
+    total = int(sum(durations) * RATE)
+    t = np.arange(total) / RATE
+
+    # Formant tracks interpolated between segment centers
+    centers = np.cumsum(durations) - np.array(durations) / 2
+    formant_shift = rng.uniform(0.95, 1.05)
+    f1 = np.interp(t, centers, [f for f, _, _ in segments]) * formant_shift
+    f2 = np.interp(t, centers, [f for _, f, _ in segments]) * formant_shift
+    f0 = pitch * rate_jitter * (1 + 0.08 * np.sin(2 * np.pi * 2.5 * t / max(t[-1], 1e-3)))
+    phase = 2 * np.pi * np.cumsum(f0) / RATE
+
+    signal = np.zeros(total)
+    for harmonic in range(1, 30):
+        frequency = f0 * harmonic
+        gain = (np.exp(-((frequency - f1) / 120) ** 2) + 0.6 * np.exp(-((frequency - f2) / 180) ** 2)
+                + 0.02 / harmonic)
+        signal += gain * np.sin(harmonic * phase) * (frequency < RATE / 2)
+    envelope = np.minimum(1, np.minimum(t, t[-1] - t) / 0.03)
+    return 0.25 * signal * envelope / (np.abs(signal).max() + 1e-9)
+
+
+def with_padding(word, rng, noise_level=0.003):
+    """Surround an utterance with background noise; returns (audio, end of speech in seconds)"""
+    padding = np.zeros(int(PADDING_SECONDS * RATE))
+    audio = np.concatenate([padding, word, padding])
+    audio += rng.normal(0, noise_level, len(audio))
+    return audio, (len(padding) + len(word)) / RATE
+
+
+def build_synthetic_set(root, rng, enroll_per_user=4, eval_per_user=20, negatives=40):
+    """Write a synthetic enrollment/evaluation set to root; returns (enroll_dir, eval_dir)"""
+    enroll_dir = os.path.join(root, 'enroll')
+    eval_dir = os.path.join(root, 'eval')
+    for user, segments in SYNTHETIC_WORDS.items():
+        os.makedirs(os.path.join(enroll_dir, user))
+        os.makedirs(os.path.join(eval_dir, user))
+        for index in range(enroll_per_user):
+            audio, _ = with_padding(synthesize_word(segments, rng), rng)
+            write_wav(os.path.join(enroll_dir, user, f"{index:02d}.wav"), audio, RATE)
+        for index in range(eval_per_user):
+            word = synthesize_word(segments, rng, stretch=rng.uniform(0.85, 1.2), pitch=rng.uniform(130, 220))
+            audio, _ = with_padding(word, rng, noise_level=rng.uniform(0.002, 0.01))
+            write_wav(os.path.join(eval_dir, user, f"{index:02d}.wav"), audio, RATE)
+
+    os.makedirs(os.path.join(eval_dir, 'negative'))
+    for index in range(negatives):
+        # Random vowel strings, some starting with the first syllable of a wake word
+        vowels = [NEGATIVE_VOWELS[i] for i in rng.choice(len(NEGATIVE_VOWELS), rng.integers(2, 6))]
+        segments = [(f1, f2, rng.uniform(0.08, 0.2)) for f1, f2 in vowels]
+        if index % 4 == 0:
+            segments = list(SYNTHETIC_WORDS[list(SYNTHETIC_WORDS)[index % 3]][:1]) + segments
+        audio, _ = with_padding(synthesize_word(segments, rng), rng)
+        write_wav(os.path.join(eval_dir, 'negative', f"{index:02d}.wav"), audio, RATE)
+    return enroll_dir, eval_dir
+
+
+def speech_end(samples, sample_rate):
+    """Time the last loud 10 ms block ends (used as the latency reference)"""
+    block = sample_rate // 100
+    energies = np.array([np.mean(samples[i:i + block] ** 2) for i in range(0, len(samples) - block, block)])
+    floor = max(energies.max() * 10 ** (-30 / 10), np.percentile(energies, 10) * 10 ** (9 / 10))
+    loud = np.nonzero(energies > floor)[0]
+    return (loud[-1] + 1) * block / sample_rate
+
+
+def replay(spotter, samples, sample_rate):
+    """Stream a clip through the spotter; returns (detections as (user, seconds), processing seconds)"""
+    spotter.reset()
+    pcm = (np.clip(samples, -1, 1) * 32767).astype(np.int16)
+    chunk = int(sample_rate * CHUNK_SECONDS)
+    detections = []
+    busy = 0.0
+    for offset in range(0, len(pcm), chunk):
+        start = time.perf_counter()
+        result = spotter.process(pcm[offset:offset + chunk].tobytes())
+        busy += time.perf_counter() - start
+        if result:
+            detections.append((result[0], min(offset + chunk, len(pcm)) / sample_rate))
+    return detections, busy
+
+
+def evaluate(spotter, eval_dir):
+    """Replay every evaluation file and collect the statistics"""
+    stats = {'positives': 0, 'detected': 0, 'wrong_user': 0, 'false_accepts': 0,
+             'negative_seconds': 0.0, 'latencies': [], 'audio_seconds': 0.0, 'busy_seconds': 0.0}
+    for path in sorted(glob.glob(os.path.join(eval_dir, '*', '*.wav'))):
+        label = os.path.basename(os.path.dirname(path))
+        samples, sample_rate = read_wav(path)
+        detections, busy = replay(spotter, samples, sample_rate)
+        stats['audio_seconds'] += len(samples) / sample_rate
+        stats['busy_seconds'] += busy
+
+        if label == 'negative':
+            stats['negative_seconds'] += len(samples) / sample_rate
+            stats['false_accepts'] += len(detections)
+            continue
+
+        stats['positives'] += 1
+        correct = [seconds for user, seconds in detections if user == label]
+        stats['wrong_user'] += sum(1 for user, _ in detections if user != label)
+        stats['false_accepts'] += sum(1 for user, _ in detections if user != label)
+        if correct:
+            stats['detected'] += 1
+            stats['latencies'].append(correct[0] - speech_end(samples, sample_rate))
+    return stats
+
+
+def report(stats):
+    """Print the benchmark table; returns True if the latency/CPU/error targets are met"""
+    positives = max(stats['positives'], 1)
+    false_reject = 1 - stats['detected'] / positives
+    hours = max(stats['negative_seconds'], 1e-9) / 3600
+    cpu = stats['busy_seconds'] / max(stats['audio_seconds'], 1e-9)
+    latencies = np.array(stats['latencies']) * 1000 if stats['latencies'] else np.array([np.nan])
+
+    print(f"\nPositives: {stats['positives']}, negative audio: {stats['negative_seconds']:.0f}s")
+    print(f"   • False reject rate:   {false_reject * 100:5.1f}%")
+    print(f"   • False accepts:       {stats['false_accepts']} "
+          f"({stats['wrong_user']} wrong user, {stats['false_accepts'] / hours:.1f}/hour of negatives)")
+    print(f"   • Detection latency:   median {np.median(latencies):.0f} ms, "
+          f"p90 {np.percentile(latencies, 90):.0f} ms after end of speech")
+    print(f"   • CPU:                 {cpu * 100:.2f}% of one core")
+    return false_reject <= 0.1 and stats['false_accepts'] <= 1 and np.median(latencies) < 300 and cpu < 0.05
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline wake word benchmark")
+    parser.add_argument('--enroll', help="Enrollment samples (<dir>/<user>/*.wav)")
+    parser.add_argument('--eval', help="Evaluation set (<dir>/<user>/*.wav and <dir>/negative/*.wav)")
+    parser.add_argument('--sensitivity', type=float, default=0.5, help="Spotter sensitivity (0-1)")
+    args = parser.parse_args()
+
+    print("🎯 Offline Wake Word Benchmark")
+    print("=" * 50)
+    work_dir = None
+    try:
+        if args.enroll and args.eval:
+            enroll_dir, eval_dir = args.enroll, args.eval
+        else:
+            work_dir = tempfile.mkdtemp()
+            enroll_dir, eval_dir = build_synthetic_set(work_dir, np.random.default_rng(7))
+            print("No recordings given - using a synthetic formant word set")
+
+        spotter = KeywordSpotter.from_directory(enroll_dir, RATE, args.sensitivity)
+        if not spotter.templates:
+            print(f"❌ No enrollment samples in {enroll_dir}")
+            return False
+        for user in spotter.users:
+            print(f"   • {user}: threshold {spotter.thresholds[user]:.2f}")
+
+        ok = report(evaluate(spotter, eval_dir))
+        print(f"\n{'✅' if ok else '❌'} Offline wake word detection "
+              f"{'meets' if ok else 'misses'} the latency/accuracy targets")
+        return ok
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
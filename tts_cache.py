@@ -0,0 +1,187 @@
+"""
+TTS Audio Cache for AI Assistant
+Content-addressed cache for synthesized speech so fixed phrases (greetings,
+game prompts, timeouts, farewells) are only sent to OpenAI TTS once
+
+Audio is stored on disk as <sha256(text, voice, model, speed)>.tts (MP3 or WAV
+bytes exactly as synthesized) with least-recently-used eviction once the cache
+grows past its size limit, and the hottest clips are also kept in memory
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSION = '.tts'
+
+
+def tts_cache_key(text: str, voice: str, model: str, speed: float) -> str:
+    """Content address for one synthesized phrase"""
+    payload = json.dumps([text, voice, model, round(float(speed), 3)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TTSCache:
+    """Disk-backed LRU cache of TTS audio with an in-memory tier for hot clips"""
+
+    def __init__(self, cache_dir: str = "tts_cache", max_disk_mb: float = 200, memory_clips: int = 32):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding the cached audio files
+            max_disk_mb: Size limit before least-recently-used clips are evicted
+            memory_clips: Number of clips kept in memory
+        """
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.memory_clips = memory_clips
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> audio bytes, most recent last
+        self._disk_index = {}  # key -> [size, last_access]
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scan_disk()
+
+    def _scan_disk(self):
+        """Rebuild the disk index from the cache directory"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(AUDIO_EXTENSION):
+                stat = entry.stat()
+                self._disk_index[entry.name[:-len(AUDIO_EXTENSION)]] = [stat.st_size, stat.st_mtime]
+                self._disk_bytes += stat.st_size
+        logger.info(f"🔊 TTS cache: {len(self._disk_index)} clips ({self._disk_bytes / (1024 * 1024):.1f} MB) "
+                    f"in {self.cache_dir}")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + AUDIO_EXTENSION)
+
+    def get(self, text: str, voice: str, model: str, speed: float = 1.0) -> Optional[bytes]:
+        """Return cached audio for the phrase, or None"""
+        key = tts_cache_key(text, voice, model, speed)
+
+        with self._lock:
+            audio_bytes = self._memory.get(key)
+            if audio_bytes is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self._touch(key)
+                return audio_bytes
+            on_disk = key in self._disk_index
+
+        if not on_disk:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            with open(self._path(key), 'rb') as f:
+                audio_bytes = f.read()
+        except OSError:
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._touch(key)
+            self._remember(key, audio_bytes)
+        return audio_bytes
+
+    def put(self, text: str, voice: str, model: str, speed: float, audio_bytes: bytes):
+        """Store synthesized audio for the phrase"""
+        if not audio_bytes:
+            return
+        key = tts_cache_key(text, voice, model, speed)
+        path = self._path(key)
+
+        try:
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(audio_bytes)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write TTS cache entry: {e}")
+            return
+
+        with self._lock:
+            if key in self._disk_index:
+                self._disk_bytes -= self._disk_index[key][0]
+            self._disk_index[key] = [len(audio_bytes), time.time()]
+            self._disk_bytes += len(audio_bytes)
+            self._remember(key, audio_bytes)
+            self._evict()
+
+    def contains(self, text: str, voice: str, model: str, speed: float = 1.0) -> bool:
+        """True if the phrase is already cached on disk"""
+        with self._lock:
+            return tts_cache_key(text, voice, model, speed) in self._disk_index
+
+    def _touch(self, key: str):
+        """Mark a clip as recently used (lock held)"""
+        entry = self._disk_index.get(key)
+        if entry:
+            entry[1] = time.time()
+            try:
+                os.utime(self._path(key))
+            except OSError:
+                pass
+
+    def _remember(self, key: str, audio_bytes: bytes):
+        """Keep a clip in the memory tier (lock held)"""
+        if self.memory_clips <= 0:
+            return
+        self._memory[key] = audio_bytes
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_clips:
+            self._memory.popitem(last=False)
+
+    def _forget(self, key: str):
+        """Drop a clip from both tiers (lock held)"""
+        self._memory.pop(key, None)
+        entry = self._disk_index.pop(key, None)
+        if entry:
+            self._disk_bytes -= entry[0]
+
+    def _evict(self):
+        """Delete least-recently-used clips until the cache fits its size limit (lock held)"""
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        for key, _ in sorted(self._disk_index.items(), key=lambda item: item[1][1]):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+            self._forget(key)
+            self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and cache size"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'clips': len(self._disk_index),
+                'disk_mb': self._disk_bytes / (1024 * 1024),
+                'memory_clips': len(self._memory),
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            }
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+TTS Cache Prewarm Script for AI Assistant
+Synthesizes every static phrase the robot says (greetings, face greetings,
+timeout prompts, farewells and fixed game responses) into the TTS cache, in
+parallel, so they play instantly and keep working without network
+
+Phrases are collected from the source code itself (string literals only -
+f-strings with runtime values are skipped), so new prompts are picked up
+automatically the next time this runs.
+
+Usage:
+    python tts_prewarm.py [--workers 4] [--dry-run]
+"""
+
+import os
+import ast
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Set, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Functions in main.py whose list/dict literals are spoken phrases
+MAIN_PHRASE_FUNCTIONS = ('get_dynamic_face_greeting', 'handle_user_interaction')
+# Modules whose constant return values are spoken as-is by main.py
+GAME_MODULES = ('math_quiz_game.py', 'letter_word_game.py', 'filipino_translator.py')
+SPEAK_METHODS = ('speak', 'speak_no_interrupt')
+MIN_PHRASE_LENGTH = 12
+
+# Voices as set up by setup_premium_tts_engines (parent mode uses Sophia's voice)
+USER_VOICES = {'sophia': 'nova', 'eladriel': 'alloy'}
+
+
+def _string(node) -> str:
+    """Value of a plain string literal, else empty"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value.strip()
+    return ""
+
+
+def _literal_strings(node) -> List[str]:
+    """Strings inside list/tuple elements and dict values below node"""
+    strings = []
+    for child in ast.walk(node):
+        if isinstance(child, (ast.List, ast.Tuple)):
+            strings.extend(_string(element) for element in child.elts)
+        elif isinstance(child, ast.Dict):
+            strings.extend(_string(value) for value in child.values)
+    return [s for s in strings if s]
+
+
+def _parse(filename: str) -> ast.AST:
+    with open(os.path.join(PROJECT_DIR, filename), 'r', encoding='utf-8') as f:
+        return ast.parse(f.read(), filename=filename)
+
+
+def _functions(tree: ast.AST, names) -> List[ast.FunctionDef]:
+    return [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef) and node.name in names]
+
+
+def collect_static_phrases() -> Set[str]:
+    """Every fixed phrase the assistant can speak"""
+    phrases = set()
+
+    main_tree = _parse('main.py')
+
+    # Greetings get a day-of-week special appended, so cache every combination
+    for function in _functions(main_tree, ('get_dynamic_greeting',)):
+        greetings, day_specials = [], []
+        for child in ast.walk(function):
+            if isinstance(child, ast.List):
+                greetings.extend(s for s in map(_string, child.elts) if s)
+            elif isinstance(child, ast.Dict):
+                day_specials.extend(s for s in map(_string, child.values) if s)
+        phrases.update(f"{greeting} {special}" for greeting in greetings for special in day_specials)
+
+    for function in _functions(main_tree, MAIN_PHRASE_FUNCTIONS):
+        phrases.update(_literal_strings(function))
+
+    # Constant phrases passed straight to speak() anywhere in main.py
+    for node in ast.walk(main_tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) \
+                and node.func.attr in SPEAK_METHODS and node.args:
+            phrases.add(_string(node.args[0]))
+
+    # Fixed responses returned by the game modules
+    for filename in GAME_MODULES:
+        for node in ast.walk(_parse(filename)):
+            if isinstance(node, ast.Return) and node.value is not None:
+                phrases.add(_string(node.value))
+
+    return {phrase for phrase in phrases if len(phrase) >= MIN_PHRASE_LENGTH}
+
+
+def voices_for_phrase(phrase: str) -> List[str]:
+    """Voices a phrase can be spoken with - by name when it addresses one child"""
+    voices = [voice for user, voice in USER_VOICES.items() if user in phrase.lower()]
+    return voices if len(voices) == 1 else sorted(set(USER_VOICES.values()))
+
+
+def prewarm(workers: int = 4, dry_run: bool = False) -> Tuple[int, int, int]:
+    """
+    Synthesize all static phrases that are not cached yet
+
+    Returns:
+        tuple: (already cached, newly synthesized, failed)
+    """
+    from config import Config
+    from tts_cache import TTSCache
+    import openai
+
+    config = Config()
+    cache = TTSCache(config.tts_cache_dir, max_disk_mb=config.tts_cache_max_mb)
+    client = openai.OpenAI(api_key=config.openai_api_key)
+    model, speed = "tts-1-hd", 1.0  # OpenAITTSEngine defaults
+
+    jobs = [(phrase, voice) for phrase in sorted(collect_static_phrases()) for voice in voices_for_phrase(phrase)]
+    missing = [(phrase, voice) for phrase, voice in jobs if not cache.contains(phrase, voice, model, speed)]
+    print(f"🔊 {len(jobs)} static phrase/voice pairs, {len(jobs) - len(missing)} already cached, "
+          f"{len(missing)} to synthesize ({sum(len(p) for p, _ in missing)} characters)")
+
+    if dry_run or not missing:
+        return len(jobs) - len(missing), 0, 0
+
+    def synthesize(phrase, voice):
+        response = client.audio.speech.create(model=model, voice=voice, input=phrase, speed=speed)
+        cache.put(phrase, voice, model, speed, response.content)
+
+    done = failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(synthesize, phrase, voice): phrase for phrase, voice in missing}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                done += 1
+                print(f"   ✅ [{done + failed}/{len(missing)}] {futures[future][:60]}")
+            except Exception as e:
+                failed += 1
+                print(f"   ❌ [{done + failed}/{len(missing)}] {futures[future][:60]}: {e}")
+
+    return len(jobs) - len(missing), done, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prewarm the TTS cache with all static phrases")
+    parser.add_argument('--workers', type=int, default=4, help="Parallel TTS requests")
+    parser.add_argument('--dry-run', action='store_true', help="Only count what would be synthesized")
+    args = parser.parse_args()
+
+    print("🔥 TTS Cache Prewarm")
+    print("=" * 40)
+    cached, synthesized, failed = prewarm(args.workers, args.dry_run)
+    print(f"\n🎉 Done: {cached} cached, {synthesized} synthesized, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
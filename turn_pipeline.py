@@ -0,0 +1,239 @@
+"""
+Pipelined Conversation Turns for AI Assistant
+Overlaps the stages of a turn instead of running recognition, routing and the
+OpenAI request strictly one after another
+
+- Speculative reply: the OpenAI request is started from the first transcript
+  available - a draft from the local recognizer while the cloud double-checks
+  it, or the final transcript - and streams into a buffer while the turn is
+  routed. It is cancelled if the turn turns out to be a local command or the
+  final transcript differs from the draft.
+- Prefetch: work a likely follow-up needs (e.g. the camera frame for
+  "what is this") is started as soon as the intent shows up in a transcript
+- Per-stage timing: capture, recognition, routing, reply and speech are timed
+  and logged once per turn
+"""
+
+import re
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_transcript(text: str) -> str:
+    """Lowercase words only, so "What's that?" and "what's that" are the same turn"""
+    return ' '.join(re.sub(r"[^a-z0-9' ]", ' ', (text or '').lower()).split())
+
+
+class SpeculativeReply:
+    """OpenAI reply streamed on a worker thread before the turn is known to need it"""
+
+    def __init__(self, text: str, user: str, start_stream: Callable[[str, str], Iterator[str]]):
+        """
+        Args:
+            text: Transcript the request was started from
+            user: User the reply is for
+            start_stream: Callable(text, user) returning an iterator of text deltas
+        """
+        self.text = text
+        self.user = user
+        self.started_at = time.time()
+        self.first_token_at = None
+        self.finished_at = None
+        self._tokens = queue.Queue()
+        self._cancelled = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(start_stream,),
+                                        name="speculative-reply", daemon=True)
+        self._thread.start()
+
+    def _run(self, start_stream):
+        stream = None
+        try:
+            stream = start_stream(self.text, self.user)
+            for token in stream:
+                if self._cancelled.is_set():
+                    break
+                if self.first_token_at is None:
+                    self.first_token_at = time.time()
+                self._tokens.put(token)
+        except Exception as e:
+            self._error = e
+        finally:
+            # Closing the generator ends the HTTP stream, so a cancelled reply stops costing tokens
+            close = getattr(stream, 'close', None)
+            if close:
+                close()
+            self.finished_at = time.time()
+            self._tokens.put(None)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self, reason: str = ""):
+        """Stop the request; tokens already received are dropped"""
+        if not self._cancelled.is_set():
+            self._cancelled.set()
+            logger.info(f"🗑️ Speculative reply for '{self.text[:40]}' cancelled{': ' + reason if reason else ''}")
+
+    def tokens(self) -> Iterator[str]:
+        """
+        Text deltas: the buffered ones first, then live ones as they arrive
+
+        Raises:
+            The request's exception, after the tokens received before it
+        """
+        while True:
+            token = self._tokens.get()
+            if token is None:
+                break
+            yield token
+        if self._error is not None:
+            raise self._error
+
+    def result(self) -> str:
+        """Whole reply (blocks until the stream ends)"""
+        return ''.join(self.tokens()).strip()
+
+
+class TurnTimer:
+    """Wall-clock time spent in each stage of one turn"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.stages: Dict[str, float] = {}
+        self.notes: List[str] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, time.time() - start)
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def note(self, text: str):
+        self.notes.append(text)
+
+    def summary(self) -> str:
+        parts = [f"{name} {self._format(seconds)}" for name, seconds in self.stages.items()]
+        parts.append(f"total {self._format(time.time() - self.started_at)}")
+        return ' | '.join(parts) + (f" ({'; '.join(self.notes)})" if self.notes else '')
+
+    @staticmethod
+    def _format(seconds: float) -> str:
+        return f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+
+class Turn:
+    """One user turn: its timer, speculative reply and prefetches"""
+
+    def __init__(self, pipeline: 'TurnPipeline', user: str):
+        self.pipeline = pipeline
+        self.user = user
+        self.timer = TurnTimer()
+        self.reply: Optional[SpeculativeReply] = None
+        self.text: Optional[str] = None  # final transcript
+        self._prefetched = set()
+        self._lock = threading.Lock()
+
+    def on_transcript(self, text: str, final: bool = True):
+        """
+        A transcript of the utterance is available
+
+        Args:
+            text: Transcript as it will be routed
+            final: False for a draft that a slower recognizer is still checking
+        """
+        if not text:
+            return
+        if final:
+            self.text = text
+        self._prefetch(text)
+
+        with self._lock:
+            if self.reply is not None:
+                if normalize_transcript(self.reply.text) == normalize_transcript(text):
+                    return
+                self.reply.cancel("transcript changed")
+                self.reply = None
+            if self.pipeline.enabled and self.pipeline.should_speculate(text, self.user):
+                self.reply = SpeculativeReply(text, self.user, self.pipeline.start_stream)
+                logger.info(f"🏎️ Speculative reply started from {'final' if final else 'draft'} "
+                            f"transcript '{text[:40]}'")
+
+    def take_reply(self, text: str) -> Optional[SpeculativeReply]:
+        """Speculative reply for the routed text, or None if there isn't a matching one"""
+        with self._lock:
+            reply, self.reply = self.reply, None
+        if reply is None:
+            return None
+        if reply.cancelled or normalize_transcript(reply.text) != normalize_transcript(text):
+            reply.cancel("transcript changed")
+            return None
+        self.timer.note(f"reply started {TurnTimer._format(time.time() - reply.started_at)} early")
+        return reply
+
+    def cancel(self, reason: str):
+        """The turn was handled without the OpenAI reply"""
+        with self._lock:
+            reply, self.reply = self.reply, None
+        if reply is not None:
+            reply.cancel(reason)
+            self.pipeline.cancelled += 1
+
+    def finish(self):
+        """Drop anything unused and log the stage timings (turns where something was said)"""
+        self.cancel("turn finished without it")
+        if self.text:
+            logger.info(f"⏱️ Turn stages for {self.user}: {self.timer.summary()}")
+
+    def _prefetch(self, text: str):
+        lowered = text.lower()
+        for index, (phrases, action) in enumerate(self.pipeline.prefetchers):
+            if index in self._prefetched or not any(phrase in lowered for phrase in phrases):
+                continue
+            self._prefetched.add(index)
+            threading.Thread(target=self._run_prefetch, args=(action, text), name="turn-prefetch",
+                             daemon=True).start()
+
+    def _run_prefetch(self, action: Callable[[str, str], None], text: str):
+        try:
+            action(text, self.user)
+        except Exception as e:
+            logger.warning(f"⚠️ Prefetch failed: {e}")
+
+
+class TurnPipeline:
+    """Creates turns and holds what they share: the reply starter, gate and prefetchers"""
+
+    def __init__(self, start_stream: Callable[[str, str], Iterator[str]],
+                 should_speculate: Optional[Callable[[str, str], bool]] = None, enabled: bool = True):
+        """
+        Args:
+            start_stream: Callable(text, user) returning the OpenAI reply as text deltas
+            should_speculate: Callable(text, user) -> False for turns that are almost certainly
+                handled locally (game answers, goodbyes), so no request is wasted on them
+            enabled: Start replies speculatively at all (prefetch and timing still work)
+        """
+        self.start_stream = start_stream
+        self.should_speculate = should_speculate or (lambda text, user: True)
+        self.enabled = enabled
+        self.prefetchers: List[Tuple[List[str], Callable[[str, str], None]]] = []
+        self.cancelled = 0
+
+    def add_prefetch(self, phrases: List[str], action: Callable[[str, str], None]):
+        """Run action(text, user) in the background, once per turn, when a transcript contains a phrase"""
+        self.prefetchers.append(([phrase.lower() for phrase in phrases], action))
+
+    def start_turn(self, user: str) -> Turn:
+        return Turn(self, user)
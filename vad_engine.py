@@ -0,0 +1,266 @@
+"""
+Frame-Level Voice Activity Detection Engine for AI Assistant
+Finds speech segments locally so only finished utterances are sent to
+speech recognition
+
+Each 20 ms frame gets three features computed in one batched numpy pass over
+the chunk:
+- RMS energy (dB) compared against an adaptive noise floor
+- zero-crossing rate (high for hiss and clicks, low for voiced speech)
+- share of spectral energy in the 300-3400 Hz speech band
+
+Frames are combined with onset/hangover smoothing into speech segments, with a
+little audio kept before the onset so soft word beginnings survive.
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FRAME_MS = 20
+SPEECH_BAND = (300.0, 3400.0)
+# Frames louder than the noise floor plus this margin may be speech
+MARGIN_DB = 8.0
+# Frames this far above the floor count as speech whatever their spectrum (fricatives, shouting)
+LOUD_MARGIN_DB = 20.0
+# Voiced speech keeps most of its energy in the speech band and crosses zero rarely
+MIN_BAND_RATIO = 0.5
+MAX_ZCR = 0.35
+ONSET_MS = 60        # consecutive speech frames needed to open a segment
+HANGOVER_MS = 300    # non-speech frames tolerated before a segment closes
+MIN_SPEECH_MS = 120  # shorter segments are dropped as clicks/bumps
+PAD_MS = 200         # audio kept before the onset
+MAX_SEGMENT_SECONDS = 15.0
+# Noise floor tracking (dB per frame): falls quickly, rises slowly
+FLOOR_FALL = 0.3
+FLOOR_RISE = 0.02
+FLOOR_RISE_IN_SPEECH_DB = 0.03
+
+
+@dataclass
+class SpeechSegment:
+    """One detected stretch of speech"""
+    start: float       # seconds since the engine started (onset, excluding padding)
+    end: float         # seconds since the engine started
+    samples: np.ndarray  # int16 audio including the padding before the onset
+    sample_rate: int
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def pcm(self) -> bytes:
+        return self.samples.astype(np.int16).tobytes()
+
+
+class VADEngine:
+    """Streaming energy/spectral voice activity detector"""
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = FRAME_MS,
+                 margin_db: float = MARGIN_DB, hangover_ms: int = HANGOVER_MS,
+                 min_speech_ms: int = MIN_SPEECH_MS, pad_ms: int = PAD_MS,
+                 min_rms: float = 50.0, max_segment_seconds: float = MAX_SEGMENT_SECONDS):
+        """
+        Initialize the engine
+
+        Args:
+            sample_rate: Sample rate of the audio passed to process()
+            frame_ms: Analysis frame length (10-30 ms)
+            margin_db: Energy above the noise floor needed for a speech frame
+            hangover_ms: Silence tolerated inside a segment
+            min_speech_ms: Shortest segment reported
+            pad_ms: Audio kept before the detected onset
+            min_rms: Absolute RMS (int16 scale) below which nothing is speech
+            max_segment_seconds: Segments are closed after this long
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.frame_seconds = self.frame_length / sample_rate
+        self.margin_db = margin_db
+        self.min_db = 20 * np.log10(max(min_rms, 1e-3))
+
+        frames = lambda ms: max(1, int(round(ms / 1000 / self.frame_seconds)))
+        self.onset_frames = frames(ONSET_MS)
+        self.hangover_frames = frames(hangover_ms)
+        self.min_speech_frames = frames(min_speech_ms)
+        self.pad_frames = frames(pad_ms)
+        self.max_segment_frames = frames(max_segment_seconds * 1000)
+
+        self.window = np.hanning(self.frame_length)
+        bins = np.fft.rfftfreq(self.frame_length, 1.0 / sample_rate)
+        self.band = (bins >= SPEECH_BAND[0]) & (bins <= SPEECH_BAND[1])
+
+        self.noise_floor_db = None
+        self.reset()
+
+    def reset(self):
+        """Forget buffered audio and any open segment (the noise floor is kept)"""
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._frame_index = 0
+        self._history = deque(maxlen=self.pad_frames + self.onset_frames)
+        self._segment = None  # frames of the open segment
+        self._segment_start = 0
+        self._speech_run = 0
+        self._silence_run = 0
+        self._last_speech_frame = None
+        self.frames_processed = 0
+        self.speech_frames = 0
+
+    # --- features --------------------------------------------------------
+
+    def features(self, samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-frame features for whole frames of int16 samples
+
+        Returns:
+            (energy in dB, zero-crossing rate, speech-band energy ratio)
+        """
+        count = len(samples) // self.frame_length
+        frames = samples[:count * self.frame_length].reshape(count, self.frame_length).astype(np.float64)
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-9)
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        power = np.abs(np.fft.rfft(frames * self.window, axis=1)) ** 2
+        band_ratio = power[:, self.band].sum(axis=1) / (power.sum(axis=1) + 1e-9)
+        return energy_db, zcr, band_ratio
+
+    @staticmethod
+    def voiced(zcr: np.ndarray, band_ratio: np.ndarray) -> np.ndarray:
+        """Frames whose spectrum looks like voiced speech (independent of loudness)"""
+        return (band_ratio >= MIN_BAND_RATIO) & (zcr <= MAX_ZCR)
+
+    def is_speech(self, energy_db: float, voiced: bool) -> bool:
+        """Raw speech decision for one frame against the current noise floor"""
+        if energy_db <= self.min_db or energy_db <= self.noise_floor_db + self.margin_db:
+            return False
+        return voiced or energy_db > self.noise_floor_db + LOUD_MARGIN_DB
+
+    def calibrate(self, samples):
+        """Set the noise floor from audio known to be (mostly) background noise"""
+        energy_db, _, _ = self.features(self._to_int16(samples))
+        if len(energy_db):
+            self.noise_floor_db = float(np.percentile(energy_db, 20))
+
+    # --- streaming -------------------------------------------------------
+
+    @staticmethod
+    def _to_int16(chunk) -> np.ndarray:
+        if isinstance(chunk, (bytes, bytearray)):
+            return np.frombuffer(chunk, dtype=np.int16)
+        return np.asarray(chunk, dtype=np.int16)
+
+    @property
+    def in_speech(self) -> bool:
+        return self._segment is not None
+
+    @property
+    def silence_seconds(self) -> float:
+        """Seconds since the last speech frame (inf before any speech)"""
+        if self._last_speech_frame is None:
+            return float('inf')
+        return (self._frame_index - 1 - self._last_speech_frame) * self.frame_seconds
+
+    def process(self, chunk) -> List[SpeechSegment]:
+        """
+        Feed captured audio (int16 bytes or array)
+
+        Returns:
+            Segments that finished within this chunk
+        """
+        samples = self._to_int16(chunk)
+        if len(self._pending):
+            samples = np.concatenate([self._pending, samples])
+        count = len(samples) // self.frame_length
+        self._pending = samples[count * self.frame_length:].copy()
+        if count == 0:
+            return []
+
+        energy_db, zcr, band_ratio = self.features(samples)
+        if self.noise_floor_db is None:
+            self.noise_floor_db = float(np.min(energy_db))
+        frames = samples[:count * self.frame_length].reshape(count, self.frame_length)
+
+        # The floor moves frame by frame, so only this last step is sequential
+        finished = []
+        for i, (level, voiced) in enumerate(zip(energy_db.tolist(), self.voiced(zcr, band_ratio).tolist())):
+            speech = self.is_speech(level, voiced)
+            self._update_floor(level, speech)
+            segment = self._step(frames[i], speech)
+            if segment is not None:
+                finished.append(segment)
+        return finished
+
+    def flush(self) -> Optional[SpeechSegment]:
+        """Close the open segment, if any (e.g. when listening stops)"""
+        if self._segment is None:
+            return None
+        trailing = min(self._silence_run, len(self._segment))
+        return self._close(trailing)
+
+    def detect(self, samples) -> List[SpeechSegment]:
+        """All speech segments in a complete recording"""
+        self.reset()
+        self.noise_floor_db = None
+        segments = self.process(samples)
+        last = self.flush()
+        return segments + ([last] if last else [])
+
+    def _update_floor(self, energy_db: float, speech: bool):
+        if energy_db < self.noise_floor_db:
+            self.noise_floor_db += FLOOR_FALL * (energy_db - self.noise_floor_db)
+        elif speech:
+            self.noise_floor_db += FLOOR_RISE_IN_SPEECH_DB
+        else:
+            self.noise_floor_db += FLOOR_RISE * (energy_db - self.noise_floor_db)
+
+    def _step(self, frame: np.ndarray, speech: bool) -> Optional[SpeechSegment]:
+        """Onset/hangover state machine for one frame"""
+        index = self._frame_index
+        self._frame_index += 1
+        self.frames_processed += 1
+        if speech:
+            self.speech_frames += 1
+            self._last_speech_frame = index
+
+        if self._segment is None:
+            self._history.append(frame)
+            self._speech_run = self._speech_run + 1 if speech else 0
+            if self._speech_run >= self.onset_frames:
+                self._segment = list(self._history)
+                self._segment_start = index - self._speech_run + 1
+                self._silence_run = 0
+            return None
+
+        self._segment.append(frame)
+        self._silence_run = 0 if speech else self._silence_run + 1
+        if self._silence_run >= self.hangover_frames:
+            return self._close(self._silence_run)
+        if len(self._segment) >= self.max_segment_frames:
+            return self._close(0)
+        return None
+
+    def _close(self, trailing_silence: int) -> Optional[SpeechSegment]:
+        """End the open segment, keeping a short tail of the trailing silence"""
+        frames, self._segment = self._segment, None
+        self._history.clear()
+        self._speech_run = 0
+        self._silence_run = 0
+
+        end_frame = self._frame_index - trailing_silence
+        speech_frames = end_frame - self._segment_start
+        if speech_frames < self.min_speech_frames:
+            return None
+        keep_tail = min(trailing_silence, self.pad_frames // 2)
+        frames = frames[:len(frames) - trailing_silence + keep_tail]
+        return SpeechSegment(
+            start=self._segment_start * self.frame_seconds,
+            end=end_frame * self.frame_seconds,
+            samples=np.concatenate(frames),
+            sample_rate=self.sample_rate
+        )
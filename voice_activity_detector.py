@@ -9,16 +9,20 @@ import time
 import threading
 import platform
 import os
+from contextlib import contextmanager
 from typing import Optional, List, Dict, Any
 import numpy as np
 
+from vad_engine import VADEngine
+
 logger = logging.getLogger(__name__)
 
 class VoiceActivityDetector:
     """Smart voice activity detection that can differentiate between AI and human speech."""
     
-    def __init__(self, recognizer: sr.Recognizer):
+    def __init__(self, recognizer: sr.Recognizer, mic_stream=None):
         self.recognizer = recognizer
+        self.mic_stream = mic_stream  # shared MicrophoneStream, if the caller has one
         self.ai_speaking = False  # Flag to track when AI is speaking
         self.platform_info = self._detect_platform()
         self.ai_speech_patterns = [
@@ -248,6 +252,9 @@ class VoiceActivityDetector:
         """
         Listen for human speech while ignoring AI's own voice.
         
+        Speech boundaries are found locally by the frame-level VAD engine; only
+        the finished utterance is sent to speech recognition.
+        
         Args:
             timeout: Maximum time to wait for first speech
             silence_threshold: Seconds of silence to wait after speech ends
@@ -259,183 +266,106 @@ class VoiceActivityDetector:
         """
         
         try:
-            with sr.Microphone() as source:
+            # Get platform-optimized settings
+            settings = self._get_optimal_thresholds(game_mode)
+            
+            # Gap between words that still belongs to the same segment
+            if game_mode == 'spelling':
+                min_silence_gap = 0.2
+            elif game_mode == 'filipino':
+                min_silence_gap = 0.3
+            elif game_mode == 'interrupt':
+                min_silence_gap = 0.1
+            else:
+                min_silence_gap = 0.4
+            
+            # Apply platform-specific silence tolerance
+            # Pi 5 SPECIFIC FIX: Reduce silence threshold for better responsiveness
+            if self.platform_info['name'] == 'Raspberry Pi 5':
+                silence_threshold = min(1.5, silence_threshold * settings['silence_tolerance_base'] * 0.7)
+            else:
+                silence_threshold = silence_threshold * settings['silence_tolerance_base']
+            
+            with self._open_audio(settings['calibration_duration']) as (read_chunk, sample_rate, noise):
                 logger.info(f"🎤 Smart Voice Detection ({self.platform_info['name']}): Listening for human speech only...")
                 
-                # Get platform-optimized settings
-                settings = self._get_optimal_thresholds(game_mode)
-                
-                # Enhanced microphone calibration with platform-specific duration
-                calibration_duration = settings['calibration_duration']
-                self.recognizer.adjust_for_ambient_noise(source, duration=calibration_duration)
-                logger.info(f"🎯 Calibrated for {calibration_duration}s on {self.platform_info['name']}")
-                
-                # Set platform-optimized energy threshold
-                optimal_threshold = settings['energy_threshold']
-                self.recognizer.energy_threshold = max(optimal_threshold, self.recognizer.energy_threshold * 0.8)
-                
-                logger.info(f"🎚️ Energy threshold set to {self.recognizer.energy_threshold} (optimized for {self.platform_info['name']} {game_mode or 'normal'} mode)")
-                
-                # Configure timing based on game mode and platform
-                if game_mode == 'spelling':
-                    # Pi 5 SPECIFIC FIX: Faster chunk processing
-                    if self.platform_info['name'] == 'Raspberry Pi 5':
-                        chunk_duration = settings['chunk_duration_base'] * 0.8  # Faster for Pi 5
-                    else:
-                        chunk_duration = settings['chunk_duration_base'] * 0.6  # Faster for spelling
-                    min_silence_gap = 0.2
-                elif game_mode == 'filipino':
-                    # Pi 5 SPECIFIC FIX: Faster chunk processing
-                    if self.platform_info['name'] == 'Raspberry Pi 5':
-                        chunk_duration = settings['chunk_duration_base'] * 0.8  # Faster for Pi 5
-                    else:
-                        chunk_duration = settings['chunk_duration_base'] * 0.8  # Medium speed
-                    min_silence_gap = 0.3
-                elif game_mode == 'interrupt':
-                    # Pi 5 SPECIFIC FIX: Faster chunk processing
-                    if self.platform_info['name'] == 'Raspberry Pi 5':
-                        chunk_duration = settings['chunk_duration_base'] * 0.8  # Faster for Pi 5
-                    else:
-                        chunk_duration = settings['chunk_duration_base'] * 0.2  # Ultra-fast
-                    min_silence_gap = 0.1
-                else:
-                    # NORMAL MODE - OPTIMIZED FOR COMPLETE SPEECH CAPTURE
-                    # Pi 5 SPECIFIC FIX: Faster chunk processing
-                    if self.platform_info['name'] == 'Raspberry Pi 5':
-                        chunk_duration = settings['chunk_duration_base'] * 0.8  # Faster for Pi 5
-                    else:
-                        chunk_duration = settings['chunk_duration_base']
-                    min_silence_gap = 0.4
-                
-                # Apply platform-specific silence tolerance
-                # Pi 5 SPECIFIC FIX: Reduce silence threshold for better responsiveness
-                if self.platform_info['name'] == 'Raspberry Pi 5':
-                    silence_threshold = min(1.5, silence_threshold * settings['silence_tolerance_base'] * 0.7)
-                else:
-                    silence_threshold = silence_threshold * settings['silence_tolerance_base']
-                
-                self.recognizer.dynamic_energy_threshold = True
-                
-                # Voice activity detection with improved continuous speech handling
-                audio_chunks = []
-                total_listening_time = 0
-                consecutive_silence_time = 0
-                human_speech_detected = False
-                recent_ai_speech = False
-                last_speech_time = 0
-                
+                engine = VADEngine(
+                    sample_rate,
+                    hangover_ms=int(min_silence_gap * 1000),
+                    min_rms=settings['energy_threshold'] * 0.5
+                )
+                engine.calibrate(noise)
+                logger.info(f"🎚️ VAD noise floor {engine.noise_floor_db:.1f} dB, minimum level "
+                            f"{settings['energy_threshold'] * 0.5:.0f} ({game_mode or 'normal'} mode)")
                 logger.info(f"👂 Listening for human speech (max {max_total_time}s, silence tolerance: {silence_threshold:.1f}s)...")
                 
-                while total_listening_time < max_total_time:
+                segments = []
+                start_time = time.time()
+                while time.time() - start_time < max_total_time:
                     # Check if AI started speaking (should stop listening)
                     if self.ai_speaking:
                         logger.info("🔇 AI started speaking - stopping voice detection")
+                        segments = []
                         break
                     
-                    try:
-                        # Listen for a chunk with longer phrase limit for complete thoughts
-                        chunk_audio = self.recognizer.listen(
-                            source, 
-                            timeout=chunk_duration, 
-                            phrase_time_limit=min(4.0, chunk_duration * 8)  # Allow longer phrases for complete thoughts
-                        )
-                        
-                        # Quick speech test for this chunk
-                        try:
-                            test_text = self.recognizer.recognize_google(chunk_audio, language='en-US')
-                            
-                            if test_text.strip():
-                                # Check if this is AI's own voice
-                                if self.is_ai_speech(test_text):
-                                    logger.info(f"🤖 Ignored AI speech: '{test_text[:30]}...'")
-                                    consecutive_silence_time += chunk_duration
-                                    recent_ai_speech = True
-                                else:
-                                    # This is human speech!
-                                    current_time = total_listening_time
-                                    
-                                    # If this speech is close to previous speech, it's likely continuation
-                                    if human_speech_detected and (current_time - last_speech_time) < (silence_threshold * 0.8):
-                                        logger.info(f"👤 Continuing human speech: '{test_text[:30]}...'")
-                                    else:
-                                        logger.info(f"👤 Human speech detected: '{test_text[:30]}...'")
-                                    
-                                    audio_chunks.append(chunk_audio)
-                                    consecutive_silence_time = 0
-                                    human_speech_detected = True
-                                    recent_ai_speech = False
-                                    last_speech_time = current_time
-                            else:
-                                consecutive_silence_time += chunk_duration
-                                
-                        except (sr.UnknownValueError, sr.RequestError):
-                            # No recognizable speech in this chunk
-                            consecutive_silence_time += chunk_duration
-                            if human_speech_detected and consecutive_silence_time >= min_silence_gap:
-                                # Only log silence if we've detected speech and had a meaningful gap
-                                if consecutive_silence_time % 0.6 == 0:  # Log every 0.6 seconds to avoid spam
-                                    logger.info(f"🔇 Silence: {consecutive_silence_time:.1f}s of {silence_threshold}s")
-                        
-                        total_listening_time += chunk_duration
-                        
-                        # Stop if we have enough silence after detecting human speech
-                        # But be more generous with silence tolerance for natural speech
-                        if consecutive_silence_time >= silence_threshold and human_speech_detected:
-                            # Check if the last detected speech seems incomplete
-                            if audio_chunks:
-                                try:
-                                    # Quick check of the last chunk to see if sentence seems incomplete
-                                    last_chunk = audio_chunks[-1]
-                                    test_text = self.recognizer.recognize_google(last_chunk, language='en-US')
-                                    
-                                    # Common incomplete patterns
-                                    incomplete_patterns = [
-                                        "what is the", "how do you", "where is the", "when did the",
-                                        "why do", "who is", "which one", "how far is", "what are the",
-                                        "tell me about", "what about", "how about", "what if",
-                                        "can you", "could you", "would you", "will you"
-                                    ]
-                                    
-                                    test_lower = test_text.lower().strip()
-                                    is_incomplete = any(test_lower.endswith(pattern) for pattern in incomplete_patterns)
-                                    
-                                    if is_incomplete and consecutive_silence_time < (silence_threshold * 2):
-                                        logger.info(f"🔄 Detected incomplete sentence: '{test_text}' - waiting for completion...")
-                                        consecutive_silence_time = 0  # Reset to wait for more speech
-                                        continue
-                                        
-                                except (sr.UnknownValueError, sr.RequestError):
-                                    pass  # Continue with normal processing
-                            
-                            logger.info(f"✅ Human finished speaking! Processing {len(audio_chunks)} chunks...")
-                            break
-                            
-                    except sr.WaitTimeoutError:
-                        # Silence in this chunk
-                        consecutive_silence_time += chunk_duration
-                        total_listening_time += chunk_duration
-                        
-                        # Only log meaningful silence periods
-                        if human_speech_detected and consecutive_silence_time >= min_silence_gap:
-                            if int(consecutive_silence_time * 10) % 6 == 0:  # Log every 0.6 seconds
-                                logger.info(f"🔇 Silence: {consecutive_silence_time:.1f}s of {silence_threshold}s")
-                        
-                        # Stop if enough silence after human speech
-                        if consecutive_silence_time >= silence_threshold and human_speech_detected:
-                            logger.info("✅ Human finished speaking! Processing collected audio...")
-                            break
-                
-                # Process collected human speech
-                if not audio_chunks:
-                    logger.info("👤 No human speech detected")
-                    return None
+                    chunk = read_chunk()
+                    if not chunk:
+                        break
+                    for segment in engine.process(chunk):
+                        logger.info(f"👤 Speech segment {segment.start:.2f}-{segment.end:.2f}s")
+                        segments.append(segment)
+                    
+                    if engine.in_speech:
+                        continue
+                    if segments and engine.silence_seconds >= silence_threshold:
+                        logger.info(f"✅ Human finished speaking! Processing {len(segments)} segments...")
+                        break
+                    if not segments and time.time() - start_time >= timeout:
+                        break
                 
-                return self._process_audio_chunks(audio_chunks, game_mode)
+                last = engine.flush()
+                if last and not self.ai_speaking:
+                    segments.append(last)
+            
+            # Process collected human speech
+            if not segments:
+                logger.info("👤 No human speech detected")
+                return None
+            
+            utterance = sr.AudioData(b''.join(segment.pcm for segment in segments), sample_rate, 2)
+            text = self._process_audio_chunks([utterance], game_mode)
+            if text and self.is_ai_speech(text):
+                logger.info(f"🤖 Ignored AI speech: '{text[:30]}...'")
+                return None
+            return text
                 
         except Exception as e:
             logger.error(f"Voice detection error: {e}")
             return None
     
+    @contextmanager
+    def _open_audio(self, calibration_duration: float):
+        """
+        Audio input for one listening session
+        
+        Yields:
+            (read_chunk, sample_rate, noise): read_chunk() returns the next PCM
+            chunk (None when the input stalls); noise is recent background audio
+            used to seed the VAD noise floor
+        """
+        if self.mic_stream is not None:
+            # Shared stream: background audio is already buffered
+            noise = self.mic_stream.recent(calibration_duration)
+            reader = self.mic_stream.reader(preroll=0.3)
+            yield (lambda: reader.read_chunk(timeout=1.0)), self.mic_stream.sample_rate, noise
+            return
+        
+        with sr.Microphone() as source:
+            read_chunk = lambda: source.stream.read(source.CHUNK)
+            noise = b''.join(read_chunk() for _ in range(int(calibration_duration * source.SAMPLE_RATE / source.CHUNK)))
+            logger.info(f"🎯 Sampled {calibration_duration}s of background on {self.platform_info['name']}")
+            yield read_chunk, source.SAMPLE_RATE, noise
+    
     def _process_audio_chunks(self, audio_chunks: List[sr.AudioData], game_mode: str = None) -> Optional[str]:
         """Process and combine audio chunks into final text with improved sentence reconstruction."""
         try:
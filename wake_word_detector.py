@@ -18,6 +18,10 @@ except ImportError:
     PORCUPINE_AVAILABLE = False
 
 from audio_utils import AudioManager
+from keyword_spotter import KeywordSpotter
+
+# A wake reader left unread for longer than this (seconds) is dropped instead of catching up
+MAX_WAKE_READER_GAP = 1.0
 
 
 class WakeWordDetector:
@@ -43,18 +47,12 @@ class WakeWordDetector:
         
         self.logger = logging.getLogger(__name__)
         
-        # Try to initialize Porcupine (if available)
-        self.porcupine = None
-        try:
-            import pvporcupine
-            self.porcupine = pvporcupine.create(
-                keywords=["hey google", "alexa", "computer"]  # Generic wake words
-            )
-            self.logger.info("Porcupine wake word engine initialized")
-        except ImportError:
-            self.logger.info("Porcupine not available, using speech recognition fallback")
-        except Exception as e:
-            self.logger.warning(f"Porcupine initialization failed: {e}, using speech recognition fallback")
+        # Offline keyword spotter (falls back to speech recognition without enrolled samples)
+        self.keyword_spotter = None
+        self._wake_reader = None
+        self._wake_reader_last_read = 0.0
+        if getattr(config, 'wake_word_engine', 'local') == 'local':
+            self._init_keyword_spotter()
         
         # Wake word patterns for speech recognition fallback
         self.wake_patterns = {
@@ -78,6 +76,28 @@ class WakeWordDetector:
         
         self.logger.info("WakeWordDetector initialized with natural conversation flow")
 
+    def _init_keyword_spotter(self):
+        """Load enrolled wake word samples for on-device detection."""
+        samples_dir = getattr(self.config, 'wake_word_samples_dir', 'wake_words')
+        try:
+            spotter = KeywordSpotter.from_directory(
+                samples_dir,
+                sample_rate=self.audio_manager.sample_rate,
+                sensitivity=getattr(self.config, 'wake_word_sensitivity', 0.5)
+            )
+        except Exception as e:
+            self.logger.warning(f"Offline wake word engine failed to load: {e}, using speech recognition fallback")
+            return
+        
+        if not spotter.templates:
+            self.logger.info(f"No wake word samples in {samples_dir}/<user>/*.wav "
+                             "(record them with: python keyword_spotter.py enroll <user>), "
+                             "using speech recognition fallback")
+            return
+        
+        self.keyword_spotter = spotter
+        self.logger.info(f"🎯 Offline wake word engine ready for: {', '.join(spotter.users)}")
+
     def is_conversation_active(self) -> bool:
         """Check if we're currently in an active conversation."""
         if not self.conversation_active:
@@ -140,6 +160,9 @@ class WakeWordDetector:
 
     def listen_for_wake_word(self, timeout: int = 1) -> Optional[str]:
         """Listen for wake words and return detected user."""
+        if self.keyword_spotter:
+            return self._listen_locally(timeout)
+        
         try:
             # DEBUG: Show that we're actively listening
             self.logger.info(f"🎤 WAKE WORD DEBUG: Starting listen cycle (timeout={timeout}s)")
@@ -178,6 +201,31 @@ class WakeWordDetector:
             self.logger.error(f"🎤 WAKE WORD DEBUG: Traceback: {traceback.format_exc()}")
             return None
 
+    def _listen_locally(self, timeout: float) -> Optional[str]:
+        """Score the shared microphone stream with the offline spotter until a wake word or timeout."""
+        if self._wake_reader is not None and time.time() - self._wake_reader_last_read > MAX_WAKE_READER_GAP:
+            # Not polled for a while (a turn or a game ran in between): its backlog is stale
+            self._wake_reader = None
+        if self._wake_reader is None:
+            # Start at the live edge so audio from the last conversation is never scored
+            self.keyword_spotter.reset()
+            self._wake_reader = self.audio_manager.mic_stream.reader()
+        
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            chunk = self._wake_reader.read_chunk(timeout=max(0.05, deadline - time.time()))
+            self._wake_reader_last_read = time.time()
+            if chunk is None:
+                continue
+            detection = self.keyword_spotter.process(chunk)
+            if detection:
+                user, score = detection
+                self._wake_reader = None
+                self.logger.info(f"🎉 WAKE WORD DEBUG: Offline match for {user} (score {score:.1f})")
+                self.start_conversation(user)
+                return user
+        return None
+
     def continuous_listen(self, callback_func):
         """Continuously listen for wake words in a separate thread."""
         def listen_loop():
@@ -244,7 +292,8 @@ class WakeWordDetector:
             "wake_words_supported": list(self.wake_patterns.keys()),
             "users_supported": list(self.wake_patterns.keys()),
             "porcupine_available": PORCUPINE_AVAILABLE,
-            "using_advanced_detection": self.porcupine is not None,
+            "using_advanced_detection": self.keyword_spotter is not None,
+            "wake_word_engine": "local" if self.keyword_spotter else "speech",
             "microphone_info": mic_info,
             "audio_sample_rate": self.audio_manager.sample_rate,
             "audio_chunk_size": self.audio_manager.chunk_size,
@@ -259,9 +308,8 @@ class WakeWordDetector:
     def stop(self):
         """Stop wake word detection."""
         self.is_listening = False
+        self._wake_reader = None
         self.end_conversation()
-        if hasattr(self, 'porcupine') and self.porcupine:
-            self.porcupine.delete()
         if hasattr(self, 'audio_manager'):
             self.audio_manager.cleanup()
         self.logger.info("Wake word detector stopped")